@@ -0,0 +1 @@
+"""Benchmarks that are run manually, outside of the test suite."""
@@ -0,0 +1,323 @@
+"""Measures the latency of the paginated listings on a seeded database.
+
+Each listing is paginated as async_cursor_pagination paginates it for its route,
+for the user seeded as the most connected user, both from its first page and
+from a page deep into it. The p50 and p99 latency of each are written to a JSON
+file along with the commit and the size of the dataset, such that the results
+of different commits can be compared with --baseline.
+
+Seed the database first with benchmarks.seed, then run from the repository root
+with:
+    python -m benchmarks.pagination --database-url sqlite:///benchmark.db
+"""
+
+import argparse
+from datetime import datetime, timedelta
+import json
+import statistics
+import subprocess
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional
+from sqlalchemy import create_engine, func, or_, select
+from sqlalchemy.orm import Session, sessionmaker
+from messenger_schemas.schema.message_schema import MessageSchema
+from messenger.constants.pagination import CursorState
+from messenger.helpers.dependencies.pagination import (
+    cursor_parser,
+    get_cursor,
+    get_page_query,
+    get_page_results,
+    get_prefetched_pagination_model,
+)
+from messenger.helpers.dependencies.seek_queries import (
+    determine_cursor_query_order,
+)
+from messenger.helpers.dependencies.queries.query_friends import (
+    select_friends,
+)
+from messenger.helpers.dependencies.queries.query_messages import (
+    select_conversation_partitions,
+)
+from messenger.helpers.dependencies.queries.query_request_recievers import (
+    select_request_recievers,
+)
+from messenger.helpers.dependencies.queries.query_request_senders import (
+    select_request_senders,
+)
+from messenger.helpers.get_model_columns import get_model_columns
+from messenger.helpers.read_watermarks import get_message_columns
+from messenger.models.fastapi.message_model import MessageModel
+from messenger.models.fastapi.pagination_model import CursorPaginationModel
+from messenger.models.fastapi.user_model import PublicUserModel
+from benchmarks.seed import (
+    BENCHMARK_FRIEND_ID,
+    BENCHMARK_USER_ID,
+    DEFAULT_DATABASE_URL,
+    get_dataset_size,
+)
+
+DEFAULT_OUTPUT = "pagination_benchmark.json"
+
+# the fraction of a listing preceding the deep page.
+DEEP_PAGE_POSITION = 0.9
+
+
+def get_listing_arguments() -> Dict[str, Dict[str, Any]]:
+    """Produces the arguments each listing's route paginates with."""
+    listings = {}
+
+    for name, select_users in (
+        ("friends", select_friends),
+        ("request_senders", select_request_senders),
+        ("request_recievers", select_request_recievers),
+    ):
+        table = select_users(BENCHMARK_USER_ID)
+        listings[name] = dict(
+            table=table,
+            unique_column=table.username,
+            default_column_value="",
+            columns=get_model_columns(table, PublicUserModel),
+        )
+
+    listings["messages"] = dict(
+        table=MessageSchema,
+        unique_column=MessageSchema.created_date_time,
+        default_column_value=datetime.now() + timedelta(weeks=100),
+        order_asc=False,
+        tiebreaker_column=MessageSchema.message_id,
+        columns=get_message_columns(MessageModel),
+        partitions=select_conversation_partitions(
+            BENCHMARK_USER_ID, BENCHMARK_FRIEND_ID
+        ),
+    )
+
+    return listings
+
+
+def paginate_listing(
+    db: Session,
+    limit: int,
+    cursor: Optional[str],
+    arguments: Dict[str, Any],
+) -> CursorPaginationModel:
+    """Paginates a listing with the page query and pagination model of
+    async_cursor_pagination, executed by a sync session."""
+    cursor_state, column_values = cursor_parser(cursor)
+    columns = arguments.get("columns")
+
+    page_query = get_page_query(
+        arguments["table"],
+        arguments["unique_column"],
+        arguments["default_column_value"],
+        arguments.get("order_asc", True),
+        arguments.get("tiebreaker_column"),
+        columns,
+        cursor_state,
+        column_values,
+        limit,
+        arguments.get("partitions"),
+    )
+
+    return get_prefetched_pagination_model(
+        get_page_results(db.execute(page_query), columns),
+        limit,
+        1,
+        cursor_state,
+        column_values,
+        arguments["unique_column"],
+        arguments.get("tiebreaker_column"),
+    )
+
+
+def get_deep_cursor(db: Session, arguments: Dict[str, Any]) -> Optional[str]:
+    """Produces the cursor of the page that begins after DEEP_PAGE_POSITION of
+    the listing, found with an OFFSET that is not part of the measurement."""
+    table = arguments["table"]
+    unique_column = arguments["unique_column"]
+    tiebreaker_column = arguments.get("tiebreaker_column")
+    partitions = arguments.get("partitions")
+
+    listing_query = select(table)
+
+    if partitions is not None:
+        listing_query = listing_query.where(or_(*partitions))
+
+    total = db.execute(
+        select(func.count()).select_from(listing_query.subquery())
+    ).scalar_one()
+    offset = int(total * DEEP_PAGE_POSITION)
+
+    if offset == 0:
+        return None
+
+    record = db.execute(
+        listing_query.order_by(
+            *determine_cursor_query_order(
+                arguments.get("order_asc", True),
+                unique_column,
+                CursorState.NEXT.value,
+                tiebreaker_column,
+            )
+        )
+        .offset(offset - 1)
+        .limit(1)
+    ).scalar_one()
+
+    return get_cursor(
+        CursorState.NEXT.value, record, unique_column, tiebreaker_column
+    )
+
+
+def measure(
+    paginate: Callable[[], Any], db: Session, repeat: int
+) -> Dict[str, float]:
+    """Returns the p50 and p99 latency in milliseconds of a pagination."""
+    # warm the connection pool, statement caches and database buffers.
+    for _ in range(min(repeat, 10)):
+        paginate()
+        db.expunge_all()
+
+    latencies: List[float] = []
+
+    for _ in range(repeat):
+        start = perf_counter()
+        paginate()
+        latencies.append((perf_counter() - start) * 1e3)
+
+        # instances are not reused from the identity map between runs.
+        db.expunge_all()
+
+    percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+
+    return {
+        "p50_ms": round(percentiles[49], 4),
+        "p99_ms": round(percentiles[98], 4),
+    }
+
+
+def get_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results: List[Dict], baseline: Optional[Dict]) -> None:
+    baseline_results = (
+        {}
+        if baseline is None
+        else {
+            (result["listing"], result["position"]): result
+            for result in baseline["results"]
+        }
+    )
+
+    print(
+        f"{'listing':<20}{'position':<10}{'rows':>6}"
+        f"{'p50 (ms)':>12}{'p99 (ms)':>12}"
+        + ("" if baseline is None else f"{'p50 change':>12}{'p99 change':>12}")
+    )
+
+    for result in results:
+        line = (
+            f"{result['listing']:<20}{result['position']:<10}"
+            f"{result['rows']:>6}{result['p50_ms']:>12.3f}"
+            f"{result['p99_ms']:>12.3f}"
+        )
+        baseline_result = baseline_results.get(
+            (result["listing"], result["position"])
+        )
+
+        if baseline_result is not None:
+            for percentile in ("p50_ms", "p99_ms"):
+                change = result[percentile] / baseline_result[percentile] - 1
+                line += f"{change:>+12.1%}"
+
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--database-url",
+        default=DEFAULT_DATABASE_URL,
+        help="the SQLAlchemy url of a database seeded by benchmarks.seed.",
+    )
+    parser.add_argument(
+        "--limit", type=int, default=50, help="the page size to paginate."
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=200,
+        help="the number of timed paginations per measurement.",
+    )
+    parser.add_argument(
+        "--output",
+        default=DEFAULT_OUTPUT,
+        help="the JSON file the results are written to.",
+    )
+    parser.add_argument(
+        "--baseline",
+        help="a JSON file written by a previous run to compare against.",
+    )
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    db = sessionmaker(bind=engine, autoflush=False)()
+
+    results = []
+
+    for listing, arguments in get_listing_arguments().items():
+        for position, cursor in (
+            ("shallow", None),
+            ("deep", get_deep_cursor(db, arguments)),
+        ):
+
+            def paginate():
+                return paginate_listing(db, args.limit, cursor, arguments)
+
+            results.append(
+                {
+                    "listing": listing,
+                    "position": position,
+                    "cursor": cursor,
+                    "rows": len(paginate().results),
+                    **measure(paginate, db, args.repeat),
+                }
+            )
+
+    db.close()
+
+    report = {
+        "commit": get_commit(),
+        "created_date_time": datetime.now().isoformat(),
+        "database": engine.dialect.name,
+        "dataset": get_dataset_size(engine),
+        "limit": args.limit,
+        "repeat": args.repeat,
+        "results": results,
+    }
+
+    with open(args.output, "w", encoding="utf-8") as output:
+        json.dump(report, output, indent=2)
+
+    baseline = None
+
+    if args.baseline is not None:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+
+    print_results(results, baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+"""Captures the MySQL query plans of the query builders on a seeded database.
+
+Each case runs a query builder the way its route does, for the user seeded as
+the most connected user, while the SELECT statements it issues are captured.
+Every captured statement is then explained with EXPLAIN. A plan regresses when
+it reads a large table with a full table scan, or sorts the rows of a large
+table with a filesort. Derived tables, such as the union of a friends list,
+are never large, since their size is bounded by the rows of the tables they
+are derived from, whose plans are checked in turn.
+
+The plans are stored as snapshots in tests/query_plans/snapshots.json, such
+that the plans a change of the indexes of the schema package produces can be
+compared against them. Row estimates are left out of the snapshots as they
+vary between seeds and MySQL versions.
+
+Seed a MySQL database with benchmarks.seed first, then run from the
+repository root with:
+    python -m benchmarks.query_plans --database-url mysql+pymysql://...
+
+Pass --update-snapshots to record the current plans. A case with no recorded
+snapshot fails as a changed plan does, such that a case is never left
+unchecked against its snapshot. The test suite checks
+the same plans when QUERY_PLAN_DATABASE_URL is set, see
+tests/query_plans/test_query_plans.py.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import Session, sessionmaker
+from messenger_schemas.schema import Base
+from messenger.constants.message_search import MAX_QUERY_TERMS
+from messenger.helpers.change_log import select_changes
+from messenger.helpers.dependencies.queries.query_message_search import (
+    select_message_search,
+)
+from messenger.helpers.friend_suggestions import select_friend_suggestions
+from messenger.helpers.handlers.friendship_handler import FriendshipHandler
+from messenger.helpers.send_message import (
+    select_direct_message_authorization,
+)
+from benchmarks.pagination import (
+    get_deep_cursor,
+    get_listing_arguments,
+    paginate_listing,
+)
+from benchmarks.seed import BENCHMARK_FRIEND_ID, BENCHMARK_USER_ID
+
+SNAPSHOTS_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "tests",
+    "query_plans",
+    "snapshots.json",
+)
+
+# the number of rows from which a table is large enough that reading all of
+# it, or sorting it, is a regression.
+LARGE_TABLE_ROWS = 1000
+
+# the page size the listings are paginated with.
+PAGE_LIMIT = 50
+
+# the columns of an EXPLAIN row kept in the snapshots.
+SNAPSHOT_COLUMNS = ("id", "select_type", "table", "type", "key", "Extra")
+
+# a case prepares the query builder it covers, returning the function that
+# runs it.
+QueryPlanCase = Callable[[Session], Callable[[], Any]]
+
+
+def get_listing_cases() -> Dict[str, QueryPlanCase]:
+    """Produces a case for the first page and a page deep into each listing
+    paginated by async_cursor_pagination."""
+    cases: Dict[str, QueryPlanCase] = {}
+
+    for listing in get_listing_arguments():
+
+        def prepare_shallow(db: Session, listing=listing):
+            arguments = get_listing_arguments()[listing]
+
+            return lambda: paginate_listing(db, PAGE_LIMIT, None, arguments)
+
+        def prepare_deep(db: Session, listing=listing):
+            arguments = get_listing_arguments()[listing]
+            cursor = get_deep_cursor(db, arguments)
+
+            return lambda: paginate_listing(db, PAGE_LIMIT, cursor, arguments)
+
+        cases[f"{listing}_shallow"] = prepare_shallow
+        cases[f"{listing}_deep"] = prepare_deep
+
+    return cases
+
+
+def prepare_friendship_bidirectional(db: Session) -> Callable[[], Any]:
+    def run():
+        try:
+            FriendshipHandler(db).get_friendship_bidirectional_query(
+                BENCHMARK_USER_ID, BENCHMARK_FRIEND_ID
+            )
+        except HTTPException:
+            pass
+
+    return run
+
+
+def prepare_direct_message_authorization(db: Session) -> Callable[[], Any]:
+    return lambda: db.execute(
+        select_direct_message_authorization(
+            BENCHMARK_USER_ID, "username" + str(BENCHMARK_FRIEND_ID)
+        )
+    ).all()
+
+
+def prepare_friend_suggestions(db: Session) -> Callable[[], Any]:
+    return lambda: db.execute(
+        select_friend_suggestions(BENCHMARK_USER_ID, PAGE_LIMIT)
+    ).all()
+
+
+def prepare_message_search(db: Session) -> Callable[[], Any]:
+    search_table = select_message_search(BENCHMARK_USER_ID, ["coffee", "late"])
+
+    return lambda: paginate_listing(
+        db,
+        PAGE_LIMIT,
+        None,
+        dict(
+            table=search_table,
+            unique_column=search_table.relevance,
+            default_column_value=MAX_QUERY_TERMS + 1,
+            order_asc=False,
+            tiebreaker_column=search_table.message_id,
+        ),
+    )
+
+
+def prepare_sync(db: Session) -> Callable[[], Any]:
+    return lambda: db.execute(
+        select_changes(BENCHMARK_USER_ID, 0, PAGE_LIMIT)
+    ).all()
+
+
+QUERY_PLAN_CASES: Dict[str, QueryPlanCase] = {
+    **get_listing_cases(),
+    "friendship_bidirectional": prepare_friendship_bidirectional,
+    "direct_message_authorization": prepare_direct_message_authorization,
+    "friend_suggestions": prepare_friend_suggestions,
+    "message_search": prepare_message_search,
+    "sync": prepare_sync,
+}
+
+
+def capture_select_statements(
+    db: Session, run: Callable[[], Any]
+) -> List[Tuple[str, Any]]:
+    """Runs a query builder, capturing the SELECT statements it issues along
+    with their parameters."""
+    statements: List[Tuple[str, Any]] = []
+
+    def capture_statement(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", capture_statement)
+
+    try:
+        run()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture_statement)
+        db.rollback()
+
+    return statements
+
+
+def explain(db: Session, statement: str, parameters: Any) -> List[Dict]:
+    """Explains a statement, keeping the columns of each row of its plan
+    that are stored in the snapshots along with the estimated rows."""
+    rows = (
+        db.connection()
+        .exec_driver_sql("EXPLAIN " + statement, parameters)
+        .mappings()
+        .all()
+    )
+
+    return [
+        {
+            **{column: row[column] for column in SNAPSHOT_COLUMNS},
+            "rows": row["rows"],
+        }
+        for row in rows
+    ]
+
+
+def get_query_plan(db: Session, case: QueryPlanCase) -> List[List[Dict]]:
+    """Explains every SELECT statement a case issues, in order."""
+    return [
+        explain(db, statement, parameters)
+        for statement, parameters in capture_select_statements(db, case(db))
+    ]
+
+
+def get_table_sizes(db: Session) -> Dict[str, int]:
+    return {
+        table.name: db.execute(
+            select(func.count()).select_from(table)
+        ).scalar_one()
+        for table in Base.metadata.sorted_tables
+    }
+
+
+def get_base_table(table: Optional[str], table_sizes: Dict[str, int]):
+    """Resolves the table an EXPLAIN row reads to the name of a schema table,
+    undoing the numbered aliases SQLAlchemy gives tables, or None for derived
+    tables."""
+    if table is None:
+        return None
+
+    for name in (table, re.sub(r"_\d+$", "", table)):
+        if name in table_sizes:
+            return name
+
+    return None
+
+
+def find_plan_regressions(
+    plan: List[List[Dict]], table_sizes: Dict[str, int]
+) -> List[str]:
+    """Finds the steps of a plan that scan or sort a large table in full.
+
+    Args:
+        plan (List[List[Dict]]): the plan of every statement of a case.
+        table_sizes (Dict[str, int]): the number of rows of each table.
+
+    Returns:
+        List[str]: a description of every regression, if any.
+    """
+    regressions = []
+
+    for index, statement_plan in enumerate(plan):
+        for step in statement_plan:
+            table = get_base_table(step["table"], table_sizes)
+
+            if table is None or table_sizes[table] < LARGE_TABLE_ROWS:
+                continue
+
+            extra = step["Extra"] or ""
+
+            if step["type"] == "ALL":
+                regressions.append(
+                    f"statement {index}: full table scan of {table} "
+                    f"({table_sizes[table]} rows)"
+                )
+            if "Using filesort" in extra:
+                regressions.append(
+                    f"statement {index}: filesort of {table} "
+                    f"({table_sizes[table]} rows)"
+                )
+
+    return regressions
+
+
+def get_plan_snapshot(plan: List[List[Dict]]) -> List[List[Dict]]:
+    return [
+        [
+            {column: step[column] for column in SNAPSHOT_COLUMNS}
+            for step in steps
+        ]
+        for steps in plan
+    ]
+
+
+def load_snapshots(path: str = SNAPSHOTS_PATH) -> Dict[str, List[List[Dict]]]:
+    if not os.path.exists(path):
+        return {}
+
+    with open(path, encoding="utf-8") as snapshots_file:
+        return json.load(snapshots_file)
+
+
+def write_snapshots(
+    snapshots: Dict[str, List[List[Dict]]], path: str = SNAPSHOTS_PATH
+) -> None:
+    with open(path, "w", encoding="utf-8") as snapshots_file:
+        json.dump(snapshots, snapshots_file, indent=2, sort_keys=True)
+        snapshots_file.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--database-url",
+        required=True,
+        help="the SQLAlchemy url of a MySQL database seeded by benchmarks.seed.",
+    )
+    parser.add_argument(
+        "--update-snapshots",
+        action="store_true",
+        help="record the current plans as the snapshots.",
+    )
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+
+    if engine.dialect.name != "mysql":
+        parser.error("query plans can only be captured from MySQL.")
+
+    db = sessionmaker(bind=engine, autoflush=False)()
+    table_sizes = get_table_sizes(db)
+    snapshots = load_snapshots()
+    failed = False
+
+    for name, case in QUERY_PLAN_CASES.items():
+        plan = get_query_plan(db, case)
+        regressions = find_plan_regressions(plan, table_sizes)
+        snapshot = get_plan_snapshot(plan)
+        is_recorded = name in snapshots
+        changed = is_recorded and snapshots[name] != snapshot
+
+        print(
+            f"{name:<32}{len(plan):>3} statements"
+            + ("  plan changed" if changed else "")
+            + ("" if is_recorded else "  no snapshot recorded")
+        )
+
+        for regression in regressions:
+            print(f"    {regression}")
+
+        failed = failed or bool(regressions)
+
+        if args.update_snapshots:
+            snapshots[name] = snapshot
+        else:
+            failed = failed or changed or not is_recorded
+
+    db.close()
+
+    if args.update_snapshots:
+        write_snapshots(snapshots)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
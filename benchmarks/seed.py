@@ -0,0 +1,429 @@
+"""Seeds a database with a synthetic dataset for the query benchmarks.
+
+The dataset is generated from a fixed random seed so that it is identical
+between runs, and thus between the commits being compared:
+
+- users, where the number of friendships of the user with id i follows a power
+  law, such that user 1 is the most connected user.
+- friendships between random users, each with a history of statuses that
+  begins with a request.
+- messages spread over the accepted friendships, along with a long
+  conversation between users 1 and 2 which the message benchmarks page through.
+
+Any existing tables of the database are dropped before it is seeded.
+
+Run from the repository root with:
+    python -m benchmarks.seed --database-url sqlite:///benchmark.db
+"""
+
+import argparse
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from random import Random
+from typing import Dict, Iterable, Iterator, List, Tuple
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from messenger_schemas.schema import Base
+
+# import all the schemas as to load the Base with all the schema metadata
+import messenger_schemas.schema.schemas
+from messenger_schemas.schema.friendship_schema import FriendshipSchema
+from messenger_schemas.schema.friendship_status_code_schema import (
+    FriendshipStatusCodeSchema,
+)
+from messenger_schemas.schema.friendship_status_schema import (
+    FriendshipStatusSchema,
+)
+from messenger_schemas.schema.message_schema import MessageSchema
+from messenger_schemas.schema.user_schema import UserSchema
+from messenger.constants.friendship_status_codes import FriendshipStatusCode
+from messenger.helpers.conversation_summaries import (
+    rebuild_conversation_summaries,
+)
+from messenger.helpers.current_friendship_status import (
+    rebuild_current_friendship_statuses,
+)
+from messenger.helpers.friend_suggestions import rebuild_mutual_friend_counts
+from messenger.helpers.friendship_counts import rebuild_friendship_counts
+from messenger.helpers.message_search import rebuild_message_search_index
+from messenger.models.schema.conversation_summary_schema import (
+    ConversationSummarySchema,
+)
+from messenger.models.schema.current_friendship_status_schema import (
+    CurrentFriendshipStatusSchema,
+)
+from messenger.models.schema.friendship_count_schema import (
+    FriendshipCountSchema,
+)
+from messenger.models.schema.message_term_schema import MessageTermSchema
+from messenger.models.schema.mutual_friend_count_schema import (
+    MutualFriendCountSchema,
+)
+
+DEFAULT_DATABASE_URL = "sqlite:///benchmark.db"
+
+# the user every listing is benchmarked for, and the friend with whom they
+# hold the benchmarked conversation.
+BENCHMARK_USER_ID = 1
+BENCHMARK_FRIEND_ID = 2
+
+SEED_START_DATE_TIME = datetime(2022, 1, 1)
+
+INSERT_BATCH_SIZE = 5000
+
+# the words the content of the messages is made of, such that the terms of
+# the search index are shared between messages as they are in practice.
+CONTENT_WORDS = (
+    "hey hello thanks sure maybe later tomorrow tonight today weekend "
+    "dinner lunch coffee movie game work meeting call running late soon "
+    "home office trip photos plans free busy great awesome sounds good"
+).split()
+
+# the statuses a friendship may move to after its request.
+STATUS_TRANSITIONS = (
+    (FriendshipStatusCode.ACCEPTED, 0.6),
+    (FriendshipStatusCode.REQUESTED, 0.15),
+    (FriendshipStatusCode.DECLINED, 0.15),
+    (FriendshipStatusCode.BLOCKED, 0.1),
+)
+
+
+@dataclass
+class SeedConfig:
+    users: int = 2000
+    max_friends: int = 1000
+    friendship_exponent: float = 0.8
+    max_status_history: int = 4
+    messages: int = 50000
+    conversation_messages: int = 50000
+    random_seed: int = 0
+
+
+def batched(rows: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    batch: List[Dict] = []
+
+    for row in rows:
+        batch.append(row)
+
+        if len(batch) == size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+def insert_rows(engine: Engine, Schema, rows: Iterable[Dict]) -> None:
+    """Inserts the rows in batches, each as a single executemany."""
+    with engine.begin() as connection:
+        for batch in batched(rows, INSERT_BATCH_SIZE):
+            connection.execute(Schema.__table__.insert(), batch)
+
+
+def get_friend_count(user_id: int, config: SeedConfig) -> int:
+    """Produces the number of friendships a user initiates, which decays as
+    a power law of the user's id."""
+    return max(
+        1,
+        int(config.max_friends * user_id**-config.friendship_exponent),
+    )
+
+
+def generate_friendship_pairs(
+    config: SeedConfig, random: Random
+) -> List[Tuple[int, int]]:
+    """Produces unique (requester_id, addressee_id) pairs, such that no two
+    pairs are between the same users."""
+    pairs = {(BENCHMARK_USER_ID, BENCHMARK_FRIEND_ID)}
+    connected = {frozenset((BENCHMARK_USER_ID, BENCHMARK_FRIEND_ID))}
+
+    for user_id in range(1, config.users + 1):
+        friend_count = min(get_friend_count(user_id, config), config.users - 1)
+
+        for friend_id in random.sample(
+            range(1, config.users + 1), friend_count
+        ):
+            key = frozenset((user_id, friend_id))
+
+            if friend_id == user_id or key in connected:
+                continue
+
+            connected.add(key)
+
+            # either user may have sent the request.
+            pairs.add(
+                (user_id, friend_id)
+                if random.random() < 0.5
+                else (friend_id, user_id)
+            )
+
+    return sorted(pairs)
+
+
+def generate_status_histories(
+    pairs: List[Tuple[int, int]], config: SeedConfig, random: Random
+) -> Tuple[List[Dict], List[Dict], List[Tuple[int, int]]]:
+    """Produces the friendship rows, their status rows and the pairs whose
+    latest status is accepted."""
+    codes = [code for code, _ in STATUS_TRANSITIONS]
+    weights = [weight for _, weight in STATUS_TRANSITIONS]
+
+    friendships: List[Dict] = []
+    statuses: List[Dict] = []
+    accepted_pairs: List[Tuple[int, int]] = []
+
+    for requester_id, addressee_id in pairs:
+        created_date_time = SEED_START_DATE_TIME + timedelta(
+            seconds=random.randrange(365 * 24 * 3600)
+        )
+        friendships.append(
+            {
+                "requester_id": requester_id,
+                "addressee_id": addressee_id,
+                "created_date_time": created_date_time,
+            }
+        )
+
+        history = [FriendshipStatusCode.REQUESTED] + random.choices(
+            codes,
+            weights,
+            k=random.randrange(1, config.max_status_history + 1) - 1,
+        )
+
+        if (requester_id, addressee_id) == (
+            BENCHMARK_USER_ID,
+            BENCHMARK_FRIEND_ID,
+        ):
+            history.append(FriendshipStatusCode.ACCEPTED)
+
+        specified_date_time = created_date_time
+
+        for status_code in history:
+            statuses.append(
+                {
+                    "requester_id": requester_id,
+                    "addressee_id": addressee_id,
+                    "specified_date_time": specified_date_time,
+                    "status_code_id": status_code.value,
+                    "specifier_id": requester_id
+                    if status_code == FriendshipStatusCode.REQUESTED
+                    else addressee_id,
+                }
+            )
+            specified_date_time += timedelta(seconds=random.randrange(1, 3600))
+
+        if history[-1] == FriendshipStatusCode.ACCEPTED:
+            accepted_pairs.append((requester_id, addressee_id))
+
+    return friendships, statuses, accepted_pairs
+
+
+def get_message_content(i: int) -> str:
+    """Produces the content of the ith message seeded, made of a term unique
+    to it followed by a few common words."""
+    words = [
+        CONTENT_WORDS[(i * step) % len(CONTENT_WORDS)] for step in (1, 7, 13)
+    ]
+
+    return " ".join(["content" + str(i), *words])
+
+
+def generate_messages(
+    accepted_pairs: List[Tuple[int, int]], config: SeedConfig, random: Random
+) -> Iterator[Dict]:
+    """Produces the messages of the benchmarked conversation followed by the
+    messages spread over the other accepted friendships.
+
+    Consecutive messages of a conversation may share a created_date_time, as
+    they do when sent within the precision of the column."""
+    created_date_time = SEED_START_DATE_TIME
+
+    for i in range(config.conversation_messages):
+        if random.random() < 0.9:
+            created_date_time += timedelta(seconds=random.randrange(1, 60))
+
+        yield {
+            "sender_id": BENCHMARK_USER_ID if i % 2 else BENCHMARK_FRIEND_ID,
+            "reciever_id": BENCHMARK_FRIEND_ID if i % 2 else BENCHMARK_USER_ID,
+            "content": get_message_content(i),
+            "created_date_time": created_date_time,
+            "seen": False,
+        }
+
+    for i in range(config.messages):
+        sender_id, reciever_id = random.choice(accepted_pairs)
+
+        if random.random() < 0.5:
+            sender_id, reciever_id = reciever_id, sender_id
+
+        yield {
+            "sender_id": sender_id,
+            "reciever_id": reciever_id,
+            "content": get_message_content(i),
+            "created_date_time": SEED_START_DATE_TIME
+            + timedelta(seconds=random.randrange(365 * 24 * 3600)),
+            "seen": False,
+        }
+
+
+def seed_database(engine: Engine, config: SeedConfig) -> Dict[str, int]:
+    """Drops and recreates every table, then seeds them with the dataset
+    described by the given config.
+
+    Returns:
+        Dict[str, int]: the number of rows in each seeded table.
+    """
+    random = Random(config.random_seed)
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    insert_rows(
+        engine,
+        FriendshipStatusCodeSchema,
+        (
+            {"status_code_id": status_code.value, "name": status_code.name}
+            for status_code in FriendshipStatusCode
+        ),
+    )
+
+    insert_rows(
+        engine,
+        UserSchema,
+        (
+            {
+                "user_id": user_id,
+                "username": "username" + str(user_id),
+                "email": "email" + str(user_id),
+                "password_hash": "password",
+            }
+            for user_id in range(1, config.users + 1)
+        ),
+    )
+
+    pairs = generate_friendship_pairs(config, random)
+    friendships, statuses, accepted_pairs = generate_status_histories(
+        pairs, config, random
+    )
+
+    insert_rows(engine, FriendshipSchema, friendships)
+    insert_rows(engine, FriendshipStatusSchema, statuses)
+
+    with Session(engine) as db:
+        rebuild_current_friendship_statuses(db)
+        rebuild_mutual_friend_counts(db)
+        rebuild_friendship_counts(db)
+        db.commit()
+
+    insert_rows(
+        engine,
+        MessageSchema,
+        generate_messages(accepted_pairs, config, random),
+    )
+
+    with Session(engine) as db:
+        rebuild_conversation_summaries(db)
+        db.commit()
+
+        for _ in rebuild_message_search_index(db):
+            pass
+
+    return get_dataset_size(engine)
+
+
+def get_dataset_size(engine: Engine) -> Dict[str, int]:
+    """Counts the rows of each table the benchmarks query."""
+    with engine.connect() as connection:
+        return {
+            Schema.__tablename__: connection.execute(
+                select(func.count()).select_from(Schema)
+            ).scalar_one()
+            for Schema in (
+                UserSchema,
+                FriendshipSchema,
+                FriendshipStatusSchema,
+                CurrentFriendshipStatusSchema,
+                MutualFriendCountSchema,
+                FriendshipCountSchema,
+                MessageSchema,
+                ConversationSummarySchema,
+                MessageTermSchema,
+            )
+        }
+
+
+def add_seed_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = SeedConfig()
+
+    parser.add_argument("--users", type=int, default=defaults.users)
+    parser.add_argument(
+        "--max-friends",
+        type=int,
+        default=defaults.max_friends,
+        help="the number of friendships initiated by the most connected user.",
+    )
+    parser.add_argument(
+        "--friendship-exponent",
+        type=float,
+        default=defaults.friendship_exponent,
+        help="the exponent of the power law friendship counts decay by.",
+    )
+    parser.add_argument(
+        "--max-status-history",
+        type=int,
+        default=defaults.max_status_history,
+        help="the largest number of statuses of a single friendship.",
+    )
+    parser.add_argument(
+        "--messages",
+        type=int,
+        default=defaults.messages,
+        help="the number of messages spread over all accepted friendships.",
+    )
+    parser.add_argument(
+        "--conversation-messages",
+        type=int,
+        default=defaults.conversation_messages,
+        help="the number of messages in the benchmarked conversation.",
+    )
+    parser.add_argument(
+        "--random-seed", type=int, default=defaults.random_seed
+    )
+
+
+def get_seed_config(args: argparse.Namespace) -> SeedConfig:
+    return SeedConfig(
+        users=args.users,
+        max_friends=args.max_friends,
+        friendship_exponent=args.friendship_exponent,
+        max_status_history=args.max_status_history,
+        messages=args.messages,
+        conversation_messages=args.conversation_messages,
+        random_seed=args.random_seed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--database-url",
+        default=DEFAULT_DATABASE_URL,
+        help="the SQLAlchemy url of the database to seed.",
+    )
+    add_seed_arguments(parser)
+    args = parser.parse_args()
+
+    dataset_size = seed_database(
+        create_engine(args.database_url), get_seed_config(args)
+    )
+
+    for table_name, row_count in dataset_size.items():
+        print(f"{table_name:<26}{row_count:>10}")
+
+
+if __name__ == "__main__":
+    main()
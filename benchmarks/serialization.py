@@ -0,0 +1,133 @@
+"""Measures the per-page serialization cost of the paginated routes.
+
+The previous path validates each row with from_orm, lets FastAPI validate the
+whole page again against the route's response_model, then encodes it with the
+jsonable_encoder and the stdlib json encoder. The fast path is paginated_response.
+
+Run from the repository root with:
+    python -m benchmarks.serialization
+"""
+
+import argparse
+from datetime import datetime, timedelta
+from timeit import Timer
+from types import SimpleNamespace
+from typing import Any, Callable, List, Type
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.utils import create_response_field
+from pydantic import BaseModel
+from messenger.helpers.paginated_response import paginated_response
+from messenger.models.fastapi.message_model import MessageModel
+from messenger.models.fastapi.pagination_model import (
+    CursorModel,
+    CursorPaginationModel,
+)
+from messenger.models.fastapi.user_model import PublicUserModel
+
+PAGE_SIZES = (100, 500, 1000)
+
+# cursors as encoded by encode_cursor for a (created_date_time, message_id).
+CURSOR = CursorModel(
+    prev_page="AQFkAAXs1hrHoABpAAAAAAAAAAEyqLlCzDNIcK51XpY",
+    next_page="AQBkAAXs1hrHoABpAAAAAAAAA-gpv05rSewT8WZK284",
+)
+
+
+def make_user_rows(page_size: int) -> List[Any]:
+    return [
+        SimpleNamespace(user_id=i, username="username" + str(i))
+        for i in range(page_size)
+    ]
+
+
+def make_message_rows(page_size: int) -> List[Any]:
+    created_date_time = datetime(2022, 11, 7)
+
+    return [
+        SimpleNamespace(
+            message_id=i,
+            sender_id=1,
+            reciever_id=2,
+            content="content" + str(i),
+            group_chat_id=None,
+            created_date_time=created_date_time + timedelta(seconds=i),
+            last_edited_date_time=None,
+            seen=False,
+        )
+        for i in range(page_size)
+    ]
+
+
+def previous_path(Model: Type[BaseModel], rows: List[Any]) -> bytes:
+    cursor_pagination_model = CursorPaginationModel(
+        cursor=CURSOR, results=rows
+    )
+    cursor_pagination_model.results = [
+        Model.from_orm(row) for row in cursor_pagination_model.results
+    ]
+
+    # mirrors fastapi.routing.serialize_response for a route with a response_model
+    response_field = create_response_field(
+        name="response", type_=CursorPaginationModel[Model]
+    )
+    value, _ = response_field.validate(
+        cursor_pagination_model.dict(by_alias=True), {}, loc=("response",)
+    )
+
+    return JSONResponse(jsonable_encoder(value)).body
+
+
+def fast_path(Model: Type[BaseModel], rows: List[Any]) -> bytes:
+    return paginated_response(
+        Model, CursorPaginationModel(cursor=CURSOR, results=rows)
+    ).body
+
+
+def time_per_page(
+    serialize: Callable[[Type[BaseModel], List[Any]], bytes],
+    Model: Type[BaseModel],
+    rows: List[Any],
+    repeat: int,
+) -> float:
+    """Returns the best time in microseconds taken to serialize one page."""
+    timer = Timer(lambda: serialize(Model, rows))
+    number, _ = timer.autorange()
+
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="the number of timing runs per measurement, the best is reported.",
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'model':<16}{'rows':>6}{'previous (us)':>16}"
+        f"{'fast (us)':>12}{'speedup':>10}"
+    )
+
+    for Model, make_rows in (
+        (PublicUserModel, make_user_rows),
+        (MessageModel, make_message_rows),
+    ):
+        for page_size in PAGE_SIZES:
+            rows = make_rows(page_size)
+            previous_time = time_per_page(
+                previous_path, Model, rows, args.repeat
+            )
+            fast_time = time_per_page(fast_path, Model, rows, args.repeat)
+
+            print(
+                f"{Model.__name__:<16}{page_size:>6}{previous_time:>16.1f}"
+                f"{fast_time:>12.1f}{previous_time / fast_time:>9.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
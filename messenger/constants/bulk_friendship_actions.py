@@ -0,0 +1,11 @@
+from enum import Enum
+
+
+class BulkFriendshipAction(Enum):
+    ACCEPT = "accept"
+    DECLINE = "decline"
+    BLOCK = "block"
+
+
+# the largest number of usernames a single bulk friendship action can address.
+MAX_BULK_FRIENDSHIP_USERNAMES = 100
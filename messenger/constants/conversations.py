@@ -0,0 +1,3 @@
+# the number of characters of the last message of a conversation kept as its
+# preview.
+LAST_MESSAGE_PREVIEW_LENGTH = 100
@@ -0,0 +1,8 @@
+# the largest number of users whose friend ids are cached, beyond which the
+# least recently used are evicted.
+FRIEND_CACHE_MAX_USERS = 10000
+
+# the number of seconds friend ids are cached for. Invalidation only reaches
+# the cache of the process that changed the friendship, so this bounds how
+# stale the cache of any other process can be.
+FRIEND_CACHE_TTL_SECONDS = 60
@@ -0,0 +1,5 @@
+# the number of friend suggestions returned when no limit is given.
+DEFAULT_FRIEND_SUGGESTIONS = 10
+
+# the largest number of friend suggestions that can be requested at once.
+MAX_FRIEND_SUGGESTIONS = 50
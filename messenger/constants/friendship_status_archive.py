@@ -0,0 +1,3 @@
+# the number of friendships whose superseded statuses are archived in each
+# transaction of the archival job.
+ARCHIVE_BATCH_SIZE = 1000
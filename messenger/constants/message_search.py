@@ -0,0 +1,10 @@
+# the length terms are truncated to before they are indexed or searched.
+MAX_TERM_LENGTH = 64
+
+# the number of distinct terms of a search query that are searched for, the
+# rest are ignored.
+MAX_QUERY_TERMS = 10
+
+# the number of messages indexed in each transaction when the index is
+# rebuilt.
+INDEX_BATCH_SIZE = 1000
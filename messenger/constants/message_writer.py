@@ -0,0 +1,6 @@
+# the largest number of messages the message writer inserts per transaction.
+MESSAGE_WRITER_MAX_BATCH_SIZE = 100
+
+# the number of seconds the message writer waits for further messages to join
+# a batch once its first message is queued.
+MESSAGE_WRITER_MAX_DELAY_SECONDS = 0.005
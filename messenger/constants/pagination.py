@@ -6,5 +6,18 @@ class CursorState(Enum):
     NEXT = "next"
 
 
-PREVIOUS_PREFIX = CursorState.PREVIOUS.value + "___"
-NEXT_PREFIX = CursorState.NEXT.value + "___"
+class AroundSide(Enum):
+    BEFORE = 0
+    AFTER = 1
+
+
+# the version of the cursor encoding, cursors of any other version are
+# rejected as invalid.
+CURSOR_VERSION = 1
+
+# the number of bytes of the HMAC-SHA256 kept as the signature of a cursor.
+CURSOR_SIGNATURE_SIZE = 12
+
+# the largest number of consecutive pages that can be retrieved by a
+# single pagination request.
+MAX_PREFETCH_PAGES = 10
@@ -0,0 +1,15 @@
+from enum import Enum
+
+
+class ChangeType(Enum):
+    # a direct message was sent or recieved.
+    MESSAGE = "message"
+    # the user read the messages of a conversation up to a message.
+    READ = "read"
+    # the partner of the user read the messages of their conversation up to
+    # a message.
+    READ_BY_PARTNER = "read_by_partner"
+
+
+# the largest number of changes a single sync can retrieve.
+MAX_SYNC_LIMIT = 500
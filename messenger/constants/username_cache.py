@@ -0,0 +1,13 @@
+# the largest number of usernames whose users are cached, beyond which the
+# least recently used are evicted.
+USERNAME_CACHE_MAX_USERNAMES = 10000
+
+# the number of seconds the user of a username is cached for. Invalidation
+# only reaches the cache of the process that created or renamed the user, so
+# this bounds how stale the cache of any other process can be.
+USERNAME_CACHE_TTL_SECONDS = 60
+
+# the number of seconds a username that belongs to no user is cached for.
+# Shorter than USERNAME_CACHE_TTL_SECONDS since a user that signs up with it
+# in another process would not be found until it expires.
+USERNAME_CACHE_NEGATIVE_TTL_SECONDS = 5
@@ -2,7 +2,16 @@
 
 from fastapi import FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
-from messenger.routers import users, auth, messages, friends, group_chat
+from messenger.helpers.message_writer import message_writer
+from messenger.routers import (
+    users,
+    auth,
+    messages,
+    friends,
+    group_chat,
+    conversations,
+    sync,
+)
 from messenger.settings import origins
 from messenger.sockets import sio_app
 
@@ -28,10 +37,18 @@ app.include_router(auth.router)
 app.include_router(messages.router)
 app.include_router(friends.router)
 app.include_router(group_chat.router)
+app.include_router(conversations.router)
+app.include_router(sync.router)
 
 app.mount("/ws", sio_app)
 
 
+@app.on_event("shutdown")
+async def close_message_writer():
+    # write the messages that are still queued before the process exits.
+    await message_writer.close()
+
+
 @app.get("/health", status_code=status.HTTP_200_OK)
 def perform_healthcheck():
     return {"health": "Everything OK!"}
@@ -4,9 +4,6 @@ from fastapi import HTTPException, status
 from messenger_schemas.schema.friendship_status_schema import (
     FriendshipStatusSchema,
 )
-from messenger_schemas.schema.user_schema import (
-    UserSchema,
-)
 from sqlalchemy.orm import (
     Session,
 )
@@ -39,8 +36,7 @@ def address_friendship_request(
     Returns:
         FriendshipStatusSchema: the new status that was created.
     """
-    friendship_handler.raise_if_blocked()
-    latest_status = friendship_handler.get_latest_friendship_status()
+    latest_status = friendship_handler.raise_if_blocked()
 
     if latest_status is not None and latest_status.status_code_id in (
         FriendshipStatusCode.ACCEPTED.value,
@@ -80,9 +76,7 @@ def address_friendship_request_as_route(
             FriendshipStatusCode.DECLINED, ]): either accept or decline
     """
     requester_handler = UserHandler(db)
-    requester = requester_handler.get_user(
-        UserSchema.username == requester_username
-    )
+    requester = requester_handler.get_user_by_username(requester_username)
 
     friendship_handler = FriendshipHandler(db)
 
@@ -0,0 +1,339 @@
+"""Applies a single friendship action to many users at once.
+
+Unlike the routes addressing a single friendship, the users, their friendships
+and the current status of each friendship are each loaded with one query, and
+every new friendship and status is inserted with one executemany, such that
+the number of queries does not grow with the number of usernames.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Type
+from bleach import clean
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+from messenger_schemas.schema.friendship_schema import FriendshipSchema
+from messenger_schemas.schema.friendship_status_schema import (
+    FriendshipStatusSchema,
+)
+from messenger_schemas.schema.user_schema import UserSchema
+from messenger.constants.bulk_friendship_actions import BulkFriendshipAction
+from messenger.constants.friendship_status_codes import FriendshipStatusCode
+from messenger.constants.generics import T
+from messenger.helpers.friend_cache import invalidate_friend_ids_on_commit
+from messenger.helpers.friendship_changes import register_friendship_change
+from messenger.models.fastapi.bulk_friendship_model import (
+    BulkFriendshipResultModel,
+)
+from messenger.models.schema.current_friendship_status_schema import (
+    CurrentFriendshipStatusSchema,
+)
+
+ACTION_STATUS_CODES = {
+    BulkFriendshipAction.ACCEPT: FriendshipStatusCode.ACCEPTED,
+    BulkFriendshipAction.DECLINE: FriendshipStatusCode.DECLINED,
+    BulkFriendshipAction.BLOCK: FriendshipStatusCode.BLOCKED,
+}
+
+
+def get_user_ids_by_username(
+    db: Session, usernames: List[str]
+) -> Dict[str, int]:
+    """Resolves the ids of the users with the given usernames in one query,
+    where usernames of no user are omitted.
+
+    Usernames are compared case insensitively by the database, thus the ids
+    are keyed by the case folded username, which the given usernames are
+    looked up by.
+    """
+    return {
+        username.casefold(): user_id
+        for username, user_id in db.execute(
+            select(UserSchema.username, UserSchema.user_id).where(
+                UserSchema.username.in_(usernames)
+            )
+        )
+    }
+
+
+def get_friendship_records_with(
+    db: Session,
+    Schema: Type[T],
+    user_id: int,
+    other_user_ids: List[int],
+    lock: bool = False,
+) -> Dict[int, T]:
+    """Retrieves the records of the friendships between a user and each of
+    the other users, where either may be the requester, in one query.
+
+    Args:
+        db (Session): the database session to use.
+        Schema (Type[T]): the schema of the records, which are keyed by the
+            requester_id and addressee_id of their friendship.
+        user_id (int): the id of the user whose friendships are retrieved.
+        other_user_ids (List[int]): the ids of the other users.
+        lock (bool): whether to lock the records until the transaction of the
+            session ends, such that concurrent changes of the friendships
+            wait for it, rather than registering the same change from the
+            same status. The records already loaded by the session are
+            refreshed. Defaults to False.
+
+    Returns:
+        Dict[int, T]: the records by the id of the other user.
+    """
+    query = db.query(Schema).filter(
+        or_(
+            and_(
+                Schema.requester_id == user_id,
+                Schema.addressee_id.in_(other_user_ids),
+            ),
+            and_(
+                Schema.addressee_id == user_id,
+                Schema.requester_id.in_(other_user_ids),
+            ),
+        )
+    )
+
+    if lock:
+        query = query.populate_existing().with_for_update()
+
+    return {
+        record.addressee_id
+        if record.requester_id == user_id
+        else record.requester_id: record
+        for record in query
+    }
+
+
+def get_friendship_pair(
+    action: BulkFriendshipAction,
+    current_user_id: int,
+    user_id: int,
+    friendship: Optional[FriendshipSchema],
+    current_status: Optional[CurrentFriendshipStatusSchema],
+) -> Tuple[int, int]:
+    """Checks that the action can be applied to the friendship between the
+    current user and another user, as the routes addressing a single
+    friendship do.
+
+    Raises:
+        HTTPException: with the status code and detail of the route that
+            applies the action to a single friendship.
+
+    Returns:
+        Tuple[int, int]: the requester and addressee ids of the friendship
+            the new status belongs to.
+    """
+    if user_id == current_user_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="cannot address a friendship with yourself",
+        )
+
+    status_code_id = (
+        None if current_status is None else current_status.status_code_id
+    )
+
+    if action == BulkFriendshipAction.BLOCK:
+        if friendship is None:
+            return (current_user_id, user_id)
+    elif friendship is None or friendship.addressee_id != current_user_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="friendship was not found",
+        )
+
+    if status_code_id == FriendshipStatusCode.BLOCKED.value:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="friendship is blocked",
+        )
+
+    if action != BulkFriendshipAction.BLOCK and status_code_id in (
+        FriendshipStatusCode.ACCEPTED.value,
+        FriendshipStatusCode.DECLINED.value,
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="friend request already addressed",
+        )
+
+    return (friendship.requester_id, friendship.addressee_id)
+
+
+def write_friendship_statuses(
+    db: Session,
+    current_user_id: int,
+    status_code_id: str,
+    friendship_pairs: Dict[int, Tuple[int, int]],
+    friendships: Dict[int, FriendshipSchema],
+    current_statuses: Dict[int, CurrentFriendshipStatusSchema],
+) -> None:
+    """Adds a new status of the given code to each of the friendships of the
+    current user, along with the friendships that do not exist yet, each with
+    one executemany. The current statuses are overwritten as
+    set_current_status does, the cached friend ids of the users are
+    invalidated and the changes are registered, all once the session commits.
+
+    Args:
+        db (Session): the database session to write with.
+        current_user_id (int): the id of the user specifying the statuses.
+        status_code_id (str): the status code of the new statuses.
+        friendship_pairs (Dict[int, Tuple[int, int]]): the requester and
+            addressee ids of each friendship by the id of the other user.
+        friendships (Dict[int, FriendshipSchema]): the existing friendships
+            by the id of the other user.
+        current_statuses (Dict[int, CurrentFriendshipStatusSchema]): the
+            current statuses by the id of the other user, which must have
+            been locked, see get_friendship_records_with.
+    """
+    specified_date_time = datetime.now()
+    new_statuses = {
+        user_id: {
+            "requester_id": requester_id,
+            "addressee_id": addressee_id,
+            "specified_date_time": specified_date_time,
+            "status_code_id": status_code_id,
+            "specifier_id": current_user_id,
+        }
+        for user_id, (requester_id, addressee_id) in friendship_pairs.items()
+    }
+
+    db.bulk_insert_mappings(
+        FriendshipSchema,
+        [
+            {
+                "requester_id": new_status["requester_id"],
+                "addressee_id": new_status["addressee_id"],
+                "created_date_time": specified_date_time,
+            }
+            for user_id, new_status in new_statuses.items()
+            if user_id not in friendships
+        ],
+    )
+    db.bulk_insert_mappings(
+        FriendshipStatusSchema, list(new_statuses.values())
+    )
+
+    # the current statuses are overwritten by an update of those that exist
+    # and an insert of those that do not.
+    db.bulk_update_mappings(
+        CurrentFriendshipStatusSchema,
+        [
+            new_status
+            for user_id, new_status in new_statuses.items()
+            if user_id in current_statuses
+        ],
+    )
+    db.bulk_insert_mappings(
+        CurrentFriendshipStatusSchema,
+        [
+            new_status
+            for user_id, new_status in new_statuses.items()
+            if user_id not in current_statuses
+        ],
+    )
+
+    invalidate_friend_ids_on_commit(db, current_user_id, *new_statuses)
+
+    for user_id, new_status in new_statuses.items():
+        current_status = current_statuses.get(user_id)
+
+        register_friendship_change(
+            db,
+            new_status["requester_id"],
+            new_status["addressee_id"],
+            None if current_status is None else current_status.status_code_id,
+            status_code_id,
+        )
+
+
+def apply_bulk_friendship_action(
+    db: Session,
+    current_user_id: int,
+    usernames: List[str],
+    action: BulkFriendshipAction,
+) -> List[BulkFriendshipResultModel]:
+    """Accepts, declines or blocks the friendships of the current user with
+    each of the given users. Each username succeeds or fails on its own, and
+    the new statuses of those that succeed are added to the session, which
+    the caller commits once.
+
+    Args:
+        db (Session): the database session to read and write with.
+        current_user_id (int): the id of the user applying the action.
+        usernames (List[str]): the usernames of the users whose friendships
+            the action is applied to.
+        action (BulkFriendshipAction): the action to apply.
+
+    Returns:
+        List[BulkFriendshipResultModel]: the result for each unique username,
+            in the order they were given.
+    """
+    # usernames that differ only in case are of the same user.
+    unique_usernames: Dict[str, str] = {}
+
+    for username in usernames:
+        username = clean(username)
+        unique_usernames.setdefault(username.casefold(), username)
+
+    user_ids = get_user_ids_by_username(db, list(unique_usernames.values()))
+
+    friendships = get_friendship_records_with(
+        db, FriendshipSchema, current_user_id, list(user_ids.values())
+    )
+    current_statuses = get_friendship_records_with(
+        db,
+        CurrentFriendshipStatusSchema,
+        current_user_id,
+        list(user_ids.values()),
+        lock=True,
+    )
+
+    friendship_pairs: Dict[int, Tuple[int, int]] = {}
+    results: List[BulkFriendshipResultModel] = []
+
+    for username in unique_usernames.values():
+        user_id = user_ids.get(username.casefold())
+
+        try:
+            if user_id is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="no such user exists",
+                )
+
+            friendship_pairs[user_id] = get_friendship_pair(
+                action,
+                current_user_id,
+                user_id,
+                friendships.get(user_id),
+                current_statuses.get(user_id),
+            )
+        except HTTPException as exc:
+            results.append(
+                BulkFriendshipResultModel(
+                    username=username,
+                    status_code=exc.status_code,
+                    detail=exc.detail,
+                )
+            )
+            continue
+
+        results.append(
+            BulkFriendshipResultModel(
+                username=username, status_code=status.HTTP_201_CREATED
+            )
+        )
+
+    if len(friendship_pairs) > 0:
+        write_friendship_statuses(
+            db,
+            current_user_id,
+            ACTION_STATUS_CODES[action].value,
+            friendship_pairs,
+            friendships,
+            current_statuses,
+        )
+
+    return results
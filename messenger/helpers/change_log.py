@@ -0,0 +1,249 @@
+"""Records the changes of the conversations of each user, such that a client
+that reconnects catches up on what it missed by retrieving the changes after
+the last sequence it has seen, see GET /sync.
+
+The changes of a user are numbered by a sequence that increases by one with
+each change, whose last value is held for each user in
+ChangeSequenceSchema. It is advanced in the transaction that records the
+changes while its row is locked, the row being created beforehand when the
+user has none, so the changes of a user commit in the order of their
+sequences, and a client that has seen a sequence never misses a change
+before it that was yet to commit. Changes are recorded last in their
+transaction, after the conversation summaries it writes, such that every
+transaction locks those rows in the same order.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Tuple, Union
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from messenger_schemas.schema.message_schema import MessageSchema
+from messenger.constants.sync import ChangeType
+from messenger.helpers.upsert import insert_or_update
+from messenger.models.schema.change_sequence_schema import (
+    ChangeSequenceSchema,
+)
+from messenger.models.schema.user_change_schema import UserChangeSchema
+
+
+class Change(NamedTuple):
+    user_id: int
+    change_type: ChangeType
+    partner_id: int
+    message_id: int
+
+
+def get_message_changes(messages: List[MessageSchema]) -> List[Change]:
+    """Produces the changes of the participants of newly inserted direct
+    messages. Messages sent to group chats have no changes."""
+    changes = []
+
+    for message in messages:
+        if message.reciever_id is None:
+            continue
+
+        changes.append(
+            Change(
+                message.sender_id,
+                ChangeType.MESSAGE,
+                message.reciever_id,
+                message.message_id,
+            )
+        )
+
+        if message.reciever_id != message.sender_id:
+            changes.append(
+                Change(
+                    message.reciever_id,
+                    ChangeType.MESSAGE,
+                    message.sender_id,
+                    message.message_id,
+                )
+            )
+
+    return changes
+
+
+def get_read_changes(
+    user_id: int, partner_id: int, message_id: int
+) -> List[Change]:
+    """Produces the changes of the participants of a conversation that one
+    of them has read up to a message."""
+    return [
+        Change(user_id, ChangeType.READ, partner_id, message_id),
+        Change(partner_id, ChangeType.READ_BY_PARTNER, user_id, message_id),
+    ]
+
+
+def insert_sequences(db: Union[Session, AsyncSession]):
+    """Produces the INSERT of the sequences of users that have none, leaving
+    the sequences that exist as they are, such that the row of each user
+    exists to be locked even before their first change.
+
+    INSERT INTO change_sequence (user_id, last_sequence) VALUES (:user_id, 0)
+    ON DUPLICATE KEY UPDATE last_sequence = last_sequence
+    """
+    return insert_or_update(
+        db,
+        ChangeSequenceSchema.__table__,
+        lambda inserted: [
+            ("last_sequence", ChangeSequenceSchema.last_sequence)
+        ],
+    )
+
+
+def select_last_sequences(user_ids: List[int]):
+    """Produces the query of the last sequences of the given users, locking
+    their rows until the transaction ends."""
+    return (
+        select(
+            ChangeSequenceSchema.user_id, ChangeSequenceSchema.last_sequence
+        )
+        .where(ChangeSequenceSchema.user_id.in_(user_ids))
+        .with_for_update()
+    )
+
+
+def get_user_ids(changes: List[Change]) -> List[int]:
+    """Produces the ids of the users of the changes in order, which is the
+    order their sequences are locked in."""
+    return sorted({change.user_id for change in changes})
+
+
+def get_change_writes(
+    changes: List[Change],
+    last_sequences: Dict[int, int],
+    created_date_time: datetime,
+) -> List[Tuple[Any, List[Dict[str, Any]]]]:
+    """Numbers the changes of each user in order from their last sequence,
+    producing the statements that record them along with their parameters.
+
+    Args:
+        changes (List[Change]): the changes in the order they were made.
+        last_sequences (Dict[int, int]): the last sequence of each user of
+            the changes.
+        created_date_time (datetime): when the changes were made.
+
+    Returns:
+        List[Tuple[Any, List[Dict[str, Any]]]]: the statements to execute, in
+            order, each with its executemany parameters.
+    """
+    sequences = dict(last_sequences)
+    change_rows = []
+
+    for change in changes:
+        sequences[change.user_id] = sequences.get(change.user_id, 0) + 1
+        change_rows.append(
+            {
+                "user_id": change.user_id,
+                "sequence": sequences[change.user_id],
+                "change_type": change.change_type.value,
+                "partner_id": change.partner_id,
+                "message_id": change.message_id,
+                "created_date_time": created_date_time,
+            }
+        )
+
+    return [
+        (
+            update(ChangeSequenceSchema.__table__)
+            .where(ChangeSequenceSchema.user_id == bindparam("b_user_id"))
+            .values(last_sequence=bindparam("b_last_sequence")),
+            [
+                {"b_user_id": user_id, "b_last_sequence": sequences[user_id]}
+                for user_id in sorted(sequences)
+            ],
+        ),
+        (insert(UserChangeSchema.__table__), change_rows),
+    ]
+
+
+def record_changes(db: Session, changes: List[Change]) -> None:
+    """Records changes under the next sequences of their users. The caller is
+    responsible for committing.
+
+    Args:
+        db (Session): the session the changes were made with.
+        changes (List[Change]): the changes in the order they were made.
+    """
+    if len(changes) == 0:
+        return
+
+    user_ids = get_user_ids(changes)
+
+    db.execute(
+        insert_sequences(db),
+        [{"user_id": user_id, "last_sequence": 0} for user_id in user_ids],
+    )
+    last_sequences = dict(db.execute(select_last_sequences(user_ids)).all())
+
+    for statement, parameters in get_change_writes(
+        changes, last_sequences, datetime.now()
+    ):
+        db.execute(statement, parameters)
+
+
+async def async_record_changes(db: AsyncSession, changes: List[Change]):
+    """Asynchronous counterpart of record_changes."""
+    if len(changes) == 0:
+        return
+
+    user_ids = get_user_ids(changes)
+
+    await db.execute(
+        insert_sequences(db),
+        [{"user_id": user_id, "last_sequence": 0} for user_id in user_ids],
+    )
+    result = await db.execute(select_last_sequences(user_ids))
+    last_sequences = dict(result.all())
+
+    for statement, parameters in get_change_writes(
+        changes, last_sequences, datetime.now()
+    ):
+        await db.execute(statement, parameters)
+
+
+def select_changes(current_user_id: int, since: int, limit: int):
+    """Produces the query of the changes of the current user after a
+    sequence, in order, along with the message each is of.
+
+    SELECT uc.sequence, uc.change_type, uc.partner_id, uc.message_id,
+        message.sender_id, message.reciever_id, message.content,
+        message.created_date_time
+    FROM user_change uc
+    INNER JOIN message ON message.message_id = uc.message_id
+    WHERE uc.user_id = :current_user_id AND uc.sequence > :since
+    ORDER BY uc.sequence
+    LIMIT :limit
+
+    The changes are read from the range of the primary key that follows the
+    sequence, thus the cost of a sync is bounded by the changes it retrieves.
+
+    Args:
+        current_user_id (int): the id of the currently signed in user.
+        since (int): the last sequence the client has seen.
+        limit (int): the number of changes to retrieve.
+    """
+    return (
+        select(
+            UserChangeSchema.sequence,
+            UserChangeSchema.change_type,
+            UserChangeSchema.partner_id,
+            UserChangeSchema.message_id,
+            MessageSchema.sender_id,
+            MessageSchema.reciever_id,
+            MessageSchema.content,
+            MessageSchema.created_date_time,
+        )
+        .join(
+            MessageSchema,
+            MessageSchema.message_id == UserChangeSchema.message_id,
+        )
+        .where(
+            UserChangeSchema.user_id == current_user_id,
+            UserChangeSchema.sequence > since,
+        )
+        .order_by(UserChangeSchema.sequence)
+        .limit(limit)
+    )
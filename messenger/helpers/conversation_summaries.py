@@ -0,0 +1,274 @@
+"""Maintains the summary of each direct conversation that the inbox of a user
+is served from.
+
+The summaries of the participants of a direct message are updated in the same
+transaction as the message is inserted, with a fixed number of statements
+however many messages are inserted. Messages sent to group chats have no
+summary. Unread counts are of the messages recieved after the reader's
+watermark of the conversation, see messenger.helpers.read_watermarks.
+
+The summaries can be rebuilt from scratch with:
+    python -m messenger.helpers.conversation_summaries
+"""
+
+import logging
+from typing import Any, Dict, List, Tuple
+from sqlalchemy import (
+    and_,
+    case,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    tuple_,
+    union_all,
+)
+from sqlalchemy.orm import Session
+from messenger_schemas.schema import DatabaseSessionContext
+from messenger_schemas.schema.message_schema import MessageSchema
+from messenger.constants.conversations import LAST_MESSAGE_PREVIEW_LENGTH
+from messenger.helpers.upsert import insert_or_update
+from messenger.models.schema.conversation_summary_schema import (
+    ConversationSummarySchema,
+)
+from messenger.models.schema.read_watermark_schema import (
+    ReadWatermarkSchema,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def get_conversation_summary_updates(
+    messages: List[MessageSchema],
+) -> Dict[Tuple[int, int], Dict[str, Any]]:
+    """Computes the latest message of each participant's summary of the
+    conversations of the given messages, along with the number of messages
+    each participant received.
+
+    Returns:
+        Dict[Tuple[int, int], Dict[str, Any]]: the update of the summary of
+            each (user_id, partner_id) pair.
+    """
+    updates: Dict[Tuple[int, int], Dict[str, Any]] = {}
+
+    for message in sorted(
+        messages,
+        key=lambda message: (message.created_date_time, message.message_id),
+    ):
+        if message.reciever_id is None:
+            continue
+
+        for user_id, partner_id, is_reciever in (
+            (message.sender_id, message.reciever_id, False),
+            (message.reciever_id, message.sender_id, True),
+        ):
+            summary_update = updates.setdefault(
+                (user_id, partner_id), {"unread_count": 0}
+            )
+            summary_update["last_message_id"] = message.message_id
+            summary_update["last_message_preview"] = message.content[
+                :LAST_MESSAGE_PREVIEW_LENGTH
+            ]
+            summary_update[
+                "last_activity_date_time"
+            ] = message.created_date_time
+
+            if is_reciever:
+                summary_update["unread_count"] += 1
+
+    return updates
+
+
+def update_conversation_summaries(
+    db: Session, messages: List[MessageSchema]
+) -> None:
+    """Updates the summaries of the conversations of newly inserted messages,
+    inserting the summaries of conversations that have none, with a single
+    statement. The caller is responsible for committing.
+
+    Args:
+        db (Session): the session the messages were inserted with.
+        messages (List[MessageSchema]): the messages, which must have been
+            flushed such that their ids are known.
+    """
+    updates = get_conversation_summary_updates(messages)
+
+    if len(updates) == 0:
+        return
+
+    def get_updates(inserted) -> List[Tuple[str, Any]]:
+        # the last message only moves forward, such that a message that
+        # commits after a later one does not replace it.
+        is_later = tuple_(
+            inserted.last_activity_date_time, inserted.last_message_id
+        ) > tuple_(
+            ConversationSummarySchema.last_activity_date_time,
+            ConversationSummarySchema.last_message_id,
+        )
+
+        # the columns compared are assigned last, as the columns assigned
+        # before them must still be compared with their previous values.
+        return [
+            (
+                column,
+                case(
+                    (is_later, getattr(inserted, column)),
+                    else_=getattr(ConversationSummarySchema, column),
+                ),
+            )
+            for column in (
+                "last_message_preview",
+                "last_message_id",
+                "last_activity_date_time",
+            )
+        ] + [
+            (
+                "unread_count",
+                ConversationSummarySchema.unread_count + inserted.unread_count,
+            )
+        ]
+
+    # the rows are written in the order of their keys, such that concurrent
+    # senders lock the summaries they share in the same order.
+    db.execute(
+        insert_or_update(db, ConversationSummarySchema.__table__, get_updates),
+        [
+            {
+                "user_id": user_id,
+                "partner_id": partner_id,
+                **updates[(user_id, partner_id)],
+            }
+            for user_id, partner_id in sorted(updates)
+        ],
+    )
+
+
+def rebuild_conversation_summaries(db: Session) -> int:
+    """Replaces every conversation summary with one summarized from the
+    direct messages. The caller is responsible for committing.
+
+    WITH side AS (
+        SELECT sender_id AS user_id, reciever_id AS partner_id, message_id,
+            content, created_date_time, 0 AS is_unread
+        FROM message WHERE reciever_id IS NOT NULL
+        UNION ALL
+        SELECT reciever_id, sender_id, message_id, content,
+            created_date_time,
+            message_id > COALESCE(read_watermark.last_read_message_id, 0)
+        FROM message
+        LEFT OUTER JOIN read_watermark
+        ON read_watermark.user_id = message.reciever_id
+        AND read_watermark.partner_id = message.sender_id
+        WHERE reciever_id IS NOT NULL
+    )
+    SELECT user_id, partner_id, message_id, SUBSTR(content, 1, :length),
+        created_date_time, unread_count
+    FROM (
+        SELECT side.*,
+            ROW_NUMBER() OVER (
+                PARTITION BY user_id, partner_id
+                ORDER BY created_date_time DESC, message_id DESC
+            ) AS position,
+            SUM(is_unread) OVER (PARTITION BY user_id, partner_id)
+                AS unread_count
+        FROM side
+    ) ranked
+    WHERE position = 1
+
+    Args:
+        db (Session): the database session to use.
+
+    Returns:
+        int: the number of conversation summaries written.
+    """
+    is_direct = MessageSchema.reciever_id.isnot(None)
+    side = union_all(
+        select(
+            MessageSchema.sender_id.label("user_id"),
+            MessageSchema.reciever_id.label("partner_id"),
+            MessageSchema.message_id,
+            MessageSchema.content,
+            MessageSchema.created_date_time,
+            literal(0).label("is_unread"),
+        ).where(is_direct),
+        select(
+            MessageSchema.reciever_id,
+            MessageSchema.sender_id,
+            MessageSchema.message_id,
+            MessageSchema.content,
+            MessageSchema.created_date_time,
+            case(
+                (
+                    MessageSchema.message_id
+                    > func.coalesce(
+                        ReadWatermarkSchema.last_read_message_id, 0
+                    ),
+                    1,
+                ),
+                else_=0,
+            ),
+        )
+        .outerjoin(
+            ReadWatermarkSchema,
+            and_(
+                ReadWatermarkSchema.user_id == MessageSchema.reciever_id,
+                ReadWatermarkSchema.partner_id == MessageSchema.sender_id,
+            ),
+        )
+        .where(is_direct),
+    ).subquery("side")
+
+    conversation = (side.c.user_id, side.c.partner_id)
+    ranked = select(
+        side,
+        func.row_number()
+        .over(
+            partition_by=conversation,
+            order_by=(
+                side.c.created_date_time.desc(),
+                side.c.message_id.desc(),
+            ),
+        )
+        .label("position"),
+        func.sum(side.c.is_unread)
+        .over(partition_by=conversation)
+        .label("unread_count"),
+    ).subquery("ranked")
+
+    db.execute(delete(ConversationSummarySchema))
+
+    result = db.execute(
+        insert(ConversationSummarySchema).from_select(
+            [
+                "user_id",
+                "partner_id",
+                "last_message_id",
+                "last_message_preview",
+                "last_activity_date_time",
+                "unread_count",
+            ],
+            select(
+                ranked.c.user_id,
+                ranked.c.partner_id,
+                ranked.c.message_id,
+                func.substr(ranked.c.content, 1, LAST_MESSAGE_PREVIEW_LENGTH),
+                ranked.c.created_date_time,
+                ranked.c.unread_count,
+            ).where(ranked.c.position == 1),
+        )
+    )
+
+    return result.rowcount
+
+
+def main():
+    with DatabaseSessionContext() as db:
+        rowcount = rebuild_conversation_summaries(db)
+        db.commit()
+
+    logger.info("rebuilt %s conversation summaries.", rowcount)
+
+
+if __name__ == "__main__":
+    main()
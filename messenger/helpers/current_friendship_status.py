@@ -0,0 +1,111 @@
+"""Rebuilds the current_friendship_status table from the friendship status
+history. The table is maintained as statuses are added, so a rebuild is only
+needed once it is first created, or if statuses were written without
+FriendshipHandler.
+
+Run from the repository root with:
+    python -m messenger.helpers.current_friendship_status
+"""
+
+import logging
+from sqlalchemy import and_, delete, func, insert, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from messenger_schemas.schema import DatabaseSessionContext
+from messenger_schemas.schema.friendship_status_schema import (
+    FriendshipStatusSchema,
+)
+from messenger.models.schema.current_friendship_status_schema import (
+    CurrentFriendshipStatusSchema,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def select_latest_friendship_statuses() -> Select:
+    """Produces the query of the latest status of every friendship.
+
+    SELECT fs.requester_id, fs.addressee_id, fs.status_code_id,
+        fs.specifier_id, fs.specified_date_time
+    FROM friendship_status fs
+    INNER JOIN (
+        SELECT requester_id, addressee_id, MAX(specified_date_time) as max_date_time
+        FROM friendship_status
+        GROUP BY requester_id, addressee_id
+    ) latest_status
+    ON fs.requester_id = latest_status.requester_id
+    AND fs.addressee_id = latest_status.addressee_id
+    AND fs.specified_date_time = latest_status.max_date_time
+    """
+    latest_status_dates = (
+        select(
+            FriendshipStatusSchema.requester_id,
+            FriendshipStatusSchema.addressee_id,
+            func.max(FriendshipStatusSchema.specified_date_time).label(
+                "max_date_time"
+            ),
+        )
+        .group_by(
+            FriendshipStatusSchema.requester_id,
+            FriendshipStatusSchema.addressee_id,
+        )
+        .subquery()
+    )
+
+    return select(
+        FriendshipStatusSchema.requester_id,
+        FriendshipStatusSchema.addressee_id,
+        FriendshipStatusSchema.status_code_id,
+        FriendshipStatusSchema.specifier_id,
+        FriendshipStatusSchema.specified_date_time,
+    ).join(
+        latest_status_dates,
+        and_(
+            FriendshipStatusSchema.requester_id
+            == latest_status_dates.c.requester_id,
+            FriendshipStatusSchema.addressee_id
+            == latest_status_dates.c.addressee_id,
+            FriendshipStatusSchema.specified_date_time
+            == latest_status_dates.c.max_date_time,
+        ),
+    )
+
+
+def rebuild_current_friendship_statuses(db: Session) -> int:
+    """Replaces every current friendship status with the latest status of
+    its friendship. The caller is responsible for committing.
+
+    Args:
+        db (Session): the database session to use.
+
+    Returns:
+        int: the number of current friendship statuses written.
+    """
+    db.execute(delete(CurrentFriendshipStatusSchema))
+
+    result = db.execute(
+        insert(CurrentFriendshipStatusSchema).from_select(
+            [
+                "requester_id",
+                "addressee_id",
+                "status_code_id",
+                "specifier_id",
+                "specified_date_time",
+            ],
+            select_latest_friendship_statuses(),
+        )
+    )
+
+    return result.rowcount
+
+
+def main():
+    with DatabaseSessionContext() as db:
+        rowcount = rebuild_current_friendship_statuses(db)
+        db.commit()
+
+    logger.info("rebuilt %s current friendship statuses.", rowcount)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+from typing import Any, List, Optional, Sequence, Type
+from fastapi import Depends, Query
+from sqlalchemy import (
+    Column,
+    and_,
+    literal,
+    select,
+    tuple_,
+    union_all,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+from messenger.constants.pagination import AroundSide, CursorState
+from messenger.constants.generics import T
+from messenger.helpers.dependencies.async_database import (
+    async_database_session,
+)
+from messenger.helpers.dependencies.pagination import get_cursor
+from messenger.helpers.dependencies.seek_queries import (
+    get_seek_query,
+    select_merged_table,
+)
+from messenger.models.fastapi.pagination_model import (
+    CursorModel,
+    CursorPaginationModel,
+)
+
+
+def get_anchor_filter(
+    ascending: bool,
+    inclusive: bool,
+    unique_column: Column,
+    anchor_value: Any,
+    tiebreaker_column: Optional[Column] = None,
+    anchor_tiebreaker_value: Optional[Any] = None,
+):
+    """Produces the filter that seeks from an anchor in one direction.
+
+    When both a tiebreaker column and an anchor tiebreaker value are given, rows are
+    compared as a row value in the same way as get_pagination_filter, otherwise
+    only the unique column is compared.
+    """
+    if tiebreaker_column is None or anchor_tiebreaker_value is None:
+        if ascending:
+            return (
+                (unique_column >= anchor_value)
+                if inclusive
+                else (unique_column > anchor_value)
+            )
+
+        return (
+            (unique_column <= anchor_value)
+            if inclusive
+            else (unique_column < anchor_value)
+        )
+
+    row = tuple_(unique_column, tiebreaker_column)
+    row_value = tuple_(anchor_value, anchor_tiebreaker_value)
+
+    if ascending:
+        return and_(
+            unique_column >= anchor_value,
+            (row >= row_value) if inclusive else (row > row_value),
+        )
+
+    return and_(
+        unique_column <= anchor_value,
+        (row <= row_value) if inclusive else (row < row_value),
+    )
+
+
+def get_around_query(
+    table: Type[T],
+    unique_column: Column,
+    anchor_value: Any,
+    order_asc: bool,
+    limit: int,
+    tiebreaker_column: Optional[Column] = None,
+    anchor_tiebreaker_value: Optional[Any] = None,
+    partitions: Optional[Sequence[Any]] = None,
+) -> Select:
+    """Produces the query of the records around an anchor.
+
+    The records before the anchor and the records from the anchor onwards are
+    each selected by their own bounded seek, which are combined with a UNION ALL
+    so that both are retrieved in a single round trip. Every record is labelled
+    with the AroundSide it was selected from, and the records are ordered in the
+    order of the pagination.
+
+    Returns:
+        Select: the query of the records around the anchor.
+    """
+    side_tables = []
+
+    for side, cursor_state, side_limit in (
+        (AroundSide.BEFORE, CursorState.PREVIOUS, limit + 1),
+        # the anchor record is selected along with the records following it.
+        (AroundSide.AFTER, CursorState.NEXT, limit + 2),
+    ):
+        ascending = order_asc == (cursor_state == CursorState.NEXT)
+
+        anchor_filter = get_anchor_filter(
+            ascending,
+            side == AroundSide.AFTER,
+            unique_column,
+            anchor_value,
+            tiebreaker_column,
+            anchor_tiebreaker_value,
+        )
+
+        side_tables.append(
+            get_seek_query(
+                table,
+                unique_column,
+                order_asc,
+                tiebreaker_column,
+                None,
+                cursor_state.value,
+                anchor_filter,
+                side_limit,
+                partitions,
+            )
+            .add_columns(literal(side.value).label("around_side"))
+            .subquery()
+        )
+
+    around_table = union_all(
+        *[select(side_table) for side_table in side_tables]
+    ).subquery()
+
+    return select_merged_table(
+        table,
+        around_table,
+        unique_column,
+        order_asc,
+        CursorState.NEXT.value,
+        tiebreaker_column,
+    ).add_columns(around_table.c.around_side)
+
+
+def get_around_pagination_model(
+    around_results: List[Any],
+    limit: int,
+    unique_column: Column,
+    tiebreaker_column: Optional[Column] = None,
+) -> CursorPaginationModel:
+    """Produces the pagination model of the records around an anchor from the
+    records selected by its around query.
+
+    Returns:
+        CursorPaginationModel: the pagination model whose previous and next
+        cursors continue paginating from the first and last of the results.
+    """
+    before_results = [
+        record
+        for record, side in around_results
+        if side == AroundSide.BEFORE.value
+    ]
+    after_results = [
+        record
+        for record, side in around_results
+        if side == AroundSide.AFTER.value
+    ]
+
+    prev_page = None
+    next_page = None
+
+    # the additional record selected on either side signals that a
+    # further page exists in that direction.
+    if len(before_results) > limit:
+        before_results = before_results[1:]
+        prev_page = get_cursor(
+            CursorState.PREVIOUS.value,
+            before_results[0],
+            unique_column,
+            tiebreaker_column,
+        )
+
+    if len(after_results) > limit + 1:
+        after_results = after_results[:-1]
+        next_page = get_cursor(
+            CursorState.NEXT.value,
+            after_results[-1],
+            unique_column,
+            tiebreaker_column,
+        )
+
+    return CursorPaginationModel(
+        cursor=CursorModel(prev_page=prev_page, next_page=next_page),
+        results=before_results + after_results,
+    )
+
+
+async def async_around_pagination(
+    limit: int = Query(
+        title="The limit on the number of items on either side of the anchor",
+        gt=0,
+    ),
+    db: AsyncSession = Depends(async_database_session),
+):
+    """Produces a coroutine function that retrieves the records around an anchor,
+    such that a client can jump to a record and continue paginating in either
+    direction from it.
+
+    Preconditions:
+        - limit must be > 0
+
+    Args:
+        limit (int): the number of records to retrieve on either side of the anchor.
+        db (AsyncSession): the async database session to query with.
+
+    Returns:
+        CursorPaginationModel: the pagination model that contains the next and
+        previous cursors, which allow further pagination requests. As well as
+        the records around the anchor.
+    """
+
+    async def pagination(
+        table: Type[T],
+        unique_column: Column,
+        anchor_value: Any,
+        order_asc=True,
+        tiebreaker_column: Optional[Column] = None,
+        anchor_tiebreaker_value: Optional[Any] = None,
+        partitions: Optional[Sequence[Any]] = None,
+    ) -> CursorPaginationModel:
+        """Retrieves up to limit records before the anchor, and the anchor along
+        with up to limit records after it, in the order of the pagination.
+
+        Args:
+            table (Type[T]): the table (which can be a subquery) to retrieve data from.
+            unique_column (Column): the column in the given table to order by.
+            anchor_value (Any): the value of the unique column to retrieve around.
+            order_asc (bool): whether to order the unique column ascending.
+            tiebreaker_column (Optional[Column]): a unique column in the given table
+                used to order rows that share a unique column value.
+            anchor_tiebreaker_value (Optional[Any]): the value of the tiebreaker
+                column of the anchor record.
+            partitions (Optional[Sequence[Any]]): disjoint filters on the given
+                table whose union is the data to retrieve from, see get_seek_query.
+
+        Returns:
+            CursorPaginationModel: the pagination model of the records around
+            the anchor.
+        """
+        around_query = get_around_query(
+            table,
+            unique_column,
+            anchor_value,
+            order_asc,
+            limit,
+            tiebreaker_column,
+            anchor_tiebreaker_value,
+            partitions,
+        )
+
+        around_results = (await db.execute(around_query)).all()
+
+        return get_around_pagination_model(
+            around_results, limit, unique_column, tiebreaker_column
+        )
+
+    return pagination
@@ -0,0 +1,52 @@
+"""Defines the async engine and the async database session dependency.
+
+The async engine uses the aiomysql driver, so that routes built on it wait on
+MySQL without holding a threadpool thread.
+"""
+
+from typing import AsyncIterator
+from sqlalchemy.engine import URL
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from messenger.settings import (
+    RDS_DB_NAME,
+    RDS_ENDPOINT,
+    RDS_MAX_OVERFLOW,
+    RDS_PASSWORD,
+    RDS_POOL_SIZE,
+    RDS_PORT,
+    RDS_USER,
+)
+
+async_engine = create_async_engine(
+    URL.create(
+        "mysql+aiomysql",
+        username=RDS_USER,
+        password=RDS_PASSWORD,
+        host=RDS_ENDPOINT,
+        port=RDS_PORT,
+        database=RDS_DB_NAME,
+    ),
+    pool_size=RDS_POOL_SIZE,
+    max_overflow=RDS_MAX_OVERFLOW,
+    pool_pre_ping=True,
+)
+
+AsyncSessionLocal = sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+async def async_database_session() -> AsyncIterator[AsyncSession]:
+    """Yields an async database session that is closed once the request
+    has been handled.
+
+    Yields:
+        AsyncSession: the async database session.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,23 +1,34 @@
 import logging
-from typing import Any, Optional, Tuple, Type
+from typing import Any, List, Optional, Sequence, Tuple, Type
 from fastapi import Depends, HTTPException, Query, status
+from pydantic import conint
 
-from sqlalchemy import Column
-from sqlalchemy.orm import Session
-from messenger_schemas.schema import (
-    database_session,
+from sqlalchemy import (
+    Column,
+    and_,
+    tuple_,
 )
+from sqlalchemy.engine import Result
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
 from messenger.constants.pagination import (
-    NEXT_PREFIX,
-    PREVIOUS_PREFIX,
+    MAX_PREFETCH_PAGES,
     CursorState,
 )
 from messenger.constants.generics import T
-from messenger.helpers.get_model_dict import get_model_dict
+from messenger.helpers.dependencies.async_database import (
+    async_database_session,
+)
+from messenger.helpers.dependencies.seek_queries import get_seek_query
+from messenger.helpers.tokens.cursor_tokens import (
+    decode_cursor,
+    encode_cursor,
+)
 
 from messenger.models.fastapi.pagination_model import (
     CursorModel,
     CursorPaginationModel,
+    PageModel,
 )
 
 logger = logging.getLogger(__name__)
@@ -28,107 +39,439 @@ INVALID_CURSOR_HTTP_EXCEPTION = HTTPException(
 )
 
 
+def validate_column_values(
+    columns: Sequence[Column], column_values: Tuple[Any, ...]
+) -> None:
+    """Checks that a cursor holds a value for each of the columns it is
+    compared against, of the python type of that column, so that the comparison
+    is made between like types.
+
+    Args:
+        columns (Sequence[Column]): the columns the values belong to, in order.
+        column_values (Tuple[Any, ...]): the column values taken from a cursor.
+
+    Raises:
+        INVALID_CURSOR_HTTP_EXCEPTION: if a value is missing, extra or of
+            another type.
+    """
+    if len(columns) != len(column_values):
+        raise INVALID_CURSOR_HTTP_EXCEPTION
+
+    for column, column_value in zip(columns, column_values):
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            continue
+
+        if not isinstance(column_value, python_type):
+            raise INVALID_CURSOR_HTTP_EXCEPTION
+
+
 def get_pagination_filter(
     order_asc: bool,
     unique_column: Column,
     cursor_state: str,
-    column_value: str,
+    column_values: Tuple[Any, ...],
     default_column_value: Any,
+    tiebreaker_column: Optional[Column] = None,
 ):
-    value = default_column_value if column_value == "" else column_value
+    """Produces the filter that seeks past the cursor, or from the default column
+    value when no column values are given.
 
+    When a tiebreaker column is given the cursor holds a (sort value, tiebreaker value)
+    pair and rows are compared as a row value, so rows sharing a sort value are
+    neither skipped nor repeated between pages. The redundant comparison on the
+    sort column alone bounds the range MySQL seeks on a (sort, tiebreaker) index.
+    """
     if cursor_state == CursorState.NEXT.value:
-        return (unique_column > value) if order_asc else (unique_column < value)
-    if cursor_state == CursorState.PREVIOUS.value:
-        return (unique_column < value) if order_asc else (unique_column > value)
+        ascending = order_asc
+    elif cursor_state == CursorState.PREVIOUS.value:
+        ascending = not order_asc
+    else:
+        raise INVALID_CURSOR_HTTP_EXCEPTION
+
+    if not column_values:
+        return (
+            (unique_column > default_column_value)
+            if ascending
+            else (unique_column < default_column_value)
+        )
+
+    if tiebreaker_column is None:
+        validate_column_values([unique_column], column_values)
+        (value,) = column_values
+
+        return (
+            (unique_column > value) if ascending else (unique_column < value)
+        )
+
+    validate_column_values([unique_column, tiebreaker_column], column_values)
+    value, tiebreaker_value = column_values
+    row = tuple_(unique_column, tiebreaker_column)
+    row_value = tuple_(value, tiebreaker_value)
 
-    raise INVALID_CURSOR_HTTP_EXCEPTION
+    if ascending:
+        return and_(unique_column >= value, row > row_value)
+
+    return and_(unique_column <= value, row < row_value)
 
 
 def cursor_parser(
     cursor: Optional[str] = None,
-) -> Tuple[str, Optional[str]]:
+) -> Tuple[str, Tuple[Any, ...]]:
+    """Decodes the cursor given by the client. No cursor paginates the first
+    page, which is a next page with no column values.
+
+    Raises:
+        INVALID_CURSOR_HTTP_EXCEPTION: if the cursor was not produced by
+            encode_cursor.
+
+    Returns:
+        Tuple[str, Tuple[Any, ...]]: the cursor state and the column values.
+    """
     if cursor is None:
-        cursor_state = CursorState.NEXT.value
-        column_value = ""
-    else:
-        cursor_values = cursor.split("___")
+        return CursorState.NEXT.value, ()
 
-        if len(cursor_values) != 2:
-            raise INVALID_CURSOR_HTTP_EXCEPTION
+    try:
+        return decode_cursor(cursor)
+    except ValueError as exc:
+        raise INVALID_CURSOR_HTTP_EXCEPTION from exc
 
-        cursor_state = cursor_values[0]
-        column_value = cursor_values[1]
 
-    return cursor_state, column_value
+async def async_cursor_parser(
+    cursor: Optional[str] = None,
+) -> Tuple[str, Tuple[Any, ...]]:
+    """Asynchronous counterpart of cursor_parser, such that FastAPI parses
+    the cursor of an async route without handing it to the threadpool."""
+    return cursor_parser(cursor)
 
 
-def determine_cursor_query_order(
-    order_asc: bool,
+def get_cursor_values(
+    record: Any,
+    unique_column: Column,
+    tiebreaker_column: Optional[Column] = None,
+) -> Tuple[Any, ...]:
+    """Produces the column values of a cursor pointing at the given record.
+
+    Args:
+        record (Any): the ORM instance or row the cursor points at.
+        unique_column (Column): the unique column being paginated on.
+        tiebreaker_column (Optional[Column]): the tiebreaker column, if any.
+
+    Returns:
+        Tuple[Any, ...]: the column values of the cursor.
+    """
+    if tiebreaker_column is None:
+        return (getattr(record, unique_column.key),)
+
+    return (
+        getattr(record, unique_column.key),
+        getattr(record, tiebreaker_column.key),
+    )
+
+
+def get_cursor(
+    cursor_state: str,
+    record: Any,
+    unique_column: Column,
+    tiebreaker_column: Optional[Column] = None,
+) -> str:
+    """Produces the encoded cursor of the given state pointing at the given
+    record.
+    """
+    return encode_cursor(
+        cursor_state,
+        get_cursor_values(record, unique_column, tiebreaker_column),
+    )
+
+
+def get_page_query(
+    table: Type[T],
     unique_column: Column,
+    default_column_value: Any,
+    order_asc: bool,
+    tiebreaker_column: Optional[Column],
+    columns: Optional[Sequence[Column]],
     cursor_state: str,
-):
-    """Change the ORDER BY in query depending on cursor state. (this ensures the limit
-    is enforced on the correct side of the table, either from the start or the end)
+    column_values: Tuple[Any, ...],
+    limit: int,
+    partitions: Optional[Sequence[Any]] = None,
+) -> Select:
+    """Produces the query of a page. One more record than the limit is selected
+    so that the existence of a further page can be determined.
+
+    The query holds no session, so it can be executed by either a Session or
+    an AsyncSession.
 
-    - If we are obtaining previous page, then we want to enforce limit starting
-    at the end of the table.
+    Returns:
+        Select: the query of the page.
+    """
+    pagination_filter = get_pagination_filter(
+        order_asc,
+        unique_column,
+        cursor_state,
+        column_values,
+        default_column_value,
+        tiebreaker_column,
+    )
 
-    - If we are obtaining next page, then we want to enforce limit starting at
-    the start of the table.
+    return get_seek_query(
+        table,
+        unique_column,
+        order_asc,
+        tiebreaker_column,
+        columns,
+        cursor_state,
+        pagination_filter,
+        limit + 1,
+        partitions,
+    )
 
-    To gain a better understanding try executing the queries in MySQL without
-    clarifying desc or asc. You will notice that the returned columns when filtering
-    with "<" and a set LIMIT will return records starting from the beginning of the
-    queried table.
 
-    Now try setting order by with desc. You will now see that it queries the expected records
-    albeit in reverse order.
+def get_page_results(
+    result: Result, columns: Optional[Sequence[Column]]
+) -> List[Any]:
+    """Produces the records of an executed page query, ORM instances when the
+    whole table was selected and rows otherwise.
     """
-    if order_asc:
-        return (
-            unique_column.asc()
-            if cursor_state == CursorState.NEXT.value
-            else unique_column.desc()
+    if columns is None:
+        return result.scalars().all()
+
+    return result.all()
+
+
+def get_cursor_pagination_model(
+    page_results: List[Any],
+    limit: int,
+    cursor_state: str,
+    column_values: Tuple[Any, ...],
+    unique_column: Column,
+    tiebreaker_column: Optional[Column] = None,
+) -> CursorPaginationModel:
+    """Produces the pagination model of a page from the records selected by
+    its page query.
+
+    Returns:
+        CursorPaginationModel: the pagination model that contains the next and
+        previous cursors, which allow further pagination requests. As well as
+        the current results from this pagination.
+    """
+    if len(page_results) == 0:
+        return CursorPaginationModel(
+            cursor=CursorModel(prev_page=None, next_page=None),
+            results=page_results,
         )
 
-    return (
-        unique_column.desc()
-        if cursor_state == CursorState.NEXT.value
-        else unique_column.asc()
+    # if its previous, then we ordered by desc, thus we need to reverse
+    # the array to get the correct order.
+    if cursor_state == CursorState.PREVIOUS.value:
+        page_results = page_results[::-1]
+
+    prev_page = None
+    next_page = None
+
+    returned_results = []
+
+    if len(page_results) < limit + 1:
+        # We are either at the first or last page, depending on cursor_state.
+
+        if cursor_state == CursorState.NEXT.value and column_values:
+            """We are at last page attempting to move forwards,
+            but there is no more pages in that direction
+            and last page is not first page, thus previous page exists
+            and next page does not.
+            """
+            prev_page = get_cursor(
+                CursorState.PREVIOUS.value,
+                page_results[0],
+                unique_column,
+                tiebreaker_column,
+            )
+        elif cursor_state == CursorState.PREVIOUS.value:
+            """We are at the first page, attempting to move backwards.
+            When cursoring previous, we can never be at the first
+            and last page at the same time. Since that would require
+            that the cursor value is one in front of the last database record
+            which is impossible. Thus a next page must exist. And previous page
+            does not.
+            """
+            next_page = get_cursor(
+                CursorState.NEXT.value,
+                page_results[-1],
+                unique_column,
+                tiebreaker_column,
+            )
+    else:
+        # We are at a middle page or --if cursor == None and
+        # cursor_state is next, then-- first page
+        if cursor_state == CursorState.NEXT.value:
+            next_page = get_cursor(
+                CursorState.NEXT.value,
+                page_results[:-1][-1],
+                unique_column,
+                tiebreaker_column,
+            )
+            # if we are not first page then set prev_page
+            if column_values:
+                prev_page = get_cursor(
+                    CursorState.PREVIOUS.value,
+                    page_results[0],
+                    unique_column,
+                    tiebreaker_column,
+                )
+
+            # if we are at next state then there is an additional element at the
+            # end of the array due to limit + 1, which we must ignore
+            returned_results = page_results[:-1]
+        elif cursor_state == CursorState.PREVIOUS.value:
+            next_page = get_cursor(
+                CursorState.NEXT.value,
+                page_results[-1],
+                unique_column,
+                tiebreaker_column,
+            )
+            # we can index at 1 since we know that if limit > 0 and
+            # len(page_results) > limit + 1 then len(page_results) > 1
+            prev_page = get_cursor(
+                CursorState.PREVIOUS.value,
+                page_results[1],
+                unique_column,
+                tiebreaker_column,
+            )
+
+            # if we are at prev state then there is an additional element at the
+            # start of the array due to limit + 1, which we must ignore
+            returned_results = page_results[1:]
+
+    return CursorPaginationModel(
+        cursor=CursorModel(prev_page=prev_page, next_page=next_page),
+        results=page_results
+        if len(page_results) <= limit
+        else returned_results,
     )
 
 
-def cursor_pagination(
+def get_prefetched_pagination_model(
+    page_results: List[Any],
+    limit: int,
+    pages: int,
+    cursor_state: str,
+    column_values: Tuple[Any, ...],
+    unique_column: Column,
+    tiebreaker_column: Optional[Column] = None,
+) -> CursorPaginationModel:
+    """Produces the pagination model of consecutive pages from the records
+    selected by a single page query of limit * pages records.
+
+    The records of each page, along with the record following it, are the
+    records its own page query would have selected, thus each page is given
+    the cursors that paginating to it one page at a time would have given.
+
+    Returns:
+        CursorPaginationModel: the pagination model whose results are the
+        results of all the pages, and whose cursor points before the first and
+        after the last of the pages. When more than one page was requested
+        the cursors and size of each page are given in order.
+    """
+    if pages == 1:
+        return get_cursor_pagination_model(
+            page_results,
+            limit,
+            cursor_state,
+            column_values,
+            unique_column,
+            tiebreaker_column,
+        )
+
+    page_models: List[CursorPaginationModel] = []
+
+    for page in range(pages):
+        start = page * limit
+
+        if page > 0 and start >= len(page_results):
+            break
+
+        # pages after the first are paginated to from the cursor of the
+        # record preceding them.
+        page_column_values = (
+            column_values
+            if page == 0
+            else get_cursor_values(
+                page_results[start - 1], unique_column, tiebreaker_column
+            )
+        )
+
+        page_models.append(
+            get_cursor_pagination_model(
+                page_results[start : start + limit + 1],
+                limit,
+                cursor_state,
+                page_column_values,
+                unique_column,
+                tiebreaker_column,
+            )
+        )
+
+    # previous pages are selected moving backwards from the cursor.
+    if cursor_state == CursorState.PREVIOUS.value:
+        page_models = page_models[::-1]
+
+    return CursorPaginationModel(
+        cursor=CursorModel(
+            prev_page=page_models[0].cursor.prev_page,
+            next_page=page_models[-1].cursor.next_page,
+        ),
+        results=[
+            result
+            for page_model in page_models
+            for result in page_model.results
+        ],
+        pages=[
+            PageModel(cursor=page_model.cursor, size=len(page_model.results))
+            for page_model in page_models
+        ],
+    )
+
+
+async def async_cursor_pagination(
     limit: int = Query(
         title="The limit on the number of items to paginate", gt=0
     ),
-    parsed_cursor: Tuple[str, str] = Depends(cursor_parser),
-    db: Session = Depends(database_session),
+    parsed_cursor: Tuple[str, Tuple[Any, ...]] = Depends(async_cursor_parser),
+    db: AsyncSession = Depends(async_database_session),
+    pages: conint(gt=0, le=MAX_PREFETCH_PAGES) = 1,
 ):
-    """Produces a function that executes cursor pagination on a
-    database query.
+    """Produces a coroutine function that executes cursor pagination on a
+    database query using an async database session, so no threadpool thread
+    is held while waiting on the database.
 
     Preconditions:
         - limit must be > 0
-        - cursor must be prefixed with either next___ or prev___ or be None
+        - cursor must have been produced by encode_cursor or be None
 
     Args:
-        parsed_cursor (str): the parsed_cursor that contains a cursor_state and column_value.
         limit (int): the number of records to retrieve per page.
+        parsed_cursor (Tuple[str, Tuple[Any, ...]]): the parsed_cursor that
+            contains a cursor_state and column_values.
+        db (AsyncSession): the async database session to query with.
+        pages (int): the number of consecutive pages to retrieve, all of
+            which are selected by a single query.
 
     Returns:
         CursorPaginationModel: the pagination model that contains the next and
         previous cursors, which allow further pagination requests. As well as
         the current results from this pagination.
     """
-    cursor_state, column_value = parsed_cursor
+    cursor_state, column_values = parsed_cursor
 
-    def pagination(
+    async def pagination(
         table: Type[T],
         unique_column: Column,
         default_column_value: Any,
         order_asc=True,
+        tiebreaker_column: Optional[Column] = None,
+        columns: Optional[Sequence[Column]] = None,
+        partitions: Optional[Sequence[Any]] = None,
     ) -> CursorPaginationModel:
         """Paginates a database query using cursors.
 
@@ -143,112 +486,57 @@ def cursor_pagination(
 
         Preconditions:
             - unique_column must be a column in the given table, whose
+            values are unique to each row, unless a tiebreaker_column is given.
+            - tiebreaker_column must be a column in the given table, whose
             values are unique to each row.
 
         Args:
             table (Type[T]): the table (which can be a subquery) to paginate data from.
-            unique_column (Column): the unique column in the given table.
+            unique_column (Column): the column in the given table to order by.
+            default_column_value (Any): the value of the unique column to
+                paginate from when no cursor is given.
+            order_asc (bool): whether to order the unique column ascending.
+            tiebreaker_column (Optional[Column]): a unique column in the given table
+                used to order rows that share a unique column value. When given
+                the cursors carry both column values.
+            columns (Optional[Sequence[Column]]): columns of the given table to
+                select instead of the whole table. When given the results are
+                lightweight rows holding only these columns (and the cursor columns)
+                rather than ORM instances.
+            partitions (Optional[Sequence[Any]]): disjoint filters on the given
+                table whose union is the data to paginate. Each is paginated by its
+                own index seek before being merged, see get_seek_query.
 
         Returns:
             CursorPaginationModel: the pagination model that contains the next and
             previous cursors, which allow further pagination requests. As well as
             the current results from this pagination.
         """
-
-        pagination_filter = get_pagination_filter(
-            order_asc,
+        pagination_query = get_page_query(
+            table,
             unique_column,
-            cursor_state,
-            column_value,
             default_column_value,
+            order_asc,
+            tiebreaker_column,
+            columns,
+            cursor_state,
+            column_values,
+            limit * pages,
+            partitions,
         )
 
-        order_by = determine_cursor_query_order(
-            order_asc, unique_column, cursor_state
-        )
-
-        page_results = (
-            db.query(table)
-            .filter(pagination_filter)
-            .order_by(order_by)
-            .limit(limit + 1)
-            .all()
+        page_results = get_page_results(
+            await db.execute(pagination_query), columns
         )
 
-        if len(page_results) == 0:
-            return CursorPaginationModel(
-                cursor=CursorModel(prev_page=None, next_page=None),
-                results=page_results,
-            )
-
-        # if its previous, then we ordered by desc, thus we need to reverse
-        # the array to get the correct order.
-        if cursor_state == CursorState.PREVIOUS.value:
-            page_results = page_results[::-1]
-
-        prev_page = None
-        next_page = None
-
-        returned_results = []
-
-        if len(page_results) < limit + 1:
-            # We are either at the first or last page, depending on cursor_state.
-
-            if cursor_state == CursorState.NEXT.value and column_value != "":
-                """We are at last page attempting to move forwards,
-                but there is no more pages in that direction
-                and last page is not first page, thus previous page exists
-                and next page does not.
-                """
-                prev_page = PREVIOUS_PREFIX + str(
-                    get_model_dict(page_results[0])[unique_column.key]
-                )
-            elif cursor_state == CursorState.PREVIOUS.value:
-                """We are at the first page, attempting to move backwards.
-                When cursoring previous, we can never be at the first
-                and last page at the same time. Since that would require
-                that the cursor value is one in front of the last database record
-                which is impossible. Thus a next page must exist. And previous page
-                does not.
-                """
-                next_page = NEXT_PREFIX + str(
-                    get_model_dict(page_results[-1])[unique_column.key]
-                )
-        else:
-            # We are at a middle page or --if cursor == None and
-            # cursor_state is next, then-- first page
-            if cursor_state == CursorState.NEXT.value:
-                next_page = NEXT_PREFIX + str(
-                    get_model_dict(page_results[:-1][-1])[unique_column.key]
-                )
-                # if we are not first page then set prev_page
-                if column_value != "":
-                    prev_page = PREVIOUS_PREFIX + str(
-                        get_model_dict(page_results[0])[unique_column.key]
-                    )
-
-                # if we are at next state then there is an additional element at the
-                # end of the array due to limit + 1, which we must ignore
-                returned_results = page_results[:-1]
-            elif cursor_state == CursorState.PREVIOUS.value:
-                next_page = NEXT_PREFIX + str(
-                    get_model_dict(page_results[-1])[unique_column.key]
-                )
-                # we can index at 1 since we know that if limit > 0 and
-                # len(page_results) > limit + 1 then len(page_results) > 1
-                prev_page = PREVIOUS_PREFIX + str(
-                    get_model_dict(page_results[1])[unique_column.key]
-                )
-
-                # if we are at prev state then there is an additional element at the
-                # start of the array due to limit + 1, which we must ignore
-                returned_results = page_results[1:]
-
-        return CursorPaginationModel(
-            cursor=CursorModel(prev_page=prev_page, next_page=next_page),
-            results=page_results
-            if len(page_results) <= limit
-            else returned_results,
+        return get_prefetched_pagination_model(
+            page_results,
+            limit,
+            pages,
+            cursor_state,
+            column_values,
+            unique_column,
+            tiebreaker_column,
         )
 
     return pagination
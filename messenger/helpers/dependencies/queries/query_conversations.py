@@ -0,0 +1,60 @@
+from fastapi import Depends
+from sqlalchemy import select
+from messenger_schemas.schema.user_schema import (
+    UserSchema,
+)
+from messenger.helpers.dependencies.user import (
+    async_get_current_active_user,
+)
+from messenger.models.schema.conversation_summary_schema import (
+    ConversationSummarySchema,
+)
+
+
+def select_conversations(current_user_id: int):
+    """Produces a subquery table of the summaries of the direct conversations
+    of the current user, along with the username of the other participant.
+
+    SELECT user.username AS partner_username, cs.partner_id,
+        cs.last_message_id, cs.last_message_preview,
+        cs.last_activity_date_time, cs.unread_count
+    FROM conversation_summary cs
+    INNER JOIN user ON user.user_id = cs.partner_id
+    WHERE cs.user_id = :current_user_id
+
+    Paginated by last activity, it is served by a range scan of the index
+    of the summaries on (user_id, last_activity_date_time, partner_id).
+
+    Args:
+        current_user_id (int): the id of the currently signed in user.
+    """
+    return (
+        select(
+            UserSchema.username.label("partner_username"),
+            ConversationSummarySchema.partner_id,
+            ConversationSummarySchema.last_message_id,
+            ConversationSummarySchema.last_message_preview,
+            ConversationSummarySchema.last_activity_date_time,
+            ConversationSummarySchema.unread_count,
+        )
+        .join(
+            UserSchema,
+            UserSchema.user_id == ConversationSummarySchema.partner_id,
+        )
+        .where(ConversationSummarySchema.user_id == current_user_id)
+        .subquery()
+        .c
+    )
+
+
+async def async_query_conversations(
+    current_user: UserSchema = Depends(async_get_current_active_user),
+):
+    """Produces a subquery table of the summaries of the direct conversations
+    of the current user. See select_conversations.
+
+    Args:
+        current_user (UserSchema, optional): the currently signed in user.
+            Defaults to Depends(async_get_current_active_user).
+    """
+    return select_conversations(current_user.user_id)
@@ -0,0 +1,100 @@
+from typing import List
+from fastapi import Depends, HTTPException, Query, status
+from sqlalchemy import func, select
+from messenger_schemas.schema.message_schema import (
+    MessageSchema,
+)
+from messenger_schemas.schema.user_schema import (
+    UserSchema,
+)
+from messenger.helpers.dependencies.user import (
+    async_get_current_active_user,
+)
+from messenger.helpers.message_search import get_query_terms
+from messenger.models.schema.message_term_schema import MessageTermSchema
+
+
+def select_message_search(current_user_id: int, terms: List[str]):
+    """Produces a subquery table of the direct messages of the current user
+    that contain any of the given terms, along with their relevance, which is
+    the number of the terms each contains.
+
+    SELECT message.message_id, message.sender_id, message.reciever_id,
+        message.content, message.created_date_time, matches.relevance
+    FROM (
+        SELECT message_id, COUNT(*) AS relevance
+        FROM message_term
+        WHERE user_id = :current_user_id AND term IN :terms
+        GROUP BY message_id
+    ) matches
+    INNER JOIN message ON message.message_id = matches.message_id
+
+    The matches are read from the range of each term of the current user in
+    the primary key of the index, thus their number bounds the cost of every
+    page of the search.
+
+    Args:
+        current_user_id (int): the id of the currently signed in user.
+        terms (List[str]): the terms to search for.
+    """
+    matches = (
+        select(
+            MessageTermSchema.message_id,
+            func.count().label("relevance"),
+        )
+        .where(
+            MessageTermSchema.user_id == current_user_id,
+            MessageTermSchema.term.in_(terms),
+        )
+        .group_by(MessageTermSchema.message_id)
+        .subquery("matches")
+    )
+
+    return (
+        select(
+            MessageSchema.message_id,
+            MessageSchema.sender_id,
+            MessageSchema.reciever_id,
+            MessageSchema.content,
+            MessageSchema.created_date_time,
+            matches.c.relevance,
+        )
+        .select_from(matches)
+        .join(MessageSchema, MessageSchema.message_id == matches.c.message_id)
+        .subquery()
+        .c
+    )
+
+
+def parse_query_terms(query: str) -> List[str]:
+    """Produces the terms of a search query.
+
+    Raises:
+        HTTPException: a 400 when the query has no terms.
+    """
+    terms = get_query_terms(query)
+
+    if len(terms) == 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="the query has no searchable terms",
+        )
+
+    return terms
+
+
+async def async_query_message_search(
+    query: str = Query(title="The terms to search the messages for"),
+    current_user: UserSchema = Depends(async_get_current_active_user),
+):
+    """Produces a subquery table of the direct messages of the current user
+    that contain any of the terms of the query. See select_message_search.
+
+    Args:
+        query (str): the terms to search the messages for.
+        current_user (UserSchema, optional): the currently signed in user.
+            Defaults to Depends(async_get_current_active_user).
+    """
+    return select_message_search(
+        current_user.user_id, parse_query_terms(query)
+    )
@@ -1,66 +1,83 @@
 from bleach import clean
 from fastapi import Depends
-from sqlalchemy import and_, or_
-from sqlalchemy.orm import Session, aliased
-from messenger_schemas.schema import (
-    database_session,
-)
+from sqlalchemy import and_
+from sqlalchemy.ext.asyncio import AsyncSession
 from messenger_schemas.schema.user_schema import (
     UserSchema,
 )
 from messenger_schemas.schema.message_schema import (
     MessageSchema,
 )
-from messenger.helpers.dependencies.user import get_current_active_user
-from messenger.helpers.handlers.user_handler import UserHandler
+from messenger.helpers.dependencies.async_database import (
+    async_database_session,
+)
+from messenger.helpers.dependencies.user import (
+    async_get_current_active_user,
+)
+from messenger.helpers.handlers.async_user_handler import AsyncUserHandler
 
 
-def query_messages(
-    friend_username: str,
-    current_user: UserSchema = Depends(get_current_active_user),
-    db: Session = Depends(database_session),
-):
-    """Produces a subquery table of all messages between the sender and the current user.
+def select_conversation_partitions(current_user_id: int, friend_id: int):
+    """Produces the filters of the two directions of the conversation between
+    the current user and a friend, which together make up all of its messages.
+
+    Rather than filtering by the OR of both directions, each direction is paginated
+    by its own index seek and merged, see get_seek_query. Such that pagination
+    produces SQL of the form:
 
-    SELECT * FROM message WHERE
-    (sender_id={...} AND reciever_id={current_user.user_id})
-    OR
-    (sender_id={current_user.user_id} AND reciever_id={...})
+    SELECT * FROM (
+        SELECT * FROM (
+            SELECT * FROM message
+            WHERE sender_id={friend_id} AND reciever_id={current_user_id}
+            AND {cursor filter} ORDER BY created_date_time DESC, message_id DESC
+            LIMIT {limit}
+        ) AS recieved
+        UNION ALL
+        SELECT * FROM (
+            SELECT * FROM message
+            WHERE sender_id={current_user_id} AND reciever_id={friend_id}
+            AND {cursor filter} ORDER BY created_date_time DESC, message_id DESC
+            LIMIT {limit}
+        ) AS sent
+    ) AS conversation
+    ORDER BY created_date_time DESC, message_id DESC
+    LIMIT {limit}
 
     Args:
-        current_user (UserSchema, optional): the currently signed in user.
-            Defaults to Depends(get_current_active_user).
-        db (Session, optional): the database session to query from.
-            Defaults to Depends(database_session).
+        current_user_id (int): the id of the currently signed in user.
+        friend_id (int): the id of the user the messages were exchanged with.
     """
 
-    user_handler = UserHandler(db)
-    friend = user_handler.get_user(
-        UserSchema.username == clean(friend_username),
-    )
+    return [
+        and_(
+            MessageSchema.sender_id == friend_id,
+            MessageSchema.reciever_id == current_user_id,
+        ),
+        and_(
+            MessageSchema.sender_id == current_user_id,
+            MessageSchema.reciever_id == friend_id,
+        ),
+    ]
 
-    filter_a = and_(
-        MessageSchema.sender_id == friend.user_id,
-        MessageSchema.reciever_id == current_user.user_id,
-    ).self_group()
-    filter_b = and_(
-        MessageSchema.sender_id == current_user.user_id,
-        MessageSchema.reciever_id == friend.user_id,
-    ).self_group()
 
-    messages_table = (
-        db.query(MessageSchema)
-        .filter(
-            or_(
-                *[
-                    filter_a,
-                    filter_b,
-                ]
-            )
-        )
-        .subquery()
-    )
+async def async_query_messages(
+    friend_username: str,
+    current_user: UserSchema = Depends(async_get_current_active_user),
+    db: AsyncSession = Depends(async_database_session),
+):
+    """Produces the filters of the conversation between the user with the
+    given username and the current user. See select_conversation_partitions.
+
+    Args:
+        friend_username (str): the username of the user the messages were
+            exchanged with.
+        current_user (UserSchema, optional): the currently signed in user.
+            Defaults to Depends(async_get_current_active_user).
+        db (AsyncSession, optional): the async database session to query from.
+            Defaults to Depends(async_database_session).
+    """
 
-    messages_table_alias = aliased(MessageSchema, messages_table)
+    user_handler = AsyncUserHandler(db)
+    friend = await user_handler.get_user_by_username(clean(friend_username))
 
-    return messages_table_alias
+    return select_conversation_partitions(current_user.user_id, friend.user_id)
@@ -0,0 +1,194 @@
+from typing import Any, List, Optional, Sequence, Type
+from sqlalchemy import Column, inspect, select, union_all
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql import Select
+from messenger.constants.pagination import CursorState
+from messenger.constants.generics import T
+
+
+def determine_cursor_query_order(
+    order_asc: bool,
+    unique_column: Column,
+    cursor_state: str,
+    tiebreaker_column: Optional[Column] = None,
+) -> List[Any]:
+    """Change the ORDER BY in query depending on cursor state. (this ensures the limit
+    is enforced on the correct side of the table, either from the start or the end)
+
+    - If we are obtaining previous page, then we want to enforce limit starting
+    at the end of the table.
+
+    - If we are obtaining next page, then we want to enforce limit starting at
+    the start of the table.
+
+    To gain a better understanding try executing the queries in MySQL without
+    clarifying desc or asc. You will notice that the returned columns when filtering
+    with "<" and a set LIMIT will return records starting from the beginning of the
+    queried table.
+
+    Now try setting order by with desc. You will now see that it queries the expected records
+    albeit in reverse order.
+
+    The tiebreaker column, if given, is ordered in the same direction as the unique
+    column so that the ORDER BY matches a composite (unique, tiebreaker) index.
+    """
+    ascending = order_asc == (cursor_state == CursorState.NEXT.value)
+    columns = (
+        [unique_column]
+        if tiebreaker_column is None
+        else [unique_column, tiebreaker_column]
+    )
+
+    return [column.asc() if ascending else column.desc() for column in columns]
+
+
+def get_projection_columns(
+    columns: Sequence[Column],
+    unique_column: Column,
+    tiebreaker_column: Optional[Column] = None,
+) -> List[Column]:
+    """Produces the columns to select when paginating in projection mode. The
+    cursor columns are appended if they are missing, since the cursors are
+    built from their values.
+
+    Args:
+        columns (Sequence[Column]): the columns requested by the caller.
+        unique_column (Column): the unique column being paginated on.
+        tiebreaker_column (Optional[Column]): the tiebreaker column, if any.
+
+    Returns:
+        List[Column]: the columns to select.
+    """
+    projection_columns = list(columns)
+    column_keys = {column.key for column in projection_columns}
+
+    for cursor_column in (unique_column, tiebreaker_column):
+        if cursor_column is not None and cursor_column.key not in column_keys:
+            projection_columns.append(cursor_column)
+            column_keys.add(cursor_column.key)
+
+    return projection_columns
+
+
+def select_merged_table(
+    table: Type[T],
+    merged_table: Any,
+    unique_column: Column,
+    order_asc: bool,
+    cursor_state: str,
+    tiebreaker_column: Optional[Column] = None,
+    columns: Optional[Sequence[Column]] = None,
+) -> Select:
+    """Produces the query of the records of a subquery merging queries of the
+    given table, in the order given by the cursor state.
+
+    Args:
+        table (Type[T]): the table the merged queries selected from.
+        merged_table (Any): the subquery merging the queries.
+        unique_column (Column): the unique column of the given table.
+        order_asc (bool): whether to order the unique column ascending.
+        cursor_state (str): the state of the cursor being paginated.
+        tiebreaker_column (Optional[Column]): the tiebreaker column of the
+            given table, if any.
+        columns (Optional[Sequence[Column]]): the columns of the given table
+            the merged queries selected. When None they selected the whole
+            table, thus ORM instances are selected from the subquery aliased
+            as the given table.
+
+    Returns:
+        Select: the query of the merged records.
+    """
+    if columns is None:
+        merged_table_alias = aliased(
+            inspect(table).mapper, merged_table, adapt_on_names=True
+        )
+        merged_entities = [merged_table_alias]
+        merged_unique_column = getattr(merged_table_alias, unique_column.key)
+        merged_tiebreaker_column = (
+            None
+            if tiebreaker_column is None
+            else getattr(merged_table_alias, tiebreaker_column.key)
+        )
+    else:
+        merged_entities = [merged_table.c[column.key] for column in columns]
+        merged_unique_column = merged_table.c[unique_column.key]
+        merged_tiebreaker_column = (
+            None
+            if tiebreaker_column is None
+            else merged_table.c[tiebreaker_column.key]
+        )
+
+    return select(*merged_entities).order_by(
+        *determine_cursor_query_order(
+            order_asc,
+            merged_unique_column,
+            cursor_state,
+            merged_tiebreaker_column,
+        )
+    )
+
+
+def get_seek_query(
+    table: Type[T],
+    unique_column: Column,
+    order_asc: bool,
+    tiebreaker_column: Optional[Column],
+    columns: Optional[Sequence[Column]],
+    cursor_state: str,
+    seek_filter: Any,
+    limit: int,
+    partitions: Optional[Sequence[Any]] = None,
+) -> Select:
+    """Produces the query that seeks the first records matching the seek filter
+    in the order given by the cursor state.
+
+    When partitions are given, each partition filter forms its own branch with
+    the seek filter, order and limit applied, and the branches are merged by a
+    UNION ALL with the order and limit applied once more. Unlike a single query
+    filtered by the OR of the partitions, every branch can be served by a range
+    scan of an index prefixed by its equality filters, so no filesort is needed
+    regardless of the size of the table.
+
+    Preconditions:
+        - the partitions must be disjoint.
+    """
+    selected_entities = (
+        [table]
+        if columns is None
+        else get_projection_columns(columns, unique_column, tiebreaker_column)
+    )
+
+    order_by = determine_cursor_query_order(
+        order_asc, unique_column, cursor_state, tiebreaker_column
+    )
+
+    if partitions is None:
+        return (
+            select(*selected_entities)
+            .where(seek_filter)
+            .order_by(*order_by)
+            .limit(limit)
+        )
+
+    merged_table = union_all(
+        *[
+            select(
+                select(*selected_entities)
+                .where(partition, seek_filter)
+                .order_by(*order_by)
+                .limit(limit)
+                .subquery()
+            )
+            for partition in partitions
+        ]
+    ).subquery()
+
+    return select_merged_table(
+        table,
+        merged_table,
+        unique_column,
+        order_asc,
+        cursor_state,
+        tiebreaker_column,
+        None if columns is None else selected_entities,
+    ).limit(limit)
@@ -0,0 +1,62 @@
+from typing import Optional, Type
+from fastapi import HTTPException, Query, status
+from pydantic import BaseModel
+from messenger.helpers.get_sparse_model import get_sparse_model
+
+INVALID_FIELDS_HTTP_EXCEPTION = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail="invalid fields",
+)
+
+
+def sparse_model(Model: Type[BaseModel]):
+    """Produces a dependency that narrows the given model to the fields requested
+    by the client, such that both the columns selected and the payload returned
+    are limited to them.
+
+    Args:
+        Model (Type[BaseModel]): the model of the route's results.
+
+    Returns:
+        the dependency which produces the requested model.
+    """
+
+    async def get_requested_model(
+        fields: Optional[str] = Query(
+            default=None,
+            title="Comma separated fields of the results to return",
+        ),
+    ) -> Type[BaseModel]:
+        """Produces the model of the requested fields.
+
+        Args:
+            fields (Optional[str]): comma separated names of the fields to return.
+                Defaults to None, which returns every field.
+
+        Raises:
+            INVALID_FIELDS_HTTP_EXCEPTION: raised when a requested field is not
+                a field of the model, or no field is requested.
+
+        Returns:
+            Type[BaseModel]: the model of the requested fields.
+        """
+        if fields is None:
+            return Model
+
+        requested_fields = {field.strip() for field in fields.split(",")}
+
+        if not requested_fields.issubset(Model.__fields__.keys()):
+            raise INVALID_FIELDS_HTTP_EXCEPTION
+
+        # ordered as the model orders them, so a fieldset always maps to
+        # the same cached model.
+        return get_sparse_model(
+            Model,
+            tuple(
+                field_name
+                for field_name in Model.__fields__
+                if field_name in requested_fields
+            ),
+        )
+
+    return get_requested_model
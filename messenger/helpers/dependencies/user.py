@@ -1,6 +1,7 @@
 import logging
 from argon2 import PasswordHasher
 from fastapi import Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from messenger_schemas.schema import (
     database_session,
@@ -10,6 +11,10 @@ from messenger_schemas.schema.user_schema import (
 )
 from messenger.constants.token import UNAUTHORIZED_CREDENTIALS_EXCEPTION
 from messenger.settings import JWT_SECRET
+from messenger.helpers.dependencies.async_database import (
+    async_database_session,
+)
+from messenger.helpers.handlers.async_user_handler import AsyncUserHandler
 from messenger.helpers.handlers.user_handler import UserHandler
 from messenger.helpers.tokens.validate_token import (
     validate_token,
@@ -25,7 +30,8 @@ password_hasher = PasswordHasher()
 
 
 def get_current_user(
-    db: Session = Depends(database_session), token: str = Depends(oauth2_scheme)
+    db: Session = Depends(database_session),
+    token: str = Depends(oauth2_scheme),
 ) -> UserSchema:
     """Retrieves a user's data from the database using a given JWT token.
 
@@ -80,3 +86,56 @@ def get_current_active_user(
     """
 
     return current_user
+
+
+async def async_get_current_user(
+    db: AsyncSession = Depends(async_database_session),
+    token: str = Depends(oauth2_scheme),
+) -> UserSchema:
+    """Asynchronous counterpart of get_current_user, which retrieves the user
+    using an async database session so that no threadpool thread is held.
+
+    Args:
+        db (AsyncSession, optional): The async database session used for querying
+            the user. Defaults to Depends(async_database_session).
+        token (str, optional): a JWT token that represents the users credentials.
+            Defaults to Depends(oauth2_scheme).
+
+    Raises:
+        UNAUTHORIZED_CREDENTIALS_EXCEPTION: An exception that returns a status of unauthorized.
+
+    Returns:
+        UserSchema: The users data from the database.
+    """
+
+    valid_token = validate_token(token, JWT_SECRET, AccessTokenData)
+
+    if valid_token is None:
+        raise UNAUTHORIZED_CREDENTIALS_EXCEPTION
+
+    user_handler = AsyncUserHandler(db)
+    try:
+        user = await user_handler.get_user(
+            UserSchema.email == valid_token.email,
+        )
+
+        return user
+    except HTTPException as exc:
+        raise UNAUTHORIZED_CREDENTIALS_EXCEPTION from exc
+
+
+async def async_get_current_active_user(
+    current_user: UserSchema = Depends(async_get_current_user),
+) -> UserSchema:
+    """Asynchronous counterpart of get_current_active_user.
+    Add as a dependency for async routes that require authenticated users.
+
+    Args:
+        current_user (UserSchema, optional): the current user from the database,
+        obtained using a JWT. Defaults to Depends(async_get_current_user).
+
+    Returns:
+        UserSchema: returns the currently active user.
+    """
+
+    return current_user
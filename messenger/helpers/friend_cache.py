@@ -0,0 +1,163 @@
+"""An in-process cache of the accepted friend ids of each user.
+
+The friend ids of a user are loaded on a miss and kept until the user is
+evicted as the least recently used, their time to live passes, or a
+friendship of the user changes. Changes are registered against the session
+that writes them with invalidate_friend_ids_on_commit, and are invalidated
+once that session commits, so a reader never caches a friendship that was
+rolled back.
+"""
+
+from collections import OrderedDict
+import threading
+from time import monotonic
+from typing import FrozenSet, Optional, Tuple
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from messenger.constants.friend_cache import (
+    FRIEND_CACHE_MAX_USERS,
+    FRIEND_CACHE_TTL_SECONDS,
+)
+from messenger.helpers.dependencies.queries.query_friends import (
+    select_friends,
+)
+
+# the key of Session.info under which the ids of users whose friend ids must
+# be invalidated once the session commits are held.
+PENDING_INVALIDATIONS_KEY = "friend_cache_pending_invalidations"
+
+
+class FriendCache:
+    """A thread safe LRU cache of the accepted friend ids of users."""
+
+    def __init__(self, max_users: int, ttl_seconds: float):
+        self._max_users = max_users
+        self._ttl_seconds = ttl_seconds
+        self._friend_ids: "OrderedDict[int, Tuple[float, FrozenSet[int]]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+        # incremented by every invalidation, so a load that began before an
+        # invalidation is not cached after it.
+        self.generation = 0
+
+    def get(self, user_id: int) -> Optional[FrozenSet[int]]:
+        """Retrieves the cached friend ids of a user.
+
+        Returns:
+            Optional[FrozenSet[int]]: the friend ids or None if they are not
+                cached or have expired.
+        """
+        with self._lock:
+            entry = self._friend_ids.get(user_id)
+
+            if entry is None:
+                return None
+
+            expires_at, friend_ids = entry
+
+            if expires_at <= monotonic():
+                del self._friend_ids[user_id]
+                return None
+
+            self._friend_ids.move_to_end(user_id)
+
+            return friend_ids
+
+    def set(
+        self, user_id: int, friend_ids: FrozenSet[int], generation: int
+    ) -> None:
+        """Caches the friend ids of a user, unless the cache was invalidated
+        since the given generation, evicting the least recently used user if
+        the cache is full.
+
+        Args:
+            user_id (int): the id of the user.
+            friend_ids (FrozenSet[int]): the ids of the user's friends.
+            generation (int): the generation read before the friend ids were loaded.
+        """
+        with self._lock:
+            if generation != self.generation:
+                return
+
+            self._friend_ids[user_id] = (
+                monotonic() + self._ttl_seconds,
+                friend_ids,
+            )
+            self._friend_ids.move_to_end(user_id)
+
+            while len(self._friend_ids) > self._max_users:
+                self._friend_ids.popitem(last=False)
+
+    def invalidate(self, *user_ids: int) -> None:
+        with self._lock:
+            self.generation += 1
+
+            for user_id in user_ids:
+                self._friend_ids.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._friend_ids.clear()
+
+    def __len__(self) -> int:
+        return len(self._friend_ids)
+
+
+friend_cache = FriendCache(FRIEND_CACHE_MAX_USERS, FRIEND_CACHE_TTL_SECONDS)
+
+
+def get_friend_ids(db: Session, user_id: int) -> FrozenSet[int]:
+    """Retrieves the ids of the users with whom a user has an accepted
+    friendship, from the cache if present.
+
+    Args:
+        db (Session): the database session to load the friend ids with on a miss.
+        user_id (int): the id of the user.
+
+    Returns:
+        FrozenSet[int]: the ids of the user's friends.
+    """
+    friend_ids = friend_cache.get(user_id)
+
+    if friend_ids is None:
+        generation = friend_cache.generation
+        friends_table = select_friends(user_id)
+        friend_ids = frozenset(
+            db.execute(select(friends_table.user_id)).scalars()
+        )
+        friend_cache.set(user_id, friend_ids, generation)
+
+    return friend_ids
+
+
+def invalidate_friend_ids_on_commit(db: Session, *user_ids: int) -> None:
+    """Invalidates the cached friend ids of the given users once the given
+    session commits, since their friendships are being changed by it.
+
+    Args:
+        db (Session): the session changing the friendships.
+        user_ids (int): the ids of the users participating in the friendships.
+    """
+    db.info.setdefault(PENDING_INVALIDATIONS_KEY, set()).update(user_ids)
+
+    # invalidate immediately as well, so that the session itself does not
+    # read friend ids cached before its change.
+    friend_cache.invalidate(*user_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def invalidate_committed_friend_ids(session: Session) -> None:
+    user_ids = session.info.pop(PENDING_INVALIDATIONS_KEY, None)
+
+    if user_ids:
+        friend_cache.invalidate(*user_ids)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def discard_pending_friend_ids(session: Session, previous_transaction) -> None:
+    # only the outermost transaction discards the changes of the session.
+    if previous_transaction.parent is None:
+        session.info.pop(PENDING_INVALIDATIONS_KEY, None)
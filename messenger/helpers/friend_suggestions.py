@@ -0,0 +1,336 @@
+"""Maintains the mutual friend counts that friend suggestions are served from.
+
+Whenever friendships become accepted, or stop being accepted, the mutual
+friend counts of the pairs of users they connect or disconnect are adjusted
+as the session that changed them commits, see
+messenger.helpers.friendship_changes. The counts are adjusted with a fixed
+number of statements however many friendships changed. Suggestions are then
+read from the counts of the current user alone, rather than by joining
+friendships to friendships at request time.
+
+The counts can be rebuilt from scratch with:
+    python -m messenger.helpers.friend_suggestions
+"""
+
+from collections import Counter
+import logging
+from typing import Dict, List, Set, Tuple
+from sqlalchemy import (
+    and_,
+    delete,
+    exists,
+    func,
+    insert,
+    or_,
+    select,
+    tuple_,
+    union_all,
+)
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from messenger_schemas.schema import DatabaseSessionContext
+from messenger_schemas.schema.user_schema import UserSchema
+from messenger.constants.friendship_status_codes import FriendshipStatusCode
+from messenger.helpers.upsert import insert_or_update
+from messenger.models.friendship_change import FriendshipChange
+from messenger.models.schema.current_friendship_status_schema import (
+    CurrentFriendshipStatusSchema,
+)
+from messenger.models.schema.mutual_friend_count_schema import (
+    MutualFriendCountSchema,
+)
+
+logger = logging.getLogger(__name__)
+
+# a change of whether a friendship is accepted as
+# (requester_id, addressee_id, is_accepted).
+AcceptedChange = Tuple[int, int, bool]
+
+
+def get_friend_ids_of_users(
+    db: Session, user_ids: Set[int]
+) -> Dict[int, Set[int]]:
+    """Retrieves the accepted friend ids of each of the given users in one
+    query."""
+    friend_ids: Dict[int, Set[int]] = {user_id: set() for user_id in user_ids}
+
+    friendships = db.execute(
+        select(
+            CurrentFriendshipStatusSchema.requester_id,
+            CurrentFriendshipStatusSchema.addressee_id,
+        ).where(
+            CurrentFriendshipStatusSchema.status_code_id
+            == FriendshipStatusCode.ACCEPTED.value,
+            or_(
+                CurrentFriendshipStatusSchema.requester_id.in_(user_ids),
+                CurrentFriendshipStatusSchema.addressee_id.in_(user_ids),
+            ),
+        )
+    )
+
+    for requester_id, addressee_id in friendships:
+        if requester_id in friend_ids:
+            friend_ids[requester_id].add(addressee_id)
+        if addressee_id in friend_ids:
+            friend_ids[addressee_id].add(requester_id)
+
+    return friend_ids
+
+
+def get_mutual_friend_count_deltas(
+    friend_ids: Dict[int, Set[int]], changes: List[AcceptedChange]
+) -> Dict[Tuple[int, int], int]:
+    """Computes the change of the mutual friend count of each pair of users
+    from a sequence of friendship changes.
+
+    Args:
+        friend_ids (Dict[int, Set[int]]): the friend ids of every user
+            participating in a change, once all the changes have been made.
+            The sets are modified.
+        changes (List[AcceptedChange]): the changes in the order they
+            were made.
+
+    Returns:
+        Dict[Tuple[int, int], int]: the non zero change of the count of each
+            (user_id, candidate_id) pair.
+    """
+    # undo the changes such that they can be replayed in order, each against
+    # the friends the users had when it was made.
+    for requester_id, addressee_id, is_accepted in reversed(changes):
+        if is_accepted:
+            friend_ids[requester_id].discard(addressee_id)
+            friend_ids[addressee_id].discard(requester_id)
+        else:
+            friend_ids[requester_id].add(addressee_id)
+            friend_ids[addressee_id].add(requester_id)
+
+    deltas: Counter = Counter()
+
+    for requester_id, addressee_id, is_accepted in changes:
+        if not is_accepted:
+            friend_ids[requester_id].discard(addressee_id)
+            friend_ids[addressee_id].discard(requester_id)
+
+        delta = 1 if is_accepted else -1
+
+        # every friend of one user gains or loses the other as a user with
+        # whom they have a mutual friend.
+        for user_id, friend_id in (
+            (requester_id, addressee_id),
+            (addressee_id, requester_id),
+        ):
+            for mutual_id in friend_ids[user_id]:
+                deltas[(friend_id, mutual_id)] += delta
+                deltas[(mutual_id, friend_id)] += delta
+
+        if is_accepted:
+            friend_ids[requester_id].add(addressee_id)
+            friend_ids[addressee_id].add(requester_id)
+
+    return {pair: delta for pair, delta in deltas.items() if delta != 0}
+
+
+def apply_mutual_friend_count_deltas(
+    db: Session, deltas: Dict[Tuple[int, int], int]
+) -> None:
+    """Adds each delta to the mutual friend count of its pair, inserting the
+    pairs that have no count and deleting those left without mutual friends.
+    """
+    pairs = sorted(deltas)
+
+    # the rows are written in the order of their keys, such that concurrent
+    # adjustments lock the rows they share in the same order.
+    db.execute(
+        insert_or_update(
+            db,
+            MutualFriendCountSchema.__table__,
+            lambda inserted: [
+                (
+                    "mutual_friend_count",
+                    MutualFriendCountSchema.mutual_friend_count
+                    + inserted.mutual_friend_count,
+                )
+            ],
+        ),
+        [
+            {
+                "user_id": user_id,
+                "candidate_id": candidate_id,
+                "mutual_friend_count": deltas[(user_id, candidate_id)],
+            }
+            for user_id, candidate_id in pairs
+        ],
+    )
+
+    db.execute(
+        delete(MutualFriendCountSchema.__table__).where(
+            tuple_(
+                MutualFriendCountSchema.user_id,
+                MutualFriendCountSchema.candidate_id,
+            ).in_(pairs),
+            MutualFriendCountSchema.mutual_friend_count <= 0,
+        )
+    )
+
+
+def apply_mutual_friend_count_changes(
+    db: Session, changes: List[FriendshipChange]
+) -> None:
+    """Adjusts the mutual friend counts by the friendship changes that made a
+    friendship accepted or stopped it being accepted.
+
+    Args:
+        db (Session): the session the changes were made with.
+        changes (List[FriendshipChange]): the changes in the order they
+            were made.
+    """
+    accepted = FriendshipStatusCode.ACCEPTED.value
+    accepted_changes: List[AcceptedChange] = [
+        (
+            change.requester_id,
+            change.addressee_id,
+            change.status_code_id == accepted,
+        )
+        for change in changes
+        if (change.previous_status_code_id == accepted)
+        != (change.status_code_id == accepted)
+    ]
+
+    if len(accepted_changes) == 0:
+        return
+
+    user_ids = {
+        user_id
+        for requester_id, addressee_id, _ in accepted_changes
+        for user_id in (requester_id, addressee_id)
+    }
+    deltas = get_mutual_friend_count_deltas(
+        get_friend_ids_of_users(db, user_ids), accepted_changes
+    )
+
+    if deltas:
+        apply_mutual_friend_count_deltas(db, deltas)
+
+
+def select_friend_suggestions(user_id: int, limit: int) -> Select:
+    """Produces the query of the users with whom a user has the most mutual
+    friends and no friendship of any status.
+
+    SELECT user.user_id, user.username, mfc.mutual_friend_count
+    FROM mutual_friend_count mfc
+    INNER JOIN user ON user.user_id = mfc.candidate_id
+    WHERE mfc.user_id = :user_id AND NOT EXISTS (
+        SELECT * FROM current_friendship_status cfs
+        WHERE (cfs.requester_id = :user_id AND cfs.addressee_id = mfc.candidate_id)
+        OR (cfs.requester_id = mfc.candidate_id AND cfs.addressee_id = :user_id)
+    )
+    ORDER BY mfc.mutual_friend_count DESC, mfc.candidate_id
+    LIMIT :limit
+
+    Args:
+        user_id (int): the id of the user to suggest friends to.
+        limit (int): the largest number of suggestions.
+    """
+    has_friendship = exists().where(
+        or_(
+            and_(
+                CurrentFriendshipStatusSchema.requester_id == user_id,
+                CurrentFriendshipStatusSchema.addressee_id
+                == MutualFriendCountSchema.candidate_id,
+            ),
+            and_(
+                CurrentFriendshipStatusSchema.requester_id
+                == MutualFriendCountSchema.candidate_id,
+                CurrentFriendshipStatusSchema.addressee_id == user_id,
+            ),
+        )
+    )
+
+    return (
+        select(
+            UserSchema.user_id,
+            UserSchema.username,
+            MutualFriendCountSchema.mutual_friend_count,
+        )
+        .join(
+            MutualFriendCountSchema,
+            UserSchema.user_id == MutualFriendCountSchema.candidate_id,
+        )
+        .where(MutualFriendCountSchema.user_id == user_id, ~has_friendship)
+        .order_by(
+            MutualFriendCountSchema.mutual_friend_count.desc(),
+            MutualFriendCountSchema.candidate_id,
+        )
+        .limit(limit)
+    )
+
+
+def rebuild_mutual_friend_counts(db: Session) -> int:
+    """Replaces every mutual friend count with one counted from the current
+    accepted friendships. The caller is responsible for committing.
+
+    WITH friend AS (
+        SELECT requester_id AS user_id, addressee_id AS friend_id
+        FROM current_friendship_status WHERE status_code_id = "A"
+        UNION ALL
+        SELECT addressee_id, requester_id
+        FROM current_friendship_status WHERE status_code_id = "A"
+    )
+    SELECT a.friend_id, b.friend_id, COUNT(*)
+    FROM friend a INNER JOIN friend b
+    ON a.user_id = b.user_id AND a.friend_id != b.friend_id
+    GROUP BY a.friend_id, b.friend_id
+
+    Args:
+        db (Session): the database session to use.
+
+    Returns:
+        int: the number of mutual friend counts written.
+    """
+    accepted = (
+        CurrentFriendshipStatusSchema.status_code_id
+        == FriendshipStatusCode.ACCEPTED.value
+    )
+    friend = union_all(
+        select(
+            CurrentFriendshipStatusSchema.requester_id.label("user_id"),
+            CurrentFriendshipStatusSchema.addressee_id.label("friend_id"),
+        ).where(accepted),
+        select(
+            CurrentFriendshipStatusSchema.addressee_id.label("user_id"),
+            CurrentFriendshipStatusSchema.requester_id.label("friend_id"),
+        ).where(accepted),
+    ).cte("friend")
+    friend_a = friend.alias("friend_a")
+    friend_b = friend.alias("friend_b")
+
+    db.execute(delete(MutualFriendCountSchema))
+
+    result = db.execute(
+        insert(MutualFriendCountSchema).from_select(
+            ["user_id", "candidate_id", "mutual_friend_count"],
+            select(friend_a.c.friend_id, friend_b.c.friend_id, func.count())
+            .join(
+                friend_b,
+                and_(
+                    friend_a.c.user_id == friend_b.c.user_id,
+                    friend_a.c.friend_id != friend_b.c.friend_id,
+                ),
+            )
+            .group_by(friend_a.c.friend_id, friend_b.c.friend_id),
+        )
+    )
+
+    return result.rowcount
+
+
+def main():
+    with DatabaseSessionContext() as db:
+        rowcount = rebuild_mutual_friend_counts(db)
+        db.commit()
+
+    logger.info("rebuilt %s mutual friend counts.", rowcount)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Collects the changes of the current status of friendships made by a session
+and applies them to the tables derived from friendships when it commits.
+
+Every change of the current status of a friendship is registered against the
+session that writes it with register_friendship_change. When the session
+commits, the registered changes are applied in the order they were made, in
+the same transaction, to the mutual friend counts and the friendship counts
+of the users involved. Changes that are rolled back are discarded.
+"""
+
+from typing import List, Optional
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from messenger.helpers.friend_suggestions import (
+    apply_mutual_friend_count_changes,
+)
+from messenger.helpers.friendship_counts import apply_friendship_count_changes
+from messenger.models.friendship_change import FriendshipChange
+
+# the key of Session.info under which the friendship changes that are yet to
+# be applied are held.
+PENDING_FRIENDSHIP_CHANGES_KEY = "pending_friendship_changes"
+
+
+def register_friendship_change(
+    db: Session,
+    requester_id: int,
+    addressee_id: int,
+    previous_status_code_id: Optional[str],
+    status_code_id: Optional[str],
+) -> None:
+    """Registers a change of the current status of a friendship, such that the
+    tables derived from friendships are updated once the session commits.
+
+    Args:
+        db (Session): the session changing the friendship.
+        requester_id (int): the id of the requester of the friendship.
+        addressee_id (int): the id of the addressee of the friendship.
+        previous_status_code_id (Optional[str]): the status code of the
+            friendship before the change, or None if it had no status.
+        status_code_id (Optional[str]): the status code of the friendship
+            after the change, or None if it was deleted.
+    """
+    if previous_status_code_id != status_code_id:
+        db.info.setdefault(PENDING_FRIENDSHIP_CHANGES_KEY, []).append(
+            FriendshipChange(
+                requester_id,
+                addressee_id,
+                previous_status_code_id,
+                status_code_id,
+            )
+        )
+
+
+def apply_friendship_changes(db: Session) -> None:
+    """Applies the friendship changes registered against the session to the
+    tables derived from friendships."""
+    changes: List[FriendshipChange] = db.info.pop(
+        PENDING_FRIENDSHIP_CHANGES_KEY, []
+    )
+
+    if len(changes) == 0:
+        return
+
+    # the current statuses of the changes must be visible to the queries of
+    # the friends of their users.
+    db.flush()
+
+    apply_mutual_friend_count_changes(db, changes)
+    apply_friendship_count_changes(db, changes)
+
+
+@event.listens_for(Session, "before_commit")
+def apply_pending_friendship_changes(session: Session) -> None:
+    apply_friendship_changes(session)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def discard_pending_friendship_changes(
+    session: Session, previous_transaction
+) -> None:
+    # only the outermost transaction discards the changes of the session.
+    if previous_transaction.parent is None:
+        session.info.pop(PENDING_FRIENDSHIP_CHANGES_KEY, None)
@@ -0,0 +1,200 @@
+"""Maintains the number of friends and of pending friendship requests of each
+user.
+
+The counts are adjusted as the session that changes friendship statuses
+commits, see messenger.helpers.friendship_changes, with a fixed number of
+statements however many friendships changed. A user with no counts has none
+of either.
+
+The counts can be rebuilt from scratch with:
+    python -m messenger.helpers.friendship_counts
+"""
+
+from collections import Counter, defaultdict
+import logging
+from typing import Dict, List, Optional
+from sqlalchemy import case, delete, func, insert, literal, select, union_all
+from sqlalchemy.orm import Session
+from messenger_schemas.schema import DatabaseSessionContext
+from messenger.constants.friendship_status_codes import FriendshipStatusCode
+from messenger.helpers.upsert import insert_or_update
+from messenger.models.friendship_change import FriendshipChange
+from messenger.models.schema.current_friendship_status_schema import (
+    CurrentFriendshipStatusSchema,
+)
+from messenger.models.schema.friendship_count_schema import (
+    FriendshipCountSchema,
+)
+
+logger = logging.getLogger(__name__)
+
+COUNT_COLUMNS = (
+    "friend_count",
+    "incoming_request_count",
+    "outgoing_request_count",
+)
+
+
+def get_status_counts(
+    status_code_id: Optional[str],
+) -> Dict[str, Dict[str, int]]:
+    """Produces the counts a friendship of a given status contributes to its
+    requester and addressee."""
+    if status_code_id == FriendshipStatusCode.ACCEPTED.value:
+        return {
+            "requester": {"friend_count": 1},
+            "addressee": {"friend_count": 1},
+        }
+
+    if status_code_id == FriendshipStatusCode.REQUESTED.value:
+        return {
+            "requester": {"outgoing_request_count": 1},
+            "addressee": {"incoming_request_count": 1},
+        }
+
+    return {"requester": {}, "addressee": {}}
+
+
+def get_friendship_count_deltas(
+    changes: List[FriendshipChange],
+) -> Dict[int, Dict[str, int]]:
+    """Computes the change of the counts of each user from a sequence of
+    friendship changes.
+
+    Returns:
+        Dict[int, Dict[str, int]]: the change of every count of each user
+            whose counts changed.
+    """
+    deltas: Dict[int, Counter] = defaultdict(Counter)
+
+    for change in changes:
+        previous_counts = get_status_counts(change.previous_status_code_id)
+        counts = get_status_counts(change.status_code_id)
+
+        for side, user_id in (
+            ("requester", change.requester_id),
+            ("addressee", change.addressee_id),
+        ):
+            deltas[user_id].update(counts[side])
+            deltas[user_id].subtract(previous_counts[side])
+
+    return {
+        user_id: {column: user_deltas[column] for column in COUNT_COLUMNS}
+        for user_id, user_deltas in deltas.items()
+        if any(user_deltas.values())
+    }
+
+
+def apply_friendship_count_deltas(
+    db: Session, deltas: Dict[int, Dict[str, int]]
+) -> None:
+    """Adds the deltas of each user to their counts, inserting the counts of
+    users that have none."""
+    db.execute(
+        insert_or_update(
+            db,
+            FriendshipCountSchema.__table__,
+            lambda inserted: [
+                (
+                    column,
+                    getattr(FriendshipCountSchema, column)
+                    + getattr(inserted, column),
+                )
+                for column in COUNT_COLUMNS
+            ],
+        ),
+        [
+            {"user_id": user_id, **deltas[user_id]}
+            for user_id in sorted(deltas)
+        ],
+    )
+
+
+def apply_friendship_count_changes(
+    db: Session, changes: List[FriendshipChange]
+) -> None:
+    """Adjusts the friendship counts by the friendship changes made with the
+    session.
+
+    Args:
+        db (Session): the session the changes were made with.
+        changes (List[FriendshipChange]): the changes in the order they
+            were made.
+    """
+    deltas = get_friendship_count_deltas(changes)
+
+    if deltas:
+        apply_friendship_count_deltas(db, deltas)
+
+
+def rebuild_friendship_counts(db: Session) -> int:
+    """Replaces every friendship count with one counted from the current
+    friendship statuses. The caller is responsible for committing.
+
+    SELECT user_id,
+        SUM(status_code_id = "A"),
+        SUM(status_code_id = "R" AND NOT is_requester),
+        SUM(status_code_id = "R" AND is_requester)
+    FROM (
+        SELECT requester_id AS user_id, status_code_id, 1 AS is_requester
+        FROM current_friendship_status
+        UNION ALL
+        SELECT addressee_id, status_code_id, 0
+        FROM current_friendship_status
+    ) side
+    GROUP BY user_id
+
+    Args:
+        db (Session): the database session to use.
+
+    Returns:
+        int: the number of friendship counts written.
+    """
+    sides = union_all(
+        select(
+            CurrentFriendshipStatusSchema.requester_id.label("user_id"),
+            CurrentFriendshipStatusSchema.status_code_id,
+            literal(1).label("is_requester"),
+        ),
+        select(
+            CurrentFriendshipStatusSchema.addressee_id,
+            CurrentFriendshipStatusSchema.status_code_id,
+            literal(0),
+        ),
+    ).subquery("side")
+
+    def count_where(criterion):
+        return func.sum(case((criterion, 1), else_=0))
+
+    is_accepted = sides.c.status_code_id == FriendshipStatusCode.ACCEPTED.value
+    is_requested = (
+        sides.c.status_code_id == FriendshipStatusCode.REQUESTED.value
+    )
+
+    db.execute(delete(FriendshipCountSchema))
+
+    result = db.execute(
+        insert(FriendshipCountSchema).from_select(
+            ["user_id", *COUNT_COLUMNS],
+            select(
+                sides.c.user_id,
+                count_where(is_accepted),
+                count_where(is_requested & (sides.c.is_requester == 0)),
+                count_where(is_requested & (sides.c.is_requester == 1)),
+            ).group_by(sides.c.user_id),
+        )
+    )
+
+    return result.rowcount
+
+
+def main():
+    with DatabaseSessionContext() as db:
+        rowcount = rebuild_friendship_counts(db)
+        db.commit()
+
+    logger.info("rebuilt %s friendship counts.", rowcount)
+
+
+if __name__ == "__main__":
+    main()
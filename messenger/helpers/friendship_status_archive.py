@@ -0,0 +1,296 @@
+"""Moves the superseded statuses of friendships from the friendship_status
+table into the friendship_status_archive table, such that friendship_status
+only holds the latest status of each friendship.
+
+Friendships are archived in order of their primary key, in batches that are
+each committed in their own transaction. The key of the last friendship of
+each batch is reported along with the throughput of the job, so that an
+interrupted job can be resumed from it with --start-after. Archiving is
+idempotent, so resuming from an earlier key, or running the job again, only
+archives the statuses that were superseded since.
+
+Run from the repository root with:
+    python -m messenger.helpers.friendship_status_archive
+"""
+
+import argparse
+from dataclasses import dataclass
+from datetime import datetime
+import logging
+from time import perf_counter
+from typing import Iterator, List, Optional, Tuple
+from sqlalchemy import (
+    DateTime,
+    and_,
+    delete,
+    exists,
+    func,
+    insert,
+    literal,
+    select,
+    tuple_,
+)
+from sqlalchemy.orm import Session
+from messenger_schemas.schema import DatabaseSessionContext
+from messenger_schemas.schema.friendship_schema import FriendshipSchema
+from messenger_schemas.schema.friendship_status_schema import (
+    FriendshipStatusSchema,
+)
+from messenger.constants.friendship_status_archive import ARCHIVE_BATCH_SIZE
+from messenger.models.schema.friendship_status_archive_schema import (
+    FriendshipStatusArchiveSchema,
+)
+
+logger = logging.getLogger(__name__)
+
+# the (requester_id, addressee_id) primary key of a friendship.
+FriendshipKey = Tuple[int, int]
+
+
+@dataclass
+class ArchiveProgress:
+    batches: int = 0
+    friendships: int = 0
+    archived_statuses: int = 0
+    elapsed_seconds: float = 0.0
+    last_key: Optional[FriendshipKey] = None
+
+    @property
+    def statuses_per_second(self) -> float:
+        if self.elapsed_seconds == 0:
+            return 0.0
+
+        return self.archived_statuses / self.elapsed_seconds
+
+
+def in_key_range(
+    Schema, start_after: Optional[FriendshipKey], end: FriendshipKey
+):
+    """Produces the criterion of the rows of a table keyed by friendship whose
+    friendship is after start_after and up to and including end."""
+    key = tuple_(Schema.requester_id, Schema.addressee_id)
+    criterion = key <= tuple_(*end)
+
+    if start_after is not None:
+        criterion = and_(key > tuple_(*start_after), criterion)
+
+    return criterion
+
+
+def get_batch_keys(
+    db: Session, start_after: Optional[FriendshipKey], batch_size: int
+) -> List[FriendshipKey]:
+    """Retrieves the keys of the friendships of the batch that begins after
+    start_after, in order."""
+    query = select(
+        FriendshipSchema.requester_id, FriendshipSchema.addressee_id
+    )
+
+    if start_after is not None:
+        query = query.where(
+            tuple_(
+                FriendshipSchema.requester_id, FriendshipSchema.addressee_id
+            )
+            > tuple_(*start_after)
+        )
+
+    keys = db.execute(
+        query.order_by(
+            FriendshipSchema.requester_id, FriendshipSchema.addressee_id
+        ).limit(batch_size)
+    )
+
+    return [
+        (requester_id, addressee_id) for requester_id, addressee_id in keys
+    ]
+
+
+def archive_batch(
+    db: Session,
+    start_after: Optional[FriendshipKey],
+    end: FriendshipKey,
+    archived_date_time: datetime,
+) -> int:
+    """Moves the superseded statuses of the friendships in a range of keys to
+    the archive. The caller is responsible for committing.
+
+    INSERT INTO friendship_status_archive
+    SELECT fs.*, :archived_date_time
+    FROM friendship_status fs
+    INNER JOIN (
+        SELECT requester_id, addressee_id, MAX(specified_date_time) AS max_date_time
+        FROM friendship_status
+        WHERE (requester_id, addressee_id) > :start_after
+        AND (requester_id, addressee_id) <= :end
+        GROUP BY requester_id, addressee_id
+    ) latest_status
+    ON fs.requester_id = latest_status.requester_id
+    AND fs.addressee_id = latest_status.addressee_id
+    AND fs.specified_date_time < latest_status.max_date_time
+
+    after which the archived statuses are deleted from friendship_status.
+
+    Returns:
+        int: the number of statuses archived.
+    """
+    latest_status_dates = (
+        select(
+            FriendshipStatusSchema.requester_id,
+            FriendshipStatusSchema.addressee_id,
+            func.max(FriendshipStatusSchema.specified_date_time).label(
+                "max_date_time"
+            ),
+        )
+        .where(in_key_range(FriendshipStatusSchema, start_after, end))
+        .group_by(
+            FriendshipStatusSchema.requester_id,
+            FriendshipStatusSchema.addressee_id,
+        )
+        .subquery()
+    )
+
+    result = db.execute(
+        insert(FriendshipStatusArchiveSchema.__table__).from_select(
+            [
+                "requester_id",
+                "addressee_id",
+                "specified_date_time",
+                "status_code_id",
+                "specifier_id",
+                "archived_date_time",
+            ],
+            select(
+                FriendshipStatusSchema.requester_id,
+                FriendshipStatusSchema.addressee_id,
+                FriendshipStatusSchema.specified_date_time,
+                FriendshipStatusSchema.status_code_id,
+                FriendshipStatusSchema.specifier_id,
+                literal(archived_date_time, DateTime),
+            ).join(
+                latest_status_dates,
+                and_(
+                    FriendshipStatusSchema.requester_id
+                    == latest_status_dates.c.requester_id,
+                    FriendshipStatusSchema.addressee_id
+                    == latest_status_dates.c.addressee_id,
+                    FriendshipStatusSchema.specified_date_time
+                    < latest_status_dates.c.max_date_time,
+                ),
+            ),
+        )
+    )
+
+    # deleting the statuses that are in the archive, rather than those that
+    # are superseded, avoids a subquery of the table being deleted from.
+    db.execute(
+        delete(FriendshipStatusSchema.__table__).where(
+            in_key_range(FriendshipStatusSchema, start_after, end),
+            exists().where(
+                FriendshipStatusArchiveSchema.requester_id
+                == FriendshipStatusSchema.requester_id,
+                FriendshipStatusArchiveSchema.addressee_id
+                == FriendshipStatusSchema.addressee_id,
+                FriendshipStatusArchiveSchema.specified_date_time
+                == FriendshipStatusSchema.specified_date_time,
+            ),
+        )
+    )
+
+    return result.rowcount
+
+
+def archive_superseded_friendship_statuses(
+    db: Session,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+    start_after: Optional[FriendshipKey] = None,
+) -> Iterator[ArchiveProgress]:
+    """Archives the superseded statuses of every friendship after
+    start_after, committing each batch of friendships.
+
+    Args:
+        db (Session): the database session to use.
+        batch_size (int): the number of friendships archived per transaction.
+        start_after (Optional[FriendshipKey]): the key of the friendship to
+            resume after, or None to begin with the first friendship.
+
+    Yields:
+        ArchiveProgress: the progress of the job once each batch commits.
+    """
+    progress = ArchiveProgress(last_key=start_after)
+    start = perf_counter()
+
+    while True:
+        keys = get_batch_keys(db, progress.last_key, batch_size)
+
+        if len(keys) == 0:
+            return
+
+        end = keys[-1]
+
+        archived_statuses = archive_batch(
+            db, progress.last_key, end, datetime.now()
+        )
+        db.commit()
+
+        progress.batches += 1
+        progress.friendships += len(keys)
+        progress.archived_statuses += archived_statuses
+        progress.elapsed_seconds = perf_counter() - start
+        progress.last_key = end
+
+        yield progress
+
+
+def parse_key(key: str) -> FriendshipKey:
+    requester_id, addressee_id = key.split(",")
+
+    return (int(requester_id), int(addressee_id))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=ARCHIVE_BATCH_SIZE,
+        help="the number of friendships archived per transaction.",
+    )
+    parser.add_argument(
+        "--start-after",
+        type=parse_key,
+        help="the requester_id,addressee_id of the friendship to resume after.",
+    )
+    args = parser.parse_args()
+
+    progress = ArchiveProgress(last_key=args.start_after)
+
+    with DatabaseSessionContext() as db:
+        for progress in archive_superseded_friendship_statuses(
+            db, args.batch_size, args.start_after
+        ):
+            logger.info(
+                "batch %s: archived %s statuses of %s friendships up to %s, "
+                "%.1f statuses/s.",
+                progress.batches,
+                progress.archived_statuses,
+                progress.friendships,
+                "%s,%s" % progress.last_key,
+                progress.statuses_per_second,
+            )
+
+    logger.info(
+        "archived %s statuses of %s friendships in %s batches and %.2fs "
+        "(%.1f statuses/s).",
+        progress.archived_statuses,
+        progress.friendships,
+        progress.batches,
+        progress.elapsed_seconds,
+        progress.statuses_per_second,
+    )
+
+
+if __name__ == "__main__":
+    main()
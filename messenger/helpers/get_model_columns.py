@@ -0,0 +1,19 @@
+from typing import List, Type
+from pydantic import BaseModel
+from sqlalchemy import Column
+from messenger.constants.generics import T
+
+
+def get_model_columns(table: Type[T], Model: Type[BaseModel]) -> List[Column]:
+    """Given a table and a pydantic model, generate the list of the table's
+    columns that populate the model's fields.
+
+    Args:
+        table (Type[T]): the table (which can be an aliased subquery) to take
+            the columns from.
+        Model (Type[BaseModel]): the model whose fields name the columns.
+
+    Returns:
+        List[Column]: the columns of the table, in the order of the model's fields.
+    """
+    return [getattr(table, field_name) for field_name in Model.__fields__]
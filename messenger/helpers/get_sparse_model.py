@@ -0,0 +1,32 @@
+from functools import lru_cache
+from typing import Tuple, Type
+from pydantic import BaseModel, create_model
+
+
+@lru_cache(maxsize=None)
+def get_sparse_model(
+    Model: Type[BaseModel], fields: Tuple[str, ...]
+) -> Type[BaseModel]:
+    """Produces a model holding only the given fields of a model, with the same
+    types, defaults and config. The models are cached, since a model is created
+    once per distinct fieldset rather than once per request.
+
+    Args:
+        Model (Type[BaseModel]): the model to take the fields from.
+        fields (Tuple[str, ...]): the names of the fields to keep, which
+            should be given in a consistent order so that the cache is hit.
+
+    Returns:
+        Type[BaseModel]: the model of the given fields.
+    """
+    return create_model(
+        f"{Model.__name__}[{','.join(fields)}]",
+        __config__=Model.__config__,
+        **{
+            field_name: (
+                Model.__fields__[field_name].outer_type_,
+                Model.__fields__[field_name].field_info,
+            )
+            for field_name in fields
+        },
+    )
@@ -0,0 +1,78 @@
+"""Defines the AsyncDatabaseHandler class"""
+
+from typing import Optional
+
+from fastapi import (
+    HTTPException,
+    status,
+)
+from sqlalchemy import select
+from sqlalchemy.exc import (
+    MultipleResultsFound,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from messenger.constants.generics import T
+
+
+class AsyncDatabaseHandler:
+    """Handles basic database functionality using an async database session."""
+
+    def __init__(self, db: AsyncSession):
+        self._db = db
+
+    async def _get_record(self, Schema: T, *criterion) -> Optional[T]:
+        """Retrieves a single record from a database that matches a set of filters.
+        If multiple are found we throw an HTTP 500 internal server error.
+        If no result is found return None.
+
+        Args:
+            Schema (Base): the SQLAlchemy schema that relates to the table
+                in the database the row will be retrieved from.
+            criterion (optional): additional keyword arguments that
+                will be used as filters in the query.
+
+        Raises:
+            HTTP_500_INTERNAL_SERVER_ERROR: this is raised when multiple records are returned
+
+        Returns:
+            Base: returns a database record.
+        """
+        result = await self._db.execute(select(Schema).where(*criterion))
+
+        try:
+            db_record: Optional[T] = result.scalar_one_or_none()
+        except MultipleResultsFound as exc:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Multiple records found",
+            ) from exc
+
+        return db_record
+
+    async def _get_record_with_not_found_raise(
+        self, Schema: T, detail: str, *criterion
+    ) -> T:
+        """Retrieves the a single record from a database that matches a set of filters.
+
+        Args:
+            Schema (Base): the SQLAlchemy schema that relates to the
+                table in the database the row will be retrieved from.
+            criterion (optional): additional keyword arguments that will
+                be used as filters in the query.
+
+        Raises:
+            HTTP_404_NOT_FOUND: this is raised when no record is found
+            HTTP_500_INTERNAL_SERVER_ERROR: this is raised when multiple records are returned
+
+        Returns:
+            Base: returns a database record.
+        """
+        db_record = await self._get_record(Schema, *criterion)
+
+        if db_record is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=detail,
+            )
+
+        return db_record
@@ -0,0 +1,50 @@
+"""Defines the AsyncUserHandler class."""
+
+from typing import Optional
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from messenger_schemas.schema.user_schema import (
+    UserSchema,
+)
+from messenger.helpers.handlers.async_database_handler import (
+    AsyncDatabaseHandler,
+)
+from messenger.helpers.username_cache import (
+    CachedUser,
+    select_cached_user,
+    username_cache,
+)
+
+
+class AsyncUserHandler(AsyncDatabaseHandler):
+    """Allows access to basic user utility methods using an async database session."""
+
+    def __init__(self, db: AsyncSession, user: Optional[UserSchema] = None):
+        super().__init__(db)
+        self.user = user
+
+    async def get_user(self, *criterion) -> UserSchema:
+        self.user = await self._get_record_with_not_found_raise(
+            UserSchema, "no such user exists", *criterion
+        )
+
+        return self.user
+
+    async def get_user_by_username(self, username: str) -> CachedUser:
+        """Asynchronous counterpart of UserHandler.get_user_by_username."""
+        is_cached, user = username_cache.get(username)
+
+        if not is_cached:
+            generation = username_cache.generation
+            result = await self._db.execute(select_cached_user(username))
+            row = result.one_or_none()
+            user = None if row is None else CachedUser(*row)
+            username_cache.set(username, user, generation)
+
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="no such user exists",
+            )
+
+        return user
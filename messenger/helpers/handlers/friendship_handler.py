@@ -1,6 +1,5 @@
 from datetime import datetime
 import logging
-from operator import attrgetter
 from typing import Optional
 from fastapi import HTTPException, status
 from sqlalchemy import and_, or_
@@ -12,9 +11,14 @@ from messenger_schemas.schema.friendship_status_schema import (
 from messenger.constants.friendship_status_codes import (
     FriendshipStatusCode,
 )
+from messenger.helpers.friend_cache import invalidate_friend_ids_on_commit
+from messenger.helpers.friendship_changes import register_friendship_change
 from messenger.helpers.handlers.database_handler import (
     DatabaseHandler,
 )
+from messenger.models.schema.current_friendship_status_schema import (
+    CurrentFriendshipStatusSchema,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -41,28 +45,34 @@ class FriendshipHandler(DatabaseHandler):
 
     def get_latest_friendship_status(
         self,
-    ) -> Optional[FriendshipStatusSchema]:
-        """Uses sqlalchemy ORM to query all friendship statuses of self.friendship.
-        Returns the last added friendship status.
+    ) -> Optional[CurrentFriendshipStatusSchema]:
+        """Retrieves the current status of self.friendship by its primary key,
+        rather than searching the status history of the friendship, which
+        grows every time it is addressed or blocked.
 
         Returns:
-            Optional[FriendshipStatusSchema]: the last added friendship status
+            Optional[CurrentFriendshipStatusSchema]: the last added friendship
+                status or None if the friendship has no statuses.
         """
-        if self.friendship is None or len(self.friendship.statuses) == 0:
+        if self.friendship is None:
             return None
 
-        return max(
-            self.friendship.statuses,
-            key=attrgetter("specified_date_time"),
+        return self._db.get(
+            CurrentFriendshipStatusSchema,
+            (self.friendship.requester_id, self.friendship.addressee_id),
         )
 
     def raise_if_blocked(
         self,
-    ) -> None:
+    ) -> Optional[CurrentFriendshipStatusSchema]:
         """Raise 400 http exception if self.friendship is blocked.
 
         Raises:
             HTTPException: 400 status detailing that the friendship is blocked.
+
+        Returns:
+            Optional[CurrentFriendshipStatusSchema]: the last added friendship
+                status, such that callers need not query it again.
         """
 
         latest_status = self.get_latest_friendship_status()
@@ -77,6 +87,8 @@ class FriendshipHandler(DatabaseHandler):
                 detail="friendship is blocked",
             )
 
+        return latest_status
+
     def add_new_status(
         self,
         requester_id: int,
@@ -104,6 +116,7 @@ class FriendshipHandler(DatabaseHandler):
         )
 
         self._db.add(new_status)
+        self.set_current_status(new_status)
 
         logger.info(
             "(requester_id: %s, addressee_id: %s, status_code_id: %s) add \
@@ -115,6 +128,101 @@ class FriendshipHandler(DatabaseHandler):
 
         return new_status
 
+    def lock_current_status(
+        self, requester_id: int, addressee_id: int
+    ) -> Optional[CurrentFriendshipStatusSchema]:
+        """Retrieves the current status of a friendship by its primary key and
+        locks it until the transaction ends, such that a concurrent change of
+        the friendship waits for this one and reads the status it writes as
+        its previous status, rather than both registering the same change.
+
+        Args:
+            requester_id (int): the user_id of the friendship requester
+            addressee_id (int): the user_id of the friendship addressee
+
+        Returns:
+            Optional[CurrentFriendshipStatusSchema]: the current status or None
+                if the friendship has no status.
+        """
+        return self._db.get(
+            CurrentFriendshipStatusSchema,
+            (requester_id, addressee_id),
+            populate_existing=True,
+            with_for_update=True,
+        )
+
+    def set_current_status(
+        self, new_status: FriendshipStatusSchema
+    ) -> CurrentFriendshipStatusSchema:
+        """Overwrites the current status of the friendship of the given status
+        with it, such that it is written in the same transaction as the status.
+        The cached friend ids of both users are invalidated once it commits,
+        and the change is registered such that the mutual friend counts and
+        friendship counts derived from it are adjusted as it commits.
+
+        Args:
+            new_status (FriendshipStatusSchema): the newest status of its friendship.
+
+        Returns:
+            CurrentFriendshipStatusSchema: the current status of the friendship.
+        """
+        invalidate_friend_ids_on_commit(
+            self._db, new_status.requester_id, new_status.addressee_id
+        )
+
+        # loads the current status into the session, so merging it below
+        # does not query it again.
+        previous_status = self.lock_current_status(
+            new_status.requester_id, new_status.addressee_id
+        )
+        register_friendship_change(
+            self._db,
+            new_status.requester_id,
+            new_status.addressee_id,
+            None
+            if previous_status is None
+            else previous_status.status_code_id,
+            new_status.status_code_id,
+        )
+
+        return self._db.merge(
+            CurrentFriendshipStatusSchema(
+                requester_id=new_status.requester_id,
+                addressee_id=new_status.addressee_id,
+                status_code_id=new_status.status_code_id,
+                specifier_id=new_status.specifier_id,
+                specified_date_time=new_status.specified_date_time,
+            )
+        )
+
+    def get_current_status(
+        self, user_id_a: int, user_id_b: int
+    ) -> Optional[CurrentFriendshipStatusSchema]:
+        """Retrieves the current status of the friendship between two users,
+        where either may be the requester, by its primary key.
+
+        Args:
+            user_id_a (int): the id of a user participating in the friendship
+            user_id_b (int): the id of a user participating in the friendship
+
+        Returns:
+            Optional[CurrentFriendshipStatusSchema]: the current status or None
+                if no friendship was found.
+        """
+        return self._get_record(
+            CurrentFriendshipStatusSchema,
+            or_(
+                and_(
+                    CurrentFriendshipStatusSchema.requester_id == user_id_a,
+                    CurrentFriendshipStatusSchema.addressee_id == user_id_b,
+                ),
+                and_(
+                    CurrentFriendshipStatusSchema.requester_id == user_id_b,
+                    CurrentFriendshipStatusSchema.addressee_id == user_id_a,
+                ),
+            ),
+        )
+
     def get_friendship(
         self, addressee_id: int, requester_id: int
     ) -> FriendshipSchema:
@@ -6,7 +6,12 @@ from sqlalchemy.orm import Session
 from messenger_schemas.schema.message_schema import (
     MessageSchema,
 )
+from messenger.helpers.change_log import get_message_changes, record_changes
+from messenger.helpers.conversation_summaries import (
+    update_conversation_summaries,
+)
 from messenger.helpers.handlers.database_handler import DatabaseHandler
+from messenger.helpers.message_search import index_messages
 
 
 class MessageHandler(DatabaseHandler):
@@ -44,6 +49,10 @@ class MessageHandler(DatabaseHandler):
         )
 
         self._db.add(message)
+        self._db.flush()
+        update_conversation_summaries(self._db, [message])
+        index_messages(self._db, [message])
+        record_changes(self._db, get_message_changes([message]))
         self._db.commit()
         self._db.refresh(message)
 
@@ -1,11 +1,17 @@
 """Defines the UserHandler class."""
 
 from typing import Optional
+from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 from messenger_schemas.schema.user_schema import (
     UserSchema,
 )
 from messenger.helpers.handlers.database_handler import DatabaseHandler
+from messenger.helpers.username_cache import (
+    CachedUser,
+    select_cached_user,
+    username_cache,
+)
 
 
 class UserHandler(DatabaseHandler):
@@ -21,3 +27,32 @@ class UserHandler(DatabaseHandler):
         )
 
         return self.user
+
+    def get_user_by_username(self, username: str) -> CachedUser:
+        """Resolves a username to the id and username of its user, from the
+        username cache if present.
+
+        Args:
+            username (str): the username of the user.
+
+        Raises:
+            HTTPException: a 404 if the username belongs to no user.
+
+        Returns:
+            CachedUser: the id and username of the user.
+        """
+        is_cached, user = username_cache.get(username)
+
+        if not is_cached:
+            generation = username_cache.generation
+            row = self._db.execute(select_cached_user(username)).one_or_none()
+            user = None if row is None else CachedUser(*row)
+            username_cache.set(username, user, generation)
+
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="no such user exists",
+            )
+
+        return user
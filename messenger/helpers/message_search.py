@@ -0,0 +1,166 @@
+"""Maintains the inverted index that the direct messages of a user are
+searched with, see MessageTermSchema.
+
+The terms of a message are the distinct runs of letters and digits of its
+content, case folded. Messages are indexed in the same transaction as they
+are inserted, with a single statement however many messages are inserted.
+Messages sent to group chats are not indexed.
+
+The index can be rebuilt from scratch, committing a batch of messages at a
+time, with:
+    python -m messenger.helpers.message_search
+"""
+
+import argparse
+import logging
+import re
+from time import perf_counter
+from typing import Any, Dict, Iterator, List, Optional
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+from messenger_schemas.schema import DatabaseSessionContext
+from messenger_schemas.schema.message_schema import MessageSchema
+from messenger.constants.message_search import (
+    INDEX_BATCH_SIZE,
+    MAX_QUERY_TERMS,
+    MAX_TERM_LENGTH,
+)
+from messenger.models.schema.message_term_schema import MessageTermSchema
+
+logger = logging.getLogger(__name__)
+
+TERM_PATTERN = re.compile(r"\w+")
+
+
+def get_terms(text: str) -> List[str]:
+    """Produces the distinct terms of a text in order of first occurrence."""
+    return list(
+        dict.fromkeys(
+            term[:MAX_TERM_LENGTH]
+            for term in TERM_PATTERN.findall(text.casefold())
+        )
+    )
+
+
+def get_query_terms(query: str) -> List[str]:
+    """Produces the terms of a search query that are searched for."""
+    return get_terms(query)[:MAX_QUERY_TERMS]
+
+
+def get_message_term_rows(messages: List[Any]) -> List[Dict[str, Any]]:
+    """Produces the rows of the index of direct messages, each term of a
+    message being held once for each of its participants.
+
+    Args:
+        messages (List[Any]): the messages, or rows of their message_id,
+            sender_id, reciever_id and content.
+    """
+    return [
+        {"user_id": user_id, "term": term, "message_id": message.message_id}
+        for message in messages
+        if message.reciever_id is not None
+        for user_id in {message.sender_id, message.reciever_id}
+        for term in get_terms(message.content)
+    ]
+
+
+def index_messages(db: Session, messages: List[Any]) -> None:
+    """Indexes the terms of newly inserted messages. The caller is
+    responsible for committing.
+
+    Args:
+        db (Session): the session the messages were inserted with.
+        messages (List[Any]): the messages, which must have been flushed
+            such that their ids are known.
+    """
+    rows = get_message_term_rows(messages)
+
+    if rows:
+        db.execute(insert(MessageTermSchema.__table__), rows)
+
+
+def get_unindexed_batch(
+    db: Session, start_after: Optional[int], batch_size: int
+) -> List[Any]:
+    """Retrieves the batch of direct messages that begins after the message
+    with the id start_after, in order of their ids."""
+    query = select(
+        MessageSchema.message_id,
+        MessageSchema.sender_id,
+        MessageSchema.reciever_id,
+        MessageSchema.content,
+    ).where(MessageSchema.reciever_id.isnot(None))
+
+    if start_after is not None:
+        query = query.where(MessageSchema.message_id > start_after)
+
+    return db.execute(
+        query.order_by(MessageSchema.message_id).limit(batch_size)
+    ).all()
+
+
+def rebuild_message_search_index(
+    db: Session, batch_size: int = INDEX_BATCH_SIZE
+) -> Iterator[int]:
+    """Replaces the index with one of every direct message, committing each
+    batch of messages.
+
+    Args:
+        db (Session): the database session to use.
+        batch_size (int): the number of messages indexed per transaction.
+
+    Yields:
+        int: the number of messages indexed once each batch commits.
+    """
+    db.execute(delete(MessageTermSchema))
+    db.commit()
+
+    indexed_messages = 0
+    last_message_id = None
+
+    while True:
+        messages = get_unindexed_batch(db, last_message_id, batch_size)
+
+        if len(messages) == 0:
+            return
+
+        index_messages(db, messages)
+        db.commit()
+
+        indexed_messages += len(messages)
+        last_message_id = messages[-1].message_id
+
+        yield indexed_messages
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=INDEX_BATCH_SIZE,
+        help="the number of messages indexed per transaction.",
+    )
+    args = parser.parse_args()
+
+    indexed_messages = 0
+    start = perf_counter()
+
+    with DatabaseSessionContext() as db:
+        for indexed_messages in rebuild_message_search_index(
+            db, args.batch_size
+        ):
+            logger.info("indexed %s messages.", indexed_messages)
+
+    logger.info(
+        "indexed %s messages in %.2fs.",
+        indexed_messages,
+        perf_counter() - start,
+    )
+
+
+if __name__ == "__main__":
+    main()
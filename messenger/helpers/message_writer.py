@@ -0,0 +1,231 @@
+"""Writes the messages sent through the socket in batches.
+
+Each message sent with MessageHandler.send_message is inserted and committed
+in its own transaction, then refreshed. Under bursts of messages the latency of
+those commits limits the number of messages per second. The message writer
+instead queues messages, and inserts every message queued within a few
+milliseconds of the first, up to a batch size, in a single transaction. The
+ids of the messages are read back as they are inserted, such that no message
+is refreshed. The writer of a message is only answered once its batch commits.
+When a batch fails, its messages are retried one at a time, so a message that
+cannot be inserted does not fail the rest of its batch.
+
+Batches are written on a worker thread, so while one commits the next is
+queued.
+"""
+
+import asyncio
+from contextlib import AbstractContextManager
+from datetime import datetime
+import logging
+from typing import Callable, List, NamedTuple, Optional
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from messenger_schemas.schema import DatabaseSessionContext
+from messenger_schemas.schema.message_schema import MessageSchema
+from messenger.constants.message_writer import (
+    MESSAGE_WRITER_MAX_BATCH_SIZE,
+    MESSAGE_WRITER_MAX_DELAY_SECONDS,
+)
+from messenger.helpers.change_log import get_message_changes, record_changes
+from messenger.helpers.conversation_summaries import (
+    update_conversation_summaries,
+)
+from messenger.helpers.message_search import index_messages
+from messenger.models.fastapi.message_model import MessageModel
+
+logger = logging.getLogger(__name__)
+
+
+class PendingMessage(NamedTuple):
+    sender_id: int
+    reciever_id: Optional[int]
+    content: str
+    group_chat_id: Optional[int]
+    created_date_time: datetime
+    future: "asyncio.Future[MessageModel]"
+
+
+class MessageWriter:
+    """Inserts queued messages in batches, each committed as one
+    transaction."""
+
+    def __init__(
+        self,
+        max_batch_size: int,
+        max_delay_seconds: float,
+        session_context: Callable[
+            [], AbstractContextManager
+        ] = DatabaseSessionContext,
+    ):
+        self._max_batch_size = max_batch_size
+        self._max_delay_seconds = max_delay_seconds
+        self._session_context = session_context
+        self._queue: Optional["asyncio.Queue[PendingMessage]"] = None
+        self._worker: Optional["asyncio.Task[None]"] = None
+
+    async def write(
+        self,
+        sender_id: int,
+        reciever_id: Optional[int],
+        content: str,
+        group_chat_id: Optional[int],
+    ) -> MessageModel:
+        """Queues a message to be inserted with the next batch.
+
+        Args:
+            sender_id (int): the user_id of the user sending the message.
+            reciever_id (Optional[int]): the user_id of the user recieving
+                the message.
+            content (str): the content of the message.
+            group_chat_id (Optional[int]): the group chat the message is sent
+                to, if any.
+
+        Raises:
+            HTTPException: a 500 if the batch of the message was not written.
+
+        Returns:
+            MessageModel: the message once its batch has committed.
+        """
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._write_batches())
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(
+            PendingMessage(
+                sender_id,
+                reciever_id,
+                content,
+                group_chat_id,
+                datetime.now(),
+                future,
+            )
+        )
+
+        return await future
+
+    async def close(self) -> None:
+        """Waits for the queued messages to be written, then stops the
+        worker."""
+        if self._queue is not None:
+            await self._queue.join()
+
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+
+    async def _next_batch(self) -> List[PendingMessage]:
+        """Waits for a message, then for those queued until the batch is full
+        or the delay since the first has passed."""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self._max_delay_seconds
+
+        while len(batch) < self._max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+
+            timeout = deadline - loop.time()
+
+            if timeout <= 0:
+                break
+
+            try:
+                batch.append(
+                    await asyncio.wait_for(self._queue.get(), timeout)
+                )
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _write_batches(self) -> None:
+        while True:
+            batch = await self._next_batch()
+
+            try:
+                await self._write_batch(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _write_batch(self, batch: List[PendingMessage]) -> None:
+        """Inserts a batch, answering the writer of each of its messages.
+        When the batch fails, its messages are inserted one at a time, such
+        that a message that cannot be inserted fails alone."""
+        try:
+            message_models = await asyncio.to_thread(self._insert_batch, batch)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.error(
+                "a batch of %s messages was not inserted due to %s",
+                len(batch),
+                exc,
+                exc_info=True,
+            )
+
+            if len(batch) == 1:
+                self._fail(batch[0])
+                return
+
+            for pending_message in batch:
+                await self._write_batch([pending_message])
+        else:
+            for pending_message, message_model in zip(batch, message_models):
+                if not pending_message.future.done():
+                    pending_message.future.set_result(message_model)
+
+    def _fail(self, pending_message: PendingMessage) -> None:
+        if not pending_message.future.done():
+            pending_message.future.set_exception(
+                HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="message could not be sent",
+                )
+            )
+
+    def _insert_batch(self, batch: List[PendingMessage]) -> List[MessageModel]:
+        """Inserts a batch of messages in a single transaction.
+
+        The id of each message is read back as it is inserted by the flush,
+        and its remaining columns are those it was created with, so the models
+        are produced before the commit expires the messages.
+        """
+        db: Session
+
+        with self._session_context() as db:
+            messages = [
+                MessageSchema(
+                    sender_id=pending_message.sender_id,
+                    reciever_id=pending_message.reciever_id,
+                    content=pending_message.content,
+                    created_date_time=pending_message.created_date_time,
+                    group_chat_id=pending_message.group_chat_id,
+                    seen=False,
+                )
+                for pending_message in batch
+            ]
+
+            db.add_all(messages)
+            db.flush()
+            update_conversation_summaries(db, messages)
+            index_messages(db, messages)
+            record_changes(db, get_message_changes(messages))
+
+            message_models = [
+                MessageModel.from_orm(message) for message in messages
+            ]
+
+            db.commit()
+
+        logger.info("inserted a batch of %s messages.", len(batch))
+
+        return message_models
+
+
+message_writer = MessageWriter(
+    MESSAGE_WRITER_MAX_BATCH_SIZE, MESSAGE_WRITER_MAX_DELAY_SECONDS
+)
@@ -0,0 +1,131 @@
+"""Creates the tables this repository maintains alongside the messenger_schemas
+tables, filling each table it creates from the data it is derived from, such
+that an existing database is served as though the tables had been maintained
+from the start. Tables that already exist are left as they are, thus running
+it again does nothing.
+
+It must run before the api serves a database that lacks any of the tables,
+which the Dockerfile does before starting the api.
+
+Run from the repository root with:
+    python -m messenger.helpers.migrate
+"""
+
+import logging
+from typing import Callable, List, Optional, Tuple, Type
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+from messenger_schemas.schema import Base, DatabaseSessionContext
+from messenger.helpers.conversation_summaries import (
+    rebuild_conversation_summaries,
+)
+from messenger.helpers.current_friendship_status import (
+    rebuild_current_friendship_statuses,
+)
+from messenger.helpers.friend_suggestions import rebuild_mutual_friend_counts
+from messenger.helpers.friendship_counts import rebuild_friendship_counts
+from messenger.helpers.message_search import rebuild_message_search_index
+from messenger.helpers.read_watermarks import rebuild_read_watermarks
+from messenger.models.schema.change_sequence_schema import (
+    ChangeSequenceSchema,
+)
+from messenger.models.schema.conversation_summary_schema import (
+    ConversationSummarySchema,
+)
+from messenger.models.schema.current_friendship_status_schema import (
+    CurrentFriendshipStatusSchema,
+)
+from messenger.models.schema.friendship_count_schema import (
+    FriendshipCountSchema,
+)
+from messenger.models.schema.friendship_status_archive_schema import (
+    FriendshipStatusArchiveSchema,
+)
+from messenger.models.schema.message_term_schema import MessageTermSchema
+from messenger.models.schema.mutual_friend_count_schema import (
+    MutualFriendCountSchema,
+)
+from messenger.models.schema.read_watermark_schema import (
+    ReadWatermarkSchema,
+)
+from messenger.models.schema.user_change_schema import UserChangeSchema
+
+logger = logging.getLogger(__name__)
+
+
+def rebuild_message_terms(db: Session) -> int:
+    """Rebuilds the message search index, committing each batch of
+    messages.
+
+    Returns:
+        int: the number of messages indexed.
+    """
+    indexed_messages = 0
+
+    for indexed_messages in rebuild_message_search_index(db):
+        pass
+
+    return indexed_messages
+
+
+# every table along with the rebuild that fills it, in the order they are
+# rebuilt, such that each is rebuilt after the tables it is derived from. The
+# archive and the change log start out empty.
+MAINTAINED_TABLES: List[Tuple[Type, Optional[Callable[[Session], int]]]] = [
+    (CurrentFriendshipStatusSchema, rebuild_current_friendship_statuses),
+    (FriendshipCountSchema, rebuild_friendship_counts),
+    (MutualFriendCountSchema, rebuild_mutual_friend_counts),
+    (ReadWatermarkSchema, rebuild_read_watermarks),
+    (ConversationSummarySchema, rebuild_conversation_summaries),
+    (MessageTermSchema, rebuild_message_terms),
+    (FriendshipStatusArchiveSchema, None),
+    (ChangeSequenceSchema, None),
+    (UserChangeSchema, None),
+]
+
+
+def migrate(db: Session) -> List[str]:
+    """Creates the maintained tables that do not exist yet, then rebuilds
+    each of the created tables, committing after each rebuild.
+
+    Args:
+        db (Session): the database session to use.
+
+    Returns:
+        List[str]: the names of the tables that were created.
+    """
+    bind = db.get_bind()
+    existing_table_names = set(inspect(bind).get_table_names())
+
+    created_tables = [
+        (Schema, rebuild)
+        for (Schema, rebuild) in MAINTAINED_TABLES
+        if Schema.__tablename__ not in existing_table_names
+    ]
+
+    Base.metadata.create_all(
+        bind=bind,
+        tables=[Schema.__table__ for (Schema, _) in created_tables],
+    )
+
+    for Schema, rebuild in created_tables:
+        if rebuild is None:
+            continue
+
+        rowcount = rebuild(db)
+        db.commit()
+
+        logger.info("rebuilt %s rows of %s.", rowcount, Schema.__tablename__)
+
+    return [Schema.__tablename__ for (Schema, _) in created_tables]
+
+
+def main():
+    with DatabaseSessionContext() as db:
+        created_table_names = migrate(db)
+
+    logger.info("created %s tables.", len(created_table_names))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Defines the fast response path for paginated routes."""
+
+from typing import Type
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+from messenger.models.fastapi.pagination_model import CursorPaginationModel
+
+
+def paginated_response(
+    Model: Type[BaseModel],
+    cursor_pagination_model: CursorPaginationModel,
+) -> ORJSONResponse:
+    """Produces the response of a paginated route directly from the rows of a
+    pagination.
+
+    The rows are validated into the given model in a single pass while the
+    pagination model is parametrized, and the payload is encoded with orjson.
+    Since a Response is returned, FastAPI skips validating it again against the
+    route's response_model and skips the jsonable_encoder; the response_model
+    still documents the route.
+
+    Args:
+        Model (Type[BaseModel]): the orm_mode model each row is validated into.
+        cursor_pagination_model (CursorPaginationModel): the result of a pagination,
+            whose results are database rows or ORM instances.
+
+    Returns:
+        ORJSONResponse: the encoded CursorPaginationModel[Model].
+    """
+    validated_pagination_model = CursorPaginationModel[Model](
+        cursor=cursor_pagination_model.cursor,
+        results=cursor_pagination_model.results,
+        pages=cursor_pagination_model.pages,
+    )
+
+    # the pages are only given when several pages were prefetched, thus the
+    # payload of a single page is unchanged for clients that never ask for
+    # them.
+    return ORJSONResponse(
+        validated_pagination_model.dict(
+            exclude={"pages"}
+            if validated_pagination_model.pages is None
+            else None
+        )
+    )
@@ -0,0 +1,377 @@
+"""Tracks which messages of a direct conversation each participant has read.
+
+Rather than flagging every message as seen, each user holds a watermark of
+the last message they have read of each conversation, see
+ReadWatermarkSchema. A message is seen once its reciever's watermark of the
+conversation is at or after it, and the unread count of a conversation
+summary is the number of recieved messages after the watermark.
+
+The watermarks of a database whose messages were flagged as seen before the
+watermarks existed are built with rebuild_read_watermarks.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Tuple, Type
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy import (
+    and_,
+    case,
+    delete,
+    exists,
+    func,
+    insert,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from messenger_schemas.schema.message_schema import MessageSchema
+from messenger.helpers.change_log import (
+    async_record_changes,
+    get_read_changes,
+)
+from messenger.helpers.get_model_columns import get_model_columns
+from messenger.helpers.upsert import insert_or_update
+from messenger.models.fastapi.message_model import (
+    MessageModel,
+    ReadWatermarkModel,
+)
+from messenger.models.schema.conversation_summary_schema import (
+    ConversationSummarySchema,
+)
+from messenger.models.schema.read_watermark_schema import (
+    ReadWatermarkSchema,
+)
+
+
+def select_seen():
+    """Produces the seen column of a message, derived from the watermark of
+    its reciever. Messages of group chats are never seen.
+
+    EXISTS (
+        SELECT * FROM read_watermark
+        WHERE read_watermark.user_id = message.reciever_id
+        AND read_watermark.partner_id = message.sender_id
+        AND read_watermark.last_read_message_id >= message.message_id
+    ) AS seen
+    """
+    return exists(
+        select(ReadWatermarkSchema.user_id)
+        .where(
+            ReadWatermarkSchema.user_id == MessageSchema.reciever_id,
+            ReadWatermarkSchema.partner_id == MessageSchema.sender_id,
+            ReadWatermarkSchema.last_read_message_id
+            >= MessageSchema.message_id,
+        )
+        .correlate_except(ReadWatermarkSchema)
+    ).label("seen")
+
+
+def get_message_columns(Model: Type[BaseModel]) -> List:
+    """Produces the columns of the message table that populate a model of
+    messages, with the seen column derived from the read watermarks.
+
+    Args:
+        Model (Type[BaseModel]): the model whose fields name the columns.
+    """
+    return [
+        select_seen() if column.key == "seen" else column
+        for column in get_model_columns(MessageSchema, Model)
+    ]
+
+
+async def async_get_seen_messages(
+    db: AsyncSession, messages: List[MessageSchema]
+) -> List[MessageModel]:
+    """Produces the models of messages retrieved as ORM instances, whose seen
+    field is derived from the watermarks of their recievers.
+
+    Args:
+        db (AsyncSession): the async database session to query from.
+        messages (List[MessageSchema]): the messages to produce models of.
+
+    Returns:
+        List[MessageModel]: the models of the messages, in the same order.
+    """
+    conversations = {
+        (message.reciever_id, message.sender_id)
+        for message in messages
+        if message.reciever_id is not None
+    }
+    watermarks: Dict[Tuple[int, int], int] = {}
+
+    if conversations:
+        result = await db.execute(
+            select(
+                ReadWatermarkSchema.user_id,
+                ReadWatermarkSchema.partner_id,
+                ReadWatermarkSchema.last_read_message_id,
+            ).where(
+                tuple_(
+                    ReadWatermarkSchema.user_id,
+                    ReadWatermarkSchema.partner_id,
+                ).in_(list(conversations))
+            )
+        )
+        watermarks = {
+            (user_id, partner_id): last_read_message_id
+            for user_id, partner_id, last_read_message_id in result.all()
+        }
+
+    def is_seen(message: MessageSchema) -> bool:
+        last_read_message_id = watermarks.get(
+            (message.reciever_id, message.sender_id)
+        )
+
+        return (
+            last_read_message_id is not None
+            and message.message_id <= last_read_message_id
+        )
+
+    return [
+        MessageModel.from_orm(message).copy(update={"seen": is_seen(message)})
+        for message in messages
+    ]
+
+
+def select_read_target(current_user_id: int, partner_id: int, message_id: int):
+    """Produces the query of a message of the conversation between the
+    current user and their partner, along with the current user's watermark
+    of the conversation, if any.
+
+    SELECT message.message_id, read_watermark.last_read_message_id,
+        read_watermark.read_date_time
+    FROM message
+    LEFT OUTER JOIN read_watermark
+    ON read_watermark.user_id = :current_user_id
+    AND read_watermark.partner_id = :partner_id
+    WHERE message.message_id = :message_id
+    AND ((message.sender_id = :partner_id
+        AND message.reciever_id = :current_user_id)
+        OR (message.sender_id = :current_user_id
+        AND message.reciever_id = :partner_id))
+    """
+    return (
+        select(
+            MessageSchema.message_id,
+            ReadWatermarkSchema.last_read_message_id,
+            ReadWatermarkSchema.read_date_time,
+        )
+        .outerjoin(
+            ReadWatermarkSchema,
+            and_(
+                ReadWatermarkSchema.user_id == current_user_id,
+                ReadWatermarkSchema.partner_id == partner_id,
+            ),
+        )
+        .where(
+            MessageSchema.message_id == message_id,
+            or_(
+                and_(
+                    MessageSchema.sender_id == partner_id,
+                    MessageSchema.reciever_id == current_user_id,
+                ),
+                and_(
+                    MessageSchema.sender_id == current_user_id,
+                    MessageSchema.reciever_id == partner_id,
+                ),
+            ),
+        )
+    )
+
+
+def count_unread_messages(current_user_id: int, partner_id: int):
+    """Produces the number of messages the current user recieved from their
+    partner after the current user's watermark of their conversation."""
+    last_read_message_id = (
+        select(ReadWatermarkSchema.last_read_message_id)
+        .where(
+            ReadWatermarkSchema.user_id == current_user_id,
+            ReadWatermarkSchema.partner_id == partner_id,
+        )
+        .scalar_subquery()
+    )
+
+    return (
+        select(func.count())
+        .select_from(MessageSchema)
+        .where(
+            MessageSchema.sender_id == partner_id,
+            MessageSchema.reciever_id == current_user_id,
+            MessageSchema.message_id > func.coalesce(last_read_message_id, 0),
+        )
+        .scalar_subquery()
+    )
+
+
+async def read_messages(
+    db: AsyncSession, current_user_id: int, partner_id: int, message_id: int
+) -> ReadWatermarkModel:
+    """Marks every message of the conversation between the current user and
+    their partner up to and including a message as read, by advancing the
+    current user's watermark of the conversation to it. Watermarks never move
+    back, so reading an earlier message leaves the watermark as it is.
+
+    The watermark and the unread count of the current user's summary of the
+    conversation are written in a single transaction, however many messages
+    are read.
+
+    Args:
+        db (AsyncSession): the async database session to use.
+        current_user_id (int): the id of the user reading the messages.
+        partner_id (int): the id of the other participant.
+        message_id (int): the id of the last message read.
+
+    Raises:
+        HTTPException: a 404 when the message is not of the conversation.
+
+    Returns:
+        ReadWatermarkModel: the watermark of the conversation.
+    """
+    result = await db.execute(
+        select_read_target(current_user_id, partner_id, message_id)
+    )
+    row = result.one_or_none()
+
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="message was not found",
+        )
+
+    (_, last_read_message_id, last_read_date_time) = row
+
+    if last_read_message_id is not None and last_read_message_id >= message_id:
+        return ReadWatermarkModel(
+            last_read_message_id=last_read_message_id,
+            read_date_time=last_read_date_time,
+        )
+
+    def get_updates(inserted) -> List[Tuple[str, Any]]:
+        is_after = (
+            inserted.last_read_message_id
+            > ReadWatermarkSchema.last_read_message_id
+        )
+
+        # GREATEST(last_read_message_id, VALUES(last_read_message_id)), with
+        # the read time assigned first as it is compared with the previous
+        # watermark.
+        return [
+            (
+                column,
+                case(
+                    (is_after, getattr(inserted, column)),
+                    else_=getattr(ReadWatermarkSchema, column),
+                ),
+            )
+            for column in ("read_date_time", "last_read_message_id")
+        ]
+
+    # a single write, which neither fails when the watermark is created
+    # concurrently nor moves back when it was advanced concurrently.
+    await db.execute(
+        insert_or_update(
+            db, ReadWatermarkSchema.__table__, get_updates
+        ).values(
+            user_id=current_user_id,
+            partner_id=partner_id,
+            last_read_message_id=message_id,
+            read_date_time=datetime.now(),
+        )
+    )
+
+    # the row is locked by the write until the transaction ends.
+    result = await db.execute(
+        select(
+            ReadWatermarkSchema.last_read_message_id,
+            ReadWatermarkSchema.read_date_time,
+        ).where(
+            ReadWatermarkSchema.user_id == current_user_id,
+            ReadWatermarkSchema.partner_id == partner_id,
+        )
+    )
+    (last_read_message_id, read_date_time) = result.one()
+
+    if last_read_message_id != message_id:
+        # the watermark was advanced past the message concurrently, by a
+        # transaction that recounted the summary and recorded the changes.
+        await db.commit()
+
+        return ReadWatermarkModel(
+            last_read_message_id=last_read_message_id,
+            read_date_time=read_date_time,
+        )
+
+    # recounting rather than decrementing keeps the count exact when
+    # messages arrive as the conversation is read.
+    await db.execute(
+        update(ConversationSummarySchema.__table__)
+        .where(
+            ConversationSummarySchema.user_id == current_user_id,
+            ConversationSummarySchema.partner_id == partner_id,
+        )
+        .values(
+            unread_count=count_unread_messages(current_user_id, partner_id)
+        )
+    )
+    # the changes are recorded after the summary is written, as they are when
+    # messages are sent, such that the two lock the rows of change_sequence
+    # and conversation_summary in the same order.
+    await async_record_changes(
+        db, get_read_changes(current_user_id, partner_id, message_id)
+    )
+    await db.commit()
+
+    return ReadWatermarkModel(
+        last_read_message_id=last_read_message_id,
+        read_date_time=read_date_time,
+    )
+
+
+def rebuild_read_watermarks(db: Session) -> int:
+    """Replaces every read watermark with one at the last message each user
+    was flagged as having seen of each direct conversation, such that the
+    messages seen before the watermarks existed remain seen. The time a
+    message was read was never recorded, thus the time it was sent is taken
+    as the read time. The caller is responsible for committing.
+
+    INSERT INTO read_watermark
+    SELECT reciever_id, sender_id, MAX(message_id), MAX(created_date_time)
+    FROM message
+    WHERE reciever_id IS NOT NULL AND seen
+    GROUP BY reciever_id, sender_id
+
+    Args:
+        db (Session): the database session to use.
+
+    Returns:
+        int: the number of watermarks written.
+    """
+    db.execute(delete(ReadWatermarkSchema))
+
+    result = db.execute(
+        insert(ReadWatermarkSchema).from_select(
+            [
+                "user_id",
+                "partner_id",
+                "last_read_message_id",
+                "read_date_time",
+            ],
+            select(
+                MessageSchema.reciever_id,
+                MessageSchema.sender_id,
+                func.max(MessageSchema.message_id),
+                func.max(MessageSchema.created_date_time),
+            )
+            .where(
+                MessageSchema.reciever_id.is_not(None),
+                MessageSchema.seen.is_(True),
+            )
+            .group_by(MessageSchema.reciever_id, MessageSchema.sender_id),
+        )
+    )
+
+    return result.rowcount
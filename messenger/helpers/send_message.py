@@ -1,27 +1,155 @@
 from typing import Optional
 from bleach import clean
 from fastapi import HTTPException, status
-from messenger_schemas.schema.user_schema import (
-    UserSchema,
-)
+from sqlalchemy import and_, or_, select
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from messenger_schemas.schema.user_schema import UserSchema
 from messenger.constants.friendship_status_codes import FriendshipStatusCode
-from messenger.helpers.handlers.friendship_handler import FriendshipHandler
+from messenger.helpers.friend_cache import friend_cache
 from messenger.helpers.handlers.group_chat_handler import GroupChatHandler
 from messenger.helpers.handlers.message_handler import MessageHandler
-from messenger.helpers.handlers.user_handler import UserHandler
+from messenger.helpers.username_cache import CachedUser, username_cache
 from messenger.models.fastapi.message_model import MessageModel
+from messenger.models.schema.current_friendship_status_schema import (
+    CurrentFriendshipStatusSchema,
+)
 
 
-def send_message(
+def select_direct_message_authorization(
+    current_user_id: int, addressee_username: str
+) -> Select:
+    """Produces the query of the addressee of a direct message along with the
+    current status of their friendship with the sender, if any.
+
+    SELECT user.user_id, user.username, cfs.status_code_id
+    FROM user
+    LEFT OUTER JOIN current_friendship_status cfs
+    ON (cfs.requester_id = :current_user_id AND cfs.addressee_id = user.user_id)
+    OR (cfs.requester_id = user.user_id AND cfs.addressee_id = :current_user_id)
+    WHERE user.username = :addressee_username
+
+    Args:
+        current_user_id (int): the id of the user sending the message.
+        addressee_username (str): the username of the user receiving it.
+    """
+    return (
+        select(
+            UserSchema.user_id,
+            UserSchema.username,
+            CurrentFriendshipStatusSchema.status_code_id,
+        )
+        .outerjoin(
+            CurrentFriendshipStatusSchema,
+            or_(
+                and_(
+                    CurrentFriendshipStatusSchema.requester_id
+                    == current_user_id,
+                    CurrentFriendshipStatusSchema.addressee_id
+                    == UserSchema.user_id,
+                ),
+                and_(
+                    CurrentFriendshipStatusSchema.requester_id
+                    == UserSchema.user_id,
+                    CurrentFriendshipStatusSchema.addressee_id
+                    == current_user_id,
+                ),
+            ),
+        )
+        .where(UserSchema.username == addressee_username)
+    )
+
+
+def authorize_direct_message(
+    db: Session, current_user_id: int, addressee_username: str
+) -> int:
+    """Verifies that a user may message the user with a given username, that
+    is, that their friendship is accepted.
+
+    Once the addressee's username and the sender's friends are cached this
+    needs no query, otherwise the addressee, their friendship and its status
+    are resolved with a single one.
+
+    Args:
+        db (Session): the database session to query from.
+        current_user_id (int): the id of the user sending the message.
+        addressee_username (str): the username of the user receiving it.
+
+    Raises:
+        HTTPException: a 404 if no such user or friendship exists, or a 400
+            if the friendship is not accepted.
+
+    Returns:
+        int: the id of the addressee.
+    """
+    is_cached, addressee = username_cache.get(addressee_username)
+    friend_ids = friend_cache.get(current_user_id)
+
+    if (
+        is_cached
+        and addressee is not None
+        and friend_ids is not None
+        and addressee.user_id in friend_ids
+    ):
+        return addressee.user_id
+
+    generation = username_cache.generation
+    row = db.execute(
+        select_direct_message_authorization(
+            current_user_id, addressee_username
+        )
+    ).first()
+
+    username_cache.set(
+        addressee_username,
+        None if row is None else CachedUser(row.user_id, row.username),
+        generation,
+    )
+
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="no such user exists",
+        )
+
+    if row.status_code_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="friendship was not found",
+        )
+
+    if row.status_code_id != FriendshipStatusCode.ACCEPTED.value:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="you cannot message this person if you are not their friend",
+        )
+
+    return row.user_id
+
+
+def authorize_message(
     db: Session,
     current_user_id: int,
-    content: str,
     group_chat_id: Optional[int] = None,
     addressee_username: Optional[str] = None,
-) -> MessageModel:
-    addressee_handler = UserHandler(db)
+) -> Optional[int]:
+    """Verifies that a user may send a message to a group chat, or to the
+    user with a given username.
+
+    Args:
+        db (Session): the database session to query from.
+        current_user_id (int): the id of the user sending the message.
+        group_chat_id (Optional[int]): the id of the group chat the message
+            is sent to, if any.
+        addressee_username (Optional[str]): the username of the user the
+            message is sent to, if it is not sent to a group chat.
+
+    Raises:
+        HTTPException: if the message cannot be sent.
 
+    Returns:
+        Optional[int]: the id of the addressee of a direct message.
+    """
     if group_chat_id is not None:
         group_chat_handler = GroupChatHandler(db)
 
@@ -29,40 +157,36 @@ def send_message(
             group_chat_id, current_user_id
         ):
             raise HTTPException(status.HTTP_404_NOT_FOUND, "user not found")
-    elif addressee_username is not None:
-        addressee = addressee_handler.get_user(
-            UserSchema.username == clean(addressee_username),
-        )
 
-        friendship_handler = FriendshipHandler(db)
+        return None
 
-        friendship_handler.get_friendship_bidirectional_query(
-            current_user_id, addressee.user_id
+    if addressee_username is not None:
+        return authorize_direct_message(
+            db, current_user_id, clean(addressee_username)
         )
 
-        latest_status = friendship_handler.get_latest_friendship_status()
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="no addressee or groupchat specified",
+    )
 
-        # friendship must be accepted
-        if (
-            latest_status is None
-            or latest_status.status_code_id
-            != FriendshipStatusCode.ACCEPTED.value
-        ):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="you cannot message this person if you are not their friend",
-            )
-    else:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="no addressee or groupchat specified",
-        )
+
+def send_message(
+    db: Session,
+    current_user_id: int,
+    content: str,
+    group_chat_id: Optional[int] = None,
+    addressee_username: Optional[str] = None,
+) -> MessageModel:
+    addressee_id = authorize_message(
+        db, current_user_id, group_chat_id, addressee_username
+    )
 
     message_handler = MessageHandler(db)
 
     message = message_handler.send_message(
         current_user_id,
-        getattr(addressee_handler.user, "user_id", None),
+        addressee_id,
         content,
         group_chat_id,
     )
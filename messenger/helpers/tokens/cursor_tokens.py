@@ -0,0 +1,175 @@
+"""Encodes and decodes the cursors handed to clients by the paginated routes.
+
+A cursor is the base64url encoding (without padding) of:
+
+    version (1 byte) | cursor state (1 byte) | values | signature
+
+where each value is a type tag followed by its packed value, and the signature
+is a truncated HMAC-SHA256 of everything preceding it. Values keep their type,
+so a cursor decodes to exactly the values it was encoded from, and the
+signature prevents a client from forging a cursor that seeks from values the
+server never handed out.
+"""
+
+import base64
+from datetime import datetime, timedelta
+import hashlib
+import hmac
+import struct
+from typing import Any, List, Tuple
+from messenger.constants.pagination import (
+    CURSOR_SIGNATURE_SIZE,
+    CURSOR_VERSION,
+    CursorState,
+)
+from messenger.settings import JWT_SECRET
+
+# the key is derived from the JWT secret so cursors cannot be used as tokens
+# and tokens cannot be used as cursors.
+CURSOR_KEY = hmac.new(JWT_SECRET.encode(), b"cursor", hashlib.sha256).digest()
+
+CURSOR_STATE_CODES = {
+    CursorState.NEXT.value: 0,
+    CursorState.PREVIOUS.value: 1,
+}
+CURSOR_STATES = {code: state for state, code in CURSOR_STATE_CODES.items()}
+
+EPOCH = datetime(1970, 1, 1)
+
+INT_TAG = b"i"
+STR_TAG = b"s"
+DATETIME_TAG = b"d"
+
+INT_FORMAT = struct.Struct(">q")
+LENGTH_FORMAT = struct.Struct(">H")
+
+
+def sign(payload: bytes) -> bytes:
+    return hmac.new(CURSOR_KEY, payload, hashlib.sha256).digest()[
+        :CURSOR_SIGNATURE_SIZE
+    ]
+
+
+def pack_value(value: Any) -> bytes:
+    """Packs a single cursor value along with the tag of its type.
+
+    Raises:
+        TypeError: if the value is not of a type a cursor can hold.
+        ValueError: if the value does not fit its packed size.
+    """
+    # bool is a subclass of int but no paginated column holds one.
+    if isinstance(value, int) and not isinstance(value, bool):
+        try:
+            return INT_TAG + INT_FORMAT.pack(value)
+        except struct.error as exc:
+            raise ValueError("cursor int out of range") from exc
+
+    if isinstance(value, str):
+        encoded_value = value.encode()
+
+        if len(encoded_value) > 0xFFFF:
+            raise ValueError("cursor str too long")
+
+        return STR_TAG + LENGTH_FORMAT.pack(len(encoded_value)) + encoded_value
+
+    if isinstance(value, datetime) and value.tzinfo is None:
+        microseconds = (value - EPOCH) // timedelta(microseconds=1)
+
+        return DATETIME_TAG + INT_FORMAT.pack(microseconds)
+
+    raise TypeError(f"cannot encode a {type(value).__name__} in a cursor")
+
+
+def unpack_values(packed_values: bytes) -> Tuple[Any, ...]:
+    """Unpacks the values packed by pack_value in order.
+
+    Raises:
+        ValueError: if the packed values are malformed.
+    """
+    values: List[Any] = []
+    offset = 0
+
+    try:
+        while offset < len(packed_values):
+            tag = packed_values[offset : offset + 1]
+            offset += 1
+
+            if tag == INT_TAG:
+                (value,) = INT_FORMAT.unpack_from(packed_values, offset)
+                offset += INT_FORMAT.size
+            elif tag == DATETIME_TAG:
+                (microseconds,) = INT_FORMAT.unpack_from(packed_values, offset)
+                offset += INT_FORMAT.size
+                value = EPOCH + timedelta(microseconds=microseconds)
+            elif tag == STR_TAG:
+                (length,) = LENGTH_FORMAT.unpack_from(packed_values, offset)
+                offset += LENGTH_FORMAT.size
+
+                if offset + length > len(packed_values):
+                    raise ValueError("truncated cursor str")
+
+                value = packed_values[offset : offset + length].decode()
+                offset += length
+            else:
+                raise ValueError("unknown cursor value tag")
+
+            values.append(value)
+    except (struct.error, OverflowError, UnicodeDecodeError) as exc:
+        raise ValueError("malformed cursor values") from exc
+
+    return tuple(values)
+
+
+def encode_cursor(cursor_state: str, values: Tuple[Any, ...]) -> str:
+    """Encodes a signed cursor.
+
+    Args:
+        cursor_state (str): the CursorState value of the cursor.
+        values (Tuple[Any, ...]): the column values the cursor points at,
+            each an int, str or naive datetime.
+
+    Returns:
+        str: the url safe cursor.
+    """
+    payload = bytes(
+        (CURSOR_VERSION, CURSOR_STATE_CODES[cursor_state])
+    ) + b"".join(pack_value(value) for value in values)
+
+    return (
+        base64.urlsafe_b64encode(payload + sign(payload))
+        .rstrip(b"=")
+        .decode("ascii")
+    )
+
+
+def decode_cursor(cursor: str) -> Tuple[str, Tuple[Any, ...]]:
+    """Decodes a cursor produced by encode_cursor.
+
+    Args:
+        cursor (str): the cursor given by the client.
+
+    Raises:
+        ValueError: if the cursor is malformed, of another version or its
+            signature does not match.
+
+    Returns:
+        Tuple[str, Tuple[Any, ...]]: the cursor state and the column values.
+    """
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+    except ValueError as exc:
+        raise ValueError("cursor is not base64") from exc
+
+    payload = data[:-CURSOR_SIGNATURE_SIZE]
+    signature = data[-CURSOR_SIGNATURE_SIZE:]
+
+    if len(payload) < 2 or not hmac.compare_digest(signature, sign(payload)):
+        raise ValueError("cursor signature does not match")
+
+    if payload[0] != CURSOR_VERSION:
+        raise ValueError("unsupported cursor version")
+
+    if payload[1] not in CURSOR_STATES:
+        raise ValueError("unknown cursor state")
+
+    return CURSOR_STATES[payload[1]], unpack_values(payload[2:])
@@ -0,0 +1,47 @@
+from typing import Any, Callable, List, Tuple, Union
+from sqlalchemy import Table
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+def insert_or_update(
+    db: Union[Session, AsyncSession],
+    table: Table,
+    get_updates: Callable[[Any], List[Tuple[str, Any]]],
+):
+    """Produces an INSERT into a table where a row whose primary key already
+    exists instead updates that row, such that a row is created or adjusted
+    with a single statement, which neither fails nor is lost when another
+    transaction creates the row concurrently.
+
+    INSERT INTO table (...) VALUES (...)
+    ON DUPLICATE KEY UPDATE column = expression, ...
+
+    On SQLite, which the tests run against, the statement is instead an
+    INSERT ... ON CONFLICT of the primary key DO UPDATE.
+
+    Args:
+        db (Union[Session, AsyncSession]): the session the statement is to be
+            executed with, whose dialect the statement is produced for.
+        table (Table): the table to insert into.
+        get_updates (Callable[[Any], List[Tuple[str, Any]]]): given the
+            columns of the row that would have been inserted, produces the
+            (column name, expression) updates of an existing row. MySQL
+            assigns them in order, each seeing the columns assigned before
+            it, thus an update must be placed after every update whose
+            expression reads its column.
+    """
+    if db.get_bind().dialect.name == "mysql":
+        statement = mysql.insert(table)
+
+        return statement.on_duplicate_key_update(
+            get_updates(statement.inserted)
+        )
+
+    statement = sqlite.insert(table)
+
+    return statement.on_conflict_do_update(
+        index_elements=list(table.primary_key.columns),
+        set_=dict(get_updates(statement.excluded)),
+    )
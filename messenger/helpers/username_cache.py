@@ -0,0 +1,207 @@
+"""An in-process cache of the user each username belongs to.
+
+Routes address other users by username, so resolving a username to the id of
+its user precedes nearly every message and friendship request. The id and
+username of the user of a username are cached once loaded, as is the absence
+of a user for usernames that belong to no one, until evicted as the least
+recently used or their time to live passes.
+
+Users that are inserted, renamed or deleted through a session are collected
+as it flushes, and their usernames are invalidated immediately and once more
+when the session commits or rolls back. Usernames changed with Core
+statements rather than the ORM are not seen, and are only refreshed once
+their time to live passes.
+
+Usernames are keyed case insensitively, such that invalidating a username
+reaches every casing of it under a case insensitive collation.
+"""
+
+from collections import OrderedDict
+import threading
+from time import monotonic
+from typing import NamedTuple, Optional, Set, Tuple
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from messenger_schemas.schema.user_schema import UserSchema
+from messenger.constants.username_cache import (
+    USERNAME_CACHE_MAX_USERNAMES,
+    USERNAME_CACHE_NEGATIVE_TTL_SECONDS,
+    USERNAME_CACHE_TTL_SECONDS,
+)
+
+# the key of Session.info under which the usernames that must be invalidated
+# once the session commits or rolls back are held.
+PENDING_INVALIDATIONS_KEY = "username_cache_pending_invalidations"
+
+
+class CachedUser(NamedTuple):
+    user_id: int
+    username: str
+
+
+class UsernameCache:
+    """A thread safe LRU cache of the user of each username, including the
+    usernames that belong to no user."""
+
+    def __init__(
+        self,
+        max_usernames: int,
+        ttl_seconds: float,
+        negative_ttl_seconds: float,
+    ):
+        self._max_usernames = max_usernames
+        self._ttl_seconds = ttl_seconds
+        self._negative_ttl_seconds = negative_ttl_seconds
+        self._users: "OrderedDict[str, Tuple[float, str, Optional[CachedUser]]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+        # incremented by every invalidation, so a load that began before an
+        # invalidation is not cached after it.
+        self.generation = 0
+
+    def get(self, username: str) -> Tuple[bool, Optional[CachedUser]]:
+        """Retrieves the cached user of a username.
+
+        Returns:
+            Tuple[bool, Optional[CachedUser]]: whether the username is cached,
+                and if so its user or None if it belongs to no user.
+        """
+        key = username.casefold()
+
+        with self._lock:
+            entry = self._users.get(key)
+
+            if entry is None:
+                return False, None
+
+            expires_at, cached_username, user = entry
+
+            if expires_at <= monotonic():
+                del self._users[key]
+                return False, None
+
+            # another casing of the username may belong to another user under
+            # a case sensitive collation.
+            if cached_username != username:
+                return False, None
+
+            self._users.move_to_end(key)
+
+            return True, user
+
+    def set(
+        self, username: str, user: Optional[CachedUser], generation: int
+    ) -> None:
+        """Caches the user of a username, unless the cache was invalidated
+        since the given generation, evicting the least recently used username
+        if the cache is full.
+
+        Args:
+            username (str): the username that was looked up.
+            user (Optional[CachedUser]): the user of the username, or None if
+                it belongs to no user.
+            generation (int): the generation read before the user was loaded.
+        """
+        ttl_seconds = (
+            self._negative_ttl_seconds if user is None else self._ttl_seconds
+        )
+        key = username.casefold()
+
+        with self._lock:
+            if generation != self.generation:
+                return
+
+            self._users[key] = (monotonic() + ttl_seconds, username, user)
+            self._users.move_to_end(key)
+
+            while len(self._users) > self._max_usernames:
+                self._users.popitem(last=False)
+
+    def invalidate(self, *usernames: str) -> None:
+        with self._lock:
+            self.generation += 1
+
+            for username in usernames:
+                self._users.pop(username.casefold(), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._users.clear()
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+
+username_cache = UsernameCache(
+    USERNAME_CACHE_MAX_USERNAMES,
+    USERNAME_CACHE_TTL_SECONDS,
+    USERNAME_CACHE_NEGATIVE_TTL_SECONDS,
+)
+
+
+def select_cached_user(username: str) -> Select:
+    """Produces the query of the id and username of the user of a username."""
+    return select(UserSchema.user_id, UserSchema.username).where(
+        UserSchema.username == username
+    )
+
+
+def get_changed_usernames(session: Session) -> Set[str]:
+    """Collects the usernames of the users the session is inserting, renaming
+    or deleting, both former and new."""
+    usernames: Set[str] = set()
+
+    for user in (*session.new, *session.dirty, *session.deleted):
+        if not isinstance(user, UserSchema):
+            continue
+
+        history = inspect(user).attrs.username.history
+
+        usernames.update(
+            username
+            for username in (*history.added, *history.deleted)
+            if username is not None
+        )
+
+        if user in session.deleted and user.username is not None:
+            usernames.add(user.username)
+
+    return usernames
+
+
+@event.listens_for(Session, "after_flush")
+def invalidate_flushed_usernames(session: Session, flush_context) -> None:
+    usernames = get_changed_usernames(session)
+
+    if usernames:
+        session.info.setdefault(PENDING_INVALIDATIONS_KEY, set()).update(
+            usernames
+        )
+
+        # invalidate immediately as well, so that the session itself does not
+        # read users cached before its change.
+        username_cache.invalidate(*usernames)
+
+
+@event.listens_for(Session, "after_commit")
+def invalidate_committed_usernames(session: Session) -> None:
+    usernames = session.info.pop(PENDING_INVALIDATIONS_KEY, None)
+
+    if usernames:
+        username_cache.invalidate(*usernames)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def invalidate_rolled_back_usernames(
+    session: Session, previous_transaction
+) -> None:
+    # the session may have cached the users it flushed before rolling back.
+    if previous_transaction.parent is None:
+        usernames = session.info.pop(PENDING_INVALIDATIONS_KEY, None)
+
+        if usernames:
+            username_cache.invalidate(*usernames)
@@ -0,0 +1,23 @@
+from typing import List, Optional
+from pydantic import BaseModel, conlist
+from messenger.constants.bulk_friendship_actions import (
+    MAX_BULK_FRIENDSHIP_USERNAMES,
+    BulkFriendshipAction,
+)
+
+
+class BulkFriendshipActionModel(BaseModel):
+    usernames: conlist(
+        str, min_items=1, max_items=MAX_BULK_FRIENDSHIP_USERNAMES
+    )  # type: ignore
+    action: BulkFriendshipAction
+
+
+class BulkFriendshipResultModel(BaseModel):
+    username: str
+    status_code: int
+    detail: Optional[str] = None
+
+
+class BulkFriendshipResponseModel(BaseModel):
+    results: List[BulkFriendshipResultModel]
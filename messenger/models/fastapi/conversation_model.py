@@ -0,0 +1,13 @@
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class ConversationModel(BaseModel):
+    partner_username: str
+    last_message_id: int
+    last_message_preview: str
+    last_activity_date_time: datetime
+    unread_count: int
+
+    class Config:
+        orm_mode = True
@@ -0,0 +1,5 @@
+from messenger.models.fastapi.user_model import PublicUserModel
+
+
+class FriendSuggestionModel(PublicUserModel):
+    mutual_friend_count: int
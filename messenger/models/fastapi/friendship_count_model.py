@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+
+class FriendshipCountModel(BaseModel):
+    friend_count: int = 0
+    incoming_request_count: int = 0
+    outgoing_request_count: int = 0
+
+    class Config:
+        orm_mode = True
@@ -24,3 +24,27 @@ class MessageModel(BaseMessageModel):
 
     class Config:
         orm_mode = True
+
+
+class ReadMessagesModel(BaseModel):
+    message_id: int
+
+
+class ReadWatermarkModel(BaseModel):
+    last_read_message_id: int
+    read_date_time: datetime
+
+    class Config:
+        orm_mode = True
+
+
+class MessageSearchResultModel(BaseModel):
+    message_id: int
+    sender_id: int
+    reciever_id: int
+    content: str
+    created_date_time: datetime
+    relevance: int
+
+    class Config:
+        orm_mode = True
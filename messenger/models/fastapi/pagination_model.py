@@ -9,6 +9,12 @@ class CursorModel(BaseModel):
     next_page: Optional[str]
 
 
+class PageModel(BaseModel):
+    cursor: CursorModel
+    size: int
+
+
 class CursorPaginationModel(GenericModel, Generic[S]):
     cursor: CursorModel
     results: List[S]
+    pages: Optional[List[PageModel]] = None
@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import List
+from pydantic import BaseModel
+from messenger.constants.sync import ChangeType
+
+
+class ChangeModel(BaseModel):
+    sequence: int
+    change_type: ChangeType
+    partner_id: int
+    message_id: int
+    sender_id: int
+    reciever_id: int
+    content: str
+    created_date_time: datetime
+
+    class Config:
+        orm_mode = True
+
+
+class SyncModel(BaseModel):
+    changes: List[ChangeModel]
+    # the sequence to sync from next, which is the last sequence retrieved.
+    next_since: int
+    has_more: bool
@@ -0,0 +1,11 @@
+from typing import NamedTuple, Optional
+
+
+class FriendshipChange(NamedTuple):
+    """A change of the current status of a friendship."""
+
+    requester_id: int
+    addressee_id: int
+    # None when the friendship had no status, or no longer exists.
+    previous_status_code_id: Optional[str]
+    status_code_id: Optional[str]
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, ForeignKey, Integer
+from messenger_schemas.schema import Base
+
+
+class ChangeSequenceSchema(Base):
+    """The sequence of the last change recorded for each user. A user with
+    no sequence has had no changes.
+
+    The row of a user is locked while their changes are recorded, see
+    messenger.helpers.change_log.
+    """
+
+    __tablename__ = "change_sequence"
+
+    user_id = Column(Integer, ForeignKey("user.user_id"), primary_key=True)
+    last_sequence = Column(Integer, nullable=False)
@@ -0,0 +1,44 @@
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+)
+from messenger_schemas.schema import Base
+from messenger.constants.conversations import LAST_MESSAGE_PREVIEW_LENGTH
+
+
+class ConversationSummarySchema(Base):
+    """The latest message of each direct conversation, and the number of its
+    messages each participant has not read. One row is held per participant,
+    such that the inbox of a user is read from their rows alone in order of
+    last activity.
+
+    Summaries are updated in the same transaction as the messages they
+    summarize, see messenger.helpers.conversation_summaries.
+    """
+
+    __tablename__ = "conversation_summary"
+
+    user_id = Column(Integer, ForeignKey("user.user_id"), primary_key=True)
+    partner_id = Column(Integer, ForeignKey("user.user_id"), primary_key=True)
+    last_message_id = Column(
+        Integer, ForeignKey("message.message_id"), nullable=False
+    )
+    last_message_preview = Column(
+        String(LAST_MESSAGE_PREVIEW_LENGTH), nullable=False
+    )
+    last_activity_date_time = Column(DateTime, nullable=False)
+    unread_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        # serve the inbox of a user in order of last activity.
+        Index(
+            "ix_conversation_summary_user_activity",
+            user_id,
+            last_activity_date_time,
+            partner_id,
+        ),
+    )
@@ -0,0 +1,54 @@
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    ForeignKeyConstraint,
+    Index,
+    Integer,
+    String,
+)
+from messenger_schemas.schema import Base
+
+
+class CurrentFriendshipStatusSchema(Base):
+    """The latest status of each friendship. One row is held per friendship
+    and is overwritten in the same transaction as each new friendship status,
+    so the current state of a friendship is found by its primary key rather
+    than by the MAX(specified_date_time) of its status history.
+
+    The history itself remains in the friendship_status table.
+    """
+
+    __tablename__ = "current_friendship_status"
+
+    requester_id = Column(Integer, primary_key=True)
+    addressee_id = Column(Integer, primary_key=True)
+    status_code_id = Column(
+        String(1),
+        ForeignKey("friendship_status_code.status_code_id"),
+        nullable=False,
+    )
+    specifier_id = Column(Integer, ForeignKey("user.user_id"), nullable=False)
+    specified_date_time = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        ForeignKeyConstraint(
+            [requester_id, addressee_id],
+            ["friendship.requester_id", "friendship.addressee_id"],
+            ondelete="CASCADE",
+        ),
+        # serve the listings of a user's friendships of a given status from
+        # either side of the friendship.
+        Index(
+            "ix_current_friendship_status_requester",
+            requester_id,
+            status_code_id,
+            addressee_id,
+        ),
+        Index(
+            "ix_current_friendship_status_addressee",
+            addressee_id,
+            status_code_id,
+            requester_id,
+        ),
+    )
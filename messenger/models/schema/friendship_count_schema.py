@@ -0,0 +1,19 @@
+from sqlalchemy import Column, ForeignKey, Integer
+from messenger_schemas.schema import Base
+
+
+class FriendshipCountSchema(Base):
+    """The number of friends, and of unanswered friendship requests sent to
+    and by each user, such that they can be read without counting the
+    friendships of the user.
+
+    Counts are adjusted as friendship statuses change, see
+    messenger.helpers.friendship_counts.
+    """
+
+    __tablename__ = "friendship_count"
+
+    user_id = Column(Integer, ForeignKey("user.user_id"), primary_key=True)
+    friend_count = Column(Integer, nullable=False, default=0)
+    incoming_request_count = Column(Integer, nullable=False, default=0)
+    outgoing_request_count = Column(Integer, nullable=False, default=0)
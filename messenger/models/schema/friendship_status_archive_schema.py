@@ -0,0 +1,37 @@
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    ForeignKeyConstraint,
+    Integer,
+    String,
+)
+from messenger_schemas.schema import Base
+
+
+class FriendshipStatusArchiveSchema(Base):
+    """The friendship statuses that were superseded by a later status of
+    their friendship, moved out of the friendship_status table such that it
+    only holds the latest status of each friendship.
+
+    See messenger.helpers.friendship_status_archive.
+    """
+
+    __tablename__ = "friendship_status_archive"
+
+    requester_id = Column(Integer, primary_key=True)
+    addressee_id = Column(Integer, primary_key=True)
+    specified_date_time = Column(DateTime, primary_key=True)
+    status_code_id = Column(
+        String(1), ForeignKey("friendship_status_code.status_code_id")
+    )
+    specifier_id = Column(Integer, ForeignKey("user.user_id"))
+    archived_date_time = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        ForeignKeyConstraint(
+            [requester_id, addressee_id],
+            ["friendship.requester_id", "friendship.addressee_id"],
+            ondelete="CASCADE",
+        ),
+    )
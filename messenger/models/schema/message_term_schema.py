@@ -0,0 +1,22 @@
+from sqlalchemy import Column, ForeignKey, Integer, String
+from messenger_schemas.schema import Base
+from messenger.constants.message_search import MAX_TERM_LENGTH
+
+
+class MessageTermSchema(Base):
+    """The inverted index of the content of direct messages. Each term of a
+    message is held once for each of its participants, such that the
+    messages of a user that contain a term are found by the range of the
+    (user_id, term) prefix of the primary key.
+
+    Terms are indexed in the same transaction as the messages they are of,
+    see messenger.helpers.message_search.
+    """
+
+    __tablename__ = "message_term"
+
+    user_id = Column(Integer, ForeignKey("user.user_id"), primary_key=True)
+    term = Column(String(MAX_TERM_LENGTH), primary_key=True)
+    message_id = Column(
+        Integer, ForeignKey("message.message_id"), primary_key=True
+    )
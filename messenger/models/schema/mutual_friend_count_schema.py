@@ -0,0 +1,30 @@
+from sqlalchemy import Column, ForeignKey, Index, Integer
+from messenger_schemas.schema import Base
+
+
+class MutualFriendCountSchema(Base):
+    """The number of accepted friends two users have in common, for every
+    pair of users with at least one. Each pair is held in both directions so
+    the candidates of a user are found by the range of their user_id.
+
+    Counts are adjusted as friendships are accepted or stop being accepted,
+    see messenger.helpers.friend_suggestions.
+    """
+
+    __tablename__ = "mutual_friend_count"
+
+    user_id = Column(Integer, ForeignKey("user.user_id"), primary_key=True)
+    candidate_id = Column(
+        Integer, ForeignKey("user.user_id"), primary_key=True
+    )
+    mutual_friend_count = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        # serve the candidates of a user with the most mutual friends first.
+        Index(
+            "ix_mutual_friend_count_user_count",
+            user_id,
+            mutual_friend_count,
+            candidate_id,
+        ),
+    )
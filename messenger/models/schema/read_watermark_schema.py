@@ -0,0 +1,28 @@
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+)
+from messenger_schemas.schema import Base
+
+
+class ReadWatermarkSchema(Base):
+    """The last message of each direct conversation that a user has read.
+    Every message of the conversation up to and including it is read by the
+    user, such that reading a conversation is a single write however many
+    messages it has.
+
+    Whether a message is seen, and the unread counts of the conversation
+    summaries, are derived from the watermarks, see
+    messenger.helpers.read_watermarks.
+    """
+
+    __tablename__ = "read_watermark"
+
+    user_id = Column(Integer, ForeignKey("user.user_id"), primary_key=True)
+    partner_id = Column(Integer, ForeignKey("user.user_id"), primary_key=True)
+    last_read_message_id = Column(
+        Integer, ForeignKey("message.message_id"), nullable=False
+    )
+    read_date_time = Column(DateTime, nullable=False)
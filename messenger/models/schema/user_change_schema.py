@@ -0,0 +1,24 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from messenger_schemas.schema import Base
+
+
+class UserChangeSchema(Base):
+    """The changes of the conversations of each user, numbered by a sequence
+    that increases by one with every change of the user. The changes after a
+    sequence are found by the range of the primary key that follows it.
+
+    Changes are recorded in the same transaction as what they describe, see
+    messenger.helpers.change_log.
+    """
+
+    __tablename__ = "user_change"
+
+    user_id = Column(Integer, ForeignKey("user.user_id"), primary_key=True)
+    sequence = Column(Integer, primary_key=True, autoincrement=False)
+    # the value of a ChangeType.
+    change_type = Column(String(16), nullable=False)
+    partner_id = Column(Integer, ForeignKey("user.user_id"), nullable=False)
+    message_id = Column(
+        Integer, ForeignKey("message.message_id"), nullable=False
+    )
+    created_date_time = Column(DateTime, nullable=False)
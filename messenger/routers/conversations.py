@@ -0,0 +1,56 @@
+"""Contains routes for conversations."""
+
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Type
+from fastapi import APIRouter, Depends, status
+from pydantic import BaseModel
+from messenger.helpers.dependencies.pagination import (
+    async_cursor_pagination,
+)
+from messenger.helpers.dependencies.queries.query_conversations import (
+    async_query_conversations,
+)
+from messenger.helpers.dependencies.sparse_fields import sparse_model
+from messenger.helpers.get_model_columns import get_model_columns
+from messenger.helpers.paginated_response import paginated_response
+from messenger.models.fastapi.conversation_model import ConversationModel
+from messenger.models.fastapi.pagination_model import CursorPaginationModel
+
+
+router = APIRouter(
+    prefix="/conversations",
+    tags=["conversations"],
+    responses={status.HTTP_404_NOT_FOUND: {"description": "Not found"}},
+)
+
+
+@router.get(
+    "/",
+    response_model=CursorPaginationModel[ConversationModel],
+    status_code=status.HTTP_200_OK,
+)
+async def get_conversations(
+    pagination: Callable[..., Awaitable[CursorPaginationModel]] = Depends(
+        async_cursor_pagination
+    ),
+    conversations_table=Depends(async_query_conversations),
+    Model: Type[BaseModel] = Depends(sparse_model(ConversationModel)),
+):
+    """Retrieves the direct conversations of the current user, most recently
+    active first, along with their last message and the number of messages
+    the current user has not read.
+
+    Returns:
+        CursorPaginationModel[ConversationModel]: the conversations of the
+            current user.
+    """
+    cursor_pagination_model = await pagination(
+        conversations_table,
+        conversations_table.last_activity_date_time,
+        datetime.now() + timedelta(weeks=100),
+        False,
+        conversations_table.partner_id,
+        columns=get_model_columns(conversations_table, Model),
+    )
+
+    return paginated_response(Model, cursor_pagination_model)
@@ -2,11 +2,13 @@
 
 from datetime import datetime
 import logging
-from typing import Any, Callable, Optional, Type
+from typing import Awaitable, Callable, List, Optional, Type
 from bleach import clean
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import Column
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import BaseModel
+from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from messenger_schemas.schema import (
     database_session,
@@ -20,16 +22,21 @@ from messenger_schemas.schema.friendship_status_schema import (
 from messenger_schemas.schema.user_schema import (
     UserSchema,
 )
+from messenger.constants.friend_suggestions import (
+    DEFAULT_FRIEND_SUGGESTIONS,
+    MAX_FRIEND_SUGGESTIONS,
+)
 from messenger.constants.friendship_status_codes import FriendshipStatusCode
-from messenger.helpers.dependencies.pagination import cursor_pagination
+from messenger.helpers.dependencies.pagination import async_cursor_pagination
+from messenger.helpers.dependencies.sparse_fields import sparse_model
 from messenger.helpers.dependencies.queries.query_friends import (
-    query_friends,
+    async_query_friends,
 )
 from messenger.helpers.dependencies.queries.query_request_senders import (
-    query_request_senders,
+    async_query_request_senders,
 )
 from messenger.helpers.dependencies.queries.query_request_recievers import (
-    query_request_recievers,
+    async_query_request_recievers,
 )
 from messenger.helpers.handlers.friendship_handler import (
     FriendshipHandler,
@@ -37,12 +44,38 @@ from messenger.helpers.handlers.friendship_handler import (
 from messenger.helpers.address_friendship_request import (
     address_friendship_request_as_route,
 )
-from messenger.helpers.dependencies.user import get_current_active_user
+from messenger.helpers.bulk_friendship_actions import (
+    apply_bulk_friendship_action,
+)
+from messenger.helpers.dependencies.async_database import (
+    async_database_session,
+)
+from messenger.helpers.dependencies.user import (
+    async_get_current_active_user,
+    get_current_active_user,
+)
+from messenger.helpers.friend_cache import invalidate_friend_ids_on_commit
+from messenger.helpers.friend_suggestions import select_friend_suggestions
+from messenger.helpers.friendship_changes import register_friendship_change
+from messenger.helpers.get_model_columns import get_model_columns
 from messenger.helpers.handlers.user_handler import UserHandler
+from messenger.helpers.paginated_response import paginated_response
+from messenger.models.fastapi.bulk_friendship_model import (
+    BulkFriendshipActionModel,
+    BulkFriendshipResponseModel,
+)
+from messenger.models.fastapi.friendship_count_model import (
+    FriendshipCountModel,
+)
+from messenger.models.fastapi.friend_suggestion_model import (
+    FriendSuggestionModel,
+)
 from messenger.models.fastapi.friendship_model import FriendshipModel
 from messenger.models.fastapi.pagination_model import CursorPaginationModel
 from messenger.models.fastapi.user_model import PublicUserModel
-from messenger.constants.generics import T
+from messenger.models.schema.friendship_count_schema import (
+    FriendshipCountSchema,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -58,26 +91,21 @@ router = APIRouter(
     response_model=CursorPaginationModel[PublicUserModel],
     status_code=status.HTTP_200_OK,
 )
-def get_friends(
-    pagination: Callable[
-        [
-            Type[T],
-            Column,
-            Any,
-        ],
-        CursorPaginationModel,
-    ] = Depends(cursor_pagination),
-    friends_table=Depends(query_friends),
+async def get_friends(
+    pagination: Callable[..., Awaitable[CursorPaginationModel]] = Depends(
+        async_cursor_pagination
+    ),
+    friends_table=Depends(async_query_friends),
+    Model: Type[BaseModel] = Depends(sparse_model(PublicUserModel)),
 ):
-    cursor_pagination_model = pagination(
-        friends_table, friends_table.username, ""
+    cursor_pagination_model = await pagination(
+        friends_table,
+        friends_table.username,
+        "",
+        columns=get_model_columns(friends_table, Model),
     )
-    cursor_pagination_model.results = [
-        PublicUserModel.from_orm(friend_user)
-        for friend_user in cursor_pagination_model.results
-    ]
 
-    return cursor_pagination_model
+    return paginated_response(Model, cursor_pagination_model)
 
 
 @router.get(
@@ -85,16 +113,12 @@ def get_friends(
     status_code=status.HTTP_200_OK,
     response_model=CursorPaginationModel[PublicUserModel],
 )
-def get_friend_request_senders(
-    pagination: Callable[
-        [
-            Type[T],
-            Column,
-            Any,
-        ],
-        CursorPaginationModel,
-    ] = Depends(cursor_pagination),
-    friend_request_senders_table=Depends(query_request_senders),
+async def get_friend_request_senders(
+    pagination: Callable[..., Awaitable[CursorPaginationModel]] = Depends(
+        async_cursor_pagination
+    ),
+    friend_request_senders_table=Depends(async_query_request_senders),
+    Model: Type[BaseModel] = Depends(sparse_model(PublicUserModel)),
 ):
     """Retrieves all users that have sent friend requests to the current user and
     are unanswered.
@@ -106,15 +130,14 @@ def get_friend_request_senders(
     Returns:
         _type_: the friendship requests recieved, and those sent.
     """
-    cursor_pagination_model = pagination(
-        friend_request_senders_table, friend_request_senders_table.username, ""
+    cursor_pagination_model = await pagination(
+        friend_request_senders_table,
+        friend_request_senders_table.username,
+        "",
+        columns=get_model_columns(friend_request_senders_table, Model),
     )
-    cursor_pagination_model.results = [
-        PublicUserModel.from_orm(user)
-        for user in cursor_pagination_model.results
-    ]
 
-    return cursor_pagination_model
+    return paginated_response(Model, cursor_pagination_model)
 
 
 @router.get(
@@ -122,16 +145,12 @@ def get_friend_request_senders(
     status_code=status.HTTP_200_OK,
     response_model=CursorPaginationModel[PublicUserModel],
 )
-def get_friend_request_recievers(
-    pagination: Callable[
-        [
-            Type[T],
-            Column,
-            Any,
-        ],
-        CursorPaginationModel,
-    ] = Depends(cursor_pagination),
-    friend_request_recievers_table=Depends(query_request_recievers),
+async def get_friend_request_recievers(
+    pagination: Callable[..., Awaitable[CursorPaginationModel]] = Depends(
+        async_cursor_pagination
+    ),
+    friend_request_recievers_table=Depends(async_query_request_recievers),
+    Model: Type[BaseModel] = Depends(sparse_model(PublicUserModel)),
 ):
     """Retrieves all users that have recieved a friend request from the current
     user and have yet to answer.
@@ -143,17 +162,84 @@ def get_friend_request_recievers(
     Returns:
         _type_: the friendship requests recieved, and those sent.
     """
-    cursor_pagination_model = pagination(
+    cursor_pagination_model = await pagination(
         friend_request_recievers_table,
         friend_request_recievers_table.username,
         "",
+        columns=get_model_columns(friend_request_recievers_table, Model),
     )
-    cursor_pagination_model.results = [
-        PublicUserModel.from_orm(user)
-        for user in cursor_pagination_model.results
-    ]
 
-    return cursor_pagination_model
+    return paginated_response(Model, cursor_pagination_model)
+
+
+@router.get(
+    "/counts",
+    status_code=status.HTTP_200_OK,
+    response_model=FriendshipCountModel,
+)
+async def get_friendship_counts(
+    current_user: UserSchema = Depends(async_get_current_active_user),
+    db: AsyncSession = Depends(async_database_session),
+):
+    """Retrieves the number of friends of the current user, and of the
+    unanswered friendship requests sent to and by them.
+
+    Args:
+        current_user (UserSchema, optional): the current signed-in user
+            whose counts will be retrieved. Defaults to Depends(async_get_current_active_user).
+        db (AsyncSession, optional): the database session to read the counts
+            from. Defaults to Depends(async_database_session).
+
+    Returns:
+        FriendshipCountModel: the counts of the current user.
+    """
+    result = await db.execute(
+        select(FriendshipCountSchema).where(
+            FriendshipCountSchema.user_id == current_user.user_id
+        )
+    )
+    friendship_count = result.scalars().first()
+
+    if friendship_count is None:
+        return FriendshipCountModel()
+
+    return FriendshipCountModel.from_orm(friendship_count)
+
+
+@router.get(
+    "/suggestions",
+    status_code=status.HTTP_200_OK,
+    response_model=List[FriendSuggestionModel],
+)
+async def get_friend_suggestions(
+    limit: int = Query(
+        DEFAULT_FRIEND_SUGGESTIONS, ge=1, le=MAX_FRIEND_SUGGESTIONS
+    ),
+    current_user: UserSchema = Depends(async_get_current_active_user),
+    db: AsyncSession = Depends(async_database_session),
+):
+    """Retrieves the users the current user has the most mutual friends with,
+    excluding those with whom they already have a friendship of any status.
+
+    Args:
+        limit (int): the largest number of suggestions to retrieve.
+        current_user (UserSchema, optional): the current signed-in user
+            to suggest friends to. Defaults to Depends(async_get_current_active_user).
+        db (AsyncSession, optional): the database session to read the mutual
+            friend counts from. Defaults to Depends(async_database_session).
+
+    Returns:
+        List[FriendSuggestionModel]: the suggested users along with the number
+            of mutual friends they have with the current user.
+    """
+    suggestions = await db.execute(
+        select_friend_suggestions(current_user.user_id, limit)
+    )
+
+    return [
+        FriendSuggestionModel.from_orm(suggestion)
+        for suggestion in suggestions
+    ]
 
 
 @router.post(
@@ -188,9 +274,7 @@ def send_friendship_request(
         )
 
     addressee_handler = UserHandler(db)
-    addressee = addressee_handler.get_user(
-        UserSchema.username == clean(username),
-    )
+    addressee = addressee_handler.get_user_by_username(clean(username))
 
     friendship_handler = FriendshipHandler(db)
 
@@ -256,6 +340,7 @@ def send_friendship_request(
         )
 
         db.add(new_status)
+        friendship_handler.set_current_status(new_status)
         logger.info(
             "(requester: %s, addressee: %s, specified_date_time: %s, status_code_id: %s)\
             friendship status has been successfully inserted into the friendship_status table",
@@ -350,8 +435,8 @@ def block_friendship_request(
     friendship_handler = FriendshipHandler(db)
     user_to_block_handler = UserHandler(db)
 
-    user_to_block = user_to_block_handler.get_user(
-        UserSchema.username == clean(user_to_block_username)
+    user_to_block = user_to_block_handler.get_user_by_username(
+        clean(user_to_block_username)
     )
 
     friendship: Optional[FriendshipSchema] = None
@@ -402,6 +487,51 @@ def block_friendship_request(
     )
 
 
+@router.post(
+    "/requests/bulk",
+    response_model=BulkFriendshipResponseModel,
+    status_code=status.HTTP_200_OK,
+)
+def bulk_friendship_action(
+    body: BulkFriendshipActionModel,
+    current_user: UserSchema = Depends(get_current_active_user),
+    db: Session = Depends(database_session),
+):
+    """Accepts, declines or blocks the friendships of the current user with
+    many users at once. The users, friendships and statuses are loaded and
+    written in batches, and the new statuses are committed once.
+
+    Args:
+        body (BulkFriendshipActionModel): the usernames and the action to
+            apply to the friendship with each of them.
+        current_user (UserSchema, optional): The currently signed in user that
+            will be executing the action. Defaults to Depends(get_current_active_user).
+        db (Session, optional): the database session to use for database reads/writes.
+            Defaults to Depends(database_session).
+
+    Returns:
+        BulkFriendshipResponseModel: the status code and detail of the action
+            for each username, as its single friendship route would respond.
+    """
+    results = apply_bulk_friendship_action(
+        db, current_user.user_id, body.usernames, body.action
+    )
+
+    db.commit()
+
+    logger.info(
+        "(user_id: %s, action: %s) applied bulk friendship action to %s of %s users.",
+        current_user.user_id,
+        body.action.value,
+        sum(
+            result.status_code == status.HTTP_201_CREATED for result in results
+        ),
+        len(results),
+    )
+
+    return BulkFriendshipResponseModel(results=results)
+
+
 @router.delete("/requests", status_code=status.HTTP_200_OK)
 def delete_friendship_request(
     friend_username: str,
@@ -421,9 +551,7 @@ def delete_friendship_request(
     friendship_handler = FriendshipHandler(db)
     friend_handler = UserHandler(db)
 
-    friend = friend_handler.get_user(
-        UserSchema.username == clean(friend_username)
-    )
+    friend = friend_handler.get_user_by_username(clean(friend_username))
 
     friendship: Optional[FriendshipSchema] = None
 
@@ -434,10 +562,24 @@ def delete_friendship_request(
     except HTTPException:
         pass
 
+    current_status = friendship_handler.lock_current_status(
+        friendship.requester_id, friendship.addressee_id
+    )
+
     db.query(FriendshipSchema).filter(
         FriendshipSchema.addressee_id == friendship.addressee_id,
         FriendshipSchema.requester_id == friendship.requester_id,
     ).delete()
+    invalidate_friend_ids_on_commit(
+        db, friendship.requester_id, friendship.addressee_id
+    )
+    register_friendship_change(
+        db,
+        friendship.requester_id,
+        friendship.addressee_id,
+        None if current_status is None else current_status.status_code_id,
+        None,
+    )
 
     db.commit()
 
@@ -1,27 +1,62 @@
 """Contains routes for messages."""
 
 from datetime import timedelta, datetime
-from typing import Any, Callable, Optional, Type
-from sqlalchemy import Column
+from typing import Awaitable, Callable, Optional, Type
+from bleach import clean
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import BaseModel
 from messenger_schemas.schema import (
     database_session,
 )
+from messenger_schemas.schema.message_schema import (
+    MessageSchema,
+)
 from messenger_schemas.schema.user_schema import (
     UserSchema,
 )
-from messenger.constants.generics import T
-from messenger.helpers.dependencies.pagination import cursor_pagination
-from messenger.helpers.dependencies.queries.query_messages import query_messages
-from messenger.helpers.dependencies.user import get_current_active_user
+from messenger.constants.message_search import MAX_QUERY_TERMS
+from messenger.helpers.dependencies.async_database import (
+    async_database_session,
+)
+from messenger.helpers.dependencies.around_pagination import (
+    async_around_pagination,
+)
+from messenger.helpers.dependencies.pagination import (
+    async_cursor_pagination,
+)
+from messenger.helpers.dependencies.queries.query_message_search import (
+    async_query_message_search,
+)
+from messenger.helpers.dependencies.queries.query_messages import (
+    async_query_messages,
+)
+from messenger.helpers.dependencies.sparse_fields import sparse_model
+from messenger.helpers.dependencies.user import (
+    async_get_current_active_user,
+    get_current_active_user,
+)
+from messenger.helpers.get_model_columns import get_model_columns
+from messenger.helpers.handlers.async_user_handler import AsyncUserHandler
+from messenger.helpers.paginated_response import paginated_response
+from messenger.helpers.read_watermarks import (
+    async_get_seen_messages,
+    get_message_columns,
+    read_messages,
+)
 from messenger.helpers.send_message import send_message
 from messenger.models.fastapi.message_model import (
     BaseMessageModel,
     CreateMessageModel,
     MessageModel,
+    MessageSearchResultModel,
+    ReadMessagesModel,
+    ReadWatermarkModel,
 )
 from messenger.models.fastapi.pagination_model import CursorPaginationModel
+from messenger.sockets import sio
 
 
 router = APIRouter(
@@ -36,12 +71,12 @@ router = APIRouter(
     response_model=CursorPaginationModel[MessageModel],
     status_code=status.HTTP_200_OK,
 )
-def get_messages(
-    pagination: Callable[
-        [Type[T], Column, Any, bool],
-        CursorPaginationModel,
-    ] = Depends(cursor_pagination),
-    messages_table=Depends(query_messages),
+async def get_messages(
+    pagination: Callable[..., Awaitable[CursorPaginationModel]] = Depends(
+        async_cursor_pagination
+    ),
+    conversation_partitions=Depends(async_query_messages),
+    Model: Type[BaseModel] = Depends(sparse_model(MessageModel)),
 ):
     """Returns all messages this user has recieved.
 
@@ -53,19 +88,118 @@ def get_messages(
         CursorPaginationModel[MessageModel]: the messages this user has recieved
     """
 
-    cursor_pagination_model = pagination(
-        messages_table,
-        messages_table.created_date_time,
+    cursor_pagination_model = await pagination(
+        MessageSchema,
+        MessageSchema.created_date_time,
         datetime.now() + timedelta(weeks=100),
         False,
+        MessageSchema.message_id,
+        columns=get_message_columns(Model),
+        partitions=conversation_partitions,
     )
 
-    cursor_pagination_model.results = [
-        MessageModel.from_orm(message)
-        for message in cursor_pagination_model.results
-    ]
+    return paginated_response(Model, cursor_pagination_model)
 
-    return cursor_pagination_model
+
+@router.get(
+    "/search",
+    response_model=CursorPaginationModel[MessageSearchResultModel],
+    status_code=status.HTTP_200_OK,
+)
+async def search_messages(
+    pagination: Callable[..., Awaitable[CursorPaginationModel]] = Depends(
+        async_cursor_pagination
+    ),
+    search_table=Depends(async_query_message_search),
+    Model: Type[BaseModel] = Depends(sparse_model(MessageSearchResultModel)),
+):
+    """Searches the direct messages of the current user for the terms of a
+    query. The messages that contain the most of the terms come first, and
+    the most recent first of those that contain as many.
+
+    Returns:
+        CursorPaginationModel[MessageSearchResultModel]: the messages that
+            contain any of the terms.
+    """
+    cursor_pagination_model = await pagination(
+        search_table,
+        search_table.relevance,
+        MAX_QUERY_TERMS + 1,
+        False,
+        search_table.message_id,
+        columns=get_model_columns(search_table, Model),
+    )
+
+    return paginated_response(Model, cursor_pagination_model)
+
+
+@router.get(
+    "/around",
+    response_model=CursorPaginationModel[MessageModel],
+    status_code=status.HTTP_200_OK,
+)
+async def get_messages_around(
+    message_id: Optional[int] = None,
+    created_date_time: Optional[datetime] = None,
+    pagination: Callable[..., Awaitable[CursorPaginationModel]] = Depends(
+        async_around_pagination
+    ),
+    conversation_partitions=Depends(async_query_messages),
+    db: AsyncSession = Depends(async_database_session),
+):
+    """Returns the messages around an anchor, which is either a message or a
+    point in time, such that a client can jump into the message history.
+
+    The messages are ordered as they are by get_messages, thus the returned
+    cursors continue paginating from the anchor in either direction.
+
+    Args:
+        message_id (Optional[int]): the id of the message to anchor on.
+        created_date_time (Optional[datetime]): the point in time to anchor on.
+
+    Raises:
+        HTTPException: a 400 when not exactly one anchor is given.
+        HTTPException: a 404 when the message to anchor on is not of the
+            conversation.
+
+    Returns:
+        CursorPaginationModel[MessageModel]: the messages around the anchor.
+    """
+    if (message_id is None) == (created_date_time is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="either a message_id or created_date_time must be given",
+        )
+
+    if message_id is not None:
+        result = await db.execute(
+            select(MessageSchema.created_date_time).where(
+                MessageSchema.message_id == message_id,
+                or_(*conversation_partitions),
+            )
+        )
+        created_date_time = result.scalar_one_or_none()
+
+        if created_date_time is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="message was not found",
+            )
+
+    cursor_pagination_model = await pagination(
+        MessageSchema,
+        MessageSchema.created_date_time,
+        created_date_time,
+        False,
+        MessageSchema.message_id,
+        message_id,
+        partitions=conversation_partitions,
+    )
+    cursor_pagination_model.results = await async_get_seen_messages(
+        db, cursor_pagination_model.results
+    )
+
+    return paginated_response(MessageModel, cursor_pagination_model)
 
 
 @router.post(
@@ -93,5 +227,56 @@ def send_message_route(
         OKModel: whether the message was successfully sent
     """
     return send_message(
-        db, current_user, body.content, body.group_chat_id, addressee_username
+        db,
+        current_user.user_id,
+        body.content,
+        body.group_chat_id,
+        addressee_username,
+    )
+
+
+@router.post(
+    "/read",
+    response_model=ReadWatermarkModel,
+    status_code=status.HTTP_200_OK,
+)
+async def read_messages_route(
+    friend_username: str,
+    body: ReadMessagesModel,
+    current_user: UserSchema = Depends(async_get_current_active_user),
+    db: AsyncSession = Depends(async_database_session),
+):
+    """Marks the messages of the conversation with a friend as read, up to
+    and including the given message, then notifies the friend through a
+    "messages read" socket event.
+
+    Args:
+        friend_username (str): the username of the user the messages were
+            exchanged with.
+        body (ReadMessagesModel): the id of the last message read.
+        current_user (UserSchema, optional): the currently signed in user.
+            Defaults to Depends(async_get_current_active_user).
+        db (AsyncSession, optional): the async database session to use.
+            Defaults to Depends(async_database_session).
+
+    Returns:
+        ReadWatermarkModel: the last message of the conversation the current
+            user has read.
+    """
+    user_handler = AsyncUserHandler(db)
+    friend = await user_handler.get_user_by_username(clean(friend_username))
+
+    read_watermark = await read_messages(
+        db, current_user.user_id, friend.user_id, body.message_id
     )
+
+    await sio.emit(
+        "messages read",
+        {
+            "reader_username": current_user.username,
+            "read_watermark": read_watermark.json(),
+        },
+        to=friend.user_id,
+    )
+
+    return read_watermark
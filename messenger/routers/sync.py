@@ -0,0 +1,68 @@
+"""Contains routes for catching up on the changes of conversations."""
+
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from messenger_schemas.schema.user_schema import (
+    UserSchema,
+)
+from messenger.constants.sync import MAX_SYNC_LIMIT
+from messenger.helpers.change_log import select_changes
+from messenger.helpers.dependencies.async_database import (
+    async_database_session,
+)
+from messenger.helpers.dependencies.user import (
+    async_get_current_active_user,
+)
+from messenger.models.fastapi.sync_model import ChangeModel, SyncModel
+
+
+router = APIRouter(
+    prefix="/sync",
+    tags=["sync"],
+    responses={status.HTTP_404_NOT_FOUND: {"description": "Not found"}},
+)
+
+
+@router.get("/", response_model=SyncModel, status_code=status.HTTP_200_OK)
+async def sync_changes(
+    since: int = Query(
+        title="The last sequence the client has seen, or 0 for none",
+        ge=0,
+    ),
+    limit: int = Query(
+        title="The limit on the number of changes to retrieve",
+        gt=0,
+        le=MAX_SYNC_LIMIT,
+    ),
+    current_user: UserSchema = Depends(async_get_current_active_user),
+    db: AsyncSession = Depends(async_database_session),
+):
+    """Retrieves the changes of the conversations of the current user after
+    a sequence, in order, across every conversation. A client that
+    reconnects catches up by syncing from the last sequence it has seen,
+    then from the next_since of each response while has_more is true.
+
+    Args:
+        since (int): the last sequence the client has seen, or 0 for none.
+        limit (int): the number of changes to retrieve.
+        current_user (UserSchema, optional): the currently signed in user.
+            Defaults to Depends(async_get_current_active_user).
+        db (AsyncSession, optional): the async database session to query
+            from. Defaults to Depends(async_database_session).
+
+    Returns:
+        SyncModel: the changes after the sequence.
+    """
+    # one more change than the limit is selected so that the existence of
+    # further changes can be determined.
+    result = await db.execute(
+        select_changes(current_user.user_id, since, limit + 1)
+    )
+    rows = result.all()
+    changes = [ChangeModel.from_orm(row) for row in rows[:limit]]
+
+    return SyncModel(
+        changes=changes,
+        next_since=changes[-1].sequence if changes else since,
+        has_more=len(rows) > limit,
+    )
@@ -12,3 +12,16 @@ origins = [
     "http://localhost",
     "http://localhost:3000",
 ]
+
+# connection details of the MySQL database, used to create the async engine.
+RDS_ENDPOINT = os.environ["RDS_ENDPOINT"]
+RDS_PORT = int(os.environ["RDS_PORT"])
+RDS_DB_NAME = os.environ["RDS_DB_NAME"]
+RDS_USER = os.environ["RDS_USER"]
+RDS_PASSWORD = os.environ["RDS_PASSWORD"]
+RDS_POOL_SIZE = int(os.environ["RDS_POOL_SIZE"])
+RDS_MAX_OVERFLOW = int(os.environ["RDS_MAX_OVERFLOW"])
+
+# whether messages sent through the socket are written in batches by the
+# message writer, rather than each in its own transaction. Off unless enabled.
+USE_MESSAGE_WRITER = os.environ.get("USE_MESSAGE_WRITER", "false") == "true"
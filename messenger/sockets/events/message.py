@@ -1,8 +1,12 @@
+import asyncio
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from fastapi import HTTPException
 from messenger_schemas.schema import DatabaseSessionContext
-from messenger.helpers.send_message import send_message
+from messenger.helpers.message_writer import message_writer
+from messenger.helpers.send_message import authorize_message, send_message
+from messenger.models.fastapi.message_model import MessageModel
+from messenger.settings import USE_MESSAGE_WRITER
 from messenger.sockets import (
     sio,
 )
@@ -10,6 +14,45 @@ from messenger.sockets import (
 logger = logging.getLogger(__name__)
 
 
+def authorize_message_data(
+    current_user_id: int, data: Dict[str, Any]
+) -> Optional[int]:
+    """Authorizes the message of a message event within its own session,
+    producing the user_id of its addressee, if any."""
+    with DatabaseSessionContext() as db:
+        return authorize_message(
+            db,
+            current_user_id,
+            data["group_chat_id"],
+            data["addressee_username"],
+        )
+
+
+async def write_message(
+    current_user_id: int, data: Dict[str, Any]
+) -> MessageModel:
+    """Authorizes a message, then queues it with the message writer, which
+    answers once the batch it is inserted with commits.
+
+    The message is authorized with blocking queries, thus on a worker thread
+    so as not to stall the event loop.
+
+    Args:
+        current_user_id (int): the id of the user sending the message.
+        data (Dict[str, Any]): the data of the message event.
+    """
+    addressee_id = await asyncio.to_thread(
+        authorize_message_data, current_user_id, data
+    )
+
+    return await message_writer.write(
+        current_user_id,
+        addressee_id,
+        data["content"],
+        data["group_chat_id"],
+    )
+
+
 async def emit_message(sid, data: Dict[str, Any]):
     """Sends a message to a specific friend.
 
@@ -30,26 +73,30 @@ async def emit_message(sid, data: Dict[str, Any]):
         "group_chat_id", "addressee_username", and "message_tracker_id".
     """
     session = await sio.get_session(sid)
-    with DatabaseSessionContext() as db:
-        try:
-            message_model = send_message(
-                db,
-                session["user_id"],
-                data["content"],
-                data["group_chat_id"],
-                data["addressee_username"],
-            )
-        except HTTPException as exc:
-            await sio.emit(
-                "message response",
-                {
-                    "detail": exc.detail,
-                    "status_code": exc.status_code,
-                    "message_tracking_id": data["message_tracking_id"],
-                },
-                to=sid,
-            )
-            return
+
+    try:
+        if USE_MESSAGE_WRITER:
+            message_model = await write_message(session["user_id"], data)
+        else:
+            with DatabaseSessionContext() as db:
+                message_model = send_message(
+                    db,
+                    session["user_id"],
+                    data["content"],
+                    data["group_chat_id"],
+                    data["addressee_username"],
+                )
+    except HTTPException as exc:
+        await sio.emit(
+            "message response",
+            {
+                "detail": exc.detail,
+                "status_code": exc.status_code,
+                "message_tracking_id": data["message_tracking_id"],
+            },
+            to=sid,
+        )
+        return
 
     success_data = (
         {
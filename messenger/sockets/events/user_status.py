@@ -1,10 +1,7 @@
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, FrozenSet
 from messenger_schemas.schema import DatabaseSessionContext
-from messenger_schemas.schema.user_schema import UserSchema
 
-from messenger.helpers.dependencies.queries.query_friends import (
-    query_friends,
-)
+from messenger.helpers.friend_cache import friend_cache, get_friend_ids
 from messenger.helpers.pubsub.subscriber import Subscriber
 from messenger.models.socketio.connection_params import (
     OnConnectionParams,
@@ -24,25 +21,25 @@ from messenger.sockets.events.event_system import (
 
 def get_friendlist_ids(
     current_user_id: int,
-) -> List[Tuple[int,]]:
-    """Retrieves a list of ids of friendships accepted between
-        the current user and the friend using a context manager.
+) -> FrozenSet[int]:
+    """Retrieves the ids of the users with whom the current user has an
+        accepted friendship. A database session is only opened when the ids
+        are not cached.
 
     Args:
         current_user_id (int): the id of the current user
 
     Returns:
-        List[Tuple[int,]]: the ids of friendships accepted between
-        the current user and the friend.
+        FrozenSet[int]: the ids of the current user's friends.
     """
-    with DatabaseSessionContext() as db:
-        current_user = UserSchema(user_id=current_user_id)
-
-        friends_table = query_friends(current_user, db)
-        friend_ids = db.query(friends_table.user_id).all()
+    friend_ids = friend_cache.get(current_user_id)
 
+    if friend_ids is not None:
         return friend_ids
 
+    with DatabaseSessionContext() as db:
+        return get_friend_ids(db, current_user_id)
+
 
 async def emit_status_to_friends(_: str, current_user_id: int) -> None:
     """Emits to all active friends that the we are active.
@@ -54,7 +51,7 @@ async def emit_status_to_friends(_: str, current_user_id: int) -> None:
     friend_ids = get_friendlist_ids(current_user_id)
 
     # notify friends of your status change from offline to some custom status
-    for (friend_id,) in friend_ids:
+    for friend_id in friend_ids:
         await sio.emit(
             "ping status change",
             StatusChangeEventData(
@@ -105,7 +102,7 @@ async def on_disconnect_emit_user_status(
     # notify friends of your status change to offline
     session = await sio.get_session(connection_params.sid)
     friend_ids = get_friendlist_ids(session["user_id"])
-    for (friend_id,) in friend_ids:
+    for friend_id in friend_ids:
         await sio.emit(
             "ping status change",
             StatusChangeEventData(
@@ -5,6 +5,15 @@ from messenger_schemas.schema import (
 
 # import all the schemas as to load the Base with all the schema metadata
 import messenger_schemas.schema.schemas
+import messenger.models.schema.change_sequence_schema
+import messenger.models.schema.conversation_summary_schema
+import messenger.models.schema.current_friendship_status_schema
+import messenger.models.schema.friendship_count_schema
+import messenger.models.schema.friendship_status_archive_schema
+import messenger.models.schema.message_term_schema
+import messenger.models.schema.mutual_friend_count_schema
+import messenger.models.schema.read_watermark_schema
+import messenger.models.schema.user_change_schema
 from messenger_schemas.schema import engine
 
 TestingSessionLocal = sessionmaker(
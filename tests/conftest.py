@@ -1,5 +1,6 @@
 """Shared data/functions used during tests"""
 
+from fastapi.testclient import TestClient
 import pytest
 from sqlalchemy import event
 from sqlalchemy.orm import Session
@@ -7,9 +8,20 @@ from messenger_schemas.schema import engine
 from messenger_schemas.schema.friendship_status_code_schema import (
     FriendshipStatusCodeSchema,
 )
+from messenger_schemas.schema.user_schema import UserSchema
 from messenger.constants.friendship_status_codes import FriendshipStatusCode
+from messenger.fastApi import app
+from messenger.helpers.dependencies.async_database import (
+    async_database_session,
+)
+from messenger.helpers.dependencies.user import (
+    async_get_current_active_user,
+)
+from messenger.helpers.username_cache import username_cache
 from tests import TestingSessionLocal
 
+FROZEN_DATE = "2022-11-07"
+
 valid_passwords = [
     "Password231",
     "aValidpassword2",
@@ -109,6 +121,73 @@ def session():
     transaction.rollback()
     connection.close()
 
+    # the users of the test are rolled back, thus so must their usernames be.
+    username_cache.clear()
+
+
+class AsyncSessionAdapter:
+    """Exposes the awaitable methods of an AsyncSession over the sync
+    test session, so that async dependencies query within the same
+    savepoint as the rest of a test.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    async def execute(self, *args, **kwargs):
+        return self.session.execute(*args, **kwargs)
+
+    async def commit(self):
+        self.session.commit()
+
+    def get_bind(self, *args, **kwargs):
+        return self.session.get_bind(*args, **kwargs)
+
+
+@pytest.fixture
+def current_active_user(session: Session) -> UserSchema:
+    """Adds the user that the async_client is signed in as."""
+    user = UserSchema(
+        user_id=1,
+        username="test-username",
+        email="test-email",
+        password_hash="test-password-hash",
+    )
+
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+
+    return user
+
+
+@pytest.fixture
+def async_client(session: Session, current_active_user: UserSchema):
+    """Produces a test client whose async routes query within the test
+    session, signed in as the current_active_user.
+
+    Yields:
+        TestClient: the client to send requests with.
+    """
+
+    async def override_async_database_session():
+        yield AsyncSessionAdapter(session)
+
+    async def override_async_get_current_active_user():
+        return current_active_user
+
+    app.dependency_overrides[
+        async_get_current_active_user
+    ] = override_async_get_current_active_user
+    app.dependency_overrides[
+        async_database_session
+    ] = override_async_database_session
+
+    yield TestClient(app)
+
+    del app.dependency_overrides[async_database_session]
+    del app.dependency_overrides[async_get_current_active_user]
+
 
 def add_initial_friendship_status_codes(session: Session):
     """Test helper function that adds all the expected status codes
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Callable, List, Type
 from sqlalchemy.orm import Session
 from messenger_schemas.schema.message_schema import (
@@ -9,6 +9,7 @@ from messenger_schemas.schema.user_schema import (
 )
 from messenger.constants.generics import T
 from messenger.constants.pagination import CursorState
+from messenger.helpers.tokens.cursor_tokens import encode_cursor
 from tests.conftest import (
     generate_email,
     generate_username,
@@ -20,6 +21,9 @@ from tests.conftest import (
 # * the use of double digits or more.
 
 
+SHARED_CREATED_DATE_TIME = datetime(2022, 11, 7)
+
+
 def get_message_schema_params(message_id: int):
     return {
         "message_id": message_id,
@@ -28,6 +32,37 @@ def get_message_schema_params(message_id: int):
     }
 
 
+def get_shared_date_message_schema_params(message_id: int):
+    return {
+        "message_id": message_id,
+        "content": "content" + str(message_id),
+        "created_date_time": SHARED_CREATED_DATE_TIME,
+    }
+
+
+def get_paired_date_message_schema_params(message_id: int):
+    # pairs of consecutive messages share a created_date_time.
+    return {
+        "message_id": message_id,
+        "content": "content" + str(message_id),
+        "created_date_time": SHARED_CREATED_DATE_TIME
+        + timedelta(minutes=message_id // 2),
+    }
+
+
+def get_conversation_message_schema_params(message_id: int):
+    # messages alternate between being sent by user 1 to user 2, by user 2
+    # to user 1 and by user 1 to user 3, with every pair sharing a
+    # created_date_time.
+    sender_id, reciever_id = [(1, 2), (2, 1), (1, 3)][message_id % 3]
+
+    return {
+        **get_paired_date_message_schema_params(message_id),
+        "sender_id": sender_id,
+        "reciever_id": reciever_id,
+    }
+
+
 # Create parameters under the pretense that the unique column will
 # be made from one of get_..._params functions.
 # These params are passed too pytest.mark.parametrize.
@@ -38,31 +73,31 @@ paginate_next_when_last_page_test_params = (
         (
             UserSchema,
             UserSchema.username,
-            (CursorState.NEXT.value, generate_username(2)),
+            (CursorState.NEXT.value, (generate_username(2),)),
             2,
             4,
             get_user_schema_params,
-            CursorState.PREVIOUS.value + "___" + generate_username(3),
+            encode_cursor(CursorState.PREVIOUS.value, (generate_username(3),)),
             [3, 4],
         ),
         (
             MessageSchema,
             MessageSchema.message_id,
-            (CursorState.NEXT.value, "2"),
+            (CursorState.NEXT.value, (2,)),
             1,
             3,
             get_message_schema_params,
-            CursorState.PREVIOUS.value + "___3",
+            encode_cursor(CursorState.PREVIOUS.value, (3,)),
             [3],
         ),
         (
             UserSchema,
             UserSchema.email,
-            (CursorState.NEXT.value, generate_email(4)),
+            (CursorState.NEXT.value, (generate_email(4),)),
             2,
             5,
             get_user_schema_params,
-            CursorState.PREVIOUS.value + "___" + generate_email(5),
+            encode_cursor(CursorState.PREVIOUS.value, (generate_email(5),)),
             [5, 6],
         ),
     ],
@@ -77,37 +112,37 @@ when_first_page_test_params = (
         (
             UserSchema,
             UserSchema.username,
-            (CursorState.NEXT.value, ""),
+            (CursorState.NEXT.value, ()),
             2,
             4,
             get_user_schema_params,
-            CursorState.NEXT.value + "___" + generate_username(2),
+            encode_cursor(CursorState.NEXT.value, (generate_username(2),)),
             [1, 2],
         ),
         (
             MessageSchema,
             MessageSchema.message_id,
-            (CursorState.PREVIOUS.value, "2"),
+            (CursorState.PREVIOUS.value, (2,)),
             1,
             4,
             get_message_schema_params,
-            CursorState.NEXT.value + "___1",
+            encode_cursor(CursorState.NEXT.value, (1,)),
             [1],
         ),
         (
             UserSchema,
             UserSchema.email,
-            (CursorState.NEXT.value, ""),
+            (CursorState.NEXT.value, ()),
             5,
             9,
             get_user_schema_params,
-            CursorState.NEXT.value + "___" + generate_email(5),
+            encode_cursor(CursorState.NEXT.value, (generate_email(5),)),
             [1, 2, 3, 4, 5],
         ),
         (
             UserSchema,
             UserSchema.username,
-            (CursorState.NEXT.value, ""),
+            (CursorState.NEXT.value, ()),
             3,
             3,
             get_user_schema_params,
@@ -117,21 +152,21 @@ when_first_page_test_params = (
         (
             UserSchema,
             UserSchema.email,
-            (CursorState.PREVIOUS.value, generate_email(4)),
+            (CursorState.PREVIOUS.value, (generate_email(4),)),
             5,
             9,
             get_user_schema_params,
-            CursorState.NEXT.value + "___" + generate_email(3),
+            encode_cursor(CursorState.NEXT.value, (generate_email(3),)),
             [1, 2, 3],
         ),
         (
             UserSchema,
             UserSchema.email,
-            (CursorState.PREVIOUS.value, generate_email(6)),
+            (CursorState.PREVIOUS.value, (generate_email(6),)),
             5,
             9,
             get_user_schema_params,
-            CursorState.NEXT.value + "___" + generate_email(5),
+            encode_cursor(CursorState.NEXT.value, (generate_email(5),)),
             [1, 2, 3, 4, 5],
         ),
     ],
@@ -147,45 +182,45 @@ when_middle_page_test_params = (
         (
             UserSchema,
             UserSchema.username,
-            (CursorState.NEXT.value, generate_username(5)),
+            (CursorState.NEXT.value, (generate_username(5),)),
             3,
             10,
             get_user_schema_params,
-            CursorState.NEXT.value + "___" + generate_username(8),
-            CursorState.PREVIOUS.value + "___" + generate_username(6),
+            encode_cursor(CursorState.NEXT.value, (generate_username(8),)),
+            encode_cursor(CursorState.PREVIOUS.value, (generate_username(6),)),
             [6, 7, 8],
         ),
         (
             MessageSchema,
             MessageSchema.message_id,
-            (CursorState.PREVIOUS.value, "4"),
+            (CursorState.PREVIOUS.value, (4,)),
             2,
             5,
             get_message_schema_params,
-            CursorState.NEXT.value + "___3",
-            CursorState.PREVIOUS.value + "___2",
+            encode_cursor(CursorState.NEXT.value, (3,)),
+            encode_cursor(CursorState.PREVIOUS.value, (2,)),
             [2, 3],
         ),
         (
             UserSchema,
             UserSchema.email,
-            (CursorState.NEXT.value, generate_email(3)),
+            (CursorState.NEXT.value, (generate_email(3),)),
             5,
             14,
             get_user_schema_params,
-            CursorState.NEXT.value + "___" + generate_email(8),
-            CursorState.PREVIOUS.value + "___" + generate_email(4),
+            encode_cursor(CursorState.NEXT.value, (generate_email(8),)),
+            encode_cursor(CursorState.PREVIOUS.value, (generate_email(4),)),
             [4, 5, 6, 7, 8],
         ),
         (
             UserSchema,
             UserSchema.username,
-            (CursorState.PREVIOUS.value, generate_username(6)),
+            (CursorState.PREVIOUS.value, (generate_username(6),)),
             3,
             7,
             get_user_schema_params,
-            CursorState.NEXT.value + "___" + generate_username(5),
-            CursorState.PREVIOUS.value + "___" + generate_username(3),
+            encode_cursor(CursorState.NEXT.value, (generate_username(5),)),
+            encode_cursor(CursorState.PREVIOUS.value, (generate_username(3),)),
             [3, 4, 5],
         ),
     ],
@@ -235,26 +270,78 @@ null_cursors_test_params = (
     ],
 )
 
+# messages all share a created_date_time and are paginated
+# on created_date_time with message_id as the tiebreaker.
+composite_cursor_test_params = (
+    "limit, records_to_create, order_asc, default_column_value",
+    [
+        (2, 5, True, datetime(1970, 1, 1)),
+        (3, 9, True, datetime(1970, 1, 1)),
+        (2, 5, False, datetime(3000, 1, 1)),
+        (4, 7, False, datetime(3000, 1, 1)),
+        (1, 3, False, datetime(3000, 1, 1)),
+    ],
+)
+
+
+def tamper_cursor(cursor: str, index: int = 4) -> str:
+    """Changes a single character of a cursor."""
+    character = "B" if cursor[index] == "A" else "A"
+
+    return cursor[:index] + character + cursor[index + 1 :]
+
+
+invalid_composite_column_values = [
+    (SHARED_CREATED_DATE_TIME,),
+    (12,),
+    (SHARED_CREATED_DATE_TIME, 12, 13),
+    (SHARED_CREATED_DATE_TIME, "not_an_id"),
+    ("not_a_date", 12),
+    (12, SHARED_CREATED_DATE_TIME),
+]
+
 incorrect_parsed_cursors = [
-    ("awds", ""),
-    ("incorrect", "values"),
-    ("___", "username"),
-    ("", ""),
+    ("awds", ()),
+    ("incorrect", ("values",)),
+    ("___", ("username",)),
+    ("", ()),
+]
+
+invalid_column_values = [
+    (12,),
+    (SHARED_CREATED_DATE_TIME,),
+    ("username", "username"),
 ]
 
-invalid_cursors = ["incorrect", "not__valid", "hu_oh", "ping pong", ""]
+invalid_cursors = [
+    "incorrect",
+    "not__valid",
+    "hu_oh",
+    "ping pong",
+    "",
+    CursorState.NEXT.value + "___username23",
+    tamper_cursor(encode_cursor(CursorState.NEXT.value, ("username23",))),
+    # a valid cursor that was truncated.
+    encode_cursor(CursorState.NEXT.value, ("username23",))[:-4],
+]
 valid_cursor_params = [
     (
-        CursorState.NEXT.value + "___username23",
-        (CursorState.NEXT.value, "username23"),
+        encode_cursor(CursorState.NEXT.value, ("username23",)),
+        (CursorState.NEXT.value, ("username23",)),
     ),
     (
-        CursorState.PREVIOUS.value + "___somecolumnvalue",
-        (CursorState.PREVIOUS.value, "somecolumnvalue"),
+        encode_cursor(CursorState.PREVIOUS.value, ("somecolumnvalue",)),
+        (CursorState.PREVIOUS.value, ("somecolumnvalue",)),
     ),
     (
-        CursorState.NEXT.value + "___a_valid_value",
-        (CursorState.NEXT.value, "a_valid_value"),
+        encode_cursor(CursorState.NEXT.value, (12,)),
+        (CursorState.NEXT.value, (12,)),
+    ),
+    (
+        encode_cursor(
+            CursorState.NEXT.value, (datetime(2022, 11, 7, 0, 0, 0, 12), 12)
+        ),
+        (CursorState.NEXT.value, (datetime(2022, 11, 7, 0, 0, 0, 12), 12)),
     ),
 ]
 
@@ -280,3 +367,20 @@ def add_schemas(
     session.commit()
 
     return expected_results
+
+
+# messages are created with get_paired_date_message_schema_params and
+# ordered newest first, thus the ids are ordered descending.
+around_anchor_test_params = (
+    """limit, anchor_message_id, anchor_minutes, records_to_create,
+        expected_result_ids, expected_prev_id, expected_next_id""",
+    [
+        (2, 5, None, 9, [7, 6, 5, 4, 3], 7, 3),
+        (2, 9, None, 9, [9, 8, 7], None, 7),
+        (2, 1, None, 9, [3, 2, 1], 3, None),
+        (3, 4, None, 5, [5, 4, 3, 2, 1], None, None),
+        (2, None, 2, 9, [7, 6, 5, 4, 3], 7, 3),
+        (2, None, 2.5, 9, [7, 6, 5, 4, 3], 7, 3),
+        (1, None, 10, 9, [9, 8], None, 8),
+    ],
+)
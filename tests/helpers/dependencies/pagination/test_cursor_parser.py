@@ -1,8 +1,11 @@
-from typing import Tuple
+from typing import Any, Tuple
 from fastapi import HTTPException
 import pytest
 from messenger.constants.pagination import CursorState
-from messenger.helpers.dependencies.pagination import cursor_parser
+from messenger.helpers.dependencies.pagination import (
+    async_cursor_parser,
+    cursor_parser,
+)
 from tests.helpers.dependencies.pagination.conftest import (
     invalid_cursors,
     valid_cursor_params,
@@ -11,10 +14,10 @@ from tests.helpers.dependencies.pagination.conftest import (
 
 class TestCursorParser:
     def test_when_curser_is_none_paginates_first_page(self):
-        cursor_state, column_value = cursor_parser()
+        cursor_state, column_values = cursor_parser()
 
         assert cursor_state == CursorState.NEXT.value
-        assert column_value == ""
+        assert column_values == ()
 
     @pytest.mark.parametrize("invalid_cursor", invalid_cursors)
     def test_raise_when_cursor_is_invalid(self, invalid_cursor: str):
@@ -27,8 +30,34 @@ class TestCursorParser:
         "valid_cursor, expected_parsed_cursor", valid_cursor_params
     )
     def test_parses_valid_cursor_correctly(
-        self, valid_cursor: str, expected_parsed_cursor: Tuple[str, str]
+        self,
+        valid_cursor: str,
+        expected_parsed_cursor: Tuple[str, Tuple[Any, ...]],
     ):
         parsed_cursor = cursor_parser(valid_cursor)
 
         assert parsed_cursor == expected_parsed_cursor
+
+
+class TestAsyncCursorParser:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "valid_cursor, expected_parsed_cursor", valid_cursor_params
+    )
+    async def test_parses_as_cursor_parser(
+        self,
+        valid_cursor: str,
+        expected_parsed_cursor: Tuple[str, Tuple[Any, ...]],
+    ):
+        assert (
+            await async_cursor_parser(valid_cursor) == expected_parsed_cursor
+        )
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("invalid_cursor", invalid_cursors)
+    async def test_raise_when_cursor_is_invalid(self, invalid_cursor: str):
+        with pytest.raises(HTTPException) as exc:
+            await async_cursor_parser(invalid_cursor)
+
+        assert exc.value.status_code == 400
+        assert exc.value.detail == "invalid cursor"
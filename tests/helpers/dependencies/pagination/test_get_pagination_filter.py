@@ -1,24 +1,66 @@
-from typing import Tuple
+from typing import Any, Tuple
 from fastapi import HTTPException
 import pytest
+from messenger_schemas.schema.message_schema import (
+    MessageSchema,
+)
 from messenger_schemas.schema.user_schema import (
     UserSchema,
 )
+from messenger.constants.pagination import CursorState
 from messenger.helpers.dependencies.pagination import get_pagination_filter
 from tests.helpers.dependencies.pagination.conftest import (
     incorrect_parsed_cursors,
+    invalid_column_values,
+    invalid_composite_column_values,
 )
 
 
 class TestGetPaginationFilter:
     @pytest.mark.parametrize("invalid_parsed_cursor", incorrect_parsed_cursors)
     def test_raises_when_cursor_state_invalid(
-        self, invalid_parsed_cursor: Tuple[str, str]
+        self, invalid_parsed_cursor: Tuple[str, Tuple[Any, ...]]
+    ):
+        cursor_state, column_values = invalid_parsed_cursor
+        with pytest.raises(HTTPException) as exc:
+            get_pagination_filter(
+                True, UserSchema.username, cursor_state, column_values, ""
+            )
+
+        assert exc.value.status_code == 400
+        assert exc.value.detail == "invalid cursor"
+
+    @pytest.mark.parametrize(
+        "invalid_column_value", invalid_composite_column_values
+    )
+    def test_raises_when_composite_column_value_invalid(
+        self, invalid_column_value: Tuple[Any, ...]
     ):
-        cursor_state, column_value = invalid_parsed_cursor
         with pytest.raises(HTTPException) as exc:
             get_pagination_filter(
-                True, UserSchema.username, cursor_state, column_value, ""
+                False,
+                MessageSchema.created_date_time,
+                CursorState.NEXT.value,
+                invalid_column_value,
+                "",
+                MessageSchema.message_id,
             )
-            assert exc.value.status_code == 400
-            assert exc.value.detail == "invalid cursor"
+
+        assert exc.value.status_code == 400
+        assert exc.value.detail == "invalid cursor"
+
+    @pytest.mark.parametrize("invalid_column_value", invalid_column_values)
+    def test_raises_when_column_value_invalid(
+        self, invalid_column_value: Tuple[Any, ...]
+    ):
+        with pytest.raises(HTTPException) as exc:
+            get_pagination_filter(
+                True,
+                UserSchema.username,
+                CursorState.NEXT.value,
+                invalid_column_value,
+                "",
+            )
+
+        assert exc.value.status_code == 400
+        assert exc.value.detail == "invalid cursor"
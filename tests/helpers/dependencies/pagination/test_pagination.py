@@ -1,15 +1,34 @@
-from typing import List, Optional, Tuple, Type, Callable
+from datetime import datetime, timedelta
+from typing import Any, List, Optional, Tuple, Type, Callable
 from fastapi import HTTPException
 import pytest
-from sqlalchemy import Column
+from sqlalchemy import Column, and_
 from sqlalchemy.orm import Session
+from messenger_schemas.schema.message_schema import (
+    MessageSchema,
+)
 from messenger_schemas.schema.user_schema import (
     UserSchema,
 )
 from messenger.constants.pagination import CursorState
 from messenger.constants.generics import T
-from messenger.helpers.dependencies.pagination import cursor_pagination
+from messenger.helpers.dependencies.around_pagination import (
+    async_around_pagination,
+)
+from messenger.helpers.dependencies.pagination import (
+    async_cursor_pagination,
+    cursor_parser,
+)
+from messenger.helpers.tokens.cursor_tokens import encode_cursor
+from messenger.models.fastapi.pagination_model import CursorPaginationModel
+from tests.conftest import AsyncSessionAdapter, get_user_schema_params
 from tests.helpers.dependencies.pagination.conftest import (
+    SHARED_CREATED_DATE_TIME,
+    around_anchor_test_params,
+    get_conversation_message_schema_params,
+    get_paired_date_message_schema_params,
+    composite_cursor_test_params,
+    get_shared_date_message_schema_params,
     null_cursors_test_params,
     paginate_next_when_last_page_test_params,
     when_middle_page_test_params,
@@ -19,12 +38,30 @@ from tests.helpers.dependencies.pagination.conftest import (
 )
 
 
+async def paginate(
+    limit: int,
+    parsed_cursor: Tuple[str, Tuple[Any, ...]],
+    session: Session,
+    *args,
+    pages: int = 1,
+    **kwargs,
+) -> CursorPaginationModel:
+    """Paginates within the test session as async_cursor_pagination does for
+    a route."""
+    pagination = await async_cursor_pagination(
+        limit, parsed_cursor, AsyncSessionAdapter(session), pages
+    )
+
+    return await pagination(*args, **kwargs)
+
+
 class TestCursorPaginationQuery:
+    @pytest.mark.asyncio
     @pytest.mark.parametrize(
         null_cursors_test_params[0],
         null_cursors_test_params[1],
     )
-    def test_paginating_first_and_last_page_returns_null_cursors(
+    async def test_paginating_first_and_last_page_returns_null_cursors(
         self,
         table: Type[T],
         unique_column: Column,
@@ -45,24 +82,25 @@ class TestCursorPaginationQuery:
         # the only case where the client can paginate the first
         # and last page, is when given a next cursor of None
         # thus the cursor state is set to next, and value is "".
-        pagination = cursor_pagination(
-            limit, (CursorState.NEXT.value, ""), session
+        pagination = await async_cursor_pagination(
+            limit, (CursorState.NEXT.value, ""), AsyncSessionAdapter(session)
         )
-        pagination_model = pagination(table, unique_column, "")
+        pagination_model = await pagination(table, unique_column, "")
 
         assert pagination_model.cursor.prev_page is None
         assert pagination_model.cursor.next_page is None
         assert pagination_model.results == expected_results
 
+    @pytest.mark.asyncio
     @pytest.mark.parametrize(
         paginate_next_when_last_page_test_params[0],
         paginate_next_when_last_page_test_params[1],
     )
-    def test_paginating_next_when_last_page(
+    async def test_paginating_next_when_last_page(
         self,
         table: Type[T],
         unique_column: Column,
-        parsed_cursor: Tuple[str, str],
+        parsed_cursor: Tuple[str, Tuple[Any, ...]],
         limit: int,
         records_to_create: int,
         get_table_params: Callable[[int], dict],
@@ -78,22 +116,25 @@ class TestCursorPaginationQuery:
             expected_result_ids,
         )
 
-        pagination = cursor_pagination(limit, parsed_cursor, session)
-        pagination_model = pagination(table, unique_column, "")
+        pagination = await async_cursor_pagination(
+            limit, parsed_cursor, AsyncSessionAdapter(session)
+        )
+        pagination_model = await pagination(table, unique_column, "")
 
         assert pagination_model.cursor.next_page is None
         assert pagination_model.cursor.prev_page == expected_prev_cursor
         assert pagination_model.results == expected_results
 
+    @pytest.mark.asyncio
     @pytest.mark.parametrize(
         when_middle_page_test_params[0],
         when_middle_page_test_params[1],
     )
-    def test_paginating_next_or_prev_when_middle_page(
+    async def test_paginating_next_or_prev_when_middle_page(
         self,
         table: Type[T],
         unique_column: Column,
-        parsed_cursor: Tuple[str, str],
+        parsed_cursor: Tuple[str, Tuple[Any, ...]],
         limit: int,
         records_to_create: int,
         get_table_params: Callable[[int], dict],
@@ -110,22 +151,25 @@ class TestCursorPaginationQuery:
             expected_result_ids,
         )
 
-        pagination = cursor_pagination(limit, parsed_cursor, session)
-        pagination_model = pagination(table, unique_column, "")
+        pagination = await async_cursor_pagination(
+            limit, parsed_cursor, AsyncSessionAdapter(session)
+        )
+        pagination_model = await pagination(table, unique_column, "")
 
         assert pagination_model.cursor.next_page == expected_next_cursor
         assert pagination_model.cursor.prev_page == expected_prev_cursor
         assert pagination_model.results == expected_results
 
+    @pytest.mark.asyncio
     @pytest.mark.parametrize(
         when_first_page_test_params[0],
         when_first_page_test_params[1],
     )
-    def test_paginating_next_or_prev_when_first_page(
+    async def test_paginating_next_or_prev_when_first_page(
         self,
         table: Type[T],
         unique_column: Column,
-        parsed_cursor: Tuple[str, str],
+        parsed_cursor: Tuple[str, Tuple[Any, ...]],
         limit: int,
         records_to_create: int,
         get_table_params: Callable[[int], dict],
@@ -141,41 +185,613 @@ class TestCursorPaginationQuery:
             expected_result_ids,
         )
 
-        pagination = cursor_pagination(limit, parsed_cursor, session)
-        pagination_model = pagination(table, unique_column, "")
+        pagination = await async_cursor_pagination(
+            limit, parsed_cursor, AsyncSessionAdapter(session)
+        )
+        pagination_model = await pagination(table, unique_column, "")
 
         assert pagination_model.cursor.next_page == expected_next_cursor
         assert pagination_model.cursor.prev_page is None
 
         assert pagination_model.results == expected_results
 
+    @pytest.mark.asyncio
     @pytest.mark.parametrize("limit", [1, 2, 12, 52, 7, 12])
-    def test_paginating_when_no_results(
+    async def test_paginating_when_no_results(
         self,
         limit: int,
         session: Session,
     ):
-        pagination = cursor_pagination(
-            limit, (CursorState.NEXT.value, ""), session
+        pagination = await async_cursor_pagination(
+            limit, (CursorState.NEXT.value, ""), AsyncSessionAdapter(session)
+        )
+        pagination_model = await pagination(
+            UserSchema, UserSchema.username, ""
         )
-        pagination_model = pagination(UserSchema, UserSchema.username, "")
 
         assert pagination_model.cursor.next_page is None
         assert pagination_model.cursor.prev_page is None
         assert pagination_model.results == []
 
+    @pytest.mark.asyncio
     @pytest.mark.parametrize(
         "incorrect_parsed_cursor", incorrect_parsed_cursors
     )
-    def test_raises_exception_with_incorrect_cursor_format(
+    async def test_raises_exception_with_incorrect_cursor_format(
         self,
-        incorrect_parsed_cursor: Tuple[str, str],
+        incorrect_parsed_cursor: Tuple[str, Tuple[Any, ...]],
         session: Session,
     ):
-        pagination = cursor_pagination(1, incorrect_parsed_cursor, session)
+        pagination = await async_cursor_pagination(
+            1, incorrect_parsed_cursor, AsyncSessionAdapter(session)
+        )
 
         with pytest.raises(HTTPException) as exc:
-            pagination(UserSchema, UserSchema.username, "")
+            await pagination(UserSchema, UserSchema.username, "")
 
             assert exc.value.status_code == 400
             assert exc.value.detail == "invalid cursor"
+
+
+class TestCompositeCursorPagination:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        composite_cursor_test_params[0],
+        composite_cursor_test_params[1],
+    )
+    async def test_paginating_next_visits_each_record_once(
+        self,
+        limit: int,
+        records_to_create: int,
+        order_asc: bool,
+        default_column_value: datetime,
+        session: Session,
+    ):
+        add_schemas(
+            MessageSchema,
+            records_to_create,
+            get_shared_date_message_schema_params,
+            session,
+            [],
+        )
+
+        paginated_ids: List[int] = []
+        cursor: Optional[str] = None
+
+        while True:
+            pagination = await async_cursor_pagination(
+                limit, cursor_parser(cursor), AsyncSessionAdapter(session)
+            )
+            pagination_model = await pagination(
+                MessageSchema,
+                MessageSchema.created_date_time,
+                default_column_value,
+                order_asc,
+                MessageSchema.message_id,
+            )
+            paginated_ids.extend(
+                message.message_id for message in pagination_model.results
+            )
+
+            if pagination_model.cursor.next_page is None:
+                break
+
+            cursor = pagination_model.cursor.next_page
+
+        expected_ids = list(range(1, records_to_create + 1))
+
+        assert paginated_ids == (
+            expected_ids if order_asc else expected_ids[::-1]
+        )
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        composite_cursor_test_params[0],
+        composite_cursor_test_params[1],
+    )
+    async def test_paginating_prev_returns_previous_page(
+        self,
+        limit: int,
+        records_to_create: int,
+        order_asc: bool,
+        default_column_value: datetime,
+        session: Session,
+    ):
+        add_schemas(
+            MessageSchema,
+            records_to_create,
+            get_shared_date_message_schema_params,
+            session,
+            [],
+        )
+
+        first_page = await paginate(
+            limit,
+            cursor_parser(None),
+            session,
+            MessageSchema,
+            MessageSchema.created_date_time,
+            default_column_value,
+            order_asc,
+            MessageSchema.message_id,
+        )
+        second_page = await paginate(
+            limit,
+            cursor_parser(first_page.cursor.next_page),
+            session,
+            MessageSchema,
+            MessageSchema.created_date_time,
+            default_column_value,
+            order_asc,
+            MessageSchema.message_id,
+        )
+        previous_page = await paginate(
+            limit,
+            cursor_parser(second_page.cursor.prev_page),
+            session,
+            MessageSchema,
+            MessageSchema.created_date_time,
+            default_column_value,
+            order_asc,
+            MessageSchema.message_id,
+        )
+
+        assert previous_page.results == first_page.results
+        assert previous_page.cursor.prev_page is None
+        assert previous_page.cursor.next_page == first_page.cursor.next_page
+
+
+class TestProjectionCursorPagination:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "limit, records_to_create", [(2, 4), (3, 3), (5, 2)]
+    )
+    async def test_results_only_hold_projected_and_cursor_columns(
+        self,
+        limit: int,
+        records_to_create: int,
+        session: Session,
+    ):
+        add_schemas(
+            UserSchema,
+            records_to_create,
+            get_user_schema_params,
+            session,
+            [],
+        )
+
+        pagination = await async_cursor_pagination(
+            limit, (CursorState.NEXT.value, ""), AsyncSessionAdapter(session)
+        )
+        pagination_model = await pagination(
+            UserSchema, UserSchema.username, "", columns=[UserSchema.user_id]
+        )
+
+        assert [row.user_id for row in pagination_model.results] == list(
+            range(1, min(limit, records_to_create) + 1)
+        )
+
+        for row in pagination_model.results:
+            assert not isinstance(row, UserSchema)
+            assert set(row._fields) == {"user_id", "username"}
+
+
+class TestPrefetchedCursorPagination:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "limit, pages, records_to_create",
+        [(2, 3, 9), (3, 2, 6), (2, 4, 5), (4, 3, 2), (2, 2, 0)],
+    )
+    async def test_next_pages_match_sequential_pagination(
+        self,
+        limit: int,
+        pages: int,
+        records_to_create: int,
+        session: Session,
+    ):
+        add_schemas(
+            UserSchema,
+            records_to_create,
+            get_user_schema_params,
+            session,
+            [],
+        )
+
+        prefetched_model = await paginate(
+            limit,
+            cursor_parser(None),
+            session,
+            UserSchema,
+            UserSchema.user_id,
+            0,
+            pages=pages,
+        )
+
+        sequential_models = []
+        cursor = None
+
+        for _ in range(pages):
+            pagination_model = await paginate(
+                limit,
+                cursor_parser(cursor),
+                session,
+                UserSchema,
+                UserSchema.user_id,
+                0,
+            )
+            sequential_models.append(pagination_model)
+
+            cursor = pagination_model.cursor.next_page
+
+            if cursor is None:
+                break
+
+        assert prefetched_model.results == [
+            result
+            for pagination_model in sequential_models
+            for result in pagination_model.results
+        ]
+        assert [page.cursor for page in prefetched_model.pages] == [
+            pagination_model.cursor for pagination_model in sequential_models
+        ]
+        assert [page.size for page in prefetched_model.pages] == [
+            len(pagination_model.results)
+            for pagination_model in sequential_models
+        ]
+        assert prefetched_model.cursor.prev_page is None
+        assert (
+            prefetched_model.cursor.next_page
+            == sequential_models[-1].cursor.next_page
+        )
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "limit, pages, records_to_create",
+        [(2, 3, 9), (3, 2, 6), (2, 4, 5), (4, 3, 2)],
+    )
+    async def test_prev_pages_match_sequential_pagination(
+        self,
+        limit: int,
+        pages: int,
+        records_to_create: int,
+        session: Session,
+    ):
+        add_schemas(
+            UserSchema,
+            records_to_create,
+            get_user_schema_params,
+            session,
+            [],
+        )
+
+        # points after the last record, so that every record is previous.
+        parsed_cursor = (
+            CursorState.PREVIOUS.value,
+            (records_to_create + 1,),
+        )
+
+        prefetched_model = await paginate(
+            limit,
+            parsed_cursor,
+            session,
+            UserSchema,
+            UserSchema.user_id,
+            0,
+            pages=pages,
+        )
+
+        sequential_models = []
+
+        for _ in range(pages):
+            pagination_model = await paginate(
+                limit,
+                parsed_cursor,
+                session,
+                UserSchema,
+                UserSchema.user_id,
+                0,
+            )
+            sequential_models.insert(0, pagination_model)
+
+            if pagination_model.cursor.prev_page is None:
+                break
+
+            parsed_cursor = cursor_parser(pagination_model.cursor.prev_page)
+
+        assert prefetched_model.results == [
+            result
+            for pagination_model in sequential_models
+            for result in pagination_model.results
+        ]
+        assert [page.cursor for page in prefetched_model.pages] == [
+            pagination_model.cursor for pagination_model in sequential_models
+        ]
+        assert (
+            prefetched_model.cursor.prev_page
+            == sequential_models[0].cursor.prev_page
+        )
+        assert (
+            prefetched_model.cursor.next_page
+            == sequential_models[-1].cursor.next_page
+        )
+
+    @pytest.mark.asyncio
+    async def test_single_page_has_no_pages(self, session: Session):
+        add_schemas(UserSchema, 3, get_user_schema_params, session, [])
+
+        pagination_model = await paginate(
+            2, cursor_parser(None), session, UserSchema, UserSchema.user_id, 0
+        )
+
+        assert pagination_model.pages is None
+
+
+def get_paired_date_message_created_date_time(message_id: int) -> datetime:
+    return get_paired_date_message_schema_params(message_id)[
+        "created_date_time"
+    ]
+
+
+def get_paired_date_message_cursor(cursor_state: str, message_id: int) -> str:
+    return encode_cursor(
+        cursor_state,
+        (get_paired_date_message_created_date_time(message_id), message_id),
+    )
+
+
+class TestAroundPagination:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        around_anchor_test_params[0], around_anchor_test_params[1]
+    )
+    async def test_retrieves_records_around_anchor(
+        self,
+        limit: int,
+        anchor_message_id: Optional[int],
+        anchor_minutes: Optional[float],
+        records_to_create: int,
+        expected_result_ids: List[int],
+        expected_prev_id: Optional[int],
+        expected_next_id: Optional[int],
+        session: Session,
+    ):
+        add_schemas(
+            MessageSchema,
+            records_to_create,
+            get_paired_date_message_schema_params,
+            session,
+            [],
+        )
+
+        anchor_value = (
+            get_paired_date_message_created_date_time(anchor_message_id)
+            if anchor_minutes is None
+            else SHARED_CREATED_DATE_TIME + timedelta(minutes=anchor_minutes)
+        )
+
+        pagination = await async_around_pagination(
+            limit, AsyncSessionAdapter(session)
+        )
+        pagination_model = await pagination(
+            MessageSchema,
+            MessageSchema.created_date_time,
+            anchor_value,
+            False,
+            MessageSchema.message_id,
+            anchor_message_id,
+        )
+
+        assert [
+            message.message_id for message in pagination_model.results
+        ] == expected_result_ids
+        assert pagination_model.cursor.prev_page == (
+            None
+            if expected_prev_id is None
+            else get_paired_date_message_cursor(
+                CursorState.PREVIOUS.value, expected_prev_id
+            )
+        )
+        assert pagination_model.cursor.next_page == (
+            None
+            if expected_next_id is None
+            else get_paired_date_message_cursor(
+                CursorState.NEXT.value, expected_next_id
+            )
+        )
+
+    @pytest.mark.asyncio
+    async def test_cursors_continue_pagination(self, session: Session):
+        add_schemas(
+            MessageSchema,
+            9,
+            get_paired_date_message_schema_params,
+            session,
+            [],
+        )
+
+        pagination = await async_around_pagination(
+            2, AsyncSessionAdapter(session)
+        )
+        around_model = await pagination(
+            MessageSchema,
+            MessageSchema.created_date_time,
+            get_paired_date_message_created_date_time(5),
+            False,
+            MessageSchema.message_id,
+            5,
+        )
+
+        pages = [
+            await paginate(
+                2,
+                cursor_parser(cursor),
+                session,
+                MessageSchema,
+                MessageSchema.created_date_time,
+                "",
+                False,
+                MessageSchema.message_id,
+            )
+            for cursor in (
+                around_model.cursor.prev_page,
+                around_model.cursor.next_page,
+            )
+        ]
+
+        assert [message.message_id for message in pages[0].results] == [9, 8]
+        assert [message.message_id for message in pages[1].results] == [2, 1]
+
+
+conversation_partitions = [
+    and_(MessageSchema.sender_id == 1, MessageSchema.reciever_id == 2),
+    and_(MessageSchema.sender_id == 2, MessageSchema.reciever_id == 1),
+]
+
+
+def add_conversation_messages(records_to_create: int, session: Session):
+    add_schemas(UserSchema, 3, get_user_schema_params, session, [])
+    add_schemas(
+        MessageSchema,
+        records_to_create,
+        get_conversation_message_schema_params,
+        session,
+        [],
+    )
+
+
+def get_conversation_message_ids(records_to_create: int) -> List[int]:
+    # ordered newest first.
+    return [
+        message_id
+        for message_id in range(records_to_create, 0, -1)
+        if message_id % 3 != 2
+    ]
+
+
+class TestPartitionedCursorPagination:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "limit, records_to_create", [(2, 12), (3, 9), (4, 5), (5, 2)]
+    )
+    async def test_next_pages_visit_conversation_in_order(
+        self, limit: int, records_to_create: int, session: Session
+    ):
+        add_conversation_messages(records_to_create, session)
+
+        visited_ids = []
+        cursor = None
+
+        while True:
+            pagination_model = await paginate(
+                limit,
+                cursor_parser(cursor),
+                session,
+                MessageSchema,
+                MessageSchema.created_date_time,
+                SHARED_CREATED_DATE_TIME + timedelta(weeks=100),
+                False,
+                MessageSchema.message_id,
+                partitions=conversation_partitions,
+            )
+
+            assert len(pagination_model.results) <= limit
+            visited_ids.extend(
+                message.message_id for message in pagination_model.results
+            )
+
+            cursor = pagination_model.cursor.next_page
+
+            if cursor is None:
+                break
+
+        assert visited_ids == get_conversation_message_ids(records_to_create)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("limit, records_to_create", [(2, 12), (3, 9)])
+    async def test_prev_page_returns_previous_page(
+        self, limit: int, records_to_create: int, session: Session
+    ):
+        add_conversation_messages(records_to_create, session)
+
+        async def paginate_conversation(cursor: Optional[str]):
+            return await paginate(
+                limit,
+                cursor_parser(cursor),
+                session,
+                MessageSchema,
+                MessageSchema.created_date_time,
+                SHARED_CREATED_DATE_TIME + timedelta(weeks=100),
+                False,
+                MessageSchema.message_id,
+                partitions=conversation_partitions,
+            )
+
+        first_page = await paginate_conversation(None)
+        second_page = await paginate_conversation(first_page.cursor.next_page)
+        previous_page = await paginate_conversation(
+            second_page.cursor.prev_page
+        )
+
+        assert previous_page.results == first_page.results
+        assert previous_page.cursor.prev_page is None
+
+    @pytest.mark.asyncio
+    async def test_projection_selects_columns_of_merged_branches(
+        self, session: Session
+    ):
+        add_conversation_messages(9, session)
+
+        pagination_model = await paginate(
+            4,
+            cursor_parser(None),
+            session,
+            MessageSchema,
+            MessageSchema.created_date_time,
+            SHARED_CREATED_DATE_TIME + timedelta(weeks=100),
+            False,
+            MessageSchema.message_id,
+            columns=[MessageSchema.content],
+            partitions=conversation_partitions,
+        )
+
+        assert [row.message_id for row in pagination_model.results] == (
+            get_conversation_message_ids(9)[:4]
+        )
+        assert set(pagination_model.results[0]._fields) == {
+            "content",
+            "created_date_time",
+            "message_id",
+        }
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "anchor_message_id, expected_result_ids",
+        [
+            (6, [9, 7, 6, 4, 3]),
+            (9, [10, 9, 7, 6]),
+        ],
+    )
+    async def test_around_anchor_within_conversation(
+        self,
+        anchor_message_id: int,
+        expected_result_ids: List[int],
+        session: Session,
+    ):
+        add_conversation_messages(10, session)
+
+        pagination = await async_around_pagination(
+            2, AsyncSessionAdapter(session)
+        )
+        pagination_model = await pagination(
+            MessageSchema,
+            MessageSchema.created_date_time,
+            get_paired_date_message_created_date_time(anchor_message_id),
+            False,
+            MessageSchema.message_id,
+            anchor_message_id,
+            partitions=conversation_partitions,
+        )
+
+        assert [
+            message.message_id for message in pagination_model.results
+        ] == expected_result_ids
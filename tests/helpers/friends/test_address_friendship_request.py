@@ -76,12 +76,19 @@ class TestAddressFriendshipRequest:
             specifier_id=friendship.addressee_id,
         )
 
-    def test_raises_when_friendship_blocked(self, mocker: MockerFixture):
+    @patch(
+        "messenger.helpers.handlers.friendship_handler.FriendshipHandler.get_latest_friendship_status"
+    )
+    def test_raises_when_friendship_blocked(
+        self,
+        get_latest_friendship_status_mock: MagicMock,
+        mocker: MockerFixture,
+    ):
         friendship = FriendshipSchema(
             requester_id=1, addressee_id=2, created_date_time=datetime.now()
         )
 
-        friendship.statuses = [
+        get_latest_friendship_status_mock.return_value = (
             FriendshipStatusSchema(
                 requester_id=1,
                 addressee_id=2,
@@ -89,7 +96,7 @@ class TestAddressFriendshipRequest:
                 status_code_id=FriendshipStatusCode.BLOCKED.value,
                 specifier_id=2,
             )
-        ]
+        )
         friendship_handler = FriendshipHandler(mocker.MagicMock(), friendship)
 
         with pytest.raises(HTTPException) as exc:
@@ -99,12 +106,19 @@ class TestAddressFriendshipRequest:
             assert exc.value.status_code == 400
             assert exc.value.detail == "friendship is blocked"
 
-    def test_raises_when_friendship_addressed(self, mocker: MockerFixture):
+    @patch(
+        "messenger.helpers.handlers.friendship_handler.FriendshipHandler.get_latest_friendship_status"
+    )
+    def test_raises_when_friendship_addressed(
+        self,
+        get_latest_friendship_status_mock: MagicMock,
+        mocker: MockerFixture,
+    ):
         friendship = FriendshipSchema(
             requester_id=1, addressee_id=2, created_date_time=datetime.now()
         )
 
-        friendship.statuses = [
+        get_latest_friendship_status_mock.return_value = (
             FriendshipStatusSchema(
                 requester_id=1,
                 addressee_id=2,
@@ -112,7 +126,7 @@ class TestAddressFriendshipRequest:
                 status_code_id=FriendshipStatusCode.ACCEPTED.value,
                 specifier_id=2,
             )
-        ]
+        )
         friendship_handler = FriendshipHandler(mocker.MagicMock(), friendship)
 
         with pytest.raises(HTTPException) as exc:
@@ -122,8 +136,7 @@ class TestAddressFriendshipRequest:
             assert exc.value.status_code == 400
             assert exc.value.detail == "friend request already addressed"
 
-        assert friendship_handler.friendship is not None
-        friendship_handler.friendship.statuses = [
+        get_latest_friendship_status_mock.return_value = (
             FriendshipStatusSchema(
                 requester_id=1,
                 addressee_id=2,
@@ -131,7 +144,7 @@ class TestAddressFriendshipRequest:
                 status_code_id=FriendshipStatusCode.DECLINED.value,
                 specifier_id=2,
             )
-        ]
+        )
 
         with pytest.raises(HTTPException) as exc:
             address_friendship_request(
@@ -139,3 +152,6 @@ class TestAddressFriendshipRequest:
             )
             assert exc.value.status_code == 400
             assert exc.value.detail == "friend request already addressed"
+
+        # the latest status is queried once per address.
+        assert get_latest_friendship_status_mock.call_count == 2
@@ -0,0 +1,177 @@
+from datetime import datetime
+import pytest
+from sqlalchemy.orm import Session
+from messenger_schemas.schema.friendship_schema import (
+    FriendshipSchema,
+)
+from messenger_schemas.schema.friendship_status_schema import (
+    FriendshipStatusSchema,
+)
+from messenger_schemas.schema.user_schema import (
+    UserSchema,
+)
+from messenger.constants.friendship_status_codes import FriendshipStatusCode
+from messenger.helpers.friend_cache import (
+    FriendCache,
+    friend_cache,
+    get_friend_ids,
+    invalidate_friend_ids_on_commit,
+)
+from messenger.helpers.handlers.friendship_handler import FriendshipHandler
+from tests.conftest import (
+    add_initial_friendship_status_codes,
+    get_user_schema_params,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_friend_cache():
+    # the test database is rolled back between tests, thus so must the cache.
+    friend_cache.clear()
+    yield
+    friend_cache.clear()
+
+
+def add_friendship(
+    session: Session,
+    requester_id: int,
+    addressee_id: int,
+    status_code: FriendshipStatusCode,
+):
+    session.add(
+        FriendshipSchema(
+            requester_id=requester_id,
+            addressee_id=addressee_id,
+            created_date_time=datetime.now(),
+        )
+    )
+    status = FriendshipStatusSchema(
+        requester_id=requester_id,
+        addressee_id=addressee_id,
+        specified_date_time=datetime.now(),
+        status_code_id=status_code.value,
+        specifier_id=requester_id,
+    )
+    session.add(status)
+    FriendshipHandler(session).set_current_status(status)
+    session.commit()
+
+
+@pytest.fixture
+def users(session: Session):
+    add_initial_friendship_status_codes(session)
+
+    for user_id in range(1, 6):
+        session.add(UserSchema(**get_user_schema_params(user_id)))
+
+    session.commit()
+
+
+class TestFriendCache:
+    def test_evicts_least_recently_used(self):
+        cache = FriendCache(2, 60)
+
+        cache.set(1, frozenset({2}), cache.generation)
+        cache.set(2, frozenset({1}), cache.generation)
+
+        # user 1 becomes the most recently used.
+        assert cache.get(1) == frozenset({2})
+
+        cache.set(3, frozenset(), cache.generation)
+
+        assert len(cache) == 2
+        assert cache.get(2) is None
+        assert cache.get(1) == frozenset({2})
+        assert cache.get(3) == frozenset()
+
+    def test_expires_entries(self):
+        cache = FriendCache(2, 0)
+
+        cache.set(1, frozenset({2}), cache.generation)
+
+        assert cache.get(1) is None
+
+    def test_invalidates_users(self):
+        cache = FriendCache(5, 60)
+
+        for user_id in range(1, 4):
+            cache.set(user_id, frozenset(), cache.generation)
+
+        cache.invalidate(1, 2)
+
+        assert cache.get(1) is None
+        assert cache.get(2) is None
+        assert cache.get(3) == frozenset()
+
+    def test_does_not_cache_load_started_before_invalidation(self):
+        cache = FriendCache(5, 60)
+        generation = cache.generation
+
+        cache.invalidate(4)
+        cache.set(1, frozenset({2}), generation)
+
+        assert cache.get(1) is None
+
+
+@pytest.mark.usefixtures("users")
+class TestGetFriendIds:
+    def test_retrieves_accepted_friends(self, session: Session):
+        add_friendship(session, 1, 2, FriendshipStatusCode.ACCEPTED)
+        add_friendship(session, 3, 1, FriendshipStatusCode.ACCEPTED)
+        add_friendship(session, 1, 4, FriendshipStatusCode.REQUESTED)
+        add_friendship(session, 5, 1, FriendshipStatusCode.BLOCKED)
+
+        assert get_friend_ids(session, 1) == frozenset({2, 3})
+        assert get_friend_ids(session, 2) == frozenset({1})
+        assert get_friend_ids(session, 4) == frozenset()
+
+    def test_caches_friend_ids(self, session: Session):
+        add_friendship(session, 1, 2, FriendshipStatusCode.ACCEPTED)
+
+        assert get_friend_ids(session, 1) == frozenset({2})
+        assert friend_cache.get(1) == frozenset({2})
+
+    @pytest.mark.parametrize(
+        "new_status_code",
+        [FriendshipStatusCode.BLOCKED, FriendshipStatusCode.DECLINED],
+    )
+    def test_invalidates_both_users_when_status_commits(
+        self, new_status_code: FriendshipStatusCode, session: Session
+    ):
+        add_friendship(session, 1, 2, FriendshipStatusCode.ACCEPTED)
+
+        assert get_friend_ids(session, 1) == frozenset({2})
+        assert get_friend_ids(session, 2) == frozenset({1})
+
+        friendship_handler = FriendshipHandler(session)
+        friendship_handler.get_friendship(2, 1)
+        friendship_handler.add_new_status(1, 2, 2, new_status_code)
+        session.commit()
+
+        assert friend_cache.get(1) is None
+        assert friend_cache.get(2) is None
+        assert get_friend_ids(session, 1) == frozenset()
+        assert get_friend_ids(session, 2) == frozenset()
+
+    def test_invalidates_once_session_commits(self, session: Session):
+        invalidate_friend_ids_on_commit(session, 1, 2)
+
+        # cached by another reader before the change was committed.
+        friend_cache.set(1, frozenset({2}), friend_cache.generation)
+
+        session.commit()
+
+        assert friend_cache.get(1) is None
+
+    def test_discards_invalidations_when_session_rolls_back(
+        self, session: Session
+    ):
+        # the change is made within a transaction of the session.
+        session.get(UserSchema, 1)
+        invalidate_friend_ids_on_commit(session, 1, 2)
+        session.rollback()
+
+        friend_cache.set(1, frozenset({2}), friend_cache.generation)
+        session.commit()
+
+        assert friend_cache.get(1) == frozenset({2})
@@ -0,0 +1,217 @@
+from datetime import datetime, timedelta
+from itertools import combinations
+from random import Random
+from typing import Dict, List, Set, Tuple
+from freezegun import freeze_time
+import pytest
+from sqlalchemy.orm import Session
+from messenger_schemas.schema.friendship_schema import (
+    FriendshipSchema,
+)
+from messenger_schemas.schema.user_schema import (
+    UserSchema,
+)
+from messenger.constants.friendship_status_codes import FriendshipStatusCode
+from messenger.helpers.friend_suggestions import (
+    get_mutual_friend_count_deltas,
+    rebuild_mutual_friend_counts,
+    select_friend_suggestions,
+)
+from messenger.helpers.handlers.friendship_handler import FriendshipHandler
+from messenger.models.schema.mutual_friend_count_schema import (
+    MutualFriendCountSchema,
+)
+from tests.conftest import (
+    add_initial_friendship_status_codes,
+    get_user_schema_params,
+)
+from tests.helpers.friends import FROZEN_DATE
+
+
+def count_mutual_friends(
+    friend_ids: Dict[int, Set[int]]
+) -> Dict[Tuple[int, int], int]:
+    counts: Dict[Tuple[int, int], int] = {}
+
+    for user_id, candidate_id in combinations(friend_ids, 2):
+        count = len(friend_ids[user_id] & friend_ids[candidate_id])
+
+        if count > 0:
+            counts[(user_id, candidate_id)] = count
+            counts[(candidate_id, user_id)] = count
+
+    return counts
+
+
+def get_mutual_friend_counts(session: Session) -> Dict[Tuple[int, int], int]:
+    return {
+        (count.user_id, count.candidate_id): count.mutual_friend_count
+        for count in session.query(MutualFriendCountSchema)
+    }
+
+
+class TestGetMutualFriendCountDeltas:
+    @pytest.mark.parametrize("random_seed", range(5))
+    def test_deltas_match_recounted_mutual_friends(self, random_seed: int):
+        random = Random(random_seed)
+        user_ids = range(1, 9)
+        friend_ids: Dict[int, Set[int]] = {
+            user_id: set() for user_id in user_ids
+        }
+        changes: List[Tuple[int, int, bool]] = []
+
+        for _ in range(30):
+            requester_id, addressee_id = random.sample(user_ids, 2)
+            is_accepted = addressee_id not in friend_ids[requester_id]
+
+            changes.append((requester_id, addressee_id, is_accepted))
+
+            if is_accepted:
+                friend_ids[requester_id].add(addressee_id)
+                friend_ids[addressee_id].add(requester_id)
+            else:
+                friend_ids[requester_id].discard(addressee_id)
+                friend_ids[addressee_id].discard(requester_id)
+
+        deltas = get_mutual_friend_count_deltas(
+            {user_id: set(ids) for user_id, ids in friend_ids.items()},
+            changes,
+        )
+
+        assert deltas == count_mutual_friends(friend_ids)
+
+    def test_accepting_and_removing_a_friendship_cancels_out(self):
+        friend_ids = {1: {3}, 2: set()}
+
+        deltas = get_mutual_friend_count_deltas(
+            friend_ids, [(1, 2, True), (1, 2, False)]
+        )
+
+        assert deltas == {}
+
+
+class TestMutualFriendCounts:
+    def add_users(self, session: Session, user_ids: range):
+        add_initial_friendship_status_codes(session)
+
+        for user_id in user_ids:
+            session.add(UserSchema(**get_user_schema_params(user_id)))
+
+        session.commit()
+
+    def add_status(
+        self,
+        session: Session,
+        requester_id: int,
+        addressee_id: int,
+        status_code: FriendshipStatusCode,
+    ):
+        if session.get(FriendshipSchema, (requester_id, addressee_id)) is None:
+            session.add(
+                FriendshipSchema(
+                    requester_id=requester_id,
+                    addressee_id=addressee_id,
+                    created_date_time=datetime.now(),
+                )
+            )
+
+        FriendshipHandler(session).add_new_status(
+            requester_id, addressee_id, addressee_id, status_code
+        )
+
+    def get_rebuilt_mutual_friend_counts(
+        self, session: Session
+    ) -> Dict[Tuple[int, int], int]:
+        rebuild_mutual_friend_counts(session)
+        session.flush()
+
+        return get_mutual_friend_counts(session)
+
+    @freeze_time(FROZEN_DATE)
+    def test_counts_are_adjusted_on_commit(self, session: Session):
+        self.add_users(session, range(1, 7))
+
+        # each friendship is accepted in its own transaction, apart from the
+        # last two which are accepted in the same transaction.
+        for requester_id, addressee_id in ((1, 2), (1, 3), (2, 3), (4, 1)):
+            self.add_status(
+                session,
+                requester_id,
+                addressee_id,
+                FriendshipStatusCode.ACCEPTED,
+            )
+            session.commit()
+
+        self.add_status(session, 4, 2, FriendshipStatusCode.ACCEPTED)
+        self.add_status(session, 5, 4, FriendshipStatusCode.ACCEPTED)
+        session.commit()
+
+        counts = get_mutual_friend_counts(session)
+
+        assert counts[(3, 4)] == 2
+        assert counts[(5, 1)] == 1
+        assert counts == self.get_rebuilt_mutual_friend_counts(session)
+
+        # blocking a friend removes them as a mutual friend.
+        with freeze_time(datetime.now() + timedelta(hours=1)):
+            self.add_status(session, 1, 2, FriendshipStatusCode.BLOCKED)
+            session.commit()
+
+        counts = get_mutual_friend_counts(session)
+
+        assert (2, 3) not in counts
+        assert (1, 4) not in counts
+        assert counts == self.get_rebuilt_mutual_friend_counts(session)
+
+    @freeze_time(FROZEN_DATE)
+    def test_counts_are_not_adjusted_on_rollback(self, session: Session):
+        self.add_users(session, range(1, 4))
+        self.add_status(session, 1, 2, FriendshipStatusCode.ACCEPTED)
+        session.commit()
+
+        self.add_status(session, 1, 3, FriendshipStatusCode.ACCEPTED)
+        session.rollback()
+
+        # nothing is pending once rolled back, so committing other changes
+        # does not apply the rolled back friendship.
+        session.commit()
+
+        assert get_mutual_friend_counts(session) == {}
+
+    @freeze_time(FROZEN_DATE)
+    def test_select_friend_suggestions(self, session: Session):
+        self.add_users(session, range(1, 8))
+
+        for requester_id, addressee_id in (
+            (1, 2),
+            (1, 3),
+            (2, 4),
+            (3, 4),
+            (2, 5),
+            (2, 6),
+            (3, 6),
+            (2, 7),
+            (3, 7),
+        ):
+            self.add_status(
+                session,
+                requester_id,
+                addressee_id,
+                FriendshipStatusCode.ACCEPTED,
+            )
+
+        # requests and blocks are not suggested either.
+        self.add_status(session, 1, 6, FriendshipStatusCode.REQUESTED)
+        self.add_status(session, 7, 1, FriendshipStatusCode.BLOCKED)
+        session.commit()
+
+        suggestions = session.execute(select_friend_suggestions(1, 10)).all()
+
+        assert [
+            (suggestion.user_id, suggestion.mutual_friend_count)
+            for suggestion in suggestions
+        ] == [(4, 2), (5, 1)]
+
+        suggestions = session.execute(select_friend_suggestions(1, 1)).all()
+
+        assert len(suggestions) == 1
@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta
+from typing import List
 from unittest.mock import MagicMock, patch
 from freezegun import freeze_time
 from sqlalchemy.orm import Session
@@ -15,46 +16,72 @@ from messenger_schemas.schema.user_schema import (
 )
 from messenger.constants.friendship_status_codes import FriendshipStatusCode
 
+from messenger.helpers.current_friendship_status import (
+    rebuild_current_friendship_statuses,
+)
 from messenger.helpers.handlers.friendship_handler import (
     FriendshipHandler,
 )
+from messenger.models.schema.current_friendship_status_schema import (
+    CurrentFriendshipStatusSchema,
+)
+from tests.conftest import add_initial_friendship_status_codes
 from tests.helpers.friends import FROZEN_DATE
 
 
 @freeze_time(FROZEN_DATE)
-def test_get_latest_friendship_status(mocker: MockerFixture):
-    status = FriendshipStatusSchema(
-        requester_id=1,
-        addressee_id=2,
-        specified_date_time=datetime.now(),
-        status_code_id=FriendshipStatusCode.REQUESTED.value,
-        specifier_id=1,
-    )
+@pytest.mark.parametrize(
+    "status_codes",
+    [
+        [FriendshipStatusCode.REQUESTED],
+        [FriendshipStatusCode.REQUESTED, FriendshipStatusCode.ACCEPTED],
+        [
+            FriendshipStatusCode.REQUESTED,
+            FriendshipStatusCode.ACCEPTED,
+            FriendshipStatusCode.BLOCKED,
+            FriendshipStatusCode.ACCEPTED,
+        ],
+    ],
+)
+def test_get_latest_friendship_status(
+    status_codes: List[FriendshipStatusCode], session: Session
+):
+    add_initial_friendship_status_codes(session)
+    statuses = add_friendship_with_statuses(session, 1, 2, status_codes)
 
-    friendship_handler = FriendshipHandler(
-        mocker.MagicMock(), FriendshipSchema()
+    # a friendship between other users should not be considered.
+    add_friendship_with_statuses(
+        session, 3, 4, [FriendshipStatusCode.REQUESTED] * 5
     )
 
-    assert friendship_handler.friendship is not None
+    rebuild_current_friendship_statuses(session)
 
-    friendship_handler.friendship.statuses = [status]
+    friendship_handler = FriendshipHandler(session)
+    friendship_handler.get_friendship(2, 1)
 
     latest_status = friendship_handler.get_latest_friendship_status()
 
-    assert latest_status == status
-
-    status = FriendshipStatusSchema(
-        requester_id=1,
-        addressee_id=2,
-        specified_date_time=datetime.now() + timedelta(days=10),
-        status_code_id=FriendshipStatusCode.REQUESTED.value,
-        specifier_id=1,
+    assert latest_status is not None
+    assert (
+        latest_status.status_code_id,
+        latest_status.specifier_id,
+        latest_status.specified_date_time,
+    ) == (
+        statuses[-1].status_code_id,
+        statuses[-1].specifier_id,
+        statuses[-1].specified_date_time,
     )
 
-    friendship_handler.friendship.statuses.append(status)
-    latest_status = friendship_handler.get_latest_friendship_status()
 
-    assert latest_status == status
+def test_get_latest_friendship_status_without_statuses(session: Session):
+    friendship_handler = FriendshipHandler(session)
+
+    assert friendship_handler.get_latest_friendship_status() is None
+
+    add_friendship_with_statuses(session, 1, 2, [])
+    friendship_handler.get_friendship(2, 1)
+
+    assert friendship_handler.get_latest_friendship_status() is None
 
 
 # TODO: add some negative test params
@@ -143,3 +170,168 @@ def test_add_new_status(
     session_mock.add.assert_called_once_with(expected_friendship_status)
 
     assert new_status is expected_friendship_status
+
+
+def add_friendship_with_statuses(
+    session: Session,
+    requester_id: int,
+    addressee_id: int,
+    status_codes: List[FriendshipStatusCode],
+) -> List[FriendshipStatusSchema]:
+    for user_id in (requester_id, addressee_id):
+        session.add(
+            UserSchema(
+                user_id=user_id,
+                username=f"username_{user_id}",
+                email=f"email_{user_id}",
+                password_hash="password",
+            )
+        )
+
+    session.add(
+        FriendshipSchema(
+            requester_id=requester_id,
+            addressee_id=addressee_id,
+            created_date_time=datetime.now(),
+        )
+    )
+
+    statuses = [
+        FriendshipStatusSchema(
+            requester_id=requester_id,
+            addressee_id=addressee_id,
+            specified_date_time=datetime.now() + timedelta(hours=i),
+            status_code_id=status_code.value,
+            specifier_id=requester_id,
+        )
+        for i, status_code in enumerate(status_codes)
+    ]
+
+    session.add_all(statuses)
+    session.commit()
+
+    return statuses
+
+
+@freeze_time(FROZEN_DATE)
+@pytest.mark.parametrize(
+    "status_codes",
+    [
+        [FriendshipStatusCode.REQUESTED],
+        [FriendshipStatusCode.REQUESTED, FriendshipStatusCode.ACCEPTED],
+        [
+            FriendshipStatusCode.REQUESTED,
+            FriendshipStatusCode.ACCEPTED,
+            FriendshipStatusCode.BLOCKED,
+        ],
+    ],
+)
+def test_set_current_status_overwrites_previous_status(
+    status_codes: List[FriendshipStatusCode], session: Session
+):
+    add_initial_friendship_status_codes(session)
+    statuses = add_friendship_with_statuses(session, 1, 2, status_codes)
+    friendship_handler = FriendshipHandler(session)
+
+    for status in statuses:
+        friendship_handler.set_current_status(status)
+        session.commit()
+
+    current_statuses = session.query(CurrentFriendshipStatusSchema).all()
+
+    assert len(current_statuses) == 1
+    assert current_statuses[0].status_code_id == status_codes[-1].value
+    assert (
+        current_statuses[0].specified_date_time
+        == statuses[-1].specified_date_time
+    )
+
+
+@freeze_time(FROZEN_DATE)
+@pytest.mark.parametrize(
+    "user_a_id, user_b_id",
+    [(1, 3), (4, 2), (12, 1223)],
+)
+def test_get_current_status_is_bidirectional(
+    user_a_id: int, user_b_id: int, session: Session
+):
+    add_initial_friendship_status_codes(session)
+    (status,) = add_friendship_with_statuses(
+        session, user_a_id, user_b_id, [FriendshipStatusCode.ACCEPTED]
+    )
+    friendship_handler = FriendshipHandler(session)
+    friendship_handler.set_current_status(status)
+    session.commit()
+
+    for user_ids in ((user_a_id, user_b_id), (user_b_id, user_a_id)):
+        current_status = friendship_handler.get_current_status(*user_ids)
+
+        assert current_status is not None
+        assert current_status.requester_id == user_a_id
+        assert current_status.addressee_id == user_b_id
+        assert (
+            current_status.status_code_id
+            == FriendshipStatusCode.ACCEPTED.value
+        )
+
+    assert friendship_handler.get_current_status(user_a_id, 999) is None
+
+
+@freeze_time(FROZEN_DATE)
+def test_set_current_status_locks_previous_status(
+    session: Session, mocker: MockerFixture
+):
+    add_initial_friendship_status_codes(session)
+    (status,) = add_friendship_with_statuses(
+        session, 1, 2, [FriendshipStatusCode.REQUESTED]
+    )
+    get_spy = mocker.spy(session, "get")
+
+    FriendshipHandler(session).set_current_status(status)
+
+    get_spy.assert_any_call(
+        CurrentFriendshipStatusSchema,
+        (1, 2),
+        populate_existing=True,
+        with_for_update=True,
+    )
+
+
+@freeze_time(FROZEN_DATE)
+def test_rebuild_current_friendship_statuses(session: Session):
+    add_initial_friendship_status_codes(session)
+    add_friendship_with_statuses(
+        session,
+        1,
+        2,
+        [FriendshipStatusCode.REQUESTED, FriendshipStatusCode.ACCEPTED],
+    )
+    add_friendship_with_statuses(
+        session,
+        3,
+        4,
+        [
+            FriendshipStatusCode.REQUESTED,
+            FriendshipStatusCode.ACCEPTED,
+            FriendshipStatusCode.BLOCKED,
+        ],
+    )
+    add_friendship_with_statuses(
+        session, 5, 6, [FriendshipStatusCode.REQUESTED]
+    )
+
+    assert rebuild_current_friendship_statuses(session) == 3
+
+    current_status_codes = {
+        (
+            current_status.requester_id,
+            current_status.addressee_id,
+        ): current_status.status_code_id
+        for current_status in session.query(CurrentFriendshipStatusSchema)
+    }
+
+    assert current_status_codes == {
+        (1, 2): FriendshipStatusCode.ACCEPTED.value,
+        (3, 4): FriendshipStatusCode.BLOCKED.value,
+        (5, 6): FriendshipStatusCode.REQUESTED.value,
+    }
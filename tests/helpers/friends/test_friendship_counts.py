@@ -0,0 +1,178 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from freezegun import freeze_time
+import pytest
+from sqlalchemy.orm import Session
+from messenger_schemas.schema.friendship_schema import (
+    FriendshipSchema,
+)
+from messenger_schemas.schema.user_schema import (
+    UserSchema,
+)
+from messenger.constants.friendship_status_codes import FriendshipStatusCode
+from messenger.models.friendship_change import FriendshipChange
+from messenger.helpers.friendship_counts import (
+    get_friendship_count_deltas,
+    rebuild_friendship_counts,
+)
+from messenger.helpers.handlers.friendship_handler import FriendshipHandler
+from messenger.models.schema.friendship_count_schema import (
+    FriendshipCountSchema,
+)
+from tests.conftest import (
+    add_initial_friendship_status_codes,
+    get_user_schema_params,
+)
+from tests.helpers.friends import FROZEN_DATE
+
+ACCEPTED = FriendshipStatusCode.ACCEPTED.value
+REQUESTED = FriendshipStatusCode.REQUESTED.value
+DECLINED = FriendshipStatusCode.DECLINED.value
+BLOCKED = FriendshipStatusCode.BLOCKED.value
+
+
+def get_friendship_counts(session: Session) -> Dict[int, Dict[str, int]]:
+    return {
+        count.user_id: {
+            "friend_count": count.friend_count,
+            "incoming_request_count": count.incoming_request_count,
+            "outgoing_request_count": count.outgoing_request_count,
+        }
+        for count in session.query(FriendshipCountSchema)
+    }
+
+
+class TestGetFriendshipCountDeltas:
+    @pytest.mark.parametrize(
+        "changes, expected_deltas",
+        [
+            (
+                [FriendshipChange(1, 2, None, REQUESTED)],
+                {
+                    1: {
+                        "friend_count": 0,
+                        "incoming_request_count": 0,
+                        "outgoing_request_count": 1,
+                    },
+                    2: {
+                        "friend_count": 0,
+                        "incoming_request_count": 1,
+                        "outgoing_request_count": 0,
+                    },
+                },
+            ),
+            (
+                [FriendshipChange(1, 2, REQUESTED, ACCEPTED)],
+                {
+                    1: {
+                        "friend_count": 1,
+                        "incoming_request_count": 0,
+                        "outgoing_request_count": -1,
+                    },
+                    2: {
+                        "friend_count": 1,
+                        "incoming_request_count": -1,
+                        "outgoing_request_count": 0,
+                    },
+                },
+            ),
+            (
+                [FriendshipChange(1, 2, ACCEPTED, None)],
+                {
+                    1: {
+                        "friend_count": -1,
+                        "incoming_request_count": 0,
+                        "outgoing_request_count": 0,
+                    },
+                    2: {
+                        "friend_count": -1,
+                        "incoming_request_count": 0,
+                        "outgoing_request_count": 0,
+                    },
+                },
+            ),
+            ([FriendshipChange(1, 2, DECLINED, BLOCKED)], {}),
+            (
+                [
+                    FriendshipChange(1, 2, None, REQUESTED),
+                    FriendshipChange(1, 2, REQUESTED, DECLINED),
+                ],
+                {},
+            ),
+        ],
+    )
+    def test_produces_deltas_of_changed_counts(
+        self,
+        changes: List[FriendshipChange],
+        expected_deltas: Dict[int, Dict[str, int]],
+    ):
+        assert get_friendship_count_deltas(changes) == expected_deltas
+
+
+class TestFriendshipCounts:
+    def add_status(
+        self,
+        session: Session,
+        requester_id: int,
+        addressee_id: int,
+        status_code: FriendshipStatusCode,
+        hours: int = 0,
+    ):
+        if session.get(FriendshipSchema, (requester_id, addressee_id)) is None:
+            session.add(
+                FriendshipSchema(
+                    requester_id=requester_id,
+                    addressee_id=addressee_id,
+                    created_date_time=datetime.now(),
+                )
+            )
+
+        with freeze_time(datetime.now() + timedelta(hours=hours)):
+            FriendshipHandler(session).add_new_status(
+                requester_id, addressee_id, addressee_id, status_code
+            )
+
+    @freeze_time(FROZEN_DATE)
+    def test_counts_are_adjusted_on_commit(self, session: Session):
+        add_initial_friendship_status_codes(session)
+
+        for user_id in range(1, 6):
+            session.add(UserSchema(**get_user_schema_params(user_id)))
+
+        session.commit()
+
+        for requester_id, addressee_id in ((1, 2), (3, 1), (1, 4), (5, 1)):
+            self.add_status(
+                session,
+                requester_id,
+                addressee_id,
+                FriendshipStatusCode.REQUESTED,
+            )
+            session.commit()
+
+        self.add_status(session, 1, 4, FriendshipStatusCode.ACCEPTED, 1)
+        self.add_status(session, 5, 1, FriendshipStatusCode.DECLINED, 1)
+        session.commit()
+
+        counts = get_friendship_counts(session)
+
+        assert counts[1] == {
+            "friend_count": 1,
+            "incoming_request_count": 1,
+            "outgoing_request_count": 1,
+        }
+        assert counts[4]["friend_count"] == 1
+        assert counts[5]["outgoing_request_count"] == 0
+
+        rebuild_friendship_counts(session)
+        session.flush()
+
+        assert counts == get_friendship_counts(session)
+
+    @freeze_time(FROZEN_DATE)
+    def test_users_without_friendships_have_no_counts(self, session: Session):
+        session.add(UserSchema(**get_user_schema_params(1)))
+        session.commit()
+
+        assert rebuild_friendship_counts(session) == 0
+        assert get_friendship_counts(session) == {}
@@ -0,0 +1,156 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+from freezegun import freeze_time
+import pytest
+from sqlalchemy.orm import Session
+from messenger_schemas.schema.friendship_schema import (
+    FriendshipSchema,
+)
+from messenger_schemas.schema.friendship_status_schema import (
+    FriendshipStatusSchema,
+)
+from messenger_schemas.schema.user_schema import (
+    UserSchema,
+)
+from messenger.constants.friendship_status_codes import FriendshipStatusCode
+from messenger.helpers.friendship_status_archive import (
+    archive_superseded_friendship_statuses,
+)
+from messenger.models.schema.friendship_status_archive_schema import (
+    FriendshipStatusArchiveSchema,
+)
+from tests.conftest import (
+    add_initial_friendship_status_codes,
+    get_user_schema_params,
+)
+from tests.helpers.friends import FROZEN_DATE
+
+# the number of statuses in the history of each friendship.
+status_history_lengths = {(1, 2): 3, (1, 3): 1, (2, 3): 4, (4, 1): 2}
+
+
+def add_status_histories(
+    session: Session,
+) -> Dict[Tuple[int, int], FriendshipStatusSchema]:
+    """Adds the friendships with their status histories, returning the latest
+    status of each."""
+    add_initial_friendship_status_codes(session)
+
+    for user_id in range(1, 5):
+        session.add(UserSchema(**get_user_schema_params(user_id)))
+
+    latest_statuses = {}
+
+    for (requester_id, addressee_id), length in status_history_lengths.items():
+        session.add(
+            FriendshipSchema(
+                requester_id=requester_id,
+                addressee_id=addressee_id,
+                created_date_time=datetime.now(),
+            )
+        )
+
+        for i in range(length):
+            status = FriendshipStatusSchema(
+                requester_id=requester_id,
+                addressee_id=addressee_id,
+                specified_date_time=datetime.now() + timedelta(hours=i),
+                status_code_id=FriendshipStatusCode.REQUESTED.value
+                if i % 2 == 0
+                else FriendshipStatusCode.DECLINED.value,
+                specifier_id=requester_id,
+            )
+            session.add(status)
+
+        latest_statuses[(requester_id, addressee_id)] = status
+
+    session.commit()
+
+    return latest_statuses
+
+
+def get_status_keys(session: Session, Schema) -> List[Tuple]:
+    return sorted(
+        (status.requester_id, status.addressee_id, status.specified_date_time)
+        for status in session.query(Schema)
+    )
+
+
+@freeze_time(FROZEN_DATE)
+class TestArchiveSupersededFriendshipStatuses:
+    @pytest.mark.parametrize("batch_size", [1, 2, 3, 100])
+    def test_keeps_only_the_latest_status_of_each_friendship(
+        self, batch_size: int, session: Session
+    ):
+        latest_statuses = add_status_histories(session)
+        status_keys = get_status_keys(session, FriendshipStatusSchema)
+
+        progress = list(
+            archive_superseded_friendship_statuses(session, batch_size)
+        )
+
+        latest_status_keys = sorted(
+            (requester_id, addressee_id, status.specified_date_time)
+            for (
+                requester_id,
+                addressee_id,
+            ), status in latest_statuses.items()
+        )
+
+        assert (
+            get_status_keys(session, FriendshipStatusSchema)
+            == latest_status_keys
+        )
+        assert get_status_keys(
+            session, FriendshipStatusArchiveSchema
+        ) == sorted(set(status_keys) - set(latest_status_keys))
+
+        last_progress = progress[-1]
+
+        assert last_progress.batches == len(progress)
+        assert len(progress) == -(-len(status_history_lengths) // batch_size)
+        assert last_progress.friendships == len(status_history_lengths)
+        assert last_progress.archived_statuses == len(status_keys) - len(
+            latest_status_keys
+        )
+        assert last_progress.last_key == (4, 1)
+
+        for (requester_id, addressee_id), status in latest_statuses.items():
+            latest_status = (
+                session.query(FriendshipStatusSchema)
+                .filter(
+                    FriendshipStatusSchema.requester_id == requester_id,
+                    FriendshipStatusSchema.addressee_id == addressee_id,
+                )
+                .one()
+            )
+
+            assert (
+                latest_status.specified_date_time == status.specified_date_time
+            )
+
+    def test_resumes_after_the_given_friendship(self, session: Session):
+        add_status_histories(session)
+
+        progress = list(
+            archive_superseded_friendship_statuses(
+                session, 2, start_after=(1, 3)
+            )
+        )
+
+        # only the friendships (2, 3) and (4, 1) follow (1, 3).
+        assert progress[-1].friendships == 2
+        assert progress[-1].archived_statuses == 4
+        assert {
+            (status.requester_id, status.addressee_id)
+            for status in session.query(FriendshipStatusArchiveSchema)
+        } == {(2, 3), (4, 1)}
+
+    def test_archiving_again_archives_nothing(self, session: Session):
+        add_status_histories(session)
+
+        list(archive_superseded_friendship_statuses(session, 2))
+        progress = list(archive_superseded_friendship_statuses(session, 2))
+
+        assert progress[-1].archived_statuses == 0
+        assert progress[-1].friendships == len(status_history_lengths)
@@ -28,12 +28,14 @@ class TestRaiseIfBlocked:
     ):
         friendship_handler = FriendshipHandler(mocker.MagicMock())
 
-        get_latest_friendship_status_mock.return_value = FriendshipStatusSchema(
-            requester_id=1,
-            addressee_id=2,
-            specified_date_time=datetime.now() + timedelta(days=1),
-            status_code_id=FriendshipStatusCode.BLOCKED.value,
-            specifier_id=2,
+        get_latest_friendship_status_mock.return_value = (
+            FriendshipStatusSchema(
+                requester_id=1,
+                addressee_id=2,
+                specified_date_time=datetime.now() + timedelta(days=1),
+                status_code_id=FriendshipStatusCode.BLOCKED.value,
+                specifier_id=2,
+            )
         )
 
         # should raise now that the friendship has a new status with a blocked status code
@@ -56,15 +58,19 @@ class TestRaiseIfBlocked:
         mocker: MockerFixture,
         status_code_id_no_raise: str,
     ):
-        get_latest_friendship_status_mock.return_value = FriendshipStatusSchema(
-            requester_id=1,
-            addressee_id=2,
-            specified_date_time=datetime.now(),
-            status_code_id=status_code_id_no_raise,
-            specifier_id=1,
+        get_latest_friendship_status_mock.return_value = (
+            FriendshipStatusSchema(
+                requester_id=1,
+                addressee_id=2,
+                specified_date_time=datetime.now(),
+                status_code_id=status_code_id_no_raise,
+                specifier_id=1,
+            )
         )
 
         friendship_handler = FriendshipHandler(mocker.MagicMock())
 
         # should run without raising since friendship is not blocked in all cases
-        friendship_handler.raise_if_blocked()
+        latest_status = friendship_handler.raise_if_blocked()
+
+        assert latest_status is get_latest_friendship_status_mock.return_value
@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta
+from typing import List, Tuple
+from freezegun import freeze_time
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from messenger_schemas.schema.user_schema import (
+    UserSchema,
+)
+from messenger.constants.sync import ChangeType
+from messenger.helpers.change_log import (
+    Change,
+    get_change_writes,
+    select_changes,
+)
+from messenger.helpers.handlers.message_handler import MessageHandler
+from messenger.helpers.read_watermarks import read_messages
+from messenger.models.schema.change_sequence_schema import (
+    ChangeSequenceSchema,
+)
+from tests.conftest import AsyncSessionAdapter, get_user_schema_params
+from tests.helpers.messages import FROZEN_DATE
+
+
+def get_changes(
+    session: Session, user_id: int, since: int = 0
+) -> List[Tuple[int, str, int, int]]:
+    return [
+        (sequence, change_type, partner_id, message_id)
+        for (
+            sequence,
+            change_type,
+            partner_id,
+            message_id,
+            *_,
+        ) in session.execute(select_changes(user_id, since, 100))
+    ]
+
+
+def get_last_sequence(session: Session, user_id: int) -> int:
+    return session.execute(
+        select(ChangeSequenceSchema.last_sequence).where(
+            ChangeSequenceSchema.user_id == user_id
+        )
+    ).scalar_one()
+
+
+def test_get_change_writes_numbers_changes_per_user():
+    changes = [
+        Change(1, ChangeType.MESSAGE, 2, 10),
+        Change(2, ChangeType.MESSAGE, 1, 10),
+        Change(1, ChangeType.MESSAGE, 3, 11),
+    ]
+
+    writes = get_change_writes(changes, {1: 5, 2: 0}, datetime(2022, 11, 7))
+    [(_, updated_sequences), (_, change_rows)] = writes
+
+    assert updated_sequences == [
+        {"b_user_id": 1, "b_last_sequence": 7},
+        {"b_user_id": 2, "b_last_sequence": 1},
+    ]
+    assert [(row["user_id"], row["sequence"]) for row in change_rows] == [
+        (1, 6),
+        (2, 1),
+        (1, 7),
+    ]
+
+
+@freeze_time(FROZEN_DATE)
+class TestChangeLog:
+    @pytest.mark.asyncio
+    async def test_records_messages_and_reads_in_sequence(
+        self, session: Session
+    ):
+        for user_id in range(1, 4):
+            session.add(UserSchema(**get_user_schema_params(user_id)))
+
+        session.commit()
+
+        message_handler = MessageHandler(session)
+        message_ids = []
+
+        for hour, (sender_id, reciever_id) in enumerate(
+            ((2, 1), (1, 2), (3, 1), (1, 1))
+        ):
+            with freeze_time(datetime.now() + timedelta(hours=hour)):
+                message_ids.append(
+                    message_handler.send_message(
+                        sender_id, reciever_id, f"message {hour}", None
+                    ).message_id
+                )
+
+        await read_messages(AsyncSessionAdapter(session), 1, 2, message_ids[0])
+
+        assert get_changes(session, 1) == [
+            (1, ChangeType.MESSAGE.value, 2, message_ids[0]),
+            (2, ChangeType.MESSAGE.value, 2, message_ids[1]),
+            (3, ChangeType.MESSAGE.value, 3, message_ids[2]),
+            # a message to oneself is a single change.
+            (4, ChangeType.MESSAGE.value, 1, message_ids[3]),
+            (5, ChangeType.READ.value, 2, message_ids[0]),
+        ]
+        assert get_changes(session, 2, since=2) == [
+            (3, ChangeType.READ_BY_PARTNER.value, 1, message_ids[0]),
+        ]
+        assert get_last_sequence(session, 1) == 5
+        assert get_last_sequence(session, 2) == 3
+        assert get_last_sequence(session, 3) == 1
@@ -0,0 +1,143 @@
+from datetime import datetime, timedelta
+from typing import Dict, Tuple
+from freezegun import freeze_time
+from sqlalchemy.orm import Session
+from messenger_schemas.schema.message_schema import (
+    MessageSchema,
+)
+from messenger_schemas.schema.user_schema import (
+    UserSchema,
+)
+from messenger.constants.conversations import LAST_MESSAGE_PREVIEW_LENGTH
+from messenger.helpers.conversation_summaries import (
+    get_conversation_summary_updates,
+    rebuild_conversation_summaries,
+)
+from messenger.helpers.handlers.message_handler import MessageHandler
+from messenger.models.schema.conversation_summary_schema import (
+    ConversationSummarySchema,
+)
+from tests.conftest import get_user_schema_params
+from tests.helpers.messages import FROZEN_DATE
+
+
+def get_conversation_summaries(
+    session: Session,
+) -> Dict[Tuple[int, int], Tuple]:
+    return {
+        (summary.user_id, summary.partner_id): (
+            summary.last_message_id,
+            summary.last_message_preview,
+            summary.last_activity_date_time,
+            summary.unread_count,
+        )
+        for summary in session.query(ConversationSummarySchema)
+    }
+
+
+class TestGetConversationSummaryUpdates:
+    def test_summarizes_latest_message_and_counts_recieved(self):
+        messages = [
+            MessageSchema(
+                message_id=message_id,
+                sender_id=sender_id,
+                reciever_id=reciever_id,
+                content=f"message {message_id}",
+                created_date_time=datetime(2022, 1, 1) + timedelta(hours=hour),
+            )
+            for message_id, sender_id, reciever_id, hour in (
+                (3, 2, 1, 2),
+                (1, 1, 2, 0),
+                (2, 2, 1, 1),
+                (4, 1, None, 3),
+            )
+        ]
+
+        updates = get_conversation_summary_updates(messages)
+
+        # the group chat message has no summary.
+        assert set(updates) == {(1, 2), (2, 1)}
+        assert updates[(1, 2)]["last_message_id"] == 3
+        assert updates[(2, 1)]["last_message_id"] == 3
+        assert updates[(1, 2)]["unread_count"] == 2
+        assert updates[(2, 1)]["unread_count"] == 1
+
+
+@freeze_time(FROZEN_DATE)
+class TestConversationSummaries:
+    def test_summaries_are_updated_with_each_message(self, session: Session):
+        for user_id in range(1, 4):
+            session.add(UserSchema(**get_user_schema_params(user_id)))
+
+        session.commit()
+
+        message_handler = MessageHandler(session)
+
+        for hour, (sender_id, reciever_id, content) in enumerate(
+            (
+                (1, 2, "hello"),
+                (2, 1, "hi"),
+                (2, 1, "how are you?"),
+                (3, 1, "x" * (LAST_MESSAGE_PREVIEW_LENGTH * 2)),
+            )
+        ):
+            with freeze_time(datetime.now() + timedelta(hours=hour)):
+                message = message_handler.send_message(
+                    sender_id, reciever_id, content, None
+                )
+
+        summaries = get_conversation_summaries(session)
+
+        assert summaries[(1, 2)][1:] == (
+            "how are you?",
+            datetime(2022, 11, 7, 2),
+            2,
+        )
+        assert summaries[(2, 1)][1:] == (
+            "how are you?",
+            datetime(2022, 11, 7, 2),
+            1,
+        )
+        assert summaries[(1, 3)] == (
+            message.message_id,
+            "x" * LAST_MESSAGE_PREVIEW_LENGTH,
+            datetime(2022, 11, 7, 3),
+            1,
+        )
+        assert summaries[(3, 1)][3] == 0
+
+        rebuild_conversation_summaries(session)
+        session.flush()
+
+        assert get_conversation_summaries(session) == summaries
+
+    def test_earlier_message_does_not_replace_last_message(
+        self, session: Session
+    ):
+        for user_id in range(1, 3):
+            session.add(UserSchema(**get_user_schema_params(user_id)))
+
+        session.commit()
+
+        message_handler = MessageHandler(session)
+
+        with freeze_time(datetime.now() + timedelta(hours=1)):
+            later_message = message_handler.send_message(1, 2, "later", None)
+
+        # a message created earlier that is only inserted afterwards.
+        message_handler.send_message(1, 2, "earlier", None)
+
+        summaries = get_conversation_summaries(session)
+
+        assert summaries[(1, 2)] == (
+            later_message.message_id,
+            "later",
+            datetime(2022, 11, 7, 1),
+            0,
+        )
+        assert summaries[(2, 1)] == (
+            later_message.message_id,
+            "later",
+            datetime(2022, 11, 7, 1),
+            2,
+        )
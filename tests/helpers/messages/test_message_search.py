@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta
+from typing import Set, Tuple
+from freezegun import freeze_time
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from messenger_schemas.schema.user_schema import (
+    UserSchema,
+)
+from messenger.constants.message_search import (
+    MAX_QUERY_TERMS,
+    MAX_TERM_LENGTH,
+)
+from messenger.helpers.handlers.message_handler import MessageHandler
+from messenger.helpers.message_search import (
+    get_query_terms,
+    get_terms,
+    rebuild_message_search_index,
+)
+from messenger.models.schema.message_term_schema import MessageTermSchema
+from tests.conftest import get_user_schema_params
+from tests.helpers.messages import FROZEN_DATE
+
+
+def get_message_terms(session: Session) -> Set[Tuple[int, str, int]]:
+    return set(
+        session.execute(
+            select(
+                MessageTermSchema.user_id,
+                MessageTermSchema.term,
+                MessageTermSchema.message_id,
+            )
+        ).all()
+    )
+
+
+@pytest.mark.parametrize(
+    "text, expected_terms",
+    [
+        ("Hello, hello WORLD!", ["hello", "world"]),
+        ("it's 9pm", ["it", "s", "9pm"]),
+        ("Straße café", ["strasse", "café"]),
+        ("...", []),
+        ("x" * (MAX_TERM_LENGTH + 10), ["x" * MAX_TERM_LENGTH]),
+    ],
+)
+def test_get_terms(text: str, expected_terms):
+    assert get_terms(text) == expected_terms
+
+
+def test_get_query_terms_limits_terms():
+    query = " ".join(f"term{i}" for i in range(MAX_QUERY_TERMS + 5))
+
+    assert get_query_terms(query) == [
+        f"term{i}" for i in range(MAX_QUERY_TERMS)
+    ]
+
+
+@freeze_time(FROZEN_DATE)
+class TestMessageSearchIndex:
+    def test_indexes_direct_messages_for_both_participants(
+        self, session: Session
+    ):
+        for user_id in range(1, 3):
+            session.add(UserSchema(**get_user_schema_params(user_id)))
+
+        session.commit()
+
+        message = MessageHandler(session).send_message(
+            1, 2, "Coffee later? coffee!", None
+        )
+
+        assert get_message_terms(session) == {
+            (user_id, term, message.message_id)
+            for user_id in (1, 2)
+            for term in ("coffee", "later")
+        }
+
+    def test_rebuilt_index_matches_maintained_index(self, session: Session):
+        for user_id in range(1, 4):
+            session.add(UserSchema(**get_user_schema_params(user_id)))
+
+        session.commit()
+
+        message_handler = MessageHandler(session)
+
+        for hour, (sender_id, reciever_id, content) in enumerate(
+            (
+                (1, 2, "dinner tonight"),
+                (2, 1, "sure, dinner sounds good"),
+                (3, 1, "running late"),
+                (3, 3, "a note to self"),
+            )
+        ):
+            with freeze_time(datetime.now() + timedelta(hours=hour)):
+                message_handler.send_message(
+                    sender_id, reciever_id, content, None
+                )
+
+        message_terms = get_message_terms(session)
+
+        # index a message at a time so that several batches are committed.
+        indexed_messages = list(
+            rebuild_message_search_index(session, batch_size=1)
+        )
+
+        assert indexed_messages == [1, 2, 3, 4]
+        assert get_message_terms(session) == message_terms
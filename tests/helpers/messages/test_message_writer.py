@@ -0,0 +1,132 @@
+import asyncio
+from contextlib import contextmanager
+from typing import List
+from unittest.mock import patch
+from fastapi import HTTPException
+import pytest
+from sqlalchemy.orm import Session
+from messenger_schemas.schema.message_schema import (
+    MessageSchema,
+)
+from messenger_schemas.schema.user_schema import (
+    UserSchema,
+)
+from messenger.helpers.message_writer import MessageWriter
+from tests.conftest import get_user_schema_params
+
+
+class TestMessageWriter:
+    def get_message_writer(
+        self, session: Session, max_batch_size: int, batches: List[Session]
+    ) -> MessageWriter:
+        for user_id in range(1, 3):
+            session.add(UserSchema(**get_user_schema_params(user_id)))
+
+        session.commit()
+
+        @contextmanager
+        def session_context():
+            # each batch is written within its own session context.
+            batches.append(session)
+
+            try:
+                yield session
+            except Exception:
+                # the session of a failed batch is closed without committing.
+                session.rollback()
+                raise
+
+        return MessageWriter(max_batch_size, 0.05, session_context)
+
+    @pytest.mark.asyncio
+    async def test_writes_concurrent_messages_in_one_transaction(
+        self, session: Session
+    ):
+        batches: List[Session] = []
+        message_writer = self.get_message_writer(session, 100, batches)
+
+        message_models = await asyncio.gather(
+            *(
+                message_writer.write(1, 2, f"message {i}", None)
+                for i in range(5)
+            )
+        )
+        await message_writer.close()
+
+        assert len(batches) == 1
+        assert [message.content for message in message_models] == [
+            f"message {i}" for i in range(5)
+        ]
+        assert len({message.message_id for message in message_models}) == 5
+
+        for message_model in message_models:
+            message = session.get(MessageSchema, message_model.message_id)
+
+            assert message.content == message_model.content
+            assert message.sender_id == 1
+            assert message.reciever_id == 2
+
+    @pytest.mark.asyncio
+    async def test_bounds_batches_by_size(self, session: Session):
+        batches: List[Session] = []
+        message_writer = self.get_message_writer(session, 2, batches)
+
+        await asyncio.gather(
+            *(message_writer.write(1, 2, "content", None) for _ in range(5))
+        )
+        await message_writer.close()
+
+        assert len(batches) == 3
+        assert session.query(MessageSchema).count() == 5
+
+    @pytest.mark.asyncio
+    async def test_fails_every_message_of_a_failed_batch(self):
+        @contextmanager
+        def failing_session_context():
+            raise ConnectionError("database is unavailable")
+            yield
+
+        message_writer = MessageWriter(100, 0.05, failing_session_context)
+
+        results = await asyncio.gather(
+            *(message_writer.write(1, 2, "content", None) for _ in range(3)),
+            return_exceptions=True,
+        )
+        await message_writer.close()
+
+        for result in results:
+            assert isinstance(result, HTTPException)
+            assert result.status_code == 500
+
+    @pytest.mark.asyncio
+    async def test_retries_messages_of_a_failed_batch_one_at_a_time(
+        self, session: Session
+    ):
+        batches: List[Session] = []
+        message_writer = self.get_message_writer(session, 100, batches)
+
+        def index_messages(db: Session, messages: List[MessageSchema]):
+            if any(message.content == "unindexable" for message in messages):
+                raise ValueError("message could not be indexed")
+
+        with patch(
+            "messenger.helpers.message_writer.index_messages",
+            side_effect=index_messages,
+        ):
+            results = await asyncio.gather(
+                *(
+                    message_writer.write(1, 2, content, None)
+                    for content in ("first", "unindexable", "last")
+                ),
+                return_exceptions=True,
+            )
+            await message_writer.close()
+
+        # the batch, then each of its messages.
+        assert len(batches) == 4
+        assert isinstance(results[1], HTTPException)
+        assert results[1].status_code == 500
+        assert [results[0].content, results[2].content] == ["first", "last"]
+        assert [
+            message.content for message in session.query(MessageSchema)
+        ] == ["first", "last"]
@@ -0,0 +1,228 @@
+from datetime import datetime, timedelta
+from typing import List
+from unittest.mock import patch
+from fastapi import HTTPException
+from freezegun import freeze_time
+import pytest
+from sqlalchemy import func, null, select
+from sqlalchemy.orm import Session
+from messenger_schemas.schema.message_schema import (
+    MessageSchema,
+)
+from messenger_schemas.schema.user_schema import (
+    UserSchema,
+)
+from messenger.helpers.conversation_summaries import (
+    rebuild_conversation_summaries,
+)
+from messenger.helpers.handlers.message_handler import MessageHandler
+from messenger.helpers.read_watermarks import (
+    async_get_seen_messages,
+    read_messages,
+    rebuild_read_watermarks,
+    select_seen,
+)
+from messenger.models.schema.conversation_summary_schema import (
+    ConversationSummarySchema,
+)
+from messenger.models.schema.read_watermark_schema import (
+    ReadWatermarkSchema,
+)
+from messenger.models.schema.user_change_schema import UserChangeSchema
+from tests.conftest import AsyncSessionAdapter, get_user_schema_params
+from tests.helpers.messages import FROZEN_DATE
+
+
+def add_conversation(session: Session) -> List[MessageSchema]:
+    """Adds three users, along with a conversation between the first two and
+    a message from the third to the first."""
+    for user_id in range(1, 4):
+        session.add(UserSchema(**get_user_schema_params(user_id)))
+
+    session.commit()
+
+    message_handler = MessageHandler(session)
+    messages = []
+
+    for hour, (sender_id, reciever_id) in enumerate(
+        ((2, 1), (1, 2), (2, 1), (2, 1), (3, 1))
+    ):
+        with freeze_time(datetime.now() + timedelta(hours=hour)):
+            messages.append(
+                message_handler.send_message(
+                    sender_id, reciever_id, f"message {hour}", None
+                )
+            )
+
+    return messages
+
+
+def get_unread_count(session: Session, user_id: int, partner_id: int) -> int:
+    return session.execute(
+        select(ConversationSummarySchema.unread_count).where(
+            ConversationSummarySchema.user_id == user_id,
+            ConversationSummarySchema.partner_id == partner_id,
+        )
+    ).scalar_one()
+
+
+def get_change_count(session: Session) -> int:
+    return session.execute(
+        select(func.count()).select_from(UserChangeSchema)
+    ).scalar_one()
+
+
+def get_seen(session: Session) -> List[bool]:
+    return [
+        bool(seen)
+        for seen in session.execute(
+            select(select_seen())
+            .select_from(MessageSchema)
+            .order_by(MessageSchema.message_id)
+        ).scalars()
+    ]
+
+
+@freeze_time(FROZEN_DATE)
+class TestReadMessages:
+    @pytest.mark.asyncio
+    async def test_advances_watermark_and_recounts_unread(
+        self, session: Session
+    ):
+        messages = add_conversation(session)
+
+        assert get_unread_count(session, 1, 2) == 3
+        assert get_seen(session) == [False] * 5
+
+        read_watermark = await read_messages(
+            AsyncSessionAdapter(session), 1, 2, messages[2].message_id
+        )
+
+        assert read_watermark.last_read_message_id == messages[2].message_id
+        assert get_unread_count(session, 1, 2) == 1
+        # the message sent by the reader is seen once their partner reads
+        # the conversation, not when the reader does.
+        assert get_seen(session) == [True, False, True, False, False]
+
+        # the conversation with the third user is untouched.
+        assert get_unread_count(session, 1, 3) == 1
+
+        await read_messages(
+            AsyncSessionAdapter(session), 2, 1, messages[1].message_id
+        )
+
+        assert get_seen(session) == [True, True, True, False, False]
+        assert get_unread_count(session, 2, 1) == 0
+
+    @pytest.mark.asyncio
+    async def test_never_moves_watermark_back(self, session: Session):
+        messages = add_conversation(session)
+        db = AsyncSessionAdapter(session)
+
+        await read_messages(db, 1, 2, messages[3].message_id)
+        read_watermark = await read_messages(db, 1, 2, messages[0].message_id)
+
+        assert read_watermark.last_read_message_id == messages[3].message_id
+        assert session.execute(
+            select(ReadWatermarkSchema.last_read_message_id).where(
+                ReadWatermarkSchema.user_id == 1,
+                ReadWatermarkSchema.partner_id == 2,
+            )
+        ).scalar_one() == (messages[3].message_id)
+        assert get_unread_count(session, 1, 2) == 0
+
+    @pytest.mark.asyncio
+    async def test_keeps_watermark_advanced_concurrently(
+        self, session: Session
+    ):
+        messages = add_conversation(session)
+        db = AsyncSessionAdapter(session)
+
+        await read_messages(db, 1, 2, messages[3].message_id)
+        change_count = get_change_count(session)
+
+        # the watermark was read before it was advanced past the message.
+        stale_read_target = select(
+            MessageSchema.message_id, null(), null()
+        ).where(MessageSchema.message_id == messages[2].message_id)
+
+        with patch(
+            "messenger.helpers.read_watermarks.select_read_target",
+            return_value=stale_read_target,
+        ):
+            read_watermark = await read_messages(
+                db, 1, 2, messages[2].message_id
+            )
+
+        assert read_watermark.last_read_message_id == messages[3].message_id
+        assert get_unread_count(session, 1, 2) == 0
+        assert get_change_count(session) == change_count
+
+    @pytest.mark.asyncio
+    async def test_raises_when_message_is_not_of_conversation(
+        self, session: Session
+    ):
+        messages = add_conversation(session)
+
+        with pytest.raises(HTTPException) as exc:
+            await read_messages(
+                AsyncSessionAdapter(session), 1, 2, messages[4].message_id
+            )
+
+        assert exc.value.status_code == 404
+        assert exc.value.detail == "message was not found"
+
+    @pytest.mark.asyncio
+    async def test_seen_messages_match_seen_column(self, session: Session):
+        messages = add_conversation(session)
+        db = AsyncSessionAdapter(session)
+
+        await read_messages(db, 1, 2, messages[2].message_id)
+
+        seen_messages = await async_get_seen_messages(db, messages)
+
+        assert [message.seen for message in seen_messages] == get_seen(session)
+
+    @pytest.mark.asyncio
+    async def test_rebuilt_unread_counts_follow_watermarks(
+        self, session: Session
+    ):
+        messages = add_conversation(session)
+
+        await read_messages(
+            AsyncSessionAdapter(session), 1, 2, messages[2].message_id
+        )
+
+        rebuild_conversation_summaries(session)
+        session.flush()
+
+        assert get_unread_count(session, 1, 2) == 1
+        assert get_unread_count(session, 1, 3) == 1
+        assert get_unread_count(session, 2, 1) == 1
+
+
+@freeze_time(FROZEN_DATE)
+class TestRebuildReadWatermarks:
+    def test_watermarks_are_at_last_seen_messages(self, session: Session):
+        messages = add_conversation(session)
+
+        for message in (messages[0], messages[2], messages[1]):
+            message.seen = True
+
+        session.commit()
+
+        assert rebuild_read_watermarks(session) == 2
+
+        watermarks = {
+            (watermark.user_id, watermark.partner_id): (
+                watermark.last_read_message_id,
+                watermark.read_date_time,
+            )
+            for watermark in session.query(ReadWatermarkSchema)
+        }
+
+        assert watermarks == {
+            (1, 2): (messages[2].message_id, messages[2].created_date_time),
+            (2, 1): (messages[1].message_id, messages[1].created_date_time),
+        }
+        assert get_seen(session) == [True, True, True, False, False]
@@ -0,0 +1,140 @@
+from datetime import datetime
+from typing import Optional
+from fastapi import HTTPException
+from freezegun import freeze_time
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from messenger_schemas.schema.friendship_schema import (
+    FriendshipSchema,
+)
+from messenger_schemas.schema.friendship_status_schema import (
+    FriendshipStatusSchema,
+)
+from messenger_schemas.schema.user_schema import (
+    UserSchema,
+)
+from messenger.constants.friendship_status_codes import FriendshipStatusCode
+from messenger.helpers.friend_cache import friend_cache, get_friend_ids
+from messenger.helpers.handlers.friendship_handler import FriendshipHandler
+from messenger.helpers.send_message import send_message
+from tests.conftest import (
+    add_initial_friendship_status_codes,
+    generate_username,
+    get_user_schema_params,
+)
+from tests.helpers.messages import FROZEN_DATE
+
+
+@pytest.fixture(autouse=True)
+def clear_friend_cache():
+    # the test database is rolled back between tests, thus so must the cache.
+    friend_cache.clear()
+    yield
+    friend_cache.clear()
+
+
+def add_users(
+    session: Session, status_code: Optional[FriendshipStatusCode]
+) -> None:
+    add_initial_friendship_status_codes(session)
+
+    for user_id in range(1, 3):
+        session.add(UserSchema(**get_user_schema_params(user_id)))
+
+    if status_code is not None:
+        session.add(
+            FriendshipSchema(
+                requester_id=2,
+                addressee_id=1,
+                created_date_time=datetime.now(),
+            )
+        )
+        status = FriendshipStatusSchema(
+            requester_id=2,
+            addressee_id=1,
+            specified_date_time=datetime.now(),
+            status_code_id=status_code.value,
+            specifier_id=2,
+        )
+        session.add(status)
+        FriendshipHandler(session).set_current_status(status)
+
+    session.commit()
+
+
+def capture_statements(session: Session) -> list:
+    statements = []
+
+    @event.listens_for(session.get_bind(), "before_cursor_execute")
+    def capture_statement(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    return statements
+
+
+@freeze_time(FROZEN_DATE)
+class TestSendDirectMessage:
+    def test_authorizes_with_a_single_query(self, session: Session):
+        add_users(session, FriendshipStatusCode.ACCEPTED)
+        statements = capture_statements(session)
+
+        message = send_message(session, 1, "hi", None, generate_username(2))
+
+        assert message.sender_id == 1
+        assert message.reciever_id == 2
+
+        # the authorization query is followed by the message's insert.
+        assert statements[0].lstrip().startswith("SELECT")
+        assert statements[1].lstrip().startswith("INSERT")
+
+    def test_authorizes_from_caches_without_query(self, session: Session):
+        add_users(session, FriendshipStatusCode.ACCEPTED)
+        send_message(session, 1, "hi", None, generate_username(2))
+        get_friend_ids(session, 1)
+
+        statements = capture_statements(session)
+
+        send_message(session, 1, "hi again", None, generate_username(2))
+
+        assert statements[0].lstrip().startswith("INSERT")
+
+    @pytest.mark.parametrize(
+        "status_code, username, expected_status_code, expected_detail",
+        [
+            (
+                FriendshipStatusCode.ACCEPTED,
+                "unknown",
+                404,
+                "no such user exists",
+            ),
+            (None, generate_username(2), 404, "friendship was not found"),
+            (
+                FriendshipStatusCode.REQUESTED,
+                generate_username(2),
+                400,
+                "you cannot message this person if you are not their friend",
+            ),
+            (
+                FriendshipStatusCode.BLOCKED,
+                generate_username(2),
+                400,
+                "you cannot message this person if you are not their friend",
+            ),
+        ],
+    )
+    def test_raises_when_not_authorized(
+        self,
+        status_code: Optional[FriendshipStatusCode],
+        username: str,
+        expected_status_code: int,
+        expected_detail: str,
+        session: Session,
+    ):
+        add_users(session, status_code)
+
+        with pytest.raises(HTTPException) as exc_info:
+            send_message(session, 1, "hi", None, username)
+
+        assert exc_info.value.status_code == expected_status_code
+        assert exc_info.value.detail == expected_detail
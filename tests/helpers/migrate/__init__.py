@@ -0,0 +1 @@
+FROZEN_DATE = "2022-11-07"
@@ -0,0 +1,101 @@
+from datetime import datetime
+from freezegun import freeze_time
+from sqlalchemy import func, inspect, select
+from sqlalchemy.orm import Session
+from messenger_schemas.schema import Base
+from messenger_schemas.schema.friendship_schema import (
+    FriendshipSchema,
+)
+from messenger_schemas.schema.user_schema import (
+    UserSchema,
+)
+from messenger.constants.friendship_status_codes import FriendshipStatusCode
+from messenger.helpers.handlers.friendship_handler import FriendshipHandler
+from messenger.helpers.handlers.message_handler import MessageHandler
+from messenger.helpers.migrate import MAINTAINED_TABLES, migrate
+from messenger.models.schema.conversation_summary_schema import (
+    ConversationSummarySchema,
+)
+from messenger.models.schema.current_friendship_status_schema import (
+    CurrentFriendshipStatusSchema,
+)
+from messenger.models.schema.friendship_count_schema import (
+    FriendshipCountSchema,
+)
+from messenger.models.schema.message_term_schema import MessageTermSchema
+from messenger.models.schema.read_watermark_schema import (
+    ReadWatermarkSchema,
+)
+from tests.conftest import (
+    add_initial_friendship_status_codes,
+    get_user_schema_params,
+)
+from tests.helpers.migrate import FROZEN_DATE
+
+
+def count_rows(session: Session, Schema) -> int:
+    return session.execute(
+        select(func.count()).select_from(Schema)
+    ).scalar_one()
+
+
+@freeze_time(FROZEN_DATE)
+class TestMigrate:
+    def add_history(self, session: Session):
+        """Adds an accepted friendship and a direct message the reciever has
+        seen, the way they were written before the maintained tables."""
+        add_initial_friendship_status_codes(session)
+
+        for user_id in range(1, 3):
+            session.add(UserSchema(**get_user_schema_params(user_id)))
+
+        session.add(
+            FriendshipSchema(
+                requester_id=1,
+                addressee_id=2,
+                created_date_time=datetime.now(),
+            )
+        )
+        session.commit()
+
+        FriendshipHandler(session).add_new_status(
+            1, 2, 2, FriendshipStatusCode.ACCEPTED
+        )
+        message = MessageHandler(session).send_message(1, 2, "hello", None)
+        message.seen = True
+        session.commit()
+
+    def test_existing_tables_are_left_as_they_are(self, session: Session):
+        self.add_history(session)
+        session.execute(FriendshipCountSchema.__table__.delete())
+
+        assert migrate(session) == []
+        assert count_rows(session, FriendshipCountSchema) == 0
+
+    def test_created_tables_are_rebuilt(self, session: Session):
+        self.add_history(session)
+
+        Base.metadata.drop_all(
+            bind=session.connection(),
+            tables=[Schema.__table__ for (Schema, _) in MAINTAINED_TABLES],
+        )
+
+        assert set(migrate(session)) == {
+            Schema.__tablename__ for (Schema, _) in MAINTAINED_TABLES
+        }
+        assert {
+            Schema.__tablename__ for (Schema, _) in MAINTAINED_TABLES
+        } <= set(inspect(session.connection()).get_table_names())
+
+        current_status = session.get(CurrentFriendshipStatusSchema, (1, 2))
+
+        assert (
+            current_status.status_code_id
+            == FriendshipStatusCode.ACCEPTED.value
+        )
+        assert session.get(FriendshipCountSchema, 1).friend_count == 1
+        assert session.get(FriendshipCountSchema, 2).friend_count == 1
+        assert session.get(ReadWatermarkSchema, (2, 1)) is not None
+        assert session.get(ConversationSummarySchema, (2, 1)).unread_count == 0
+        # the single term of the message, held for each participant.
+        assert count_rows(session, MessageTermSchema) == 2
@@ -0,0 +1,98 @@
+from datetime import datetime
+from types import SimpleNamespace
+import orjson
+import pytest
+from pydantic import ValidationError
+from messenger.constants.pagination import CursorState
+from messenger.helpers.paginated_response import paginated_response
+from messenger.helpers.tokens.cursor_tokens import encode_cursor
+from messenger.models.fastapi.message_model import MessageModel
+from messenger.models.fastapi.pagination_model import (
+    CursorModel,
+    CursorPaginationModel,
+    PageModel,
+)
+from messenger.models.fastapi.user_model import PublicUserModel
+
+cursors = [
+    CursorModel(prev_page=None, next_page=None),
+    CursorModel(
+        prev_page=encode_cursor(CursorState.PREVIOUS.value, ("username2",)),
+        next_page=encode_cursor(CursorState.NEXT.value, ("username3",)),
+    ),
+]
+
+
+class TestPaginatedResponse:
+    @pytest.mark.parametrize("cursor", cursors)
+    def test_encodes_rows_as_model(self, cursor: CursorModel):
+        rows = [
+            SimpleNamespace(user_id=2, username="username2", email="email2"),
+            SimpleNamespace(user_id=3, username="username3", email="email3"),
+        ]
+
+        response = paginated_response(
+            PublicUserModel,
+            CursorPaginationModel(cursor=cursor, results=rows),
+        )
+
+        assert orjson.loads(response.body) == {
+            "cursor": cursor.dict(),
+            "results": [
+                {"user_id": 2, "username": "username2"},
+                {"user_id": 3, "username": "username3"},
+            ],
+        }
+
+    def test_encodes_pages(self):
+        rows = [
+            SimpleNamespace(user_id=2, username="username2"),
+            SimpleNamespace(user_id=3, username="username3"),
+        ]
+        pages = [
+            PageModel(cursor=cursors[1], size=1),
+            PageModel(cursor=cursors[0], size=1),
+        ]
+
+        response = paginated_response(
+            PublicUserModel,
+            CursorPaginationModel(
+                cursor=cursors[0], results=rows, pages=pages
+            ),
+        )
+
+        assert orjson.loads(response.body)["pages"] == [
+            page.dict() for page in pages
+        ]
+
+    def test_encodes_datetimes(self):
+        message = SimpleNamespace(
+            message_id=1,
+            sender_id=1,
+            reciever_id=2,
+            content="content",
+            group_chat_id=None,
+            created_date_time=datetime(2022, 11, 7, 12, 30),
+            last_edited_date_time=None,
+            seen=False,
+        )
+
+        response = paginated_response(
+            MessageModel,
+            CursorPaginationModel(cursor=cursors[0], results=[message]),
+        )
+
+        assert (
+            orjson.loads(response.body)["results"][0]["created_date_time"]
+            == "2022-11-07T12:30:00"
+        )
+
+    def test_raises_when_row_is_missing_a_field(self):
+        with pytest.raises(ValidationError):
+            paginated_response(
+                PublicUserModel,
+                CursorPaginationModel(
+                    cursor=cursors[0],
+                    results=[SimpleNamespace(user_id=2)],
+                ),
+            )
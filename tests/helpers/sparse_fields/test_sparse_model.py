@@ -0,0 +1,63 @@
+from types import SimpleNamespace
+from typing import Optional
+from fastapi import HTTPException
+import pytest
+from messenger.helpers.dependencies.sparse_fields import sparse_model
+from messenger.models.fastapi.message_model import MessageModel
+from messenger.models.fastapi.user_model import PublicUserModel
+
+
+class TestSparseModel:
+    @pytest.mark.asyncio
+    async def test_returns_model_when_no_fields_requested(self):
+        Model = await sparse_model(PublicUserModel)(None)
+
+        assert Model is PublicUserModel
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "fields, expected_fields",
+        [
+            ("username", ["username"]),
+            ("message_id,content", ["content", "message_id"]),
+            (
+                " seen , sender_id,seen",
+                ["seen", "sender_id"],
+            ),
+        ],
+    )
+    async def test_returns_model_of_requested_fields(
+        self, fields: str, expected_fields
+    ):
+        Model = await sparse_model(
+            PublicUserModel if fields == "username" else MessageModel
+        )(fields)
+
+        assert list(Model.__fields__) == expected_fields
+
+    @pytest.mark.asyncio
+    async def test_reuses_model_of_same_fieldset(self):
+        Model = await sparse_model(MessageModel)("content,message_id")
+        same_fieldset_model = await sparse_model(MessageModel)(
+            "message_id, content"
+        )
+
+        assert Model is same_fieldset_model
+
+    @pytest.mark.asyncio
+    async def test_model_validates_orm_rows(self):
+        Model = await sparse_model(PublicUserModel)("username")
+        row = SimpleNamespace(user_id=1, username="username1")
+
+        assert Model.from_orm(row).dict() == {"username": "username1"}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "fields", ["", "email", "username,password_hash", "username,,"]
+    )
+    async def test_raises_when_fields_invalid(self, fields: Optional[str]):
+        with pytest.raises(HTTPException) as exc_info:
+            await sparse_model(PublicUserModel)(fields)
+
+        assert exc_info.value.status_code == 400
+        assert exc_info.value.detail == "invalid fields"
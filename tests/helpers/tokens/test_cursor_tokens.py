@@ -0,0 +1,122 @@
+import base64
+from datetime import datetime
+from typing import Any, Tuple
+import pytest
+from messenger.constants.pagination import CURSOR_VERSION, CursorState
+from messenger.helpers.tokens.cursor_tokens import (
+    decode_cursor,
+    encode_cursor,
+    sign,
+)
+
+cursor_values = [
+    (),
+    ("username23",),
+    ("ünïcödé___with separators",),
+    ("",),
+    (42,),
+    (-(2**63),),
+    (datetime(2022, 11, 7, 13, 45, 2, 123456),),
+    (datetime(1900, 1, 1),),
+    (datetime(2022, 11, 7), 12),
+    ("username", 12, datetime(2022, 11, 7)),
+]
+
+unencodable_values = [
+    (2**63,),
+    (1.5,),
+    (True,),
+    (None,),
+    (datetime(2022, 11, 7).astimezone(),),
+]
+
+
+def encode_payload(payload: bytes) -> str:
+    return (
+        base64.urlsafe_b64encode(payload + sign(payload))
+        .rstrip(b"=")
+        .decode("ascii")
+    )
+
+
+class TestCursorTokens:
+    @pytest.mark.parametrize(
+        "cursor_state", [state.value for state in CursorState]
+    )
+    @pytest.mark.parametrize("values", cursor_values)
+    def test_round_trips_values(
+        self, cursor_state: str, values: Tuple[Any, ...]
+    ):
+        decoded_state, decoded_values = decode_cursor(
+            encode_cursor(cursor_state, values)
+        )
+
+        assert decoded_state == cursor_state
+        assert decoded_values == values
+        assert [type(value) for value in decoded_values] == [
+            type(value) for value in values
+        ]
+
+    def test_cursor_is_url_safe(self):
+        cursor = encode_cursor(
+            CursorState.NEXT.value, ("username?&=/+", datetime(2022, 11, 7))
+        )
+
+        assert set(cursor) <= set(
+            "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+        )
+
+    def test_does_not_expose_values_as_plain_text(self):
+        cursor = encode_cursor(CursorState.NEXT.value, ("username23",))
+
+        assert "username23" not in cursor
+
+    @pytest.mark.parametrize("index", range(4))
+    def test_raises_when_tampered(self, index: int):
+        cursor = encode_cursor(CursorState.NEXT.value, ("username23",))
+        character = "B" if cursor[index] == "A" else "A"
+
+        with pytest.raises(ValueError):
+            decode_cursor(cursor[:index] + character + cursor[index + 1 :])
+
+    def test_raises_when_values_replaced(self):
+        cursor = encode_cursor(CursorState.NEXT.value, ("username23",))
+        forged_cursor = encode_cursor(CursorState.NEXT.value, ("username1",))
+
+        # keep the signature of the original cursor with the forged values.
+        with pytest.raises(ValueError):
+            decode_cursor(forged_cursor[:-16] + cursor[-16:])
+
+    def test_raises_when_version_differs(self):
+        payload = bytes((CURSOR_VERSION + 1, 0))
+
+        with pytest.raises(ValueError):
+            decode_cursor(encode_payload(payload))
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            bytes((CURSOR_VERSION, 2)),
+            bytes((CURSOR_VERSION, 0)) + b"x",
+            bytes((CURSOR_VERSION, 0)) + b"i\x00\x01",
+            bytes((CURSOR_VERSION, 0)) + b"s\x00\x05abc",
+            bytes((CURSOR_VERSION, 0)) + b"s\x00\x01\xff",
+        ],
+    )
+    def test_raises_when_signed_payload_malformed(self, payload: bytes):
+        with pytest.raises(ValueError):
+            decode_cursor(encode_payload(payload))
+
+    @pytest.mark.parametrize(
+        "cursor", ["", "a", "next___username23", "ping pong", "ünïcödé"]
+    )
+    def test_raises_when_not_a_cursor(self, cursor: str):
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+    @pytest.mark.parametrize("values", unencodable_values)
+    def test_raises_when_value_cannot_be_encoded(
+        self, values: Tuple[Any, ...]
+    ):
+        with pytest.raises((TypeError, ValueError)):
+            encode_cursor(CursorState.NEXT.value, values)
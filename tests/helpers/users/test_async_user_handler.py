@@ -0,0 +1,36 @@
+from fastapi import HTTPException
+import pytest
+from sqlalchemy.orm import Session
+from messenger_schemas.schema.user_schema import (
+    UserSchema,
+)
+
+from messenger.helpers.handlers.async_user_handler import AsyncUserHandler
+from tests.conftest import AsyncSessionAdapter, get_user_schema_params
+
+
+@pytest.mark.asyncio
+async def test_get_user(session: Session):
+    expected_user = UserSchema(**get_user_schema_params(1))
+    session.add(expected_user)
+    session.commit()
+
+    user_handler = AsyncUserHandler(AsyncSessionAdapter(session))
+
+    user = await user_handler.get_user(
+        UserSchema.username == expected_user.username
+    )
+
+    assert user_handler.user is user
+    assert user.user_id == expected_user.user_id
+
+
+@pytest.mark.asyncio
+async def test_get_user_raises_when_not_found(session: Session):
+    user_handler = AsyncUserHandler(AsyncSessionAdapter(session))
+
+    with pytest.raises(HTTPException) as exc_info:
+        await user_handler.get_user(UserSchema.user_id == 1)
+
+    assert exc_info.value.status_code == 404
+    assert exc_info.value.detail == "no such user exists"
@@ -0,0 +1,159 @@
+from fastapi import HTTPException
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from messenger_schemas.schema.user_schema import (
+    UserSchema,
+)
+from messenger.helpers.handlers.user_handler import UserHandler
+from messenger.helpers.username_cache import (
+    CachedUser,
+    UsernameCache,
+    username_cache,
+)
+from tests.conftest import generate_username, get_user_schema_params
+
+
+@pytest.fixture
+def users(session: Session):
+    for user_id in range(1, 4):
+        session.add(UserSchema(**get_user_schema_params(user_id)))
+
+    session.commit()
+
+
+def count_queries(session: Session) -> list:
+    statements = []
+
+    @event.listens_for(session.get_bind(), "before_cursor_execute")
+    def count_query(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    return statements
+
+
+class TestUsernameCache:
+    def test_evicts_least_recently_used(self):
+        cache = UsernameCache(2, 60, 60)
+
+        cache.set("a", CachedUser(1, "a"), cache.generation)
+        cache.set("b", CachedUser(2, "b"), cache.generation)
+
+        # "a" becomes the most recently used.
+        assert cache.get("a") == (True, CachedUser(1, "a"))
+
+        cache.set("c", None, cache.generation)
+
+        assert len(cache) == 2
+        assert cache.get("b") == (False, None)
+        assert cache.get("a") == (True, CachedUser(1, "a"))
+        assert cache.get("c") == (True, None)
+
+    def test_expires_unknown_usernames_separately(self):
+        cache = UsernameCache(5, 60, 0)
+
+        cache.set("a", CachedUser(1, "a"), cache.generation)
+        cache.set("b", None, cache.generation)
+
+        assert cache.get("a") == (True, CachedUser(1, "a"))
+        assert cache.get("b") == (False, None)
+
+    def test_invalidates_every_casing_of_a_username(self):
+        cache = UsernameCache(5, 60, 60)
+
+        cache.set("Name", None, cache.generation)
+        cache.invalidate("name")
+
+        assert cache.get("Name") == (False, None)
+
+    def test_does_not_serve_another_casing_of_a_username(self):
+        cache = UsernameCache(5, 60, 60)
+
+        cache.set("Name", CachedUser(1, "Name"), cache.generation)
+
+        assert cache.get("name") == (False, None)
+
+    def test_does_not_cache_load_started_before_invalidation(self):
+        cache = UsernameCache(5, 60, 60)
+        generation = cache.generation
+
+        cache.invalidate("b")
+        cache.set("a", CachedUser(1, "a"), generation)
+
+        assert cache.get("a") == (False, None)
+
+
+@pytest.mark.usefixtures("users")
+class TestGetUserByUsername:
+    def test_resolves_username_once(self, session: Session):
+        user_handler = UserHandler(session)
+        statements = count_queries(session)
+
+        for _ in range(3):
+            user = user_handler.get_user_by_username(generate_username(2))
+
+            assert user == CachedUser(2, generate_username(2))
+
+        assert len(statements) == 1
+
+    def test_caches_unknown_usernames(self, session: Session):
+        user_handler = UserHandler(session)
+        statements = count_queries(session)
+
+        for _ in range(3):
+            with pytest.raises(HTTPException) as exc_info:
+                user_handler.get_user_by_username("unknown")
+
+            assert exc_info.value.status_code == 404
+
+        assert len(statements) == 1
+
+    def test_invalidates_username_when_user_is_created(self, session: Session):
+        user_handler = UserHandler(session)
+        username = generate_username(4)
+
+        with pytest.raises(HTTPException):
+            user_handler.get_user_by_username(username)
+
+        session.add(UserSchema(**get_user_schema_params(4)))
+        session.commit()
+
+        assert user_handler.get_user_by_username(username) == CachedUser(
+            4, username
+        )
+
+    def test_invalidates_both_usernames_when_user_is_renamed(
+        self, session: Session
+    ):
+        user_handler = UserHandler(session)
+        username = generate_username(1)
+
+        user_handler.get_user_by_username(username)
+
+        with pytest.raises(HTTPException):
+            user_handler.get_user_by_username("renamed")
+
+        session.get(UserSchema, 1).username = "renamed"
+        session.commit()
+
+        with pytest.raises(HTTPException):
+            user_handler.get_user_by_username(username)
+
+        assert user_handler.get_user_by_username("renamed") == CachedUser(
+            1, "renamed"
+        )
+
+    def test_invalidates_username_when_creation_rolls_back(
+        self, session: Session
+    ):
+        user_handler = UserHandler(session)
+        username = generate_username(4)
+
+        session.add(UserSchema(**get_user_schema_params(4)))
+        session.flush()
+
+        # cached by the session that created the user before rolling back.
+        user_handler.get_user_by_username(username)
+        session.rollback()
+
+        assert username_cache.get(username) == (False, None)
@@ -0,0 +1,122 @@
+"""Checks the MySQL query plans of the query builders, see
+benchmarks.query_plans. Skipped unless QUERY_PLAN_DATABASE_URL is the url of a
+MySQL database seeded by benchmarks.seed, as the plans of the empty test
+database do not reflect those of production.
+"""
+
+import os
+from typing import Dict, List
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from benchmarks.query_plans import (
+    QUERY_PLAN_CASES,
+    LARGE_TABLE_ROWS,
+    find_plan_regressions,
+    get_plan_snapshot,
+    get_query_plan,
+    get_table_sizes,
+    load_snapshots,
+)
+
+QUERY_PLAN_DATABASE_URL = os.environ.get("QUERY_PLAN_DATABASE_URL")
+
+requires_query_plan_database = pytest.mark.skipif(
+    QUERY_PLAN_DATABASE_URL is None,
+    reason="QUERY_PLAN_DATABASE_URL is not set",
+)
+
+
+@pytest.fixture(scope="module")
+def plan_session():
+    engine = create_engine(QUERY_PLAN_DATABASE_URL)
+
+    if engine.dialect.name != "mysql":
+        pytest.skip("query plans can only be captured from MySQL")
+
+    db = sessionmaker(bind=engine, autoflush=False)()
+
+    yield db
+
+    db.close()
+    engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def table_sizes(plan_session) -> Dict[str, int]:
+    return get_table_sizes(plan_session)
+
+
+@pytest.fixture(scope="module")
+def query_plans(plan_session) -> Dict[str, List[List[Dict]]]:
+    return {
+        name: get_query_plan(plan_session, case)
+        for name, case in QUERY_PLAN_CASES.items()
+    }
+
+
+def get_step(table: str, type: str, extra: str = None) -> Dict:
+    return {
+        "id": 1,
+        "select_type": "SIMPLE",
+        "table": table,
+        "type": type,
+        "key": None,
+        "Extra": extra,
+        "rows": 1,
+    }
+
+
+class TestFindPlanRegressions:
+    table_sizes = {"message": LARGE_TABLE_ROWS, "user": LARGE_TABLE_ROWS - 1}
+
+    def test_finds_full_scans_and_filesorts_of_large_tables(self):
+        plan = [
+            [get_step("message", "ALL")],
+            [get_step("message_1", "ref", "Using where; Using filesort")],
+        ]
+
+        assert find_plan_regressions(plan, self.table_sizes) == [
+            f"statement 0: full table scan of message ({LARGE_TABLE_ROWS} rows)",
+            f"statement 1: filesort of message ({LARGE_TABLE_ROWS} rows)",
+        ]
+
+    def test_ignores_small_and_derived_tables(self):
+        plan = [
+            [
+                get_step("user", "ALL", "Using filesort"),
+                get_step("<derived2>", "ALL", "Using filesort"),
+                get_step("message", "range", "Using where"),
+            ]
+        ]
+
+        assert find_plan_regressions(plan, self.table_sizes) == []
+
+
+@requires_query_plan_database
+@pytest.mark.parametrize("case_name", list(QUERY_PLAN_CASES))
+class TestQueryPlans:
+    def test_does_not_scan_or_sort_large_tables(
+        self,
+        case_name: str,
+        query_plans: Dict[str, List[List[Dict]]],
+        table_sizes: Dict[str, int],
+    ):
+        plan = query_plans[case_name]
+
+        assert len(plan) > 0
+        assert find_plan_regressions(plan, table_sizes) == []
+
+    def test_matches_snapshot(
+        self, case_name: str, query_plans: Dict[str, List[List[Dict]]]
+    ):
+        snapshots = load_snapshots()
+
+        assert case_name in snapshots, (
+            "no snapshot is recorded, record it with "
+            "python -m benchmarks.query_plans --update-snapshots"
+        )
+
+        assert (
+            get_plan_snapshot(query_plans[case_name]) == snapshots[case_name]
+        )
@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from freezegun import freeze_time
+from sqlalchemy.orm import Session
+from messenger_schemas.schema.user_schema import (
+    UserSchema,
+)
+from messenger.helpers.handlers.message_handler import MessageHandler
+from tests.conftest import (
+    FROZEN_DATE,
+    generate_username,
+    get_user_schema_params,
+)
+
+
+@freeze_time(FROZEN_DATE)
+class TestGetConversations:
+    def test_produces_no_conversations_without_messages(
+        self, async_client: TestClient
+    ):
+        response = async_client.get("/conversations?limit=5")
+
+        assert response.status_code == 200
+        assert response.json()["results"] == []
+
+    def test_pages_through_conversations_by_last_activity(
+        self,
+        async_client: TestClient,
+        current_active_user: UserSchema,
+        session: Session,
+    ):
+        for user_id in range(2, 6):
+            session.add(UserSchema(**get_user_schema_params(user_id)))
+
+        session.commit()
+
+        message_handler = MessageHandler(session)
+
+        # the conversation with user 3 is the least recently active, despite
+        # having been the first to begin.
+        for hour, (sender_id, reciever_id) in enumerate(
+            ((3, 1), (1, 2), (4, 1), (1, 5), (2, 1), (4, 1))
+        ):
+            with freeze_time(datetime.now() + timedelta(hours=hour)):
+                message_handler.send_message(
+                    sender_id, reciever_id, f"message {hour}", None
+                )
+
+        response = async_client.get("/conversations?limit=2")
+        first_page = response.json()
+
+        assert response.status_code == 200
+        assert [
+            (
+                conversation["partner_username"],
+                conversation["last_message_preview"],
+                conversation["unread_count"],
+            )
+            for conversation in first_page["results"]
+        ] == [
+            (generate_username(4), "message 5", 2),
+            (generate_username(2), "message 4", 1),
+        ]
+
+        response = async_client.get(
+            f"/conversations?limit=2&cursor={first_page['cursor']['next_page']}"
+        )
+        second_page = response.json()
+
+        assert [
+            conversation["partner_username"]
+            for conversation in second_page["results"]
+        ] == [generate_username(5), generate_username(3)]
+        assert second_page["cursor"]["next_page"] is None
+        assert current_active_user.user_id == 1
+
+    def test_retrieves_only_requested_fields(
+        self, async_client: TestClient, session: Session
+    ):
+        session.add(UserSchema(**get_user_schema_params(2)))
+        session.commit()
+
+        MessageHandler(session).send_message(2, 1, "hello", None)
+
+        response = async_client.get(
+            "/conversations?limit=2&fields=partner_username,unread_count"
+        )
+
+        assert response.json()["results"] == [
+            {"partner_username": generate_username(2), "unread_count": 1}
+        ]
@@ -13,6 +13,10 @@ from messenger_schemas.schema.user_schema import (
     UserSchema,
 )
 from messenger.constants.friendship_status_codes import FriendshipStatusCode
+from messenger.helpers.handlers.friendship_handler import FriendshipHandler
+from messenger.models.schema.current_friendship_status_schema import (
+    CurrentFriendshipStatusSchema,
+)
 from tests.conftest import add_initial_friendship_status_codes
 from tests.routers.friends.helpers.initialize_friendship_request import (
     initialize_friendship_request_addressed_to_current_user,
@@ -55,11 +59,24 @@ def assert_addressing_adds_new_friendship_status_to_db(
         latest_friendship_status.status_code_id
         == expected_friendship_status_code.value
     )
-    assert latest_friendship_status.requester_id == friendship_requester.user_id
+    assert (
+        latest_friendship_status.requester_id == friendship_requester.user_id
+    )
     assert latest_friendship_status.addressee_id == current_active_user.user_id
     assert latest_friendship_status.specifier_id == current_active_user.user_id
     assert latest_friendship_status.specified_date_time == datetime.now()
 
+    current_status = session.get(
+        CurrentFriendshipStatusSchema,
+        (friendship.requester_id, friendship.addressee_id),
+    )
+
+    assert current_status is not None
+    assert (
+        current_status.status_code_id == expected_friendship_status_code.value
+    )
+    assert current_status.specifier_id == current_active_user.user_id
+
 
 def assert_addressing_produces_201_status_code(
     url: str,
@@ -152,6 +169,8 @@ def assert_addressing_fails_when_friendship_already_addressed(
             specified_date_time=datetime.now() + timedelta(days=10),
         ),
     )
+    FriendshipHandler(session).set_current_status(friendship.statuses[0])
+    session.commit()
 
     response = test_client.post(url)
 
@@ -168,6 +187,8 @@ def assert_addressing_fails_when_friendship_already_addressed(
             specified_date_time=datetime.now() + timedelta(days=11),
         ),
     )
+    FriendshipHandler(session).set_current_status(friendship.statuses[0])
+    session.commit()
 
     response = test_client.post(url)
 
@@ -202,6 +223,8 @@ def assert_addressing_fails_when_friendship_blocked(
             specified_date_time=datetime.now() + timedelta(days=10),
         ),
     )
+    FriendshipHandler(session).set_current_status(friendship.statuses[0])
+    session.commit()
 
     response = test_client.post(url)
 
@@ -0,0 +1,365 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from freezegun import freeze_time
+from fastapi.testclient import TestClient
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from messenger_schemas.schema.friendship_schema import (
+    FriendshipSchema,
+)
+from messenger_schemas.schema.friendship_status_schema import (
+    FriendshipStatusSchema,
+)
+from messenger_schemas.schema.user_schema import (
+    UserSchema,
+)
+from messenger.constants.bulk_friendship_actions import (
+    MAX_BULK_FRIENDSHIP_USERNAMES,
+)
+from messenger.constants.friendship_status_codes import FriendshipStatusCode
+from messenger.helpers.handlers.friendship_handler import FriendshipHandler
+from tests.conftest import (
+    add_initial_friendship_status_codes,
+    generate_username,
+    get_user_schema_params,
+)
+from tests.routers.friends.conftest import FROZEN_DATE
+
+URL = "/friends/requests/bulk"
+
+
+def add_friendship(
+    session: Session,
+    requester_id: int,
+    addressee_id: int,
+    status_code: FriendshipStatusCode,
+):
+    status = FriendshipStatusSchema(
+        requester_id=requester_id,
+        addressee_id=addressee_id,
+        specified_date_time=datetime.now() - timedelta(days=1),
+        status_code_id=status_code.value,
+        specifier_id=requester_id,
+    )
+
+    session.add(
+        FriendshipSchema(
+            requester_id=requester_id,
+            addressee_id=addressee_id,
+            created_date_time=datetime.now() - timedelta(days=1),
+        )
+    )
+    session.add(status)
+    FriendshipHandler(session).set_current_status(status)
+    session.commit()
+
+
+def add_users(
+    session: Session,
+    current_user_id: int,
+    initial_statuses: Dict[int, Optional[FriendshipStatusCode]],
+):
+    """Adds a user for each id, along with a friendship requested by that
+    user of the given status, or no friendship if it is None."""
+    add_initial_friendship_status_codes(session)
+
+    for user_id in initial_statuses:
+        session.add(UserSchema(**get_user_schema_params(user_id)))
+
+    session.commit()
+
+    for user_id, status_code in initial_statuses.items():
+        if status_code is not None:
+            add_friendship(session, user_id, current_user_id, status_code)
+
+
+def get_results(
+    test_client: TestClient, user_ids: List[int], action: str
+) -> List[Dict]:
+    response = test_client.post(
+        URL,
+        json={
+            "usernames": [generate_username(user_id) for user_id in user_ids],
+            "action": action,
+        },
+    )
+
+    assert response.status_code == 200
+
+    return response.json()["results"]
+
+
+def get_latest_status_code_id(
+    session: Session, user_id_a: int, user_id_b: int
+) -> Optional[str]:
+    current_status = FriendshipHandler(session).get_current_status(
+        user_id_a, user_id_b
+    )
+
+    return None if current_status is None else current_status.status_code_id
+
+
+class TestBulkFriendshipAction:
+    @freeze_time(FROZEN_DATE)
+    @pytest.mark.parametrize(
+        "action, status_code",
+        [
+            ("accept", FriendshipStatusCode.ACCEPTED),
+            ("decline", FriendshipStatusCode.DECLINED),
+        ],
+    )
+    def test_addresses_every_request(
+        self,
+        action: str,
+        status_code: FriendshipStatusCode,
+        session: Session,
+        client: Tuple[TestClient, UserSchema],
+    ):
+        (test_client, current_active_user) = client
+        user_ids = [2, 3, 4, 5]
+        add_users(
+            session,
+            current_active_user.user_id,
+            {user_id: FriendshipStatusCode.REQUESTED for user_id in user_ids},
+        )
+
+        results = get_results(test_client, user_ids, action)
+
+        assert results == [
+            {
+                "username": generate_username(user_id),
+                "status_code": 201,
+                "detail": None,
+            }
+            for user_id in user_ids
+        ]
+
+        for user_id in user_ids:
+            latest_status = (
+                session.query(FriendshipStatusSchema)
+                .filter(
+                    FriendshipStatusSchema.requester_id == user_id,
+                    FriendshipStatusSchema.addressee_id
+                    == current_active_user.user_id,
+                )
+                .order_by(FriendshipStatusSchema.specified_date_time.desc())
+                .first()
+            )
+
+            assert latest_status is not None
+            assert latest_status.status_code_id == status_code.value
+            assert latest_status.specifier_id == current_active_user.user_id
+            assert (
+                get_latest_status_code_id(
+                    session, user_id, current_active_user.user_id
+                )
+                == status_code.value
+            )
+
+    @freeze_time(FROZEN_DATE)
+    def test_reports_each_failure_as_its_single_route_would(
+        self,
+        session: Session,
+        client: Tuple[TestClient, UserSchema],
+    ):
+        (test_client, current_active_user) = client
+        add_users(
+            session,
+            current_active_user.user_id,
+            {
+                2: FriendshipStatusCode.REQUESTED,
+                3: FriendshipStatusCode.ACCEPTED,
+                4: FriendshipStatusCode.BLOCKED,
+                5: None,
+            },
+        )
+        # a request sent by the current user cannot be accepted by them.
+        session.add(UserSchema(**get_user_schema_params(6)))
+        session.commit()
+        add_friendship(
+            session,
+            current_active_user.user_id,
+            6,
+            FriendshipStatusCode.REQUESTED,
+        )
+
+        response = test_client.post(
+            URL,
+            json={
+                "usernames": [
+                    generate_username(2),
+                    generate_username(3),
+                    generate_username(4),
+                    generate_username(5),
+                    generate_username(6),
+                    "non-existent-username",
+                    current_active_user.username,
+                    generate_username(2),
+                ],
+                "action": "accept",
+            },
+        )
+
+        assert response.status_code == 200
+        assert [
+            (result["status_code"], result["detail"])
+            for result in response.json()["results"]
+        ] == [
+            (201, None),
+            (400, "friend request already addressed"),
+            (400, "friendship is blocked"),
+            (404, "friendship was not found"),
+            (404, "friendship was not found"),
+            (404, "no such user exists"),
+            (400, "cannot address a friendship with yourself"),
+        ]
+
+        assert (
+            get_latest_status_code_id(session, 2, current_active_user.user_id)
+            == FriendshipStatusCode.ACCEPTED.value
+        )
+        assert (
+            get_latest_status_code_id(session, 4, current_active_user.user_id)
+            == FriendshipStatusCode.BLOCKED.value
+        )
+        assert (
+            get_latest_status_code_id(session, 6, current_active_user.user_id)
+            == FriendshipStatusCode.REQUESTED.value
+        )
+
+    @freeze_time(FROZEN_DATE)
+    def test_applies_once_to_usernames_differing_in_case(
+        self,
+        session: Session,
+        client: Tuple[TestClient, UserSchema],
+    ):
+        (test_client, current_active_user) = client
+        add_users(
+            session,
+            current_active_user.user_id,
+            {2: FriendshipStatusCode.REQUESTED},
+        )
+
+        response = test_client.post(
+            URL,
+            json={
+                "usernames": [
+                    generate_username(2),
+                    generate_username(2).upper(),
+                ],
+                "action": "accept",
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.json()["results"] == [
+            {
+                "username": generate_username(2),
+                "status_code": 201,
+                "detail": None,
+            }
+        ]
+
+    @freeze_time(FROZEN_DATE)
+    def test_blocks_with_and_without_friendships(
+        self,
+        session: Session,
+        client: Tuple[TestClient, UserSchema],
+    ):
+        (test_client, current_active_user) = client
+        add_users(
+            session,
+            current_active_user.user_id,
+            {
+                2: FriendshipStatusCode.REQUESTED,
+                3: FriendshipStatusCode.ACCEPTED,
+                4: FriendshipStatusCode.BLOCKED,
+                5: None,
+            },
+        )
+
+        results = get_results(test_client, [2, 3, 4, 5], "block")
+
+        assert [result["status_code"] for result in results] == [
+            201,
+            201,
+            400,
+            201,
+        ]
+
+        for user_id in (2, 3, 4, 5):
+            assert (
+                get_latest_status_code_id(
+                    session, user_id, current_active_user.user_id
+                )
+                == FriendshipStatusCode.BLOCKED.value
+            )
+
+        # the friendship that did not exist is requested by the blocker.
+        friendship = (
+            session.query(FriendshipSchema)
+            .filter(FriendshipSchema.addressee_id == 5)
+            .one()
+        )
+
+        assert friendship.requester_id == current_active_user.user_id
+
+    @freeze_time(FROZEN_DATE)
+    def test_query_count_does_not_grow_with_usernames(
+        self,
+        session: Session,
+        client: Tuple[TestClient, UserSchema],
+    ):
+        (test_client, current_active_user) = client
+        user_ids = list(range(2, 22))
+        add_users(
+            session,
+            current_active_user.user_id,
+            {user_id: FriendshipStatusCode.REQUESTED for user_id in user_ids},
+        )
+
+        # load the current user such that its refresh is not counted.
+        session.refresh(current_active_user)
+        statements: List[str] = []
+
+        def count_statement(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(session.bind, "before_cursor_execute", count_statement)
+
+        try:
+            get_results(test_client, user_ids[:2], "accept")
+            query_count = len(statements)
+            statements.clear()
+
+            get_results(test_client, user_ids[2:], "accept")
+        finally:
+            event.remove(
+                session.bind, "before_cursor_execute", count_statement
+            )
+
+        assert len(statements) == query_count
+
+    @pytest.mark.parametrize(
+        "body",
+        [
+            {"usernames": [], "action": "accept"},
+            {"usernames": ["username2"], "action": "request"},
+            {
+                "usernames": [
+                    generate_username(user_id)
+                    for user_id in range(MAX_BULK_FRIENDSHIP_USERNAMES + 1)
+                ],
+                "action": "block",
+            },
+        ],
+    )
+    def test_should_produce_422_when_body_invalid(
+        self, body: Dict, client: Tuple[TestClient, UserSchema]
+    ):
+        (test_client, _) = client
+
+        response = test_client.post(URL, json=body)
+
+        assert response.status_code == 422
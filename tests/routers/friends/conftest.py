@@ -18,9 +18,16 @@ from messenger_schemas.schema.friendship_status_schema import (
 )
 from messenger.constants.friendship_status_codes import FriendshipStatusCode
 from messenger.fastApi import app
-from messenger.helpers.dependencies.user import get_current_active_user
+from messenger.helpers.handlers.friendship_handler import FriendshipHandler
+from messenger.helpers.dependencies.async_database import (
+    async_database_session,
+)
+from messenger.helpers.dependencies.user import (
+    async_get_current_active_user,
+    get_current_active_user,
+)
 from messenger.models.fastapi.user_model import PublicUserModel
-from tests.conftest import get_user_schema_params
+from tests.conftest import AsyncSessionAdapter, get_user_schema_params
 
 
 @pytest.fixture
@@ -42,10 +49,22 @@ def client(session: Session):
     def override_get_current_active_user():
         yield current_active_user
 
+    async def override_async_database_session():
+        yield AsyncSessionAdapter(session)
+
+    async def override_async_get_current_active_user():
+        return current_active_user
+
     app.dependency_overrides[
         get_current_active_user
     ] = override_get_current_active_user
     app.dependency_overrides[database_session] = override_database_session
+    app.dependency_overrides[
+        async_get_current_active_user
+    ] = override_async_get_current_active_user
+    app.dependency_overrides[
+        async_database_session
+    ] = override_async_database_session
 
     test_client = TestClient(app)
 
@@ -53,6 +72,8 @@ def client(session: Session):
 
     del app.dependency_overrides[database_session]
     del app.dependency_overrides[get_current_active_user]
+    del app.dependency_overrides[async_database_session]
+    del app.dependency_overrides[async_get_current_active_user]
 
 
 FROZEN_DATE = "2022-11-07"
@@ -105,6 +126,11 @@ def add_friendships(
 
         session.add(friendship_status)
 
+        # statuses are given in order, thus the last status of a friendship
+        # is its current status. Each is flushed so the next is merged into it.
+        FriendshipHandler(session).set_current_status(friendship_status)
+        session.flush()
+
     session.commit()
 
     return expected_users
@@ -1,5 +1,6 @@
 from messenger.constants.friendship_status_codes import FriendshipStatusCode
 from messenger.constants.pagination import CursorState
+from messenger.helpers.tokens.cursor_tokens import encode_cursor
 from tests.conftest import generate_username
 
 get_first_page_params = (
@@ -27,7 +28,7 @@ get_first_page_params = (
             ],
             [3, 4, 5],
             "3",
-            CursorState.NEXT.value + "___" + generate_username(5),
+            encode_cursor(CursorState.NEXT.value, (generate_username(5),)),
         ),
         (
             [
@@ -61,9 +62,9 @@ get_middle_page_params = (
             ],
             [6, 7],
             "2",
-            CursorState.NEXT.value + "___" + generate_username(5),
-            CursorState.NEXT.value + "___" + generate_username(7),
-            CursorState.PREVIOUS.value + "___" + generate_username(6),
+            encode_cursor(CursorState.NEXT.value, (generate_username(5),)),
+            encode_cursor(CursorState.NEXT.value, (generate_username(7),)),
+            encode_cursor(CursorState.PREVIOUS.value, (generate_username(6),)),
         ),
         (
             [
@@ -76,9 +77,9 @@ get_middle_page_params = (
             ],
             [4],
             "1",
-            CursorState.PREVIOUS.value + "___" + generate_username(5),
-            CursorState.NEXT.value + "___" + generate_username(4),
-            CursorState.PREVIOUS.value + "___" + generate_username(4),
+            encode_cursor(CursorState.PREVIOUS.value, (generate_username(5),)),
+            encode_cursor(CursorState.NEXT.value, (generate_username(4),)),
+            encode_cursor(CursorState.PREVIOUS.value, (generate_username(4),)),
         ),
         (
             [
@@ -96,9 +97,9 @@ get_middle_page_params = (
             ],
             [4, 5],
             "2",
-            CursorState.PREVIOUS.value + "___" + generate_username(6),
-            CursorState.NEXT.value + "___" + generate_username(5),
-            CursorState.PREVIOUS.value + "___" + generate_username(4),
+            encode_cursor(CursorState.PREVIOUS.value, (generate_username(6),)),
+            encode_cursor(CursorState.NEXT.value, (generate_username(5),)),
+            encode_cursor(CursorState.PREVIOUS.value, (generate_username(4),)),
         ),
     ],
 )
@@ -118,8 +119,8 @@ get_last_page_params = (
             ],
             [6, 7, 8],
             "3",
-            CursorState.NEXT.value + "___" + generate_username(5),
-            CursorState.PREVIOUS.value + "___" + generate_username(6),
+            encode_cursor(CursorState.NEXT.value, (generate_username(5),)),
+            encode_cursor(CursorState.PREVIOUS.value, (generate_username(6),)),
         ),
         (
             [
@@ -132,8 +133,8 @@ get_last_page_params = (
             ],
             [6, 7],
             "5",
-            CursorState.NEXT.value + "___" + generate_username(5),
-            CursorState.PREVIOUS.value + "___" + generate_username(6),
+            encode_cursor(CursorState.NEXT.value, (generate_username(5),)),
+            encode_cursor(CursorState.PREVIOUS.value, (generate_username(6),)),
         ),
         (
             [
@@ -151,16 +152,16 @@ get_last_page_params = (
             ],
             [4, 5, 6],
             "3",
-            CursorState.NEXT.value + "___" + generate_username(3),
-            CursorState.PREVIOUS.value + "___" + generate_username(4),
+            encode_cursor(CursorState.NEXT.value, (generate_username(3),)),
+            encode_cursor(CursorState.PREVIOUS.value, (generate_username(4),)),
         ),
     ],
 )
 
 
 valid_query_params = [
-    ("5", CursorState.NEXT.value + "___2"),
-    ("3", CursorState.PREVIOUS.value + "___4"),
-    ("23", CursorState.NEXT.value + "___23"),
+    ("5", encode_cursor(CursorState.NEXT.value, (generate_username(2),))),
+    ("3", encode_cursor(CursorState.PREVIOUS.value, (generate_username(4),))),
+    ("23", encode_cursor(CursorState.NEXT.value, (generate_username(23),))),
     ("1", None),
 ]
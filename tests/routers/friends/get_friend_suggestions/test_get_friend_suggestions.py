@@ -0,0 +1,102 @@
+from datetime import datetime
+from typing import Tuple
+from fastapi.testclient import TestClient
+from freezegun import freeze_time
+import pytest
+from sqlalchemy.orm import Session
+from messenger_schemas.schema.friendship_schema import (
+    FriendshipSchema,
+)
+from messenger_schemas.schema.user_schema import (
+    UserSchema,
+)
+from messenger.constants.friend_suggestions import MAX_FRIEND_SUGGESTIONS
+from messenger.constants.friendship_status_codes import FriendshipStatusCode
+from messenger.helpers.handlers.friendship_handler import FriendshipHandler
+from tests.conftest import (
+    add_initial_friendship_status_codes,
+    generate_username,
+    get_user_schema_params,
+)
+from tests.routers.friends.conftest import FROZEN_DATE, add_friendships
+
+
+@freeze_time(FROZEN_DATE)
+class TestGetFriendSuggestions:
+    def add_friends_of_friends(self, session: Session, current_user_id: int):
+        add_initial_friendship_status_codes(session)
+        add_friendships(
+            [
+                (2, FriendshipStatusCode.ACCEPTED),
+                (3, FriendshipStatusCode.ACCEPTED),
+            ],
+            [2, 3],
+            current_user_id,
+            session,
+        )
+
+        for user_id in (4, 5):
+            session.add(UserSchema(**get_user_schema_params(user_id)))
+
+        for requester_id, addressee_id in ((2, 4), (3, 4), (2, 5)):
+            session.add(
+                FriendshipSchema(
+                    requester_id=requester_id,
+                    addressee_id=addressee_id,
+                    created_date_time=datetime.now(),
+                )
+            )
+            FriendshipHandler(session).add_new_status(
+                requester_id,
+                addressee_id,
+                addressee_id,
+                FriendshipStatusCode.ACCEPTED,
+            )
+
+        session.commit()
+
+    def test_suggests_users_by_mutual_friend_count(
+        self, client: Tuple[TestClient, UserSchema], session: Session
+    ):
+        (test_client, current_active_user) = client
+        self.add_friends_of_friends(session, current_active_user.user_id)
+
+        response = test_client.get("/friends/suggestions")
+
+        assert response.status_code == 200
+        assert response.json() == [
+            {
+                "user_id": 4,
+                "username": generate_username(4),
+                "mutual_friend_count": 2,
+            },
+            {
+                "user_id": 5,
+                "username": generate_username(5),
+                "mutual_friend_count": 1,
+            },
+        ]
+
+        response = test_client.get("/friends/suggestions?limit=1")
+
+        assert [suggestion["user_id"] for suggestion in response.json()] == [4]
+
+    def test_suggests_no_one_without_friends(
+        self, client: Tuple[TestClient, UserSchema]
+    ):
+        (test_client, _) = client
+
+        response = test_client.get("/friends/suggestions")
+
+        assert response.status_code == 200
+        assert response.json() == []
+
+    @pytest.mark.parametrize("limit", [0, -1, MAX_FRIEND_SUGGESTIONS + 1])
+    def test_produces_422_when_limit_invalid(
+        self, limit: int, client: Tuple[TestClient, UserSchema]
+    ):
+        (test_client, _) = client
+
+        response = test_client.get(f"/friends/suggestions?limit={limit}")
+
+        assert response.status_code == 422
@@ -1,5 +1,6 @@
 from messenger.constants.friendship_status_codes import FriendshipStatusCode
 from messenger.constants.pagination import CursorState
+from messenger.helpers.tokens.cursor_tokens import encode_cursor
 
 from tests.conftest import generate_username
 
@@ -28,7 +29,7 @@ get_first_page_params = (
             ],
             [3, 4, 5],
             "3",
-            CursorState.NEXT.value + "___" + generate_username(5),
+            encode_cursor(CursorState.NEXT.value, (generate_username(5),)),
         ),
         (
             [
@@ -62,9 +63,9 @@ get_middle_page_params = (
             ],
             [6, 7],
             "2",
-            CursorState.NEXT.value + "___" + generate_username(5),
-            CursorState.NEXT.value + "___" + generate_username(7),
-            CursorState.PREVIOUS.value + "___" + generate_username(6),
+            encode_cursor(CursorState.NEXT.value, (generate_username(5),)),
+            encode_cursor(CursorState.NEXT.value, (generate_username(7),)),
+            encode_cursor(CursorState.PREVIOUS.value, (generate_username(6),)),
         ),
         (
             [
@@ -77,9 +78,9 @@ get_middle_page_params = (
             ],
             [4],
             "1",
-            CursorState.PREVIOUS.value + "___" + generate_username(5),
-            CursorState.NEXT.value + "___" + generate_username(4),
-            CursorState.PREVIOUS.value + "___" + generate_username(4),
+            encode_cursor(CursorState.PREVIOUS.value, (generate_username(5),)),
+            encode_cursor(CursorState.NEXT.value, (generate_username(4),)),
+            encode_cursor(CursorState.PREVIOUS.value, (generate_username(4),)),
         ),
         (
             [
@@ -97,9 +98,9 @@ get_middle_page_params = (
             ],
             [4, 5],
             "2",
-            CursorState.PREVIOUS.value + "___" + generate_username(6),
-            CursorState.NEXT.value + "___" + generate_username(5),
-            CursorState.PREVIOUS.value + "___" + generate_username(4),
+            encode_cursor(CursorState.PREVIOUS.value, (generate_username(6),)),
+            encode_cursor(CursorState.NEXT.value, (generate_username(5),)),
+            encode_cursor(CursorState.PREVIOUS.value, (generate_username(4),)),
         ),
     ],
 )
@@ -119,8 +120,8 @@ get_last_page_params = (
             ],
             [6, 7, 8],
             "3",
-            CursorState.NEXT.value + "___" + generate_username(5),
-            CursorState.PREVIOUS.value + "___" + generate_username(6),
+            encode_cursor(CursorState.NEXT.value, (generate_username(5),)),
+            encode_cursor(CursorState.PREVIOUS.value, (generate_username(6),)),
         ),
         (
             [
@@ -133,8 +134,8 @@ get_last_page_params = (
             ],
             [6, 7],
             "5",
-            CursorState.NEXT.value + "___" + generate_username(5),
-            CursorState.PREVIOUS.value + "___" + generate_username(6),
+            encode_cursor(CursorState.NEXT.value, (generate_username(5),)),
+            encode_cursor(CursorState.PREVIOUS.value, (generate_username(6),)),
         ),
         (
             [
@@ -152,16 +153,59 @@ get_last_page_params = (
             ],
             [4, 5, 6],
             "3",
-            CursorState.NEXT.value + "___" + generate_username(3),
-            CursorState.PREVIOUS.value + "___" + generate_username(4),
+            encode_cursor(CursorState.NEXT.value, (generate_username(3),)),
+            encode_cursor(CursorState.PREVIOUS.value, (generate_username(4),)),
         ),
     ],
 )
 
 
 valid_query_params = [
-    ("5", CursorState.NEXT.value + "___2"),
-    ("3", CursorState.PREVIOUS.value + "___4"),
-    ("23", CursorState.NEXT.value + "___username-email23"),
+    ("5", encode_cursor(CursorState.NEXT.value, (generate_username(2),))),
+    ("3", encode_cursor(CursorState.PREVIOUS.value, (generate_username(4),))),
+    ("23", encode_cursor(CursorState.NEXT.value, ("username-email23",))),
     ("1", None),
 ]
+
+get_prefetched_pages_params = (
+    "friend_data, accepted_friend_ids, limit, pages",
+    [
+        (
+            [
+                (3, FriendshipStatusCode.ACCEPTED),
+                (5, FriendshipStatusCode.ACCEPTED),
+                (2, FriendshipStatusCode.DECLINED),
+                (4, FriendshipStatusCode.ACCEPTED),
+                (6, FriendshipStatusCode.ACCEPTED),
+                (7, FriendshipStatusCode.ACCEPTED),
+            ],
+            [3, 4, 5, 6, 7],
+            "2",
+            "2",
+        ),
+        (
+            [
+                (3, FriendshipStatusCode.ACCEPTED),
+                (5, FriendshipStatusCode.ACCEPTED),
+                (4, FriendshipStatusCode.ACCEPTED),
+                (6, FriendshipStatusCode.REQUESTED),
+            ],
+            [3, 4, 5],
+            "2",
+            "4",
+        ),
+        (
+            [
+                (8, FriendshipStatusCode.ACCEPTED),
+                (9, FriendshipStatusCode.ACCEPTED),
+                (5, FriendshipStatusCode.ACCEPTED),
+                (4, FriendshipStatusCode.ACCEPTED),
+                (6, FriendshipStatusCode.ACCEPTED),
+                (7, FriendshipStatusCode.ACCEPTED),
+            ],
+            [4, 5, 6, 7, 8, 9],
+            "2",
+            "3",
+        ),
+    ],
+)
@@ -7,12 +7,14 @@ from messenger_schemas.schema.user_schema import (
     UserSchema,
 )
 from messenger.constants.friendship_status_codes import FriendshipStatusCode
+from messenger.constants.pagination import MAX_PREFETCH_PAGES
 from tests.conftest import add_initial_friendship_status_codes
 from tests.routers.friends.conftest import FROZEN_DATE, add_friendships
 from tests.routers.friends.get_friends.conftest import (
     get_first_page_params,
     get_middle_page_params,
     get_last_page_params,
+    get_prefetched_pages_params,
     valid_query_params,
 )
 from tests.helpers.dependencies.pagination.conftest import invalid_cursors
@@ -43,7 +45,9 @@ class TestGetFriends:
         assert response.status_code == 400
         assert response.json() == {"detail": "invalid cursor"}
 
-    @pytest.mark.parametrize(get_first_page_params[0], get_first_page_params[1])
+    @pytest.mark.parametrize(
+        get_first_page_params[0], get_first_page_params[1]
+    )
     def test_retrieves_first_page(
         self,
         friend_data: List[Tuple[int, FriendshipStatusCode]],
@@ -71,7 +75,9 @@ class TestGetFriends:
             key=lambda user_model: user_model["user_id"],
         ) == sorted(expected_users, key=lambda user_model: user_model.user_id)
 
-    @pytest.mark.parametrize(get_first_page_params[0], get_first_page_params[1])
+    @pytest.mark.parametrize(
+        get_first_page_params[0], get_first_page_params[1]
+    )
     def test_retrieves_correct_cursor_when_first_page(
         self,
         friend_data: List[Tuple[int, FriendshipStatusCode]],
@@ -217,3 +223,101 @@ class TestGetFriends:
 
         assert response_cursor["next_page"] is None
         assert response_cursor["prev_page"] == expected_previous_cursor
+
+    @pytest.mark.parametrize("pages", ["0", str(MAX_PREFETCH_PAGES + 1)])
+    def test_produces_422_when_pages_invalid(
+        self, pages: str, client: Tuple[TestClient, UserSchema]
+    ):
+        (test_client, _) = client
+
+        response = test_client.get(f"/friends?limit=2&pages={pages}")
+        assert response.status_code == 422
+
+    @pytest.mark.parametrize(
+        get_prefetched_pages_params[0], get_prefetched_pages_params[1]
+    )
+    def test_prefetched_pages_match_sequential_pages(
+        self,
+        friend_data: List[Tuple[int, FriendshipStatusCode]],
+        accepted_friend_ids: List[int],
+        limit: str,
+        pages: str,
+        client: Tuple[TestClient, UserSchema],
+        session: Session,
+    ):
+        (test_client, current_active_user) = client
+        add_initial_friendship_status_codes(session)
+
+        add_friendships(
+            friend_data,
+            accepted_friend_ids,
+            current_active_user.user_id,
+            session,
+        )
+
+        response = test_client.get(f"/friends?limit={limit}&pages={pages}")
+
+        sequential_pages = []
+        cursor = ""
+
+        for _ in range(int(pages)):
+            page = test_client.get(f"/friends?limit={limit}&{cursor}").json()
+            sequential_pages.append(page)
+
+            if page["cursor"]["next_page"] is None:
+                break
+
+            cursor = f"cursor={page['cursor']['next_page']}"
+
+        assert response.json()["results"] == [
+            user for page in sequential_pages for user in page["results"]
+        ]
+        assert response.json()["pages"] == [
+            {"cursor": page["cursor"], "size": len(page["results"])}
+            for page in sequential_pages
+        ]
+        assert response.json()["cursor"] == {
+            "prev_page": None,
+            "next_page": sequential_pages[-1]["cursor"]["next_page"],
+        }
+
+    @pytest.mark.parametrize(
+        get_first_page_params[0], get_first_page_params[1]
+    )
+    def test_retrieves_only_requested_fields(
+        self,
+        friend_data: List[Tuple[int, FriendshipStatusCode]],
+        accepted_friend_ids: List[int],
+        limit: str,
+        expected_next_cursor: str,
+        client: Tuple[TestClient, UserSchema],
+        session: Session,
+    ):
+        (test_client, current_active_user) = client
+        add_initial_friendship_status_codes(session)
+
+        expected_users = add_friendships(
+            friend_data,
+            accepted_friend_ids,
+            current_active_user.user_id,
+            session,
+        )
+
+        response = test_client.get(f"/friends?limit={limit}&fields=username")
+
+        assert sorted(
+            response.json()["results"], key=lambda user: user["username"]
+        ) == sorted(
+            [{"username": user.username} for user in expected_users],
+            key=lambda user: user["username"],
+        )
+        assert response.json()["cursor"]["next_page"] == expected_next_cursor
+
+    def test_produces_400_when_fields_invalid(
+        self, client: Tuple[TestClient, UserSchema]
+    ):
+        (test_client, _) = client
+
+        response = test_client.get("/friends?limit=2&fields=email")
+        assert response.status_code == 400
+        assert response.json() == {"detail": "invalid fields"}
@@ -0,0 +1,93 @@
+from typing import Tuple
+from fastapi.testclient import TestClient
+from freezegun import freeze_time
+from sqlalchemy.orm import Session
+from messenger_schemas.schema.user_schema import (
+    UserSchema,
+)
+from messenger.constants.friendship_status_codes import FriendshipStatusCode
+from tests.conftest import (
+    add_initial_friendship_status_codes,
+    generate_username,
+    get_user_schema_params,
+)
+from tests.routers.friends.conftest import FROZEN_DATE, add_friendships
+
+
+@freeze_time(FROZEN_DATE)
+class TestGetFriendshipCounts:
+    def test_produces_zero_counts_without_friendships(
+        self, client: Tuple[TestClient, UserSchema]
+    ):
+        (test_client, _) = client
+
+        response = test_client.get("/friends/counts")
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "friend_count": 0,
+            "incoming_request_count": 0,
+            "outgoing_request_count": 0,
+        }
+
+    def test_counts_friends_and_requests(
+        self, client: Tuple[TestClient, UserSchema], session: Session
+    ):
+        (test_client, current_active_user) = client
+        add_initial_friendship_status_codes(session)
+        add_friendships(
+            [
+                (2, FriendshipStatusCode.ACCEPTED),
+                (3, FriendshipStatusCode.REQUESTED),
+                (4, FriendshipStatusCode.REQUESTED),
+                (4, FriendshipStatusCode.ACCEPTED),
+                (5, FriendshipStatusCode.BLOCKED),
+            ],
+            [],
+            current_active_user.user_id,
+            session,
+        )
+        add_friendships(
+            [
+                (6, FriendshipStatusCode.REQUESTED),
+                (7, FriendshipStatusCode.DECLINED),
+            ],
+            [],
+            current_active_user.user_id,
+            session,
+            active_user_is_requester=False,
+        )
+
+        response = test_client.get("/friends/counts")
+
+        assert response.json() == {
+            "friend_count": 2,
+            "incoming_request_count": 1,
+            "outgoing_request_count": 1,
+        }
+
+    def test_counts_follow_sent_and_deleted_requests(
+        self, client: Tuple[TestClient, UserSchema], session: Session
+    ):
+        (test_client, _) = client
+        add_initial_friendship_status_codes(session)
+        session.add(UserSchema(**get_user_schema_params(2)))
+        session.commit()
+
+        test_client.post(f"/friends/requests?username={generate_username(2)}")
+
+        assert test_client.get("/friends/counts").json() == {
+            "friend_count": 0,
+            "incoming_request_count": 0,
+            "outgoing_request_count": 1,
+        }
+
+        test_client.delete(
+            f"/friends/requests?friend_username={generate_username(2)}"
+        )
+
+        assert test_client.get("/friends/counts").json() == {
+            "friend_count": 0,
+            "incoming_request_count": 0,
+            "outgoing_request_count": 0,
+        }
@@ -12,6 +12,7 @@ from messenger_schemas.schema.user_schema import (
     UserSchema,
 )
 from messenger.constants.friendship_status_codes import FriendshipStatusCode
+from messenger.helpers.handlers.friendship_handler import FriendshipHandler
 from tests.conftest import add_initial_friendship_status_codes
 
 
@@ -51,6 +52,7 @@ def initialize_friendship_request_addressed_to_current_user(
     session.add(friendship_requester)
     session.add(friendship)
     session.add(friendship_status)
+    FriendshipHandler(session).set_current_status(friendship_status)
 
     session.commit()
 
@@ -13,6 +13,10 @@ from messenger_schemas.schema.friendship_status_schema import (
     FriendshipStatusSchema,
 )
 from messenger.constants.friendship_status_codes import FriendshipStatusCode
+from messenger.helpers.handlers.friendship_handler import FriendshipHandler
+from messenger.models.schema.current_friendship_status_schema import (
+    CurrentFriendshipStatusSchema,
+)
 from tests.conftest import (
     add_initial_friendship_status_codes,
     valid_usernames,
@@ -102,6 +106,40 @@ class TestSendFriendshipRequest:
             FriendshipSchema.addressee_id == user_to_friend_request.user_id,
         ).one()
 
+    @pytest.mark.parametrize(
+        "username, email, password",
+        zip(valid_usernames, valid_emails, valid_passwords),
+    )
+    def test_should_set_current_friendship_status(
+        self,
+        username: str,
+        email: str,
+        password: str,
+        session: Session,
+        client: Tuple[TestClient, UserSchema],
+    ):
+        (test_client, current_active_user) = client
+        add_initial_friendship_status_codes(session)
+        user_to_friend_request = self.add_user_to_friend_request(
+            session, current_active_user.user_id, username, password, email
+        )
+
+        test_client.post(
+            f"friends/requests?username={user_to_friend_request.username}"
+        )
+
+        current_status = session.get(
+            CurrentFriendshipStatusSchema,
+            (current_active_user.user_id, user_to_friend_request.user_id),
+        )
+
+        assert current_status is not None
+        assert (
+            current_status.status_code_id
+            == FriendshipStatusCode.REQUESTED.value
+        )
+        assert current_status.specifier_id == current_active_user.user_id
+
     @pytest.mark.parametrize(
         "username, email, password",
         zip(valid_usernames, valid_emails, valid_passwords),
@@ -171,6 +209,7 @@ class TestSendFriendshipRequest:
 
         session.add(friendship)
         session.add(friendship_status)
+        FriendshipHandler(session).set_current_status(friendship_status)
 
         session.commit()
 
@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 from fastapi.testclient import TestClient
 import pytest
 from messenger_schemas.schema import (
@@ -8,7 +8,13 @@ from messenger_schemas.schema.user_schema import (
     UserSchema,
 )
 from messenger.fastApi import app
-from messenger.helpers.dependencies.user import get_current_active_user
+from messenger.helpers.dependencies.async_database import (
+    async_database_session,
+)
+from messenger.helpers.dependencies.user import (
+    async_get_current_active_user,
+    get_current_active_user,
+)
 
 
 current_active_user = UserSchema(
@@ -20,6 +26,7 @@ current_active_user = UserSchema(
 
 
 session_mock = MagicMock()
+async_session_mock = AsyncMock()
 
 
 def override_database_session():
@@ -32,12 +39,27 @@ def override_get_current_active_user():
     return current_active_user
 
 
+def override_async_database_session():
+    async_session_mock.reset_mock()
+    return async_session_mock
+
+
+async def override_async_get_current_active_user():
+    return current_active_user
+
+
 @pytest.fixture
 def client():
     app.dependency_overrides[
         get_current_active_user
     ] = override_get_current_active_user
     app.dependency_overrides[database_session] = override_database_session
+    app.dependency_overrides[
+        async_get_current_active_user
+    ] = override_async_get_current_active_user
+    app.dependency_overrides[
+        async_database_session
+    ] = override_async_database_session
 
     test_client = TestClient(app)
 
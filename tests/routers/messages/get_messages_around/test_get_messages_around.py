@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+from fastapi.testclient import TestClient
+from freezegun import freeze_time
+import pytest
+from sqlalchemy.orm import Session
+from messenger_schemas.schema.user_schema import (
+    UserSchema,
+)
+from messenger.helpers.handlers.message_handler import MessageHandler
+from tests.conftest import (
+    FROZEN_DATE,
+    generate_username,
+    get_user_schema_params,
+)
+
+
+def send_messages(session: Session) -> List[int]:
+    """Sends messages between the current user and a second user, then one
+    from a third user to the second, returning their ids."""
+    for user_id in range(2, 4):
+        session.add(UserSchema(**get_user_schema_params(user_id)))
+
+    session.commit()
+
+    message_handler = MessageHandler(session)
+    message_ids = []
+
+    for hour, (sender_id, reciever_id) in enumerate(
+        ((1, 2), (2, 1), (1, 2), (2, 1), (3, 2))
+    ):
+        with freeze_time(datetime.now() + timedelta(hours=hour)):
+            message_ids.append(
+                message_handler.send_message(
+                    sender_id, reciever_id, f"message {hour}", None
+                ).message_id
+            )
+
+    return message_ids
+
+
+@freeze_time(FROZEN_DATE)
+class TestGetMessagesAround:
+    def test_retrieves_messages_around_message(
+        self, async_client: TestClient, session: Session
+    ):
+        message_ids = send_messages(session)
+
+        response = async_client.get(
+            f"/messages/around?friend_username={generate_username(2)}"
+            f"&message_id={message_ids[2]}&limit=1"
+        )
+
+        assert response.status_code == 200
+        assert sorted(
+            message["message_id"] for message in response.json()["results"]
+        ) == [message_ids[1], message_ids[2], message_ids[3]]
+
+    @pytest.mark.parametrize("message_index", [4, None])
+    def test_raises_when_message_is_not_of_conversation(
+        self,
+        async_client: TestClient,
+        session: Session,
+        message_index: Optional[int],
+    ):
+        message_ids = send_messages(session)
+        message_id = (
+            message_ids[message_index]
+            if message_index is not None
+            else message_ids[-1] + 1
+        )
+
+        response = async_client.get(
+            f"/messages/around?friend_username={generate_username(2)}"
+            f"&message_id={message_id}&limit=1"
+        )
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == "message was not found"
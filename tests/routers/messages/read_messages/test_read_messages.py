@@ -0,0 +1,40 @@
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+from fastapi.testclient import TestClient
+from messenger.helpers.username_cache import CachedUser
+from messenger.models.fastapi.message_model import ReadWatermarkModel
+
+
+@patch("messenger.routers.messages.sio.emit", new_callable=AsyncMock)
+@patch("messenger.routers.messages.read_messages", new_callable=AsyncMock)
+@patch(
+    "messenger.routers.messages.AsyncUserHandler.get_user_by_username",
+    new_callable=AsyncMock,
+)
+def test_notifies_friend_of_read_watermark(
+    get_user_by_username_mock: AsyncMock,
+    read_messages_mock: AsyncMock,
+    emit_mock: AsyncMock,
+    client: TestClient,
+):
+    read_watermark = ReadWatermarkModel(
+        last_read_message_id=7, read_date_time=datetime(2022, 11, 7)
+    )
+    get_user_by_username_mock.return_value = CachedUser(2, "username2")
+    read_messages_mock.return_value = read_watermark
+
+    response = client.post(
+        "/messages/read?friend_username=username2", json={"message_id": 7}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["last_read_message_id"] == 7
+    assert read_messages_mock.call_args.args[1:] == (1, 2, 7)
+    emit_mock.assert_awaited_once_with(
+        "messages read",
+        {
+            "reader_username": "test-username",
+            "read_watermark": read_watermark.json(),
+        },
+        to=2,
+    )
@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+from typing import List
+from fastapi.testclient import TestClient
+from freezegun import freeze_time
+from sqlalchemy.orm import Session
+from messenger_schemas.schema.user_schema import (
+    UserSchema,
+)
+from messenger.helpers.handlers.message_handler import MessageHandler
+from tests.conftest import FROZEN_DATE, get_user_schema_params
+
+
+def send_messages(session: Session, contents: List[str]) -> List[int]:
+    """Sends messages alternately from the current user to a second user and
+    back, while a third user messages the second, returning their ids."""
+    for user_id in range(2, 4):
+        session.add(UserSchema(**get_user_schema_params(user_id)))
+
+    session.commit()
+
+    message_handler = MessageHandler(session)
+    message_ids = []
+
+    for hour, content in enumerate(contents):
+        sender_id, reciever_id = (1, 2) if hour % 2 == 0 else (2, 1)
+
+        with freeze_time(datetime.now() + timedelta(hours=hour)):
+            message_ids.append(
+                message_handler.send_message(
+                    sender_id, reciever_id, content, None
+                ).message_id
+            )
+
+    message_handler.send_message(3, 2, "coffee later", None)
+
+    return message_ids
+
+
+@freeze_time(FROZEN_DATE)
+class TestSearchMessages:
+    def test_ranks_messages_by_matched_terms_then_recency(
+        self, async_client: TestClient, session: Session
+    ):
+        message_ids = send_messages(
+            session,
+            [
+                "coffee later?",
+                "coffee sounds good",
+                "see you later",
+                "Coffee, then later a movie",
+                "unrelated",
+            ],
+        )
+
+        response = async_client.get(
+            "/messages/search?query=Coffee+later&limit=2"
+        )
+        first_page = response.json()
+
+        assert response.status_code == 200
+        assert [
+            (result["message_id"], result["relevance"])
+            for result in first_page["results"]
+        ] == [(message_ids[3], 2), (message_ids[0], 2)]
+
+        response = async_client.get(
+            "/messages/search?query=Coffee+later&limit=2"
+            f"&cursor={first_page['cursor']['next_page']}"
+        )
+        second_page = response.json()
+
+        # the message between the other users is not searched.
+        assert [
+            (result["message_id"], result["relevance"])
+            for result in second_page["results"]
+        ] == [(message_ids[2], 1), (message_ids[1], 1)]
+        assert second_page["cursor"]["next_page"] is None
+
+    def test_retrieves_only_requested_fields(
+        self, async_client: TestClient, session: Session
+    ):
+        send_messages(session, ["dinner tonight?"])
+
+        response = async_client.get(
+            "/messages/search?query=dinner&limit=2&fields=content"
+        )
+
+        assert response.json()["results"] == [{"content": "dinner tonight?"}]
+
+    def test_raises_when_query_has_no_terms(self, async_client: TestClient):
+        response = async_client.get("/messages/search?query=...&limit=2")
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "the query has no searchable terms"
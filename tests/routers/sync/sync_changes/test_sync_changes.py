@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from freezegun import freeze_time
+import pytest
+from sqlalchemy.orm import Session
+from messenger_schemas.schema.user_schema import (
+    UserSchema,
+)
+from messenger.constants.sync import MAX_SYNC_LIMIT
+from messenger.helpers.handlers.message_handler import MessageHandler
+from tests.conftest import FROZEN_DATE, get_user_schema_params
+
+
+@freeze_time(FROZEN_DATE)
+class TestSyncChanges:
+    def test_pages_through_changes_after_sequence(
+        self, async_client: TestClient, session: Session
+    ):
+        for user_id in range(2, 4):
+            session.add(UserSchema(**get_user_schema_params(user_id)))
+
+        session.commit()
+
+        message_handler = MessageHandler(session)
+        message_ids = []
+
+        for hour, (sender_id, reciever_id) in enumerate(
+            ((2, 1), (2, 3), (1, 3), (3, 1))
+        ):
+            with freeze_time(datetime.now() + timedelta(hours=hour)):
+                message_ids.append(
+                    message_handler.send_message(
+                        sender_id, reciever_id, f"message {hour}", None
+                    ).message_id
+                )
+
+        response = async_client.get("/sync?since=0&limit=2")
+        first_page = response.json()
+
+        assert response.status_code == 200
+        assert [
+            (change["sequence"], change["message_id"])
+            for change in first_page["changes"]
+        ] == [(1, message_ids[0]), (2, message_ids[2])]
+        assert first_page["changes"][0]["change_type"] == "message"
+        assert first_page["changes"][0]["content"] == "message 0"
+        assert first_page["next_since"] == 2
+        assert first_page["has_more"]
+
+        response = async_client.get("/sync?since=2&limit=2")
+        second_page = response.json()
+
+        # the message between the other users is not a change of the
+        # current user.
+        assert [
+            (change["sequence"], change["message_id"])
+            for change in second_page["changes"]
+        ] == [(3, message_ids[3])]
+        assert second_page["next_since"] == 3
+        assert not second_page["has_more"]
+
+    def test_produces_no_changes_when_up_to_date(
+        self, async_client: TestClient
+    ):
+        response = async_client.get("/sync?since=4&limit=2")
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "changes": [],
+            "next_since": 4,
+            "has_more": False,
+        }
+
+    @pytest.mark.parametrize("limit", [0, MAX_SYNC_LIMIT + 1])
+    def test_rejects_unbounded_limit(
+        self, async_client: TestClient, limit: int
+    ):
+        response = async_client.get(f"/sync?since=0&limit={limit}")
+
+        assert response.status_code == 422